@@ -0,0 +1,6 @@
+"""
+Offline performance benchmarks for the AI Web Scraper.
+
+Benchmarks run against local fixtures only and write JSON reports that can
+be compared across commits.
+"""
@@ -0,0 +1,268 @@
+"""
+AI pipeline benchmark against the offline Gemini stand-in.
+
+Runs ContentProcessor over corpus and synthetic pages with AI_BACKEND=standin,
+so batching, caching, quota pacing and circuit-breaker behaviour can be
+measured deterministically without an API key or network access. Each
+scenario runs in a fresh process because the AI client, quota governor and
+result cache are per-process singletons configured from the environment.
+
+Usage:
+    python -m benchmarks.ai_pipeline --scenario all --documents 40
+    python -m benchmarks.ai_pipeline --scenario quota --quota-rpm 30 --rate-limit-rate 0.05
+    python -m benchmarks.ai_pipeline --scenario breaker --error-rate 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from .extraction import CORPUS_DIR
+from .reporting import ResourceMonitor, build_report, latency_summary, write_report
+from .site_server import SyntheticSite, SyntheticSiteConfig
+
+SCENARIOS = ("separate", "combined", "micro_batch", "cache", "quota", "breaker")
+
+# Settings each scenario runs with on top of the common stand-in settings
+SCENARIO_ENV = {
+    "separate": {"AI_COMBINED_ANALYSIS": "false", "AI_MICRO_BATCH_ENABLED": "false"},
+    "combined": {"AI_COMBINED_ANALYSIS": "true", "AI_MICRO_BATCH_ENABLED": "false"},
+    "micro_batch": {"AI_COMBINED_ANALYSIS": "true", "AI_MICRO_BATCH_ENABLED": "true"},
+    "cache": {"AI_COMBINED_ANALYSIS": "true", "AI_MICRO_BATCH_ENABLED": "false", "AI_CACHE_ENABLED": "true"},
+    "quota": {"AI_COMBINED_ANALYSIS": "true", "AI_MICRO_BATCH_ENABLED": "false", "AI_QUOTA_ENABLED": "true"},
+    "breaker": {"AI_COMBINED_ANALYSIS": "true", "AI_MICRO_BATCH_ENABLED": "false"},
+}
+
+
+def _load_documents(count: int, page_size: int, seed: int) -> List[Tuple[str, str]]:
+    """Corpus pages followed by synthetic pages, as (html, url) pairs."""
+    documents = [
+        (path.read_text(encoding="utf-8"), f"https://{path.stem.replace('_', '-')}.example.com/")
+        for path in sorted(CORPUS_DIR.glob("*.html"))
+    ]
+    site = SyntheticSite(SyntheticSiteConfig(num_pages=count, page_size_bytes=page_size, seed=seed))
+    page_id = 0
+    while len(documents) < count:
+        documents.append((site.render_page(page_id).decode("utf-8"), f"https://synthetic.example.com/page/{page_id}.html"))
+        page_id += 1
+    return documents[:count]
+
+
+def _scenario_env(name: str, args: Dict[str, Any], cache_dir: str) -> Dict[str, str]:
+    env = {
+        "AI_BACKEND": "standin",
+        "AI_STANDIN_LATENCY_MS": str(args["latency_ms"]),
+        "AI_STANDIN_LATENCY_DISTRIBUTION": args["distribution"],
+        "AI_STANDIN_ERROR_RATE": str(args["error_rate"]),
+        "AI_STANDIN_RATE_LIMIT_RATE": str(args["rate_limit_rate"]),
+        "AI_STANDIN_RPM": str(args["server_rpm"]),
+        "AI_STANDIN_SEED": str(args["seed"]),
+        "AI_TRIAGE_ENABLED": "false",
+        "AI_CACHE_ENABLED": "false",
+        "AI_CACHE_BACKEND": "sqlite",
+        "AI_CACHE_PATH": os.path.join(cache_dir, "ai_cache.db"),
+        "AI_QUOTA_ENABLED": "false",
+        "AI_QUOTA_BACKEND": "local",
+        "AI_QUOTA_RPM": str(args["quota_rpm"]),
+        "AI_DEFERRED_ENRICHMENT": "false",
+    }
+    env.update(SCENARIO_ENV[name])
+    return env
+
+
+async def _process_documents(documents: List[Tuple[str, str]], concurrency: int) -> Tuple[List[Tuple[bool, float]], Dict[str, Any]]:
+    from src.ai.content_processor import ContentProcessor
+    from src.ai.micro_batcher import get_micro_batcher
+    from src.models.pydantic_models import ContentType
+
+    processor = ContentProcessor()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(html: str, url: str) -> Tuple[bool, float]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await processor.process_content(html, ContentType.HTML, url)
+            except Exception:
+                return False, time.perf_counter() - start
+            ok = result.processing_metadata.get("model_used") != "fallback_processor"
+            return ok, time.perf_counter() - start
+
+    outcomes = await asyncio.gather(*(process(html, url) for html, url in documents))
+    # The micro-batcher is bound to this event loop
+    return outcomes, get_micro_batcher(processor._model).get_stats()
+
+
+async def _call_through_breaker(documents: List[Tuple[str, str]], concurrency: int) -> Tuple[List[Tuple[bool, float]], Dict[str, Any]]:
+    from src.ai.client import get_ai_client
+    from src.ai.combined_analyzer import CombinedAnalyzer
+    from src.ai.model_backend import get_model_backend
+    from src.models.pydantic_models import ContentType
+    from src.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerError
+
+    # Same thresholds as the worker's ai_circuit_breaker, with a short recovery
+    # window so the half-open transitions show up within one run
+    breaker = CircuitBreaker(
+        name="ai_benchmark",
+        config=CircuitBreakerConfig(failure_threshold=3, recovery_timeout=1.0, timeout=120.0, jitter=False)
+    )
+    model = get_model_backend()
+    analyzer = CombinedAnalyzer(model)
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def call(html: str, url: str) -> Tuple[bool, float]:
+        nonlocal rejected
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await breaker.call(get_ai_client().generate, model, analyzer._build_prompt(html, ContentType.HTML, url))
+                return True, time.perf_counter() - start
+            except CircuitBreakerError:
+                rejected += 1
+            except Exception:
+                pass
+            return False, time.perf_counter() - start
+
+    outcomes = await asyncio.gather(*(call(html, url) for html, url in documents))
+    stats = breaker.get_stats()
+    stats["rejected_while_open"] = rejected
+    return outcomes, stats
+
+
+def _run_in_process(name: str, env: Dict[str, str], args: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario; executed in a fresh process with env applied."""
+    os.environ.update(env)
+    os.environ.pop("GEMINI_API_KEY", None)
+    logging.basicConfig(level=logging.ERROR)
+
+    documents = _load_documents(args["documents"], args["page_size"], args["seed"])
+    passes = 2 if name == "cache" else 1
+
+    from src.ai.client import get_ai_client
+    from src.ai.model_backend import get_model_backend
+
+    monitor = ResourceMonitor()
+    breaker_stats = batch_stats = None
+    outcomes: List[Tuple[bool, float]] = []
+    pass_seconds = []
+    with monitor:
+        for _ in range(passes):
+            start = time.perf_counter()
+            if name == "breaker":
+                run_outcomes, breaker_stats = asyncio.run(_call_through_breaker(documents, args["concurrency"]))
+            else:
+                run_outcomes, batch_stats = asyncio.run(_process_documents(documents, args["concurrency"]))
+            pass_seconds.append(time.perf_counter() - start)
+            outcomes.extend(run_outcomes)
+
+    succeeded = [latency for ok, latency in outcomes if ok]
+    wall = monitor.summary()["wall_seconds"]
+    result = {
+        "scenario": name,
+        "status": "ok",
+        "documents": len(documents),
+        "calls": len(outcomes),
+        "succeeded": len(succeeded),
+        "failed": len(outcomes) - len(succeeded),
+        "throughput_docs_per_sec": len(succeeded) / wall if wall else 0.0,
+        "pass_seconds": pass_seconds,
+        "latency": latency_summary([latency for _, latency in outcomes]),
+        "backend": get_model_backend().get_stats(),
+        "client": get_ai_client().get_stats(),
+        "resources": monitor.summary(),
+    }
+
+    if name == "micro_batch":
+        result["micro_batch"] = batch_stats
+    if name == "cache":
+        from src.ai.result_cache import get_ai_result_cache
+        cache = get_ai_result_cache()
+        result["cache"] = cache.get_stats() if cache is not None else None
+    if name == "quota":
+        from src.ai.quota_governor import get_quota_governor
+        governor = get_quota_governor()
+        result["quota"] = governor.get_stats() if governor is not None else None
+    if breaker_stats is not None:
+        result["breaker"] = breaker_stats
+    return result
+
+
+def run_scenario(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one scenario in a fresh process.
+
+    Args:
+        name: Scenario name
+        args: Benchmark parameters
+
+    Returns:
+        Scenario result dictionary
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = _scenario_env(name, args, cache_dir)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                return executor.submit(_run_in_process, name, env, args).result()
+            except ImportError as e:
+                return {"scenario": name, "status": "skipped", "reason": f"missing dependency: {e}"}
+            except Exception as e:
+                return {"scenario": name, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="AI pipeline benchmark against the offline Gemini stand-in")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS + ("all",),
+                        help="Scenario to run (repeatable, default: combined)")
+    parser.add_argument("--documents", type=int, default=40, help="Documents to process per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent documents in flight")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario")
+    parser.add_argument("--page-size", type=int, default=8 * 1024, help="Synthetic page size in bytes")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Stand-in mean response latency")
+    parser.add_argument("--distribution", default="lognormal",
+                        choices=("fixed", "uniform", "normal", "lognormal", "exponential"),
+                        help="Stand-in latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stand-in calls failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of stand-in calls failing with 429")
+    parser.add_argument("--server-rpm", type=int, default=0, help="Stand-in server-side requests per minute (0 = unlimited)")
+    parser.add_argument("--quota-rpm", type=int, default=120, help="Quota governor requests per minute (quota scenario)")
+    parser.add_argument("--seed", type=int, default=1234, help="Stand-in and site generation seed")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or ["combined"]
+    if "all" in scenarios:
+        scenarios = list(SCENARIOS)
+
+    parameters = {key: value for key, value in vars(args).items() if key not in ("output", "scenario")}
+    results = []
+    for name in scenarios:
+        for run in range(args.repeat):
+            result = run_scenario(name, parameters)
+            result["run"] = run
+            results.append(result)
+            if result["status"] == "ok":
+                print(f"{name}[{run}]: {result['throughput_docs_per_sec']:.1f} docs/s, "
+                      f"{result['succeeded']}/{result['calls']} ok, "
+                      f"{result['backend']['requests']} model requests, "
+                      f"{result['backend']['total_tokens']} tokens, "
+                      f"p50 {result['latency']['p50_ms']:.1f} ms, p95 {result['latency']['p95_ms']:.1f} ms")
+            else:
+                print(f"{name}[{run}]: {result['status']} ({result.get('reason') or result.get('error')})")
+
+    parameters["scenarios"] = scenarios
+    report = build_report("ai_pipeline", parameters, results)
+    path = write_report(report, args.output)
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
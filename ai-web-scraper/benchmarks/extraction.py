@@ -0,0 +1,326 @@
+"""
+Extraction micro-benchmarks and regression tracking.
+
+Times the CPU hot paths of the pipeline over the HTML corpus in
+benchmarks/corpus: every ContentExtractor phase separately, the
+SimpleWebScraper extraction, DataCleaner.clean_data,
+ConfidenceScorer.calculate_confidence and ConfidenceScorer.score_batch over a
+batch of records. Results are written as JSON and can be
+compared against a stored baseline, flagging phases that slowed down by more
+than a threshold.
+
+Usage:
+    python -m benchmarks.extraction run --iterations 10
+    python -m benchmarks.extraction baseline
+    python -m benchmarks.extraction compare --threshold 0.15
+    python -m benchmarks.extraction compare --current benchmarks/results/extraction-abc123.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .reporting import PROJECT_ROOT, build_report, latency_summary, write_report
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baselines" / "extraction.json"
+
+# Size of the generated stress page
+LARGE_PAGE_BYTES = 5 * 1024 * 1024
+
+# Number of records fed to DataCleaner.clean_data per iteration
+CLEANER_BATCH_SIZE = 50
+
+
+def _generate_large_page(target_bytes: int = LARGE_PAGE_BYTES, seed: int = 42) -> str:
+    """
+    Build a category listing page of roughly ``target_bytes``.
+
+    Generated instead of checked in to keep the repository small; the output
+    is deterministic for a given seed so timings stay comparable.
+    """
+    template = (CORPUS_DIR / "ecommerce_product.html").read_text(encoding="utf-8")
+    head, _, _ = template.partition("<main")
+    rng = random.Random(seed)
+    words = ("trail light pro ultra compact weatherproof insulated merino alpine "
+             "packable stretch recycled classic summit basecamp ridge canyon").split()
+
+    parts = [head, '<main class="category-page"><h1>All products</h1><ul class="product-grid">']
+    size = sum(len(part) for part in parts)
+    item = 0
+    while size < target_bytes:
+        name = " ".join(rng.choice(words) for _ in range(3)).title()
+        description = " ".join(rng.choice(words) for _ in range(rng.randint(20, 40)))
+        card = (
+            f'<li class="product-card" data-id="{item}"><a href="/p/item-{item}">'
+            f'<img src="/images/item-{item}.jpg" alt="{name}" width="240" height="240">'
+            f'<h3 class="name">{name}</h3></a>'
+            f'<p class="summary">{description.capitalize()}.</p>'
+            f'<span class="price">${rng.randint(5, 500)}.{rng.randint(0, 99):02d}</span>'
+            f'<div class="ad" data-slot="grid-{item}"></div></li>'
+        )
+        parts.append(card)
+        size += len(card)
+        item += 1
+    parts.append("</ul></main></body></html>")
+    return "".join(parts)
+
+
+def load_corpus(names: Optional[List[str]] = None) -> Dict[str, Tuple[str, str]]:
+    """
+    Load the benchmark corpus.
+
+    Args:
+        names: Subset of case names to load (all if None)
+
+    Returns:
+        Mapping of case name to (html, base_url)
+    """
+    corpus = {}
+    for path in sorted(CORPUS_DIR.glob("*.html")):
+        corpus[path.stem] = (path.read_text(encoding="utf-8"), f"https://{path.stem.replace('_', '-')}.example.com/")
+    corpus["large_listing"] = (_generate_large_page(), "https://large-listing.example.com/")
+
+    if names:
+        missing = set(names) - set(corpus)
+        if missing:
+            raise ValueError(f"Unknown corpus cases: {', '.join(sorted(missing))}")
+        corpus = {name: corpus[name] for name in names}
+    return corpus
+
+
+class ExtractionBenchmark:
+    """Runs the per-phase timings for each corpus page."""
+
+    def __init__(self, iterations: int = 5, warmup: int = 1):
+        from bs4 import BeautifulSoup
+        from src.ai.confidence_scorer import ConfidenceScorer, ScoringInput
+        from src.models.pydantic_models import ScrapingConfig
+        from src.pipeline.cleaner import DataCleaner
+        from src.scraper.content_extractor import ContentExtractor
+        from src.scraper.simple_scraper import SimpleWebScraper
+
+        self.iterations = iterations
+        self.warmup = warmup
+        self._soup = lambda html: BeautifulSoup(html, "html.parser")
+        self.config = ScrapingConfig(extract_links=True, extract_images=True)
+        self.extractor = ContentExtractor(self.config)
+        self.simple_scraper = SimpleWebScraper(self.config)
+        self.cleaner_factory = DataCleaner
+        self.scorer = ConfidenceScorer()
+        self.scoring_input = ScoringInput
+        self._loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.simple_scraper.close()
+        self._loop.close()
+
+    def run_case(self, html: str, base_url: str) -> Dict[str, Dict[str, float]]:
+        """Time every phase for one page."""
+        timings: Dict[str, List[float]] = {}
+
+        def timed(phase: str, func: Callable[[], Any]) -> Any:
+            start = time.perf_counter()
+            result = func()
+            timings.setdefault(phase, []).append(time.perf_counter() - start)
+            return result
+
+        for iteration in range(self.warmup + self.iterations):
+            if iteration == self.warmup:
+                timings.clear()
+
+            soup = timed("parse", lambda: self._soup(html))
+            timed("clean_soup", lambda: self.extractor._clean_soup(soup))
+            metadata = timed("extract_metadata", lambda: self.extractor._extract_metadata(soup, base_url))
+            content = timed("extract_main_content", lambda: self.extractor._extract_main_content(soup))
+            structure = timed("analyze_structure", lambda: self.extractor._analyze_structure(soup))
+            links = timed("extract_links", lambda: self.extractor._extract_links(soup, base_url))
+            timed("extract_images", lambda: self.extractor._extract_images(soup, base_url))
+            timed("extract_custom_selectors", lambda: self.extractor._extract_custom_selectors(soup))
+            timed("extract_from_html", lambda: self.extractor.extract_from_html(html, base_url))
+
+            simple_soup = self._soup(html)
+            simple_content = timed(
+                "simple_extract_content",
+                lambda: self.simple_scraper._extract_content(simple_soup, base_url)
+            )
+
+            records = self._build_records(simple_content, base_url)
+            cleaner = self.cleaner_factory()
+            timed("clean_data", lambda: cleaner.clean_data(records))
+
+            structured_data = {"metadata": metadata, "content": content, "structure": structure}
+            entities = [
+                {"type": "URL", "value": link.get("url", ""), "confidence": 0.8}
+                for link in links[:50]
+            ]
+            classification = {"category": "benchmark", "confidence": 0.7}
+            timed("calculate_confidence", lambda: self._loop.run_until_complete(
+                self.scorer.calculate_confidence(
+                    structured_data, entities, classification, simple_content.get("text", "")
+                )
+            ))
+            scoring_batch = [
+                self.scoring_input(structured_data, entities, classification, simple_content.get("text", ""))
+            ] * CLEANER_BATCH_SIZE
+            timed("score_batch", lambda: self.scorer.score_batch(scoring_batch))
+
+        return {phase: latency_summary(values) for phase, values in timings.items()}
+
+    def _build_records(self, content: Dict[str, Any], base_url: str) -> List[Any]:
+        """Records for the cleaner: distinct pages plus a share of exact duplicates."""
+        from src.models.pydantic_models import ScrapedData
+
+        records = []
+        for i in range(CLEANER_BATCH_SIZE):
+            variant = dict(content)
+            # Every fifth record repeats the previous one to exercise duplicate detection
+            suffix = i - 1 if i % 5 == 4 else i
+            variant["title"] = f"{content.get('title', '')} #{suffix}"
+            variant["url"] = f"{base_url}item/{suffix}"
+            records.append(ScrapedData(job_id="benchmark", url=f"{base_url}item/{i}", content=variant))
+        return records
+
+    def run(self, corpus: Dict[str, Tuple[str, str]]) -> List[Dict[str, Any]]:
+        results = []
+        for name, (html, base_url) in corpus.items():
+            results.append({
+                "case": name,
+                "size_bytes": len(html.encode("utf-8")),
+                "phases": self.run_case(html, base_url),
+            })
+        return results
+
+
+def run_benchmark(iterations: int, warmup: int, cases: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the micro-benchmarks and return the report document."""
+    corpus = load_corpus(cases)
+    benchmark = ExtractionBenchmark(iterations=iterations, warmup=warmup)
+    try:
+        results = benchmark.run(corpus)
+    finally:
+        benchmark.close()
+    parameters = {"iterations": iterations, "warmup": warmup, "cases": list(corpus)}
+    return build_report("extraction", parameters, results)
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.15,
+    min_delta_ms: float = 0.05,
+    metric: str = "p50_ms"
+) -> List[Dict[str, Any]]:
+    """
+    Compare two extraction reports phase by phase.
+
+    Args:
+        baseline: Baseline report
+        current: Current report
+        threshold: Relative slowdown that counts as a regression (0.15 = 15%)
+        min_delta_ms: Absolute slowdown below which changes are treated as noise
+        metric: Latency statistic to compare
+
+    Returns:
+        One row per (case, phase) present in both reports
+    """
+    baseline_cases = {result["case"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        base = baseline_cases.get(result["case"])
+        if not base:
+            continue
+        for phase, stats in result["phases"].items():
+            base_stats = base["phases"].get(phase)
+            if not base_stats:
+                continue
+            before, after = base_stats[metric], stats[metric]
+            change = (after - before) / before if before else 0.0
+            rows.append({
+                "case": result["case"],
+                "phase": phase,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change": change,
+                "regression": change > threshold and (after - before) > min_delta_ms,
+            })
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]], threshold: float) -> None:
+    print(f"{'case':<20} {'phase':<26} {'baseline ms':>12} {'current ms':>12} {'change':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<20} {row['phase']:<26} {row['baseline_ms']:>12.3f} "
+              f"{row['current_ms']:>12.3f} {row['change']:>+8.1%}{flag}")
+    regressions = sum(1 for row in rows if row["regression"])
+    print(f"\n{regressions} regression(s) above {threshold:.0%}")
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extraction micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_arguments(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--iterations", type=int, default=5, help="Timed iterations per case")
+        sub.add_argument("--warmup", type=int, default=1, help="Untimed warmup iterations per case")
+        sub.add_argument("--cases", help="Comma-separated corpus cases (default: all)")
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write a report")
+    add_run_arguments(run_parser)
+    run_parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+
+    baseline_parser = subparsers.add_parser("baseline", help="Run the benchmarks and store them as the baseline")
+    add_run_arguments(baseline_parser)
+    baseline_parser.add_argument("--path", default=str(DEFAULT_BASELINE), help="Baseline file")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare a run against the baseline")
+    add_run_arguments(compare_parser)
+    compare_parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline file")
+    compare_parser.add_argument("--current", help="Existing report to compare (runs the benchmarks if omitted)")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown flagged as regression")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this")
+    compare_parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "mean_ms", "min_ms", "p95_ms"])
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    cases = args.cases.split(",") if args.cases else None
+
+    if args.command == "run":
+        path = write_report(run_benchmark(args.iterations, args.warmup, cases), args.output)
+        print(f"Report written to {path}")
+        return 0
+
+    if args.command == "baseline":
+        path = write_report(run_benchmark(args.iterations, args.warmup, cases), args.path)
+        print(f"Baseline written to {path}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"Baseline not found: {baseline_path} (create one with 'baseline')")
+        return 2
+
+    if args.current:
+        current = _load_json(Path(args.current))
+    else:
+        current = run_benchmark(args.iterations, args.warmup, cases)
+        print(f"Report written to {write_report(current)}")
+
+    rows = compare_reports(_load_json(baseline_path), current, args.threshold, args.min_delta_ms, args.metric)
+    _print_comparison(rows, args.threshold)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+"""
+Measurement and JSON reporting helpers shared by the benchmarks.
+"""
+
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Summarize latencies (seconds) as milliseconds."""
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0, "min_ms": 0.0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(values),
+        "min_ms": values[0] * 1000,
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+def _current_rss_bytes() -> Optional[int]:
+    if PSUTIL_AVAILABLE:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ResourceMonitor:
+    """
+    Samples process CPU time and resident memory while a benchmark runs.
+
+    Peak RSS is sampled on a background thread so that it reflects the
+    measured section rather than the whole process lifetime.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self.peak_rss_bytes = 0
+        self.start_rss_bytes = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = _current_rss_bytes()
+            if rss and rss > self.peak_rss_bytes:
+                self.peak_rss_bytes = rss
+
+    def start(self) -> "ResourceMonitor":
+        self.start_rss_bytes = _current_rss_bytes() or 0
+        self.peak_rss_bytes = self.start_rss_bytes
+        self._start_cpu = time.process_time()
+        self._start_wall = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        self.wall_seconds = time.perf_counter() - self._start_wall
+        self.cpu_seconds = time.process_time() - self._start_cpu
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        rss = _current_rss_bytes()
+        if rss and rss > self.peak_rss_bytes:
+            self.peak_rss_bytes = rss
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "cpu_utilization": self.cpu_seconds / self.wall_seconds if self.wall_seconds else 0.0,
+            "start_rss_mb": self.start_rss_bytes / (1024 * 1024),
+            "peak_rss_mb": self.peak_rss_bytes / (1024 * 1024),
+            # Lifetime high-water mark reported by the kernel (KiB on Linux)
+            "max_rss_lifetime_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+    def __enter__(self) -> "ResourceMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    """Metadata identifying where and at which commit a run happened."""
+    return {
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "psutil": PSUTIL_AVAILABLE,
+    }
+
+
+def build_report(benchmark: str, parameters: Dict[str, Any], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Assemble the JSON report document."""
+    return {
+        "benchmark": benchmark,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "environment": environment_info(),
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """
+    Write a report as JSON.
+
+    Args:
+        report: Report document
+        output: Target path (defaults to benchmarks/results/<benchmark>-<commit>-<ts>.json)
+
+    Returns:
+        Path of the written file
+    """
+    if output:
+        path = Path(output)
+    else:
+        commit = report.get("environment", {}).get("git_commit") or "nogit"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = DEFAULT_RESULTS_DIR / f"{report['benchmark']}-{commit}-{stamp}.json"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    return path
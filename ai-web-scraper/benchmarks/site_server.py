@@ -0,0 +1,231 @@
+"""
+Local HTTP fixture server that generates synthetic websites.
+
+Pages are generated deterministically from a seed so that repeated runs
+serve identical content, with configurable page size, link fan-out,
+response latency, error rate, compression and robots.txt rules.
+"""
+
+import gzip
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+WORDS = (
+    "data scraping content extraction pipeline analysis market product review "
+    "service customer report quarterly growth network system platform update "
+    "release feature performance security research article guide tutorial "
+    "example price shipping order account support community developer"
+).split()
+
+
+@dataclass
+class SyntheticSiteConfig:
+    """Shape of the generated site and the server's behaviour."""
+    num_pages: int = 200
+    page_size_bytes: int = 20 * 1024
+    links_per_page: int = 10
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    gzip_enabled: bool = True
+    robots_disallow: List[str] = field(default_factory=lambda: ["/private/"])
+    crawl_delay: Optional[float] = None
+    seed: int = 1234
+
+
+class SyntheticSite:
+    """Deterministic page generator for a synthetic site."""
+
+    def __init__(self, config: SyntheticSiteConfig):
+        self.config = config
+        self._cache: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+
+    def page_path(self, page_id: int) -> str:
+        return f"/page/{page_id}.html"
+
+    def robots_txt(self) -> bytes:
+        lines = ["User-agent: *"]
+        lines.extend(f"Disallow: {path}" for path in self.config.robots_disallow)
+        if self.config.crawl_delay is not None:
+            lines.append(f"Crawl-delay: {self.config.crawl_delay}")
+        return ("\n".join(lines) + "\n").encode('utf-8')
+
+    def render_page(self, page_id: int) -> bytes:
+        """Render (and memoize) the HTML for a page."""
+        with self._lock:
+            cached = self._cache.get(page_id)
+        if cached is not None:
+            return cached
+
+        rng = random.Random(self.config.seed * 100003 + page_id)
+        title = " ".join(rng.choice(WORDS) for _ in range(6)).title()
+
+        links = [
+            f'<li><a href="{self.page_path(rng.randrange(self.config.num_pages))}">'
+            f'{rng.choice(WORDS).title()} {rng.choice(WORDS)}</a></li>'
+            for _ in range(self.config.links_per_page)
+        ]
+
+        head = (
+            '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+            f'<title>{title}</title>'
+            f'<meta name="description" content="Synthetic page {page_id} about {rng.choice(WORDS)}">'
+            '</head><body>'
+            f'<header><nav><ul>{"".join(links)}</ul></nav></header>'
+            f'<main><article><h1>{title}</h1>'
+        )
+        tail = '</article></main><footer><p>Synthetic fixture site</p></footer></body></html>'
+
+        paragraphs = []
+        size = len(head) + len(tail)
+        while size < self.config.page_size_bytes:
+            sentence_count = rng.randint(3, 7)
+            text = " ".join(
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+                for _ in range(sentence_count)
+            )
+            paragraph = f"<p>{text}</p>"
+            if rng.random() < 0.15:
+                paragraph = f"<h2>{rng.choice(WORDS).title()} {rng.choice(WORDS)}</h2>" + paragraph
+            paragraphs.append(paragraph)
+            size += len(paragraph)
+
+        html = (head + "".join(paragraphs) + tail).encode('utf-8')
+        with self._lock:
+            self._cache[page_id] = html
+        return html
+
+    def should_fail(self, page_id: int, attempt: int) -> bool:
+        """Decide deterministically whether a request for a page errors."""
+        if self.config.error_rate <= 0:
+            return False
+        rng = random.Random(self.config.seed * 7919 + page_id * 31 + attempt)
+        return rng.random() < self.config.error_rate
+
+
+class _SiteRequestHandler(BaseHTTPRequestHandler):
+    """Request handler serving pages from the server's SyntheticSite."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        site: SyntheticSite = self.server.site
+        config = site.config
+        self.server.record_request()
+
+        if config.latency_ms > 0 or config.latency_jitter_ms > 0:
+            delay = config.latency_ms + random.uniform(0, config.latency_jitter_ms)
+            time.sleep(delay / 1000.0)
+
+        if self.path == "/robots.txt":
+            self._send(200, site.robots_txt(), "text/plain")
+            return
+
+        page_id = self._parse_page_id(self.path)
+        if page_id is None or page_id >= config.num_pages:
+            self._send(404, b"<html><body><h1>Not found</h1></body></html>", "text/html")
+            return
+
+        if site.should_fail(page_id, self.server.next_attempt(page_id)):
+            self._send(500, b"<html><body><h1>Internal error</h1></body></html>", "text/html")
+            return
+
+        self._send(200, site.render_page(page_id), "text/html; charset=utf-8")
+
+    def _parse_page_id(self, path: str) -> Optional[int]:
+        path = path.split('?', 1)[0]
+        if path in ("/", "/index.html"):
+            return 0
+        prefix = "/page/"
+        if path.startswith(prefix) and path.endswith(".html"):
+            try:
+                return int(path[len(prefix):-len(".html")])
+            except ValueError:
+                return None
+        return None
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        headers = {"Content-Type": content_type}
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        if self.server.site.config.gzip_enabled and "gzip" in accept_encoding and len(body) > 256:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SyntheticSiteServer:
+    """
+    Threaded HTTP server bound to localhost serving a synthetic site.
+
+    Usage:
+        with SyntheticSiteServer(SyntheticSiteConfig(num_pages=50)) as server:
+            urls = server.page_urls(50)
+    """
+
+    def __init__(self, config: Optional[SyntheticSiteConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or SyntheticSiteConfig()
+        self.site = SyntheticSite(self.config)
+        self._httpd = ThreadingHTTPServer((host, port), _SiteRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.site = self.site
+        self._httpd.record_request = self._record_request
+        self._httpd.next_attempt = self._next_attempt
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._attempts: Dict[int, int] = {}
+        self.requests_served = 0
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def page_urls(self, count: Optional[int] = None) -> List[str]:
+        """URLs of the first ``count`` pages of the site."""
+        count = self.config.num_pages if count is None else min(count, self.config.num_pages)
+        return [self.base_url + self.site.page_path(i) for i in range(count)]
+
+    def start(self) -> "SyntheticSiteServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="synthetic-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _record_request(self) -> None:
+        with self._lock:
+            self.requests_served += 1
+
+    def _next_attempt(self, page_id: int) -> int:
+        with self._lock:
+            attempt = self._attempts.get(page_id, 0)
+            self._attempts[page_id] = attempt + 1
+            return attempt
+
+    def __enter__(self) -> "SyntheticSiteServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
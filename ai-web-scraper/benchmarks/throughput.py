@@ -0,0 +1,260 @@
+"""
+End-to-end scraping throughput benchmark.
+
+Starts a local synthetic site server and drives the scraping stack against
+it, reporting pages/sec, latency percentiles, CPU time and peak RSS as JSON.
+The run is fully offline: only 127.0.0.1 is contacted and the Gemini key is
+removed from the environment unless --allow-ai is given.
+
+Usage:
+    python -m benchmarks.throughput --scenario simple --pages 200 --concurrency 8
+    python -m benchmarks.throughput --scenario all --latency-ms 20 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .reporting import ResourceMonitor, build_report, latency_summary, write_report
+from .site_server import SyntheticSiteConfig, SyntheticSiteServer
+
+SCENARIOS = ("simple", "web", "worker")
+
+# Smallest politeness delay ScrapingConfig accepts; WebScraper re-validates its config
+MIN_CONFIG_DELAY = 0.1
+
+# Failures tolerated on top of the injected --error-rate before a run counts as degraded
+FAILURE_RATE_MARGIN = 0.1
+
+# Per-page (success, latency, error message) outcome
+Outcome = Tuple[bool, float, Optional[str]]
+
+
+def _scenario_status(outcomes: List[Outcome], max_failure_rate: float) -> str:
+    """failed if no page succeeded, degraded above max_failure_rate, else ok."""
+    failed = sum(1 for ok, _, _ in outcomes if not ok)
+    if outcomes and failed == len(outcomes):
+        return "failed"
+    if outcomes and failed / len(outcomes) > max_failure_rate:
+        return "degraded"
+    return "ok"
+
+
+def _scenario_result(name: str, outcomes: List[Outcome], monitor: ResourceMonitor,
+                     requests_served: int, max_failure_rate: float) -> Dict[str, Any]:
+    """Summarize per-page outcomes for one scenario."""
+    succeeded = [latency for ok, latency, _ in outcomes if ok]
+    errors = [(error or "unknown error").strip() for ok, _, error in outcomes if not ok]
+    resources = monitor.summary()
+    wall = resources["wall_seconds"]
+    return {
+        "scenario": name,
+        "status": _scenario_status(outcomes, max_failure_rate),
+        "first_error": errors[0] if errors else None,
+        "pages_attempted": len(outcomes),
+        "pages_succeeded": len(succeeded),
+        "pages_failed": len(outcomes) - len(succeeded),
+        "failure_rate": len(errors) / len(outcomes) if outcomes else 0.0,
+        "max_failure_rate": max_failure_rate,
+        "throughput_pages_per_sec": len(succeeded) / wall if wall else 0.0,
+        "latency": latency_summary([latency for _, latency, _ in outcomes]),
+        "success_latency": latency_summary(succeeded),
+        "server_requests": requests_served,
+        "resources": resources,
+    }
+
+
+def _skipped(name: str, reason: str) -> Dict[str, Any]:
+    return {"scenario": name, "status": "skipped", "reason": reason}
+
+
+async def _run_simple(urls: List[str], concurrency: int, delay: float) -> List[Outcome]:
+    from src.models.pydantic_models import ScrapingConfig
+    from src.scraper.simple_scraper import SimpleWebScraper
+
+    # Politeness delays are excluded so the benchmark measures the stack itself
+    config = ScrapingConfig(max_retries=0, timeout=30).model_copy(
+        update={"delay_between_requests": delay}
+    )
+    scraper = SimpleWebScraper(config)
+    semaphore = asyncio.Semaphore(concurrency)
+    job_id = f"bench_{uuid.uuid4().hex[:8]}"
+
+    async def scrape(url: str) -> Outcome:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                data = await scraper.scrape_url(url, job_id)
+            except Exception as e:
+                return False, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+            error = None if data is not None else f"no data scraped from {url}"
+            return data is not None, time.perf_counter() - start, error
+
+    try:
+        return await asyncio.gather(*(scrape(url) for url in urls))
+    finally:
+        scraper.close()
+
+
+async def _run_web(urls: List[str], delay: float) -> List[Outcome]:
+    from src.models.pydantic_models import ScrapingConfig
+    from src.scraper.web_scraper import WebScraper
+
+    config = ScrapingConfig(
+        max_retries=0, timeout=30, wait_time=1,
+        delay_between_requests=max(delay, MIN_CONFIG_DELAY)
+    )
+    outcomes = []
+    # One browser session serves pages sequentially
+    async with WebScraper(config) as scraper:
+        for url in urls:
+            start = time.perf_counter()
+            result = await scraper.scrape_url(url)
+            ok = result.success and bool(result.data)
+            error = None if ok else (result.error_message or f"no data scraped from {url}")
+            outcomes.append((ok, time.perf_counter() - start, error))
+    return outcomes
+
+
+def _run_worker(urls: List[str], concurrency: int, delay: float) -> List[Outcome]:
+    from src.models.pydantic_models import ScrapingConfig
+    from src.pipeline.worker import scrape_url_task
+
+    config = ScrapingConfig(
+        max_retries=0, timeout=30, wait_time=1, javascript_enabled=False,
+        delay_between_requests=max(delay, MIN_CONFIG_DELAY)
+    ).model_dump()
+
+    def run_task(url: str) -> Outcome:
+        start = time.perf_counter()
+        # apply() executes the task in-process, so no broker round trip is measured
+        result = scrape_url_task.apply(args=(str(uuid.uuid4()), url, config))
+        elapsed = time.perf_counter() - start
+        if not result.successful():
+            return False, elapsed, f"{type(result.result).__name__}: {result.result}"
+        # A task that gave up returns its error instead of raising
+        ok = bool(result.result.get("success"))
+        return ok, elapsed, None if ok else result.result.get("error")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(run_task, urls))
+
+
+def run_scenario(name: str, server: SyntheticSiteServer, urls: List[str],
+                 concurrency: int, delay: float, max_failure_rate: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run one scenario against the fixture server.
+
+    The status is failed when no page succeeded and degraded when more pages
+    failed than max_failure_rate allows, so broken runs are not reported
+    with a misleading throughput.
+
+    Args:
+        name: Scenario name (simple, web or worker)
+        server: Running synthetic site server
+        urls: Page URLs to scrape
+        concurrency: Maximum in-flight pages
+        delay: Politeness delay between requests
+        max_failure_rate: Fraction of failed pages tolerated (the server's
+            injected error rate plus FAILURE_RATE_MARGIN if None)
+
+    Returns:
+        Scenario result dictionary
+    """
+    if max_failure_rate is None:
+        max_failure_rate = min(server.config.error_rate + FAILURE_RATE_MARGIN, 1.0)
+    runners: Dict[str, Callable[[], List[Outcome]]] = {
+        "simple": lambda: asyncio.run(_run_simple(urls, concurrency, delay)),
+        "web": lambda: asyncio.run(_run_web(urls, delay)),
+        "worker": lambda: _run_worker(urls, concurrency, delay),
+    }
+
+    requests_before = server.requests_served
+    monitor = ResourceMonitor()
+    try:
+        with monitor:
+            outcomes = runners[name]()
+    except ImportError as e:
+        return _skipped(name, f"missing dependency: {e}")
+    except Exception as e:
+        return {"scenario": name, "status": "failed", "error": f"{type(e).__name__}: {e}",
+                "resources": monitor.summary()}
+
+    return _scenario_result(name, outcomes, monitor, server.requests_served - requests_before, max_failure_rate)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end scraping throughput benchmark")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS + ("all",),
+                        help="Scenario to run (repeatable, default: simple)")
+    parser.add_argument("--pages", type=int, default=100, help="Pages to scrape per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent pages in flight")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario")
+    parser.add_argument("--delay", type=float, default=0.0, help="Politeness delay between requests (seconds)")
+    parser.add_argument("--page-size", type=int, default=20 * 1024, help="Generated page size in bytes")
+    parser.add_argument("--links", type=int, default=10, help="Links per generated page")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of page requests answered with 500")
+    parser.add_argument("--max-failure-rate", type=float, default=None,
+                        help="Failed-page fraction above which a run is degraded "
+                             f"(default: --error-rate + {FAILURE_RATE_MARGIN})")
+    parser.add_argument("--no-gzip", action="store_true", help="Serve uncompressed responses")
+    parser.add_argument("--seed", type=int, default=1234, help="Site generation seed")
+    parser.add_argument("--allow-ai", action="store_true", help="Keep GEMINI_API_KEY (run is no longer offline)")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    if not args.allow_ai:
+        os.environ.pop("GEMINI_API_KEY", None)
+
+    scenarios = args.scenario or ["simple"]
+    if "all" in scenarios:
+        scenarios = list(SCENARIOS)
+
+    site_config = SyntheticSiteConfig(
+        num_pages=args.pages,
+        page_size_bytes=args.page_size,
+        links_per_page=args.links,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        gzip_enabled=not args.no_gzip,
+        seed=args.seed,
+    )
+
+    results = []
+    with SyntheticSiteServer(site_config) as server:
+        urls = server.page_urls(args.pages)
+        for name in scenarios:
+            for run in range(args.repeat):
+                result = run_scenario(name, server, urls, args.concurrency, args.delay, args.max_failure_rate)
+                result["run"] = run
+                results.append(result)
+                if result["status"] in ("ok", "degraded"):
+                    print(f"{name}[{run}]: {result['throughput_pages_per_sec']:.1f} pages/s, "
+                          f"p50 {result['latency']['p50_ms']:.1f} ms, p95 {result['latency']['p95_ms']:.1f} ms, "
+                          f"p99 {result['latency']['p99_ms']:.1f} ms, "
+                          f"peak RSS {result['resources']['peak_rss_mb']:.1f} MB")
+                if "first_error" in result and result["status"] != "ok":
+                    print(f"{name}[{run}]: {result['status']} ({result['pages_failed']}/{result['pages_attempted']} "
+                          f"pages failed, first error: {result['first_error']})")
+                elif result["status"] != "ok":
+                    print(f"{name}[{run}]: {result['status']} ({result.get('reason') or result.get('error')})")
+
+    parameters = {key: value for key, value in vars(args).items() if key not in ("output", "scenario")}
+    parameters["scenarios"] = scenarios
+    report = build_report("throughput", parameters, results)
+    path = write_report(report, args.output)
+    print(f"Report written to {path}")
+    return 1 if any(result["status"] == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
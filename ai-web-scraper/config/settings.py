@@ -41,6 +41,86 @@ class Settings(BaseSettings):
         default=None,
         description="Google Gemini API key"
     )
+    ai_cache_enabled: bool = Field(default=True, description="Cache AI results by content hash")
+    ai_cache_backend: str = Field(
+        default="sqlite",
+        description="Persistent AI cache tier (memory, sqlite, redis)"
+    )
+    ai_cache_path: str = Field(
+        default="data/cache/ai_results.db",
+        description="SQLite file for the AI result cache"
+    )
+    ai_cache_ttl_seconds: int = Field(default=604800, description="AI result cache TTL in seconds")
+    ai_cache_memory_entries: int = Field(default=1024, description="In-process AI result cache size")
+    ai_combined_analysis: bool = Field(
+        default=False,
+        description="Default to one combined Gemini request per page instead of separate analyses"
+    )
+    ai_condense_enabled: bool = Field(
+        default=True,
+        description="Condense content to its most informative blocks before AI prompts"
+    )
+    ai_condense_token_budget: int = Field(default=1000, description="Estimated token budget for condensed prompt content")
+    ai_client_mode: str = Field(
+        default="auto",
+        description="Gemini call mode (auto uses the SDK async API when available, executor forces threads)"
+    )
+    ai_executor_workers: int = Field(default=4, description="Dedicated threads for blocking Gemini calls")
+    ai_request_timeout: float = Field(default=60.0, description="Per-call Gemini timeout in seconds")
+    ai_backend: str = Field(
+        default="gemini",
+        description="Model backend: gemini, or standin for the offline Gemini stand-in"
+    )
+    ai_standin_latency_ms: float = Field(default=800.0, description="Stand-in mean response latency in milliseconds")
+    ai_standin_latency_distribution: str = Field(
+        default="lognormal",
+        description="Stand-in latency distribution: fixed, uniform, normal, lognormal or exponential"
+    )
+    ai_standin_latency_jitter: float = Field(default=0.5, description="Stand-in relative latency spread")
+    ai_standin_error_rate: float = Field(default=0.0, description="Fraction of stand-in calls failing with a 500")
+    ai_standin_rate_limit_rate: float = Field(default=0.0, description="Fraction of stand-in calls failing with a 429")
+    ai_standin_rpm: int = Field(default=0, description="Stand-in server-side requests per minute (0 = unlimited)")
+    ai_standin_tpm: int = Field(default=0, description="Stand-in server-side tokens per minute (0 = unlimited)")
+    ai_standin_seed: int = Field(default=0, description="Stand-in random seed")
+    ai_quota_enabled: bool = Field(default=True, description="Meter Gemini requests through the quota governor")
+    ai_quota_backend: str = Field(
+        default="redis",
+        description="Quota bucket store (redis for cluster-wide, local for per process)"
+    )
+    ai_quota_rpm: int = Field(default=60, description="Gemini requests per minute across all processes")
+    ai_quota_tpm: int = Field(default=1000000, description="Gemini tokens per minute across all processes")
+    ai_quota_interactive_reserve: float = Field(
+        default=0.2,
+        description="Fraction of the quota batch requests leave for interactive requests"
+    )
+    ai_quota_interactive_timeout: float = Field(default=15.0, description="Max queueing time for interactive AI requests")
+    ai_quota_batch_timeout: float = Field(default=90.0, description="Max queueing time for batch AI requests")
+    ai_triage_enabled: bool = Field(
+        default=False,
+        description="Triage pages with the local classifier before calling Gemini"
+    )
+    ai_triage_model_path: str = Field(
+        default="data/models/page_classifier.npz",
+        description="Trained page classifier (python -m src.ai.page_classifier train)"
+    )
+    ai_triage_skip_threshold: float = Field(default=0.9, description="Confidence to skip navigation/listing pages")
+    ai_triage_local_threshold: float = Field(default=0.95, description="Confidence to use the local label instead of Gemini")
+    ai_micro_batch_enabled: bool = Field(
+        default=False,
+        description="Pack concurrent combined analyses into multi-document Gemini requests"
+    )
+    ai_micro_batch_window_ms: int = Field(default=50, description="Micro-batch collection window in milliseconds")
+    ai_micro_batch_max_docs: int = Field(default=8, description="Maximum documents per micro-batch request")
+    ai_micro_batch_token_budget: int = Field(
+        default=24000,
+        description="Estimated input token budget per micro-batch request"
+    )
+    ai_deferred_enrichment: bool = Field(
+        default=True,
+        description="Save scraped data with heuristic scores first and run AI analysis afterwards"
+    )
+    ai_enrichment_concurrency: int = Field(default=4, description="Concurrent in-process AI enrichment workers")
+    ai_enrichment_max_pending: int = Field(default=1000, description="Maximum queued in-process AI enrichments")
     
     # API Configuration
     api_host: str = Field(default="0.0.0.0", description="API host")
@@ -54,6 +134,17 @@ class Settings(BaseSettings):
     max_concurrent_jobs: int = Field(default=10, description="Maximum concurrent scraping jobs")
     default_timeout: int = Field(default=30, description="Default request timeout in seconds")
     max_retries: int = Field(default=3, description="Maximum retry attempts")
+    batch_scrape_fanout: bool = Field(default=True, description="Run batch_scrape_task URLs as parallel chunk tasks")
+    batch_scrape_chunk_size: int = Field(default=10, description="URLs per batch scraping chunk task")
+    batch_scrape_max_parallel_chunks: int = Field(default=32, description="Maximum chunk tasks per batch; chunks grow to stay under it")
+    
+    # Data Cleaning Configuration
+    dedup_index_path: str = Field(default="data/models/near_duplicates.npz", description="Saved MinHash/LSH near-duplicate index (empty to keep it in memory)")
+    dedup_num_perm: int = Field(default=128, description="MinHash permutations per near-duplicate signature")
+    dedup_bands: int = Field(default=32, description="LSH bands per signature; more bands find less similar candidates")
+    cleaning_workers: int = Field(default=0, description="Processes used by ParallelCleaner (0 = CPU count)")
+    cleaning_shard_size: int = Field(default=2000, description="Records per ParallelCleaner shard")
+    cleaning_batch_size: int = Field(default=500, description="Records per clean_batch_task message")
     
     # Dashboard Configuration
     dashboard_host: str = Field(default="0.0.0.0", description="Dashboard host")
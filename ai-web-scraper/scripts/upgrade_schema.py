@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Schema upgrade script for AI Web Scraper.
+Adds columns introduced after a database was created and optionally
+backfills content fingerprints for rows stored before they were recorded.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, select, update
+
+from src.models.database_models import ScrapedDataORM
+from src.models.schema_upgrades import upgrade_schema
+from src.pipeline.fingerprint import content_fingerprint
+
+
+def backfill_content_hashes(engine, batch_size: int) -> int:
+    """Fingerprint stored records that have no content_hash yet."""
+    updated = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(ScrapedDataORM.id, ScrapedDataORM.content)
+                .where(ScrapedDataORM.content_hash.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return updated
+            for row in rows:
+                connection.execute(
+                    update(ScrapedDataORM)
+                    .where(ScrapedDataORM.id == row.id)
+                    .values(content_hash=content_fingerprint(row.content or {}))
+                )
+        updated += len(rows)
+        print(f"Fingerprinted {updated} records")
+
+
+def main():
+    """Main upgrade function."""
+    parser = argparse.ArgumentParser(description="Upgrade an existing database schema")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL", "sqlite:///webscraper.db"),
+        help="Synchronous SQLAlchemy URL (default: DATABASE_URL)"
+    )
+    parser.add_argument(
+        "--backfill-hashes",
+        action="store_true",
+        help="Compute content_hash for records stored without one"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.begin() as connection:
+        applied = upgrade_schema(connection)
+
+    if applied:
+        print(f"✅ Added columns: {', '.join(applied)}")
+    else:
+        print("✅ Schema is up to date")
+
+    if args.backfill_hashes:
+        updated = backfill_content_hashes(engine, args.batch_size)
+        print(f"✅ Backfilled content_hash for {updated} records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Gemini client used by every AI call path.
+
+This module provides the AIClient class that sends prompts through the quota
+governor and runs them on the SDK's native async API, or on a dedicated,
+bounded thread pool when the async API is unavailable. Every call has a
+timeout, passed to the SDK as well, and cancelling the caller cancels the
+request, so slow AI responses never tie up the default executor that
+fetches, robots parsing and Selenium calls rely on. A blocking call that
+outlives its timeout keeps its executor slot until the thread returns, so
+abandoned calls cannot pile up behind the pool.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.ai.content_condenser import estimate_tokens
+from src.ai.quota_governor import (
+    EXPECTED_OUTPUT_TOKENS, AIPriority, get_quota_governor, is_rate_limit_error,
+    response_token_count, retry_after_from
+)
+from src.utils.exceptions import AIServiceException
+
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while async callers wait for a free executor slot
+SLOT_POLL_INTERVAL = 0.05
+
+
+class AIClient:
+    """
+    Quota-governed Gemini client with per-call timeouts.
+
+    The client is model-agnostic: callers pass the GenerativeModel they were
+    configured with, and all of them share one executor and one quota.
+    """
+
+    def __init__(self, mode: str = "auto", executor_workers: int = 4, default_timeout: float = 60.0):
+        """
+        Initialize AI client.
+
+        Args:
+            mode: "auto" (async API when the SDK has it) or "executor"
+            executor_workers: Threads for blocking SDK calls
+            default_timeout: Per-call timeout in seconds
+        """
+        self.mode = mode
+        self.executor_workers = max(executor_workers, 1)
+        self.default_timeout = default_timeout
+
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # One slot per executor thread, released when the SDK call returns
+        # rather than when the caller stops waiting for it
+        self._slots = threading.BoundedSemaphore(self.executor_workers)
+        self._stats = {
+            "requests": 0,
+            "async_requests": 0,
+            "executor_requests": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "errors": 0
+        }
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Dedicated thread pool for blocking SDK calls, created on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.executor_workers,
+                        thread_name_prefix="gemini"
+                    )
+        return self._executor
+
+    def _use_async(self, model: Any) -> bool:
+        if self.mode == "executor":
+            return False
+        return hasattr(model, "generate_content_async")
+
+    def _submit(self, model: Any, prompt: str, timeout: float) -> concurrent.futures.Future:
+        """Run a blocking SDK call on the executor; the caller must hold a slot."""
+        try:
+            future = self.executor.submit(
+                model.generate_content, prompt, request_options={"timeout": timeout}
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def _acquire_slot(self, timeout: float) -> bool:
+        """Wait for a free executor slot without blocking the event loop."""
+        deadline = time.monotonic() + timeout
+        while not self._slots.acquire(blocking=False):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(SLOT_POLL_INTERVAL, remaining))
+        return True
+
+    def _timeout_error(self, timeout: float) -> AIServiceException:
+        self._stats["timeouts"] += 1
+        return AIServiceException(
+            f"Gemini request timed out after {timeout:g}s",
+            service_name="gemini",
+            api_error_code="timeout"
+        )
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: str,
+        priority: Optional[AIPriority] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Generate content for a prompt.
+
+        Args:
+            model: Gemini GenerativeModel instance
+            prompt: Prompt text
+            priority: Quota priority class (context priority if None)
+            timeout: Seconds allowed for the API call, excluding quota queueing
+
+        Returns:
+            The SDK response
+
+        Raises:
+            AIServiceException: If the call times out
+            AIQuotaExceededException: If no quota was granted in time
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        governor = get_quota_governor()
+        estimated = estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS
+        if governor is not None:
+            await governor.acquire(estimated, priority)
+
+        self._stats["requests"] += 1
+        call_timeout = timeout
+        try:
+            if self._use_async(model):
+                self._stats["async_requests"] += 1
+                call = model.generate_content_async(prompt, request_options={"timeout": timeout})
+            else:
+                self._stats["executor_requests"] += 1
+                start = time.monotonic()
+                if not await self._acquire_slot(timeout):
+                    raise self._timeout_error(timeout)
+                # Waiting for the slot counts against the timeout
+                call_timeout = max(timeout - (time.monotonic() - start), 0.001)
+                call = asyncio.wrap_future(self._submit(model, prompt, call_timeout))
+            response = await asyncio.wait_for(call, timeout=call_timeout)
+        except asyncio.TimeoutError:
+            raise self._timeout_error(timeout)
+        except AIServiceException:
+            raise
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            raise
+        except Exception as e:
+            self._stats["errors"] += 1
+            if governor is not None and is_rate_limit_error(e):
+                await governor.report_rate_limited_async(retry_after_from(e))
+            raise
+
+        if governor is not None:
+            await governor.record_usage_async(estimated, response_token_count(response))
+        return response
+
+    def generate_sync(
+        self,
+        model: Any,
+        prompt: str,
+        priority: Optional[AIPriority] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Blocking variant of generate() for synchronous callers.
+
+        The call runs on the client's executor so the timeout holds even when
+        the SDK call hangs; the caller's thread is released either way.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        governor = get_quota_governor()
+        estimated = estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS
+        if governor is not None:
+            governor.acquire_sync(estimated, priority)
+
+        self._stats["requests"] += 1
+        self._stats["executor_requests"] += 1
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=timeout):
+            raise self._timeout_error(timeout)
+        timeout_left = max(timeout - (time.monotonic() - start), 0.001)
+        future = self._submit(model, prompt, timeout_left)
+        try:
+            response = future.result(timeout=timeout_left)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise self._timeout_error(timeout)
+        except Exception as e:
+            self._on_error(governor, e)
+            raise
+
+        if governor is not None:
+            governor.record_usage(estimated, response_token_count(response))
+        return response
+
+    def _on_error(self, governor, error: Exception) -> None:
+        self._stats["errors"] += 1
+        if governor is not None and is_rate_limit_error(error):
+            governor.report_rate_limited(retry_after_from(error))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics."""
+        stats = dict(self._stats)
+        stats.update({
+            "mode": self.mode,
+            "executor_workers": self.executor_workers,
+            "default_timeout": self.default_timeout
+        })
+        return stats
+
+    def shutdown(self) -> None:
+        """Shut down the executor without waiting for running calls."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global client instance
+_ai_client: Optional[AIClient] = None
+_ai_client_lock = threading.Lock()
+
+
+def get_ai_client() -> AIClient:
+    """Get the global AI client."""
+    global _ai_client
+    if _ai_client is None:
+        with _ai_client_lock:
+            if _ai_client is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                _ai_client = AIClient(
+                    mode=settings.ai_client_mode,
+                    executor_workers=settings.ai_executor_workers,
+                    default_timeout=settings.ai_request_timeout
+                )
+    return _ai_client
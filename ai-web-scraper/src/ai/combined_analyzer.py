@@ -0,0 +1,258 @@
+"""
+Combined single-request AI analysis.
+
+This module provides the CombinedAnalyzer class that asks Gemini for entities,
+classification and structured data in one prompt, and a schema validator that
+splits the combined response back into the TextAnalyzer and
+StructureExtractor result shapes used by the rest of the pipeline.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import google.generativeai as genai
+
+from src.models.pydantic_models import ContentType
+from src.utils.exceptions import ContentProcessingException
+from src.ai.client import get_ai_client
+from src.ai.content_condenser import condense_for_prompt
+
+
+logger = logging.getLogger(__name__)
+
+STRUCTURE_SECTIONS = ("products", "contacts", "articles", "navigation", "forms", "tables", "media")
+
+# Response schema for one document; shared with the micro-batcher
+COMBINED_RESPONSE_SCHEMA = """
+{
+    "entities": [
+        {"type": "PERSON|ORGANIZATION|LOCATION|DATE|EMAIL|PHONE|URL|PRODUCT|MONEY", "value": "entity_value", "confidence": 0.95, "context": "surrounding_context"}
+    ],
+    "classification": {
+        "primary_category": "category_name",
+        "subcategories": ["sub1", "sub2"],
+        "confidence": 0.90,
+        "content_type": "article|product|news|blog|etc"
+    },
+    "sentiment": {"overall": "positive|negative|neutral", "score": 0.75},
+    "key_topics": [{"topic": "topic_name", "relevance": 0.85, "keywords": ["key1", "key2"]}],
+    "summary": "Brief summary of the content",
+    "language": "detected_language_code",
+    "content_metadata": {"word_count": 150, "reading_level": "intermediate", "content_quality": "high|medium|low"},
+    "structured_data": {
+        "products": [{"name": "", "price": "", "description": "", "availability": "in_stock|out_of_stock", "rating": 4.5, "reviews_count": 123}],
+        "contacts": [{"type": "email|phone|address", "value": "", "label": ""}],
+        "articles": [{"title": "", "author": "", "date": "", "content": "", "tags": []}],
+        "navigation": [{"text": "", "url": "", "level": 1}],
+        "forms": [{"action": "", "method": "GET|POST", "fields": [{"name": "", "type": "text", "required": true, "label": ""}]}],
+        "tables": [{"headers": [], "rows": [[]], "caption": ""}],
+        "media": [{"type": "image|video|audio", "src": "", "alt": "", "caption": ""}]
+    },
+    "page_metadata": {
+        "page_title": "extracted_title",
+        "meta_description": "meta_description",
+        "keywords": ["keyword1", "keyword2"],
+        "structure_complexity": "simple|moderate|complex",
+        "data_richness": "low|medium|high"
+    }
+}
+"""
+
+
+class CombinedAnalyzer:
+    """
+    Single-call replacement for TextAnalyzer + StructureExtractor.
+
+    One request carries the content once and returns both analyses, halving
+    the request count and input tokens per page.
+    """
+
+    def __init__(self, model: genai.GenerativeModel):
+        """
+        Initialize combined analyzer with Gemini model.
+
+        Args:
+            model: Configured Gemini GenerativeModel instance
+        """
+        self.model = model
+        self.logger = logging.getLogger(__name__)
+
+    async def analyze(
+        self,
+        content: str,
+        content_type: ContentType,
+        source_url: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Analyze content with a single Gemini request.
+
+        Args:
+            content: Raw content to analyze
+            content_type: Type of content being processed
+            source_url: Source URL for context
+
+        Returns:
+            (analysis_results, structure_results) in the TextAnalyzer and
+            StructureExtractor result shapes
+
+        Raises:
+            ContentProcessingException: If the response is missing or fails validation
+        """
+        prompt = self._build_prompt(content, content_type, source_url)
+
+        response = await get_ai_client().generate(self.model, prompt)
+        if not response.text:
+            raise ContentProcessingException(
+                "Empty response from Gemini",
+                processing_stage="combined_analysis",
+                content_length=len(content)
+            )
+
+        try:
+            data = json.loads(_strip_code_fence(response.text))
+        except json.JSONDecodeError as e:
+            raise ContentProcessingException(
+                f"Combined analysis returned invalid JSON: {e}",
+                processing_stage="combined_validation",
+                content_length=len(content)
+            )
+
+        return split_combined_result(data, source_url, len(content))
+
+    def _build_prompt(self, content: str, content_type: ContentType, source_url: str) -> str:
+        """Build the combined analysis prompt."""
+        return f"""
+        Analyze this web content and return entities, classification and structured data in one JSON object.
+
+        Source URL: {source_url}
+        Content type: {content_type.value}
+        Content: {condense_for_prompt(content)}
+
+        Return JSON in exactly this structure:
+        {COMBINED_RESPONSE_SCHEMA}
+
+        Omit structured_data sections that contain no actual data. Respond only with valid JSON.
+        """
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a Markdown code fence around a JSON response."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _clamp_confidence(value: Any, default: float = 0.5) -> float:
+    try:
+        return min(max(float(value), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return default
+
+
+def _require(data: Dict[str, Any], key: str, expected_type: type, content_length: int) -> Any:
+    value = data.get(key)
+    if not isinstance(value, expected_type):
+        raise ContentProcessingException(
+            f"Combined analysis field '{key}' missing or not a {expected_type.__name__}",
+            processing_stage="combined_validation",
+            content_length=content_length
+        )
+    return value
+
+
+def split_combined_result(
+    data: Any,
+    source_url: str,
+    content_length: int
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Validate a combined response and split it into the separate result shapes.
+
+    Args:
+        data: Parsed JSON response
+        source_url: Source URL recorded in the metadata
+        content_length: Length of the analyzed content
+
+    Returns:
+        (analysis_results, structure_results) matching TextAnalyzer.analyze_text
+        and StructureExtractor.extract_structure
+
+    Raises:
+        ContentProcessingException: If required fields are missing or malformed
+    """
+    if not isinstance(data, dict):
+        raise ContentProcessingException(
+            "Combined analysis response is not a JSON object",
+            processing_stage="combined_validation",
+            content_length=content_length
+        )
+
+    raw_entities = _require(data, "entities", list, content_length)
+    classification = _require(data, "classification", dict, content_length)
+    raw_structure = _require(data, "structured_data", dict, content_length)
+
+    entities: List[Dict[str, Any]] = []
+    for entity in raw_entities:
+        if isinstance(entity, dict) and entity.get("type") and entity.get("value") not in (None, ""):
+            entity = dict(entity)
+            entity["confidence"] = _clamp_confidence(entity.get("confidence"))
+            entities.append(entity)
+
+    classification = dict(classification)
+    classification["confidence"] = _clamp_confidence(classification.get("confidence"))
+
+    sentiment = data.get("sentiment")
+    if not isinstance(sentiment, dict):
+        sentiment = {"overall": "neutral", "score": 0.5}
+
+    key_topics = [topic for topic in data.get("key_topics") or [] if isinstance(topic, dict)]
+
+    timestamp = datetime.utcnow().isoformat()
+
+    analysis_metadata = data.get("content_metadata")
+    analysis_metadata = dict(analysis_metadata) if isinstance(analysis_metadata, dict) else {}
+    analysis_metadata.update({
+        "processing_timestamp": timestamp,
+        "source_url": source_url,
+        "content_length": content_length,
+        "analysis_mode": "combined"
+    })
+
+    analysis_results = {
+        "entities": entities,
+        "classification": classification,
+        "sentiment": sentiment,
+        "key_topics": key_topics,
+        "summary": str(data.get("summary") or ""),
+        "language": str(data.get("language") or "unknown"),
+        "metadata": analysis_metadata
+    }
+
+    # Keep only known sections that hold data, as the separate prompt asks for
+    structured_data = {
+        section: raw_structure[section]
+        for section in STRUCTURE_SECTIONS
+        if isinstance(raw_structure.get(section), list) and raw_structure[section]
+    }
+
+    structure_metadata = data.get("page_metadata")
+    structure_metadata = dict(structure_metadata) if isinstance(structure_metadata, dict) else {}
+    structure_metadata.setdefault("language", analysis_results["language"])
+    structure_metadata.update({
+        "processing_timestamp": timestamp,
+        "source_url": source_url,
+        "content_length": content_length,
+        "extraction_method": "gemini_ai_combined"
+    })
+
+    structure_results = {
+        "structured_data": structured_data,
+        "metadata": structure_metadata
+    }
+
+    return analysis_results, structure_results
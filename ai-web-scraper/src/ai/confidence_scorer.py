@@ -9,12 +9,39 @@ consistency, and extraction quality.
 import asyncio
 import logging
 import math
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
+# Order of the score components in batch feature matrices
+SCORE_COMPONENTS = (
+    "completeness",
+    "consistency",
+    "entity_confidence",
+    "structure_quality",
+    "content_richness",
+    "validation_score"
+)
+
+
+@dataclass
+class ScoringInput:
+    """One record to score with ConfidenceScorer.score_batch()."""
+    structured_data: Dict[str, Any]
+    entities: List[Dict[str, Any]]
+    classification: Dict[str, Any]
+    raw_content: str
+    additional_factors: Optional[Dict[str, Any]] = None
+
 
 class ConfidenceScorer:
     """
@@ -534,4 +561,297 @@ class ConfidenceScorer:
             "content_richness": self._calculate_content_richness_score(
                 structured_data, entities, raw_content
             )
-        }
\ No newline at end of file
+        }
+    
+    async def calculate_confidence_batch(
+        self,
+        records: Sequence[ScoringInput]
+    ) -> List[float]:
+        """
+        Calculate confidence scores for many records at once.
+        
+        Scores match calculate_confidence() for each record. Additional factors
+        adjust the weights of their own record only.
+        
+        Args:
+            records: Records to score
+        
+        Returns:
+            Confidence scores between 0.0 and 1.0, in input order
+        """
+        if not NUMPY_AVAILABLE:
+            scores = []
+            for record in records:
+                scorer = ConfidenceScorer()
+                scores.append(await scorer.calculate_confidence(
+                    structured_data=record.structured_data,
+                    entities=record.entities,
+                    classification=record.classification,
+                    raw_content=record.raw_content,
+                    additional_factors=record.additional_factors
+                ))
+            return scores
+        
+        return self.score_batch(records).tolist()
+    
+    def score_batch(self, records: Sequence[ScoringInput]) -> "np.ndarray":
+        """
+        Vectorized confidence scoring.
+        
+        Each record is reduced to a fixed set of features in one pass over its
+        data; the six component scores are then computed for all records with
+        array operations and weighted in a single matrix operation.
+        
+        Args:
+            records: Records to score
+        
+        Returns:
+            Array of confidence scores; records that cannot be scored get 0.0
+        """
+        components, weights, valid = self.score_components_batch(records)
+        scores = np.einsum("ij,ij->i", components, weights)
+        return np.where(valid, np.clip(scores, 0.0, 1.0), 0.0)
+    
+    def score_components_batch(
+        self,
+        records: Sequence[ScoringInput]
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Compute the component scores of many records.
+        
+        Args:
+            records: Records to score
+        
+        Returns:
+            Tuple of (components, weights, valid): (N, 6) component scores and
+            weights in SCORE_COMPONENTS order, and a mask of the records whose
+            features could be extracted
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch confidence scoring")
+        
+        features = _BatchFeatures(len(records), [self.weights[name] for name in SCORE_COMPONENTS])
+        for i, record in enumerate(records):
+            try:
+                features.add(i, record, self)
+            except Exception as e:
+                self.logger.debug(f"Confidence features failed for record {i}: {e}")
+                features.valid[i] = False
+        
+        return features.components(), features.weights, features.valid
+
+
+def _walk_structure(data: Any, texts: List[str]) -> Tuple[int, int]:
+    """
+    Walk nested data once for the batch scorer.
+
+    Args:
+        data: Value to walk
+        texts: Receives the normalized text values longer than three characters
+
+    Returns:
+        Tuple of (maximum nesting depth, total text length)
+    """
+    max_depth = 0
+    text_length = 0
+    stack = [(data, 0)]
+    while stack:
+        value, depth = stack.pop()
+        if depth > max_depth:
+            max_depth = depth
+        if isinstance(value, str):
+            text_length += len(value)
+            stripped = value.strip()
+            if len(stripped) > 3:
+                texts.append(stripped.lower())
+        elif isinstance(value, dict):
+            stack.extend((child, depth + 1) for child in value.values())
+        elif isinstance(value, list):
+            stack.extend((child, depth + 1) for child in value)
+    return max_depth, text_length
+
+
+class _BatchFeatures:
+    """Scoring features of a batch of records, one array element per record."""
+
+    # Structured data keys that indicate complete extraction
+    KEY_DATA_TYPES = ('title', 'content', 'text', 'name', 'description')
+
+    COLUMNS = (
+        "sections", "non_empty_sections", "empty_sections", "filled_sections", "key_type_hits",
+        "type_consistency", "type_appropriateness", "depth", "text_length", "duplicate_heavy",
+        "content_length", "stripped_length", "entities", "entity_types",
+        "classification_confidence", "has_classification_confidence",
+        "emails", "valid_emails", "urls", "valid_urls", "phones", "valid_phones"
+    )
+
+    def __init__(self, size: int, weights: List[float]):
+        self.size = size
+        self.valid = np.ones(size, dtype=bool)
+        self.weights = np.tile(np.asarray(weights, dtype=float), (size, 1))
+        # Plain lists while records are added; converted to arrays for scoring
+        self.columns = {name: [0.0] * size for name in self.COLUMNS}
+
+        # Entity confidences flattened across records, with their record index
+        self.consistency_confidences: List[float] = []
+        self.consistency_index: List[int] = []
+        self.entity_confidences: List[float] = []
+        self.entity_index: List[int] = []
+
+    def add(self, i: int, record: ScoringInput, scorer: "ConfidenceScorer") -> None:
+        """Extract the features of record i; raises where calculate_confidence would fail."""
+        structured_data = record.structured_data
+        entities = record.entities
+        raw_content = record.raw_content
+        values: Dict[str, float] = {}
+
+        keys = [str(key).lower() for key in structured_data.keys()]
+        values["key_type_hits"] = sum(
+            1 for key_type in self.KEY_DATA_TYPES if any(key_type in key for key in keys)
+        )
+        values["type_consistency"] = scorer._check_data_type_consistency(structured_data)
+        if structured_data:
+            section_values = list(structured_data.values())
+            values["sections"] = len(section_values)
+            values["non_empty_sections"] = sum(
+                1 for value in section_values
+                if value and (
+                    (isinstance(value, list) and len(value) > 0) or
+                    (isinstance(value, dict) and len(value) > 0) or
+                    (isinstance(value, str) and len(value.strip()) > 0)
+                )
+            )
+            values["empty_sections"] = sum(
+                1 for value in section_values
+                if not value or (isinstance(value, (list, dict)) and len(value) == 0)
+            )
+            values["filled_sections"] = sum(1 for value in section_values if value)
+            values["type_appropriateness"] = scorer._check_type_appropriateness(structured_data)
+
+            texts: List[str] = []
+            values["depth"], values["text_length"] = _walk_structure(structured_data, texts)
+            if texts and 1.0 - (len(set(texts)) / len(texts)) > 0.5:
+                values["duplicate_heavy"] = 1
+
+        values["content_length"] = len(raw_content)
+        values["stripped_length"] = len(raw_content.strip())
+
+        if entities:
+            values["entities"] = len(entities)
+            values["entity_types"] = len(set(entity.get('type', 'unknown') for entity in entities))
+            validated = {'EMAIL': [], 'URL': [], 'PHONE': []}
+            for entity in entities:
+                confidence = entity.get('confidence')
+                if isinstance(confidence, (int, float)):
+                    self.consistency_confidences.append(confidence)
+                    self.consistency_index.append(i)
+                confidence = entity.get('confidence', 0.5)
+                if isinstance(confidence, (int, float)):
+                    self.entity_confidences.append(confidence)
+                    self.entity_index.append(i)
+                entity_type = entity.get('type')
+                if entity_type in validated:
+                    validated[entity_type].append(entity.get('value', ''))
+
+            for entity_type, validator, total_name, valid_name in (
+                ('EMAIL', scorer._validate_email, "emails", "valid_emails"),
+                ('URL', scorer._validate_url, "urls", "valid_urls"),
+                ('PHONE', scorer._validate_phone, "phones", "valid_phones")
+            ):
+                if validated[entity_type]:
+                    values[total_name] = len(validated[entity_type])
+                    values[valid_name] = sum(1 for value in validated[entity_type] if validator(value))
+
+        classification_confidence = record.classification.get('confidence', 0.5)
+        if isinstance(classification_confidence, (int, float)):
+            values["classification_confidence"] = classification_confidence
+            values["has_classification_confidence"] = 1
+
+        # Same adjustments as _apply_additional_factors, for this record only
+        factors = record.additional_factors
+        if factors:
+            if 'processing_time' in factors and factors['processing_time'] > 30:
+                self.weights[i, SCORE_COMPONENTS.index("validation_score")] *= 0.8
+            if 'source_reliability' in factors and factors['source_reliability'] > 0.8:
+                self.weights[i] *= 1.1
+
+        for name, value in values.items():
+            self.columns[name][i] = value
+
+    def _per_record(self, index: List[int], weights: Any) -> "np.ndarray":
+        return np.bincount(
+            np.asarray(index, dtype=np.intp),
+            weights=np.asarray(weights, dtype=float),
+            minlength=self.size
+        )
+
+    def components(self) -> "np.ndarray":
+        """Component scores as an (N, 6) array in SCORE_COMPONENTS order."""
+        c = {name: np.asarray(column, dtype=float) for name, column in self.columns.items()}
+        has_data = c["sections"] > 0
+        has_content = c["content_length"] > 0
+        has_text = c["stripped_length"] > 0
+        has_entities = c["entities"] > 0
+        has_class = c["has_classification_confidence"] > 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Completeness
+            sections_factor = np.where(has_data, c["non_empty_sections"] / c["sections"], 0.0)
+            expected_entities = np.maximum(np.minimum(c["content_length"] // 500, 20), 1)
+            coverage_factor = np.where(has_content, np.minimum(c["entities"] / expected_entities, 1.0), 0.0)
+            key_factor = c["key_type_hits"] / len(self.KEY_DATA_TYPES)
+            completeness = (sections_factor + coverage_factor + key_factor) / (1.0 + has_data + has_content)
+
+            # Consistency
+            counts = self._per_record(self.consistency_index, np.ones(len(self.consistency_index)))
+            has_confidences = counts > 0
+            means = self._per_record(self.consistency_index, self.consistency_confidences) / counts
+            deviations = np.asarray(self.consistency_confidences, dtype=float) - means[np.asarray(self.consistency_index, dtype=np.intp)]
+            variances = self._per_record(self.consistency_index, deviations ** 2) / counts
+            variance_factor = np.where(has_confidences, np.maximum(0.0, 1.0 - variances), 0.0)
+            class_factor = np.where(has_class, c["classification_confidence"], 0.0)
+            consistency = (variance_factor + class_factor + c["type_consistency"]) / (1.0 + has_confidences + has_class)
+
+            # Entity confidence: confidence-weighted mean confidence
+            entity_confidences = np.asarray(self.entity_confidences, dtype=float)
+            total = self._per_record(self.entity_index, entity_confidences)
+            weighted = self._per_record(self.entity_index, entity_confidences * entity_confidences)
+            entity_confidence = np.where(total != 0, weighted / total, 0.0)
+
+            # Structure quality
+            depth_factor = np.maximum(0.0, 1.0 - np.abs(c["depth"] - 3) / 5.0)
+            balance_factor = 1.0 - c["empty_sections"] / c["sections"]
+            structure_quality = np.where(
+                has_data, (depth_factor + balance_factor + c["type_appropriateness"]) / 3, 0.0
+            )
+
+            # Content richness
+            ratio = np.minimum(c["text_length"] / c["stripped_length"], 1.0)
+            ratio_factor = np.where(
+                ratio < 0.3, ratio / 0.3, np.where(ratio <= 0.8, 1.0, 1.0 - (ratio - 0.8) / 0.2)
+            )
+            ratio_factor = np.where(has_text, np.maximum(0.0, ratio_factor), 0.0)
+            diversity_factor = np.where(has_entities, np.minimum(c["entity_types"] / 5.0, 1.0), 0.0)
+            variety_factor = np.where(has_data, np.minimum(c["filled_sections"] / 8.0, 1.0), 0.0)
+            richness_count = 0.0 + has_text + has_entities + has_data
+            content_richness = np.where(
+                richness_count > 0,
+                (ratio_factor + diversity_factor + variety_factor) / richness_count,
+                0.0
+            )
+
+            # Validation
+            validation_sum = np.zeros(self.size)
+            validation_count = np.ones(self.size)
+            for total_name, valid_name in (("emails", "valid_emails"), ("urls", "valid_urls"), ("phones", "valid_phones")):
+                present = c[total_name] > 0
+                validation_sum += np.where(present, c[valid_name] / c[total_name], 0.0)
+                validation_count += present
+            validation_sum += np.where(c["duplicate_heavy"] > 0, 0.7, 1.0)
+            validation_score = validation_sum / validation_count
+
+        components = np.column_stack([
+            completeness, consistency, entity_confidence,
+            structure_quality, content_richness, validation_score
+        ])
+        return np.where(self.valid[:, None], components, 0.0)
@@ -0,0 +1,334 @@
+"""
+Token-budget-aware content condensation for AI prompts.
+
+This module provides the ContentCondenser class that turns page content into
+the most informative text that fits a token budget: boilerplate is dropped
+using the content extractor's main-content signals, repeated blocks are
+removed, and the remaining paragraphs are ranked by information density and
+packed into the budget in their original order.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    from bs4 import BeautifulSoup, Comment
+    from src.scraper.content_extractor import BOILERPLATE_SELECTORS, MAIN_CONTENT_SELECTORS
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for Latin-script web text
+CHARS_PER_TOKEN = 4
+
+# Page chrome removed when no main content container is found
+LAYOUT_SELECTORS = [
+    'nav', 'header', 'footer', 'aside',
+    '.navigation', '.nav', '.menu', '.breadcrumb',
+    '.sidebar', '.side-bar', '#sidebar', '#navigation', '#footer'
+]
+
+# Text without paragraph breaks is split into sentence groups of about this size
+MAX_BLOCK_CHARS = 600
+
+# Blocks shorter than this are ranked as if they had this many tokens
+MIN_RANK_TOKENS = 16
+
+# Blocks scoring below this fraction of the best block are never packed
+MIN_RELATIVE_SCORE = 0.15
+
+# Elements whose text forms one block
+BLOCK_TAGS = [
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'dt', 'dd',
+    'blockquote', 'pre', 'figcaption', 'caption', 'td', 'th'
+]
+
+# Phrases typical of site chrome that survives selector-based removal
+BOILERPLATE_PATTERN = re.compile(
+    r'\b(?:cookies?|all rights reserved|privacy policy|terms of (?:use|service)|'
+    r'subscribe|sign up|log ?in|newsletter|follow us|share this|skip to)\b|©',
+    re.IGNORECASE
+)
+
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+_WORD_PATTERN = re.compile(r'[^\W\d_]{2,}')
+_SIGNAL_PATTERN = re.compile(r'\d|[$€£¥]|@|https?://')
+_SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+_HTML_PATTERN = re.compile(r'<\s*(?:html|body|div|p|article|main|section|span|h[1-6])\b', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without calling the API.
+
+    Words count one token per four characters and punctuation one token
+    each, which tracks subword tokenizers closely on web text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return sum((len(piece) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN for piece in _TOKEN_PATTERN.findall(text))
+
+
+@dataclass
+class CondensedContent:
+    """Condensed text with statistics about what was kept."""
+    text: str
+    original_tokens: int
+    tokens: int
+    blocks_total: int
+    blocks_kept: int
+    duplicates_removed: int
+
+    @property
+    def truncated(self) -> bool:
+        return self.blocks_kept < self.blocks_total - self.duplicates_removed
+
+
+class ContentCondenser:
+    """
+    Condenses HTML or text to the most informative content within a token budget.
+    """
+
+    def __init__(self, token_budget: int = 1000, min_block_chars: int = 3):
+        """
+        Initialize content condenser.
+
+        Args:
+            token_budget: Maximum estimated tokens in the condensed text
+            min_block_chars: Blocks shorter than this are dropped
+        """
+        self.token_budget = max(token_budget, 1)
+        self.min_block_chars = min_block_chars
+
+    def condense(self, content: str, is_html: Optional[bool] = None) -> CondensedContent:
+        """
+        Condense content to fit the token budget.
+
+        Args:
+            content: Raw HTML or plain text
+            is_html: Whether content is HTML (detected if None)
+
+        Returns:
+            CondensedContent with the packed text and statistics
+        """
+        if is_html is None:
+            is_html = bool(_HTML_PATTERN.search(content[:2000]))
+
+        if is_html and BS4_AVAILABLE:
+            blocks = self._html_blocks(content)
+        else:
+            blocks = self._text_blocks(content)
+
+        blocks_total = len(blocks)
+        blocks, duplicates_removed = self._dedupe(blocks)
+        block_tokens = [estimate_tokens(block) for block in blocks]
+        original_tokens = sum(block_tokens)
+
+        if original_tokens <= self.token_budget:
+            kept = list(range(len(blocks)))
+        else:
+            kept = self._pack(blocks, block_tokens)
+
+        text = "\n".join(blocks[i] for i in kept)
+        if not text and blocks:
+            # Nothing fits whole; cut the best block down to the budget
+            best = max(range(len(blocks)), key=lambda i: self._score(blocks[i], i, len(blocks)))
+            text = self._truncate(blocks[best])
+            kept = [best]
+
+        return CondensedContent(
+            text=text,
+            original_tokens=original_tokens,
+            tokens=estimate_tokens(text),
+            blocks_total=blocks_total,
+            blocks_kept=len(kept),
+            duplicates_removed=duplicates_removed
+        )
+
+    def _html_blocks(self, html: str) -> List[str]:
+        """Split the main content of an HTML page into text blocks."""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+        for element in soup(['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'form']):
+            element.decompose()
+        self._remove(soup, BOILERPLATE_SELECTORS)
+
+        main_area = None
+        for selector in MAIN_CONTENT_SELECTORS:
+            try:
+                main_area = soup.select_one(selector)
+            except Exception:
+                continue
+            if main_area:
+                break
+
+        if main_area is None:
+            main_area = soup.find('body') or soup
+            self._remove(main_area, LAYOUT_SELECTORS)
+
+        title = soup.find('title')
+        blocks = [title.get_text(' ', strip=True)] if title else []
+
+        elements = main_area.find_all(BLOCK_TAGS)
+        if not elements:
+            return blocks + self._text_blocks(main_area.get_text('\n'))
+
+        for element in elements:
+            # Nested blocks (a <p> inside an <li>) are emitted by the innermost element
+            if element.find(BLOCK_TAGS):
+                continue
+            text = re.sub(r'\s+', ' ', element.get_text(' ', strip=True))
+            if len(text) >= self.min_block_chars:
+                blocks.append(text)
+        return blocks
+
+    @staticmethod
+    def _remove(root, selectors: List[str]) -> None:
+        for selector in selectors:
+            try:
+                for element in root.select(selector):
+                    element.decompose()
+            except Exception:
+                continue
+
+    def _text_blocks(self, text: str) -> List[str]:
+        """Split plain text into paragraph blocks."""
+        parts = re.split(r'\n\s*\n' if '\n\n' in text else r'\n', text)
+        blocks = []
+        for part in parts:
+            part = re.sub(r'\s+', ' ', part).strip()
+            if len(part) > MAX_BLOCK_CHARS:
+                blocks.extend(self._sentence_chunks(part))
+            elif len(part) >= self.min_block_chars:
+                blocks.append(part)
+        return blocks
+
+    def _sentence_chunks(self, text: str) -> List[str]:
+        """Group the sentences of a long run of text into block-sized chunks."""
+        chunks = []
+        current = ""
+        for sentence in _SENTENCE_PATTERN.split(text):
+            if current and len(current) + len(sentence) + 1 > MAX_BLOCK_CHARS:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+        return [chunk for chunk in chunks if len(chunk) >= self.min_block_chars]
+
+    @staticmethod
+    def _dedupe(blocks: List[str]) -> Tuple[List[str], int]:
+        """Drop blocks whose normalized text has already been seen."""
+        seen = set()
+        unique = []
+        for block in blocks:
+            key = hashlib.md5(re.sub(r'\W+', ' ', block.lower()).strip().encode('utf-8')).digest()
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(block)
+        return unique, len(blocks) - len(unique)
+
+    @staticmethod
+    def _score(block: str, position: int, count: int) -> float:
+        """Information density of a block: distinct words, data signals, position."""
+        words = [word.lower() for word in _WORD_PATTERN.findall(block)]
+        if not words:
+            return 0.1 if _SIGNAL_PATTERN.search(block) else 0.0
+
+        distinct_ratio = len(set(words)) / len(words)
+        score = distinct_ratio * math.log1p(len(set(words)))
+
+        # Numbers, prices, emails and links are what extraction prompts look for
+        score += 0.5 * min(len(_SIGNAL_PATTERN.findall(block)), 5) / 5
+
+        if BOILERPLATE_PATTERN.search(block) and len(words) < 40:
+            score *= 0.1
+
+        # Earlier blocks carry the lead of the page
+        score *= 1.0 + 0.25 * (1.0 - position / max(count, 1))
+        return score
+
+    def _pack(self, blocks: List[str], block_tokens: List[int]) -> List[int]:
+        """Choose the highest-scoring blocks that fit, in document order."""
+        count = len(blocks)
+        scores = [self._score(block, i, count) for i, block in enumerate(blocks)]
+        # Blocks far below the best are chrome; leave their budget unused
+        floor = max(scores) * MIN_RELATIVE_SCORE
+
+        # Mild length normalization so one long block cannot crowd out several dense ones
+        ranked = sorted(
+            (i for i in range(count) if scores[i] >= floor),
+            key=lambda i: scores[i] / math.sqrt(max(block_tokens[i], MIN_RANK_TOKENS)),
+            reverse=True
+        )
+
+        remaining = self.token_budget
+        kept = []
+        for i in ranked:
+            cost = block_tokens[i] + 1  # newline separator
+            if cost <= remaining:
+                kept.append(i)
+                remaining -= cost
+            if remaining <= 1:
+                break
+
+        return sorted(kept)
+
+    def _truncate(self, text: str) -> str:
+        """Cut text to the budget at a word boundary."""
+        cut = text[:self.token_budget * CHARS_PER_TOKEN]
+        while cut and estimate_tokens(cut) > self.token_budget:
+            cut = cut[:int(len(cut) * 0.9)]
+        if len(cut) < len(text) and ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        return cut
+
+
+def condense_for_prompt(
+    content: str,
+    token_budget: Optional[int] = None,
+    is_html: Optional[bool] = None
+) -> str:
+    """
+    Condense content for a Gemini prompt using the configured settings.
+
+    Args:
+        content: Raw HTML or plain text
+        token_budget: Token budget (AI_CONDENSE_TOKEN_BUDGET if None)
+        is_html: Whether content is HTML (detected if None)
+
+    Returns:
+        Condensed text; a plain prefix of the content when condensation is disabled
+    """
+    from config.settings import get_settings
+    settings = get_settings()
+
+    if token_budget is None:
+        token_budget = settings.ai_condense_token_budget
+
+    if not content:
+        return ""
+
+    if not settings.ai_condense_enabled:
+        return content[:token_budget * CHARS_PER_TOKEN]
+
+    try:
+        return ContentCondenser(token_budget).condense(content, is_html).text
+    except Exception as e:
+        logger.warning(f"Content condensation failed, truncating instead: {e}")
+        return content[:token_budget * CHARS_PER_TOKEN]
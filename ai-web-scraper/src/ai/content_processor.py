@@ -24,9 +24,24 @@ from src.utils.exceptions import (
 from src.utils.error_recovery import with_recovery, recovery_manager
 from src.utils.error_notifications import notify_error
 from src.utils.logger import get_logger, get_correlation_id
+from src.ai.client import get_ai_client
+from src.ai.model_backend import get_model_backend
+from src.ai.page_classifier import PageSample, TriageAction, TriageDecision, get_page_triage
+from src.ai.result_cache import get_ai_result_cache, make_cache_key
 
 logger = get_logger(__name__)
 
+MODEL_NAME = "gemini-2.0-flash-exp"
+
+# Bump when the analysis/structure prompts or confidence scoring change
+PROCESSING_VERSION = "1"
+
+# Seconds allowed for the health check prompt
+HEALTH_CHECK_TIMEOUT = 10.0
+
+# Confidence of a triage-skipped page when heuristic scoring fails
+SKIPPED_PAGE_CONFIDENCE = 0.3
+
 
 class ProcessedContent:
     """Container for AI-processed content results."""
@@ -45,6 +60,8 @@ class ProcessedContent:
         self.confidence_score = confidence_score
         self.processing_metadata = processing_metadata
         self.processed_at = datetime.utcnow()
+        # Result cache key when scoring, and therefore caching, was deferred
+        self.cache_key: Optional[str] = None
 
 
 class ContentProcessor:
@@ -64,6 +81,13 @@ class ContentProcessor:
     
     def _initialize_gemini(self) -> None:
         """Initialize Gemini API configuration with security validation."""
+        # Alternative backends (the offline stand-in) need no API key
+        backend = get_model_backend()
+        if backend is not None:
+            self._model = backend
+            logger.info(f"Using '{self.settings.ai_backend}' model backend")
+            return
+        
         api_key = self._get_secure_api_key()
         if not api_key:
             logger.warning("Gemini API key not configured - AI processing will be disabled")
@@ -93,7 +117,7 @@ class ContentProcessor:
             }
             
             self._model = genai.GenerativeModel(
-                model_name="gemini-2.0-flash-exp",
+                model_name=MODEL_NAME,
                 generation_config=generation_config,
                 safety_settings=safety_settings
             )
@@ -147,7 +171,11 @@ class ContentProcessor:
         raw_content: str,
         content_type: ContentType,
         url: str,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Dict[str, Any]] = None,
+        combined_analysis: Optional[bool] = None,
+        micro_batch: Optional[bool] = None,
+        triage: Optional[TriageDecision] = None,
+        defer_scoring: bool = False
     ) -> ProcessedContent:
         """
         Process raw content using AI to extract structured data.
@@ -157,6 +185,13 @@ class ContentProcessor:
             content_type: Type of content being processed
             url: Source URL for context
             additional_context: Additional context for processing
+            combined_analysis: Use one combined Gemini request instead of separate
+                text and structure requests (settings default if None)
+            micro_batch: Share a multi-document request with concurrent calls;
+                implies combined analysis (settings default if None)
+            triage: Precomputed page triage decision (local classifier runs if None)
+            defer_scoring: Leave confidence_score as None for the caller to score
+                in batch with finish_deferred_scoring()
             
         Returns:
             ProcessedContent: AI-processed content with structured data
@@ -185,23 +220,69 @@ class ContentProcessor:
             if len(raw_content) > 1000000:  # 1MB limit
                 logger.warning(f"Content size ({len(raw_content)} chars) exceeds recommended limit")
             
+            # Navigation and listing pages never reach Gemini
+            if triage is None:
+                triage = self._triage(raw_content, url)
+            if triage is not None and triage.action == TriageAction.SKIP:
+                logger.info(f"Skipping AI processing for {triage.label} page", extra={"url": url})
+                return await self._skipped_result(triage, raw_content, additional_context, correlation_id)
+            
+            # Identical content processed before is served from the result cache
+            if micro_batch is None:
+                micro_batch = self.settings.ai_micro_batch_enabled
+            if combined_analysis is None:
+                combined_analysis = micro_batch or self.settings.ai_combined_analysis
+            micro_batch = micro_batch and combined_analysis
+            analysis_mode = "combined" if combined_analysis else "separate"
+            
+            cache = get_ai_result_cache()
+            cache_key = None
+            if cache is not None:
+                cache_key = make_cache_key(
+                    "process_content", raw_content, PROCESSING_VERSION, MODEL_NAME,
+                    f"{content_type.value}:{analysis_mode}"
+                )
+                cached = await cache.aget(cache_key)
+                if cached is not None:
+                    logger.info("AI content processing served from cache", extra={"url": url})
+                    return self._from_cache(cached, additional_context, correlation_id)
+            
             # Import AI modules here to avoid circular imports
             from src.ai.text_analyzer import TextAnalyzer
             from src.ai.structure_extractor import StructureExtractor
             from src.ai.confidence_scorer import ConfidenceScorer
+            from src.ai.combined_analyzer import CombinedAnalyzer
+            from src.ai.micro_batcher import get_micro_batcher
             
-            # Initialize processors
-            text_analyzer = TextAnalyzer(self._model)
-            structure_extractor = StructureExtractor(self._model)
-            confidence_scorer = ConfidenceScorer()
+            analysis_results = structure_results = None
             
-            # Process content in parallel where possible
-            tasks = [
-                self._safe_analyze_text(text_analyzer, raw_content, url),
-                self._safe_extract_structure(structure_extractor, raw_content, content_type, url)
-            ]
+            # One request for both analyses; separate requests remain the fallback
+            if combined_analysis:
+                try:
+                    if micro_batch:
+                        analysis_results, structure_results = await get_micro_batcher(self._model).submit(
+                            raw_content, content_type, url
+                        )
+                    else:
+                        analysis_results, structure_results = await CombinedAnalyzer(self._model).analyze(
+                            raw_content, content_type, url
+                        )
+                except Exception as e:
+                    logger.warning(f"Combined analysis failed, falling back to separate requests: {e}")
+                    analysis_mode = "separate"
             
-            analysis_results, structure_results = await asyncio.gather(*tasks, return_exceptions=True)
+            if analysis_results is None:
+                # Initialize processors
+                text_analyzer = TextAnalyzer(self._model)
+                structure_extractor = StructureExtractor(self._model)
+                
+                # Process content in parallel where possible
+                tasks = [
+                    self._safe_analyze_text(text_analyzer, raw_content, url),
+                    self._safe_extract_structure(structure_extractor, raw_content, content_type, url)
+                ]
+                
+                analysis_results, structure_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Handle any exceptions from parallel processing
             if isinstance(analysis_results, Exception):
@@ -213,6 +294,7 @@ class ContentProcessor:
                     correlation_id=correlation_id
                 )
                 analysis_results = {"entities": [], "classification": {"category": "unknown"}}
+                cache_key = None
             
             if isinstance(structure_results, Exception):
                 logger.error(f"Structure extraction failed: {structure_results}")
@@ -223,6 +305,7 @@ class ContentProcessor:
                     correlation_id=correlation_id
                 )
                 structure_results = {"structured_data": {}, "metadata": {}}
+                cache_key = None
             
             # Combine results
             structured_data = structure_results.get("structured_data", {})
@@ -230,35 +313,24 @@ class ContentProcessor:
             classification = analysis_results.get("classification", {"category": "unknown"})
             
             # Calculate confidence score
-            try:
-                confidence_score = await confidence_scorer.calculate_confidence(
-                    structured_data=structured_data,
-                    entities=entities,
-                    classification=classification,
-                    raw_content=raw_content
-                )
-                
-                # Check confidence threshold
-                min_confidence = 0.3  # Configurable threshold
-                if confidence_score < min_confidence:
-                    await notify_error(
-                        ConfidenceThresholdException(
-                            f"AI processing confidence ({confidence_score:.2f}) below threshold ({min_confidence})",
-                            confidence_score=confidence_score,
-                            threshold=min_confidence
-                        ),
-                        "ai_confidence_scorer",
-                        context={"url": url, "confidence": confidence_score},
-                        correlation_id=correlation_id
+            confidence_score = None
+            if not defer_scoring:
+                try:
+                    confidence_score = await ConfidenceScorer().calculate_confidence(
+                        structured_data=structured_data,
+                        entities=entities,
+                        classification=classification,
+                        raw_content=raw_content
                     )
-                
-            except Exception as e:
-                logger.error(f"Confidence scoring failed: {e}")
-                confidence_score = 0.5  # Default confidence
+                    await self._check_confidence_threshold(confidence_score, url, correlation_id)
+                except Exception as e:
+                    logger.error(f"Confidence scoring failed: {e}")
+                    confidence_score = 0.5  # Default confidence
             
             # Prepare processing metadata
             processing_metadata = {
-                "model_used": "gemini-2.0-flash-exp",
+                "model_used": MODEL_NAME,
+                "analysis_mode": analysis_mode,
                 "processing_time": datetime.utcnow().isoformat(),
                 "content_length": len(raw_content),
                 "entities_found": len(entities),
@@ -277,6 +349,12 @@ class ContentProcessor:
                 processing_metadata=processing_metadata
             )
             
+            # Partial results (a failed sub-analysis) are not cached so they get retried
+            if defer_scoring:
+                result.cache_key = cache_key
+            elif cache_key is not None:
+                await self._cache_result(cache_key, result)
+            
             logger.info(
                 f"AI content processing completed successfully",
                 extra={
@@ -313,6 +391,163 @@ class ContentProcessor:
                 
                 raise processing_error
     
+    async def _check_confidence_threshold(
+        self,
+        confidence_score: float,
+        url: str,
+        correlation_id: Optional[str]
+    ) -> None:
+        """Report results whose confidence is below the minimum threshold."""
+        min_confidence = 0.3  # Configurable threshold
+        if confidence_score < min_confidence:
+            await notify_error(
+                ConfidenceThresholdException(
+                    f"AI processing confidence ({confidence_score:.2f}) below threshold ({min_confidence})",
+                    confidence_score=confidence_score,
+                    threshold=min_confidence
+                ),
+                "ai_confidence_scorer",
+                context={"url": url, "confidence": confidence_score},
+                correlation_id=correlation_id
+            )
+    
+    async def _cache_result(self, cache_key: str, result: ProcessedContent) -> None:
+        """Store a scored result in the AI result cache."""
+        cache = get_ai_result_cache()
+        if cache is None:
+            return
+        await cache.aset(cache_key, {
+            "structured_data": result.structured_data,
+            "entities": result.entities,
+            "classification": result.classification,
+            "confidence_score": result.confidence_score,
+            "processing_metadata": result.processing_metadata
+        })
+    
+    async def finish_deferred_scoring(
+        self,
+        results: List[ProcessedContent],
+        raw_contents: List[str],
+        urls: List[str]
+    ) -> None:
+        """
+        Score results processed with defer_scoring in one vectorized batch.
+        
+        Sets confidence_score on every result that is still unscored, reports
+        low-confidence results and stores cacheable results in the result cache.
+        
+        Args:
+            results: Processed results
+            raw_contents: Raw content each result was processed from
+            urls: Source URL of each result
+        """
+        from src.ai.confidence_scorer import ConfidenceScorer, ScoringInput
+        
+        pending = [i for i, result in enumerate(results) if result.confidence_score is None]
+        if not pending:
+            return
+        
+        try:
+            scores = await ConfidenceScorer().calculate_confidence_batch([
+                ScoringInput(
+                    structured_data=results[i].structured_data,
+                    entities=results[i].entities,
+                    classification=results[i].classification,
+                    raw_content=raw_contents[i]
+                )
+                for i in pending
+            ])
+        except Exception as e:
+            logger.error(f"Batch confidence scoring failed: {e}")
+            scores = [0.5] * len(pending)  # Default confidence
+        
+        for i, score in zip(pending, scores):
+            result = results[i]
+            result.confidence_score = score
+            correlation_id = result.processing_metadata.get("correlation_id")
+            await self._check_confidence_threshold(score, urls[i], correlation_id)
+            if result.cache_key is not None:
+                await self._cache_result(result.cache_key, result)
+                result.cache_key = None
+    
+    def _from_cache(
+        self,
+        cached: Dict[str, Any],
+        additional_context: Optional[Dict[str, Any]],
+        correlation_id: Optional[str]
+    ) -> ProcessedContent:
+        """Rebuild a ProcessedContent from a cached result for the current request."""
+        processing_metadata = cached.get("processing_metadata", {})
+        processing_metadata.update({
+            "cache_hit": True,
+            "additional_context": additional_context or {},
+            "correlation_id": correlation_id
+        })
+        
+        return ProcessedContent(
+            structured_data=cached.get("structured_data", {}),
+            entities=cached.get("entities", []),
+            classification=cached.get("classification", {"category": "unknown"}),
+            confidence_score=cached.get("confidence_score", 0.5),
+            processing_metadata=processing_metadata
+        )
+    
+    def _triage(self, raw_content: str, url: str) -> Optional[TriageDecision]:
+        """Triage a page with the local classifier, or return None when triage is off."""
+        page_triage = get_page_triage()
+        if page_triage is None:
+            return None
+        try:
+            return page_triage.decide(PageSample.from_content(raw_content, url))
+        except Exception as e:
+            logger.warning(f"Page triage failed: {e}", extra={"url": url})
+            return None
+    
+    async def _skipped_result(
+        self,
+        triage: TriageDecision,
+        raw_content: str,
+        additional_context: Optional[Dict[str, Any]],
+        correlation_id: Optional[str]
+    ) -> ProcessedContent:
+        """
+        Result for a page the triage classifier ruled out of AI processing.
+        
+        The triage confidence measures how sure the classifier is of the
+        page type, not the quality of the extracted data, so it is kept in
+        the metadata and the record gets the heuristic content score that
+        an unanalyzed page would have.
+        """
+        from src.ai.confidence_scorer import ConfidenceScorer
+        try:
+            confidence_score = await ConfidenceScorer().calculate_confidence(
+                structured_data={},
+                entities=[],
+                classification={},
+                raw_content=raw_content
+            )
+        except Exception as e:
+            logger.error(f"Confidence scoring failed: {e}")
+            confidence_score = SKIPPED_PAGE_CONFIDENCE
+        
+        return ProcessedContent(
+            structured_data={},
+            entities=[],
+            classification={"primary_category": triage.label, "confidence": triage.confidence},
+            confidence_score=confidence_score,
+            processing_metadata={
+                "model_used": "page_classifier",
+                "analysis_mode": "skipped",
+                "processing_time": datetime.utcnow().isoformat(),
+                "content_length": len(raw_content),
+                "entities_found": 0,
+                "structure_complexity": 0,
+                "triage": triage.to_dict(),
+                "additional_context": additional_context or {},
+                "correlation_id": correlation_id
+            }
+        )
+    
     async def _safe_analyze_text(self, analyzer, content: str, url: str) -> Dict[str, Any]:
         """Safely analyze text with error handling."""
         try:
@@ -433,7 +668,8 @@ class ContentProcessor:
     async def batch_process_content(
         self,
         content_items: List[Tuple[str, ContentType, str]],
-        max_concurrent: int = 5
+        max_concurrent: int = 5,
+        micro_batch: Optional[bool] = None
     ) -> List[ProcessedContent]:
         """
         Process multiple content items in parallel batches.
@@ -441,19 +677,42 @@ class ContentProcessor:
         Args:
             content_items: List of (content, content_type, url) tuples
             max_concurrent: Maximum number of concurrent processing tasks
+            micro_batch: Pack items into multi-document requests (settings default if None)
             
         Returns:
             List of ProcessedContent results
         """
+        if micro_batch is None:
+            micro_batch = self.settings.ai_micro_batch_enabled
+        
+        # With micro-batching several items share one request, so let enough
+        # items in flight to fill a batch
+        if micro_batch:
+            max_concurrent = max(max_concurrent, self.settings.ai_micro_batch_max_docs)
+        
         semaphore = asyncio.Semaphore(max_concurrent)
         
-        async def process_with_semaphore(content, content_type, url):
+        # Triage the whole batch in one vectorized classifier pass
+        decisions: List[Optional[TriageDecision]] = [None] * len(content_items)
+        page_triage = get_page_triage() if self._model else None
+        if page_triage is not None:
+            try:
+                decisions = page_triage.decide_batch([
+                    PageSample.from_content(content, url) for content, _, url in content_items
+                ])
+            except Exception as e:
+                logger.warning(f"Batch page triage failed: {e}")
+        
+        async def process_with_semaphore(content, content_type, url, triage):
             async with semaphore:
-                return await self.process_content(content, content_type, url)
+                return await self.process_content(
+                    content, content_type, url, micro_batch=micro_batch, triage=triage,
+                    defer_scoring=True
+                )
         
         tasks = [
-            process_with_semaphore(content, content_type, url)
-            for content, content_type, url in content_items
+            process_with_semaphore(content, content_type, url, triage)
+            for (content, content_type, url), triage in zip(content_items, decisions)
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -476,6 +735,13 @@ class ContentProcessor:
             else:
                 processed_results.append(result)
         
+        # Score all AI results in one vectorized pass
+        await self.finish_deferred_scoring(
+            processed_results,
+            [content for content, _, _ in content_items],
+            [url for _, _, url in content_items]
+        )
+        
         return processed_results
     
     def is_available(self) -> bool:
@@ -494,13 +760,13 @@ class ContentProcessor:
         try:
             # Test with a simple prompt
             test_prompt = "Analyze this text: 'Hello world'"
-            response = await asyncio.to_thread(
-                self._model.generate_content, test_prompt
+            response = await get_ai_client().generate(
+                self._model, test_prompt, timeout=HEALTH_CHECK_TIMEOUT
             )
             
             return {
                 "status": "healthy",
-                "model": "gemini-2.0-flash-exp",
+                "model": MODEL_NAME,
                 "test_response_length": len(response.text) if response.text else 0,
                 "timestamp": datetime.utcnow().isoformat()
             }
@@ -0,0 +1,316 @@
+"""
+Multi-document micro-batching for Gemini requests.
+
+This module provides the AIMicroBatcher class that collects combined analysis
+requests for a short window, packs several documents into one prompt with
+per-document IDs, and resolves each caller's future from the matching entry
+of the JSON response. Fewer, larger requests keep batch jobs under the
+per-minute request quota.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import google.generativeai as genai
+
+from src.models.pydantic_models import ContentType
+from src.utils.exceptions import ContentProcessingException
+from src.ai.combined_analyzer import (
+    COMBINED_RESPONSE_SCHEMA, CombinedAnalyzer,
+    _strip_code_fence, split_combined_result
+)
+from src.ai.content_condenser import condense_for_prompt, estimate_tokens
+from src.ai.client import get_ai_client
+
+
+logger = logging.getLogger(__name__)
+
+# Prompt instructions and per-document headers, in tokens
+PROMPT_OVERHEAD_TOKENS = 600
+DOCUMENT_OVERHEAD_TOKENS = 30
+
+
+@dataclass
+class _PendingDocument:
+    """A document waiting for the next batch flush."""
+    doc_id: str
+    content: str
+    content_type: ContentType
+    source_url: str
+    future: asyncio.Future
+    tokens: int = field(default=0)
+
+
+class AIMicroBatcher:
+    """
+    Coalesces concurrent combined analysis requests into multi-document prompts.
+
+    A batch is flushed when the collection window elapses, when it holds
+    max_batch_docs documents, or when adding another document would exceed
+    the token budget. Each batcher is bound to the event loop it is first
+    used on; use get_micro_batcher() to get one for the running loop.
+    """
+
+    def __init__(
+        self,
+        model: genai.GenerativeModel,
+        max_wait_ms: int = 50,
+        max_batch_docs: int = 8,
+        token_budget: int = 24000
+    ):
+        """
+        Initialize micro-batcher.
+
+        Args:
+            model: Configured Gemini GenerativeModel instance
+            max_wait_ms: How long the first document in a batch waits for company
+            max_batch_docs: Maximum documents packed into one request
+            token_budget: Estimated input token budget per request
+        """
+        self.model = model
+        self.max_wait = max(max_wait_ms, 0) / 1000.0
+        self.max_batch_docs = max(max_batch_docs, 1)
+        self.token_budget = max(token_budget, 1)
+
+        self._ids = itertools.count(1)
+        self._pending: List[_PendingDocument] = []
+        self._pending_tokens = PROMPT_OVERHEAD_TOKENS
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self._stats = {
+            "documents": 0,
+            "requests": 0,
+            "batched_documents": 0,
+            "document_failures": 0,
+            "request_failures": 0
+        }
+
+    async def submit(
+        self,
+        content: str,
+        content_type: ContentType,
+        source_url: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Queue a document for the next batch and wait for its result.
+
+        Args:
+            content: Raw content to analyze
+            content_type: Type of content being processed
+            source_url: Source URL for context
+
+        Returns:
+            (analysis_results, structure_results) as returned by CombinedAnalyzer.analyze
+
+        Raises:
+            ContentProcessingException: If the batch request fails or the response
+                has no valid entry for this document
+        """
+        loop = asyncio.get_running_loop()
+        # Condensed once here so the batch token budget counts what is actually sent
+        content = condense_for_prompt(content)
+        document = _PendingDocument(
+            doc_id=f"doc-{next(self._ids)}",
+            content=content,
+            content_type=content_type,
+            source_url=source_url,
+            future=loop.create_future(),
+            tokens=estimate_tokens(content) + DOCUMENT_OVERHEAD_TOKENS
+        )
+        self._stats["documents"] += 1
+
+        # Close the current batch first if this document would not fit
+        if self._pending and self._pending_tokens + document.tokens > self.token_budget:
+            self._flush()
+
+        self._pending.append(document)
+        self._pending_tokens += document.tokens
+
+        if len(self._pending) >= self.max_batch_docs or self._pending_tokens >= self.token_budget:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await document.future
+
+    def _flush(self) -> None:
+        """Send the pending documents as one request."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        self._pending_tokens = PROMPT_OVERHEAD_TOKENS
+
+        batch = [document for document in batch if not document.future.done()]
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_PendingDocument]) -> None:
+        """Run one request for a batch and resolve each document's future."""
+        self._stats["requests"] += 1
+
+        # A lone document uses the regular single-document prompt
+        if len(batch) == 1:
+            document = batch[0]
+            try:
+                result = await CombinedAnalyzer(self.model).analyze(
+                    document.content, document.content_type, document.source_url
+                )
+            except Exception as e:
+                self._stats["request_failures"] += 1
+                self._set_exception(document, e)
+            else:
+                self._set_result(document, result)
+            return
+
+        self._stats["batched_documents"] += len(batch)
+
+        try:
+            entries = await self._request(batch)
+        except Exception as e:
+            self._stats["request_failures"] += 1
+            logger.warning(f"Micro-batch request for {len(batch)} documents failed: {e}")
+            for document in batch:
+                self._set_exception(document, e)
+            return
+
+        for document in batch:
+            entry = entries.get(document.doc_id)
+            try:
+                if entry is None:
+                    raise ContentProcessingException(
+                        f"Batch response has no result for {document.doc_id}",
+                        processing_stage="batch_demultiplex",
+                        content_length=len(document.content)
+                    )
+                analysis_results, structure_results = split_combined_result(
+                    entry, document.source_url, len(document.content)
+                )
+            except Exception as e:
+                self._stats["document_failures"] += 1
+                self._set_exception(document, e)
+                continue
+
+            analysis_results["metadata"]["batch_size"] = len(batch)
+            structure_results["metadata"]["batch_size"] = len(batch)
+            self._set_result(document, (analysis_results, structure_results))
+
+    async def _request(self, batch: List[_PendingDocument]) -> Dict[str, Any]:
+        """Send a multi-document prompt and index the response entries by ID."""
+        content_length = sum(len(document.content) for document in batch)
+
+        response = await get_ai_client().generate(self.model, self._build_prompt(batch))
+        if not response.text:
+            raise ContentProcessingException(
+                "Empty response from Gemini",
+                processing_stage="batch_analysis",
+                content_length=content_length
+            )
+
+        try:
+            data = json.loads(_strip_code_fence(response.text))
+        except json.JSONDecodeError as e:
+            raise ContentProcessingException(
+                f"Batch analysis returned invalid JSON: {e}",
+                processing_stage="batch_validation",
+                content_length=content_length
+            )
+
+        results = data.get("results") if isinstance(data, dict) else data
+        if not isinstance(results, list):
+            raise ContentProcessingException(
+                "Batch analysis response has no results list",
+                processing_stage="batch_validation",
+                content_length=content_length
+            )
+
+        return {
+            str(entry["id"]): entry
+            for entry in results
+            if isinstance(entry, dict) and entry.get("id") is not None
+        }
+
+    def _build_prompt(self, batch: List[_PendingDocument]) -> str:
+        """Build the multi-document analysis prompt."""
+        documents = "\n\n".join(
+            f"=== DOCUMENT {document.doc_id} ===\n"
+            f"Source URL: {document.source_url}\n"
+            f"Content type: {document.content_type.value}\n"
+            f"Content: {document.content}\n"
+            f"=== END {document.doc_id} ==="
+            for document in batch
+        )
+
+        return f"""
+        Analyze each of the {len(batch)} web documents below independently and return
+        entities, classification and structured data for every document.
+
+        {documents}
+
+        Return one JSON object of the form {{"results": [...]}} with exactly one entry per
+        document. Each entry has an "id" field holding the document ID (for example
+        "{batch[0].doc_id}") plus the fields of this structure:
+        {COMBINED_RESPONSE_SCHEMA}
+
+        Do not mix information between documents. Omit structured_data sections that
+        contain no actual data. Respond only with valid JSON.
+        """
+
+    @staticmethod
+    def _set_result(document: _PendingDocument, result: Any) -> None:
+        if not document.future.done():
+            document.future.set_result(result)
+
+    @staticmethod
+    def _set_exception(document: _PendingDocument, error: BaseException) -> None:
+        if not document.future.done():
+            document.future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        stats = dict(self._stats)
+        stats["pending"] = len(self._pending)
+        stats["documents_per_request"] = (
+            round(stats["documents"] / stats["requests"], 2) if stats["requests"] else 0.0
+        )
+        return stats
+
+
+# Batchers hold loop-bound futures and timers, so keep one per event loop
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AIMicroBatcher]" = weakref.WeakKeyDictionary()
+
+
+def get_micro_batcher(model: genai.GenerativeModel) -> AIMicroBatcher:
+    """
+    Get the micro-batcher for the running event loop.
+
+    Args:
+        model: Configured Gemini GenerativeModel instance
+
+    Returns:
+        AIMicroBatcher configured from settings
+    """
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None or batcher.model is not model:
+        from config.settings import get_settings
+        settings = get_settings()
+        batcher = AIMicroBatcher(
+            model,
+            max_wait_ms=settings.ai_micro_batch_window_ms,
+            max_batch_docs=settings.ai_micro_batch_max_docs,
+            token_budget=settings.ai_micro_batch_token_budget
+        )
+        _batchers[loop] = batcher
+    return batcher
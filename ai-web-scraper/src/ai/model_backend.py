@@ -0,0 +1,118 @@
+"""
+Pluggable model backends for AI calls.
+
+Every AI call path sends its prompts through AIClient, which only relies on
+the GenerativeModel call interface: generate_content() and, optionally,
+generate_content_async(), returning a response with .text and
+.usage_metadata. This module defines that interface as ModelBackend and a
+registry of alternative backends selected with AI_BACKEND. The default
+"gemini" backend keeps the SDK model each caller configures itself; "standin"
+is the offline stand-in in src.ai.standin_model.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Protocol, runtime_checkable
+
+
+GEMINI_BACKEND = "gemini"
+
+
+@runtime_checkable
+class ModelBackend(Protocol):
+    """Call interface shared by the Gemini SDK model and alternative backends."""
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> Any:
+        """Generate a response, blocking the calling thread."""
+        ...
+
+    async def generate_content_async(self, prompt: Any, **kwargs: Any) -> Any:
+        """Generate a response without blocking the event loop."""
+        ...
+
+
+@dataclass
+class UsageMetadata:
+    """Token accounting in the shape the Gemini SDK reports it."""
+    prompt_token_count: int
+    candidates_token_count: int
+    total_token_count: int
+
+
+@dataclass
+class ModelResponse:
+    """Minimal SDK-compatible response for non-Gemini backends."""
+    text: str
+    usage_metadata: UsageMetadata
+
+
+# Backend name -> factory taking the settings object
+BackendFactory = Callable[[Any], ModelBackend]
+
+_factories: Dict[str, BackendFactory] = {}
+_instances: Dict[str, ModelBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def register_model_backend(name: str, factory: BackendFactory) -> None:
+    """
+    Register a model backend.
+
+    Args:
+        name: Value of AI_BACKEND that selects the backend
+        factory: Callable building the backend from the settings object
+    """
+    if name == GEMINI_BACKEND:
+        raise ValueError(f"'{GEMINI_BACKEND}' is reserved for the Gemini SDK")
+    _factories[name] = factory
+
+
+def _create_standin(settings: Any) -> ModelBackend:
+    from src.ai.standin_model import StandInConfig, StandInModel
+    return StandInModel(StandInConfig.from_settings(settings))
+
+
+register_model_backend("standin", _create_standin)
+
+
+def get_model_backend(name: Optional[str] = None) -> Optional[ModelBackend]:
+    """
+    Get the configured alternative model backend.
+
+    Backends are shared per process, so their request accounting and rate
+    limits apply across all callers, as the real API's would.
+
+    Args:
+        name: Backend name (AI_BACKEND if None)
+
+    Returns:
+        The backend instance, or None when the Gemini SDK should be used
+
+    Raises:
+        ValueError: If the backend name is not registered
+    """
+    if name is None:
+        from config.settings import get_settings
+        name = get_settings().ai_backend
+    if name == GEMINI_BACKEND:
+        return None
+
+    backend = _instances.get(name)
+    if backend is None:
+        with _instances_lock:
+            backend = _instances.get(name)
+            if backend is None:
+                factory = _factories.get(name)
+                if factory is None:
+                    available = ", ".join(sorted([GEMINI_BACKEND, *_factories]))
+                    raise ValueError(f"Unknown AI backend '{name}' (available: {available})")
+                from config.settings import get_settings
+                backend = factory(get_settings())
+                _instances[name] = backend
+    return backend
+
+
+def active_backend_name() -> str:
+    """Name of the configured model backend."""
+    from config.settings import get_settings
+    return get_settings().ai_backend
@@ -0,0 +1,531 @@
+"""
+Local page classifier for triaging pages before AI analysis.
+
+This module provides a hashed n-gram PageClassifier (a softmax linear model
+in NumPy) trained offline from the categories Gemini stored in ai_metadata,
+and PageTriage, which uses it to decide per page whether a Gemini call is
+needed: navigation and listing pages are skipped, confidently classified
+pages use the local label, and everything else goes to the model.
+
+Train a model from stored results with:
+
+    python -m src.ai.page_classifier train --output data/models/page_classifier.npz
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import re
+import zlib
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when feature extraction changes; models trained on other versions are rejected
+FEATURE_VERSION = 1
+
+DEFAULT_N_FEATURES = 2 ** 17
+
+# Words per page used for features; the lead of a page carries its category
+MAX_FEATURE_WORDS = 1500
+
+# ai_metadata statuses whose categories did not come from Gemini
+_NON_MODEL_STATUSES = {"failed", "disabled", "skipped", "local", "error"}
+_IGNORED_LABELS = {"", "unknown", "error", "none", "null"}
+
+_WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_SCRIPT_PATTERN = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_LINK_PATTERN = re.compile(r"<a\s[^>]*href", re.IGNORECASE)
+_HTML_PATTERN = re.compile(r"<\s*(?:html|body|div|p|a|span)\b", re.IGNORECASE)
+
+
+@dataclass
+class PageSample:
+    """Inputs the classifier sees for one page."""
+    text: str
+    url: str = ""
+    title: str = ""
+    link_count: Optional[int] = None
+
+    @classmethod
+    def from_content(cls, content: str, url: str = "", title: str = "") -> "PageSample":
+        """Build a sample from raw HTML or text, counting links in HTML."""
+        link_count = None
+        if _HTML_PATTERN.search(content[:2000]):
+            link_count = len(_LINK_PATTERN.findall(content))
+            content = _TAG_PATTERN.sub(" ", _SCRIPT_PATTERN.sub(" ", content))
+        return cls(text=content, url=url, title=title, link_count=link_count)
+
+    @property
+    def word_count(self) -> int:
+        return len(_WORD_PATTERN.findall(self.text[:MAX_FEATURE_WORDS * 12]))
+
+
+def page_tokens(sample: PageSample) -> List[str]:
+    """
+    Feature tokens for a page: word unigrams and bigrams, title words,
+    URL path segments and coarse length / link-density buckets.
+    """
+    words = [word.lower() for word in _WORD_PATTERN.findall(sample.text)[:MAX_FEATURE_WORDS]]
+    tokens = [f"w:{word}" for word in words]
+    tokens.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+    tokens.extend(f"t:{word.lower()}" for word in _WORD_PATTERN.findall(sample.title or ""))
+
+    path = re.sub(r"^[a-z]+://[^/]+", "", (sample.url or "").lower())
+    for segment in re.split(r"[/\-_.?=&]+", path):
+        if segment:
+            tokens.append("u:" + re.sub(r"\d+", "#", segment))
+
+    tokens.append(f"len:{int(math.log2(len(words) + 1))}")
+    if sample.link_count is not None:
+        density = sample.link_count / (len(words) + 1)
+        tokens.append(f"ld:{min(int(density * 20), 20)}")
+    return tokens
+
+
+class HashingVectorizer:
+    """Maps token lists to L2-normalized, log-scaled sparse rows (CSR arrays)."""
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES):
+        self.n_features = n_features
+
+    def transform(self, samples: Sequence[PageSample]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Vectorize a batch of pages.
+
+        Args:
+            samples: Pages to vectorize
+
+        Returns:
+            (indptr, indices, values) of a CSR matrix with one row per page
+        """
+        indptr = np.zeros(len(samples) + 1, dtype=np.int64)
+        all_indices = []
+        all_values = []
+
+        for row, sample in enumerate(samples):
+            tokens = page_tokens(sample)
+            hashes = np.fromiter(
+                (zlib.crc32(token.encode("utf-8")) for token in tokens),
+                dtype=np.uint32,
+                count=len(tokens)
+            ) % self.n_features
+            indices, counts = np.unique(hashes, return_counts=True)
+            values = 1.0 + np.log(counts.astype(np.float32))
+            norm = np.sqrt(np.dot(values, values))
+            if norm > 0:
+                values /= norm
+
+            all_indices.append(indices.astype(np.int64))
+            all_values.append(values.astype(np.float32))
+            indptr[row + 1] = indptr[row] + len(indices)
+
+        if not all_indices:
+            return indptr, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return indptr, np.concatenate(all_indices), np.concatenate(all_values)
+
+
+class PageClassifier:
+    """
+    Multinomial logistic regression over hashed n-gram features.
+    """
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES, classes: Optional[Sequence[str]] = None):
+        """
+        Initialize page classifier.
+
+        Args:
+            n_features: Hashed feature space size
+            classes: Class labels (set by fit() if None)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the page classifier")
+
+        self.vectorizer = HashingVectorizer(n_features)
+        self.classes: List[str] = list(classes or [])
+        self.weights = np.zeros((n_features, len(self.classes)), dtype=np.float32)
+        self.bias = np.zeros(len(self.classes), dtype=np.float32)
+
+    @property
+    def n_features(self) -> int:
+        return self.vectorizer.n_features
+
+    def _scores(self, indptr: "np.ndarray", indices: "np.ndarray", values: "np.ndarray") -> "np.ndarray":
+        n_rows = len(indptr) - 1
+        rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+        contributions = self.weights[indices] * values[:, None]
+        scores = np.empty((n_rows, len(self.classes)), dtype=np.float32)
+        for column in range(len(self.classes)):
+            scores[:, column] = np.bincount(rows, weights=contributions[:, column], minlength=n_rows)
+        return scores + self.bias
+
+    @staticmethod
+    def _softmax(scores: "np.ndarray") -> "np.ndarray":
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(
+        self,
+        samples: Sequence[PageSample],
+        labels: Sequence[str],
+        epochs: int = 10,
+        learning_rate: float = 5.0,
+        l2: float = 1e-6,
+        batch_size: int = 256,
+        seed: int = 0
+    ) -> "PageClassifier":
+        """
+        Train with mini-batch gradient descent on the softmax loss.
+
+        Args:
+            samples: Training pages
+            labels: Category label per page
+            epochs: Passes over the training data
+            learning_rate: Step size
+            l2: L2 regularization strength
+            batch_size: Pages per gradient step
+            seed: Shuffle seed
+
+        Returns:
+            self
+        """
+        if len(samples) != len(labels) or not samples:
+            raise ValueError("fit() needs the same, non-zero number of samples and labels")
+
+        self.classes = sorted(set(labels))
+        class_index = {label: i for i, label in enumerate(self.classes)}
+        targets = np.array([class_index[label] for label in labels], dtype=np.int64)
+        self.weights = np.zeros((self.n_features, len(self.classes)), dtype=np.float32)
+        self.bias = np.zeros(len(self.classes), dtype=np.float32)
+
+        indptr, indices, values = self.vectorizer.transform(samples)
+        rng = np.random.default_rng(seed)
+
+        for epoch in range(epochs):
+            order = rng.permutation(len(samples))
+            step = learning_rate / math.sqrt(epoch + 1)
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                b_indptr, b_indices, b_values = _take_rows(indptr, indices, values, batch)
+
+                probs = self._softmax(self._scores(b_indptr, b_indices, b_values))
+                probs[np.arange(len(batch)), targets[batch]] -= 1.0
+                probs /= len(batch)
+
+                rows = np.repeat(np.arange(len(batch)), np.diff(b_indptr))
+                if l2:
+                    touched = np.unique(b_indices)
+                    self.weights[touched] *= (1.0 - step * l2)
+                np.add.at(self.weights, b_indices, -step * b_values[:, None] * probs[rows])
+                self.bias -= step * probs.sum(axis=0)
+
+        return self
+
+    def predict_proba(self, samples: Sequence[PageSample]) -> "np.ndarray":
+        """
+        Class probabilities for a batch of pages.
+
+        Args:
+            samples: Pages to classify
+
+        Returns:
+            Array of shape (len(samples), len(classes))
+        """
+        if not self.classes:
+            raise ValueError("Classifier has not been trained")
+        return self._softmax(self._scores(*self.vectorizer.transform(samples)))
+
+    def predict(self, samples: Sequence[PageSample]) -> List[Tuple[str, float]]:
+        """Most likely label and its probability for each page."""
+        probs = self.predict_proba(samples)
+        best = probs.argmax(axis=1)
+        return [(self.classes[i], float(probs[row, i])) for row, i in enumerate(best)]
+
+    def save(self, path: str) -> None:
+        """Save the model to a compressed .npz file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            classes=np.array(self.classes),
+            n_features=np.array(self.n_features),
+            feature_version=np.array(FEATURE_VERSION)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PageClassifier":
+        """Load a model saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["feature_version"]) != FEATURE_VERSION:
+                raise ValueError(
+                    f"Model feature version {int(data['feature_version'])} does not match {FEATURE_VERSION}; retrain it"
+                )
+            classifier = cls(int(data["n_features"]), [str(label) for label in data["classes"]])
+            classifier.weights = data["weights"].astype(np.float32)
+            classifier.bias = data["bias"].astype(np.float32)
+        return classifier
+
+
+def _take_rows(indptr, indices, values, rows):
+    """Select rows of a CSR matrix."""
+    starts = indptr[rows]
+    ends = indptr[rows + 1]
+    lengths = ends - starts
+    new_indptr = np.concatenate(([0], np.cumsum(lengths)))
+    positions = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)]) if len(rows) else np.zeros(0, dtype=np.int64)
+    return new_indptr, indices[positions], values[positions]
+
+
+class TriageAction(str, Enum):
+    """What to do with a page before AI analysis."""
+    SKIP = "skip"    # No AI call; page is navigation or a listing
+    LOCAL = "local"  # No AI call; use the local label
+    AI = "ai"        # Send to Gemini
+
+
+@dataclass
+class TriageDecision:
+    """Triage outcome for one page."""
+    action: TriageAction
+    label: Optional[str]
+    confidence: float
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["action"] = self.action.value
+        return data
+
+
+class PageTriage:
+    """
+    Decides per page whether Gemini is needed, using the local classifier.
+    """
+
+    # Pages with little text and at least this many links per word are navigation
+    NAVIGATION_LINK_DENSITY = 0.25
+    NAVIGATION_MAX_WORDS = 150
+
+    def __init__(
+        self,
+        classifier: PageClassifier,
+        skip_labels: Iterable[str] = ("navigation", "listing"),
+        skip_threshold: float = 0.9,
+        local_threshold: float = 0.95
+    ):
+        """
+        Initialize triage.
+
+        Args:
+            classifier: Trained page classifier
+            skip_labels: Labels whose pages never need AI analysis
+            skip_threshold: Confidence needed to skip a page with a skip label
+            local_threshold: Confidence needed to use the local label instead of AI
+        """
+        self.classifier = classifier
+        self.skip_labels = set(skip_labels)
+        self.skip_threshold = skip_threshold
+        self.local_threshold = local_threshold
+
+    def decide_batch(self, samples: Sequence[PageSample]) -> List[TriageDecision]:
+        """
+        Triage a batch of pages with one vectorized classifier pass.
+
+        Args:
+            samples: Pages to triage
+
+        Returns:
+            One TriageDecision per page
+        """
+        if not samples:
+            return []
+
+        decisions = []
+        for sample, (label, confidence) in zip(samples, self.classifier.predict(samples)):
+            words = sample.word_count
+            if (sample.link_count is not None and words <= self.NAVIGATION_MAX_WORDS
+                    and sample.link_count >= self.NAVIGATION_LINK_DENSITY * max(words, 1)):
+                decisions.append(TriageDecision(TriageAction.SKIP, "navigation", 1.0, "link_density"))
+            elif label in self.skip_labels and confidence >= self.skip_threshold:
+                decisions.append(TriageDecision(TriageAction.SKIP, label, confidence, "classifier"))
+            elif confidence >= self.local_threshold:
+                decisions.append(TriageDecision(TriageAction.LOCAL, label, confidence, "classifier"))
+            else:
+                decisions.append(TriageDecision(TriageAction.AI, label, confidence, "low_confidence"))
+        return decisions
+
+    def decide(self, sample: PageSample) -> TriageDecision:
+        """Triage a single page."""
+        return self.decide_batch([sample])[0]
+
+
+def label_from_ai_metadata(ai_metadata: Any) -> Optional[str]:
+    """
+    Category Gemini assigned to a page, or None if the record has no model label.
+
+    Args:
+        ai_metadata: Stored ai_metadata of a scraped record
+
+    Returns:
+        Normalized category label
+    """
+    if not isinstance(ai_metadata, dict):
+        return None
+    if ai_metadata.get("processing_status") in _NON_MODEL_STATUSES or ai_metadata.get("error"):
+        return None
+
+    classification = ai_metadata.get("classification")
+    candidates = [
+        ai_metadata.get("content_category"),
+        classification.get("primary_category") if isinstance(classification, dict) else None,
+        ai_metadata.get("primary_category")
+    ]
+    for candidate in candidates:
+        if isinstance(candidate, str) and candidate.strip().lower() not in _IGNORED_LABELS:
+            return candidate.strip().lower()
+    return None
+
+
+def sample_from_record(url: str, content: Dict[str, Any], raw_html: Optional[str] = None) -> PageSample:
+    """Build a classifier sample from a stored record's content."""
+    content = content or {}
+    text = content.get("text") or ""
+    if not text and raw_html:
+        return PageSample.from_content(raw_html, url, content.get("title", ""))
+
+    links = content.get("links")
+    link_count = len(links) if isinstance(links, list) else content.get("links_count")
+    return PageSample(text=text, url=url, title=content.get("title") or "", link_count=link_count)
+
+
+async def load_training_data(limit: int = 50000, page_size: int = 500) -> Tuple[List[PageSample], List[str]]:
+    """
+    Load labeled samples from AI-processed records in the database.
+
+    Args:
+        limit: Maximum records to read
+        page_size: Records per query
+
+    Returns:
+        (samples, labels)
+    """
+    from src.pipeline.repository import DataRepository
+
+    repository = DataRepository()
+    samples: List[PageSample] = []
+    labels: List[str] = []
+    offset = 0
+    while offset < limit:
+        records, _ = await repository.get_scraped_data(
+            ai_processed_only=True, limit=min(page_size, limit - offset), offset=offset
+        )
+        if not records:
+            break
+        for record in records:
+            label = label_from_ai_metadata(record.ai_metadata)
+            if label:
+                samples.append(sample_from_record(record.url, record.content, record.raw_html))
+                labels.append(label)
+        offset += len(records)
+    return samples, labels
+
+
+# Global triage instance
+_page_triage: Optional[PageTriage] = None
+_page_triage_loaded = False
+
+
+def get_page_triage() -> Optional[PageTriage]:
+    """Get the configured page triage, or None when disabled or no model is available."""
+    global _page_triage, _page_triage_loaded
+    if _page_triage_loaded:
+        return _page_triage
+
+    from config.settings import get_settings
+    settings = get_settings()
+    _page_triage_loaded = True
+    if not settings.ai_triage_enabled:
+        return None
+    if not NUMPY_AVAILABLE:
+        logger.warning("numpy not installed; page triage disabled")
+        return None
+
+    try:
+        classifier = PageClassifier.load(settings.ai_triage_model_path)
+    except Exception as e:
+        logger.warning(f"Page triage disabled, could not load {settings.ai_triage_model_path}: {e}")
+        return None
+
+    _page_triage = PageTriage(
+        classifier,
+        skip_threshold=settings.ai_triage_skip_threshold,
+        local_threshold=settings.ai_triage_local_threshold
+    )
+    logger.info(f"Page triage enabled with classes: {', '.join(classifier.classes)}")
+    return _page_triage
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Train a page classifier from stored AI results."""
+    parser = argparse.ArgumentParser(description="Train the local page classifier from stored ai_metadata labels")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="train and save a model")
+    train.add_argument("--output", default="data/models/page_classifier.npz")
+    train.add_argument("--limit", type=int, default=50000, help="maximum records to read")
+    train.add_argument("--min-class-count", type=int, default=20, help="drop rarer labels")
+    train.add_argument("--epochs", type=int, default=10)
+    train.add_argument("--learning-rate", type=float, default=5.0)
+    train.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES)
+    train.add_argument("--holdout", type=float, default=0.1, help="fraction held out for evaluation")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    samples, labels = asyncio.run(load_training_data(args.limit))
+    counts: Dict[str, int] = {}
+    for label in labels:
+        counts[label] = counts.get(label, 0) + 1
+    kept = [i for i, label in enumerate(labels) if counts[label] >= args.min_class_count]
+    samples = [samples[i] for i in kept]
+    labels = [labels[i] for i in kept]
+    if len(set(labels)) < 2:
+        logger.error(f"Need at least two labels with {args.min_class_count}+ records; found {counts}")
+        return 1
+
+    order = np.random.default_rng(0).permutation(len(samples))
+    n_holdout = int(len(samples) * args.holdout)
+    test, training = order[:n_holdout], order[n_holdout:]
+
+    classifier = PageClassifier(args.n_features).fit(
+        [samples[i] for i in training], [labels[i] for i in training],
+        epochs=args.epochs, learning_rate=args.learning_rate
+    )
+    if n_holdout:
+        predictions = classifier.predict([samples[i] for i in test])
+        accuracy = sum(predicted == labels[i] for (predicted, _), i in zip(predictions, test)) / n_holdout
+        logger.info(f"Holdout accuracy: {accuracy:.3f} on {n_holdout} records")
+
+    classifier.save(args.output)
+    logger.info(f"Saved {len(classifier.classes)}-class model trained on {len(training)} records to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,554 @@
+"""
+Cluster-wide Gemini quota governor.
+
+This module provides the QuotaGovernor class that meters Gemini requests
+against shared requests-per-minute and tokens-per-minute buckets kept in
+Redis, so every worker and API process draws from the same quota. Callers
+queue by priority (interactive before batch) and deadline instead of bursting
+into 429 responses, and a 429 pauses the whole cluster briefly rather than
+tripping a long circuit-breaker timeout. Redis round trips made from async
+callers run in a worker thread, and after a Redis failure the governor uses
+its local buckets for a backoff period instead of retrying on every call.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from src.utils.exceptions import AIQuotaExceededException
+
+
+logger = logging.getLogger(__name__)
+
+# Output tokens reserved per request until the response reports actual usage
+EXPECTED_OUTPUT_TOKENS = 800
+
+# Cluster-wide pause after a 429 without a usable retry hint
+DEFAULT_RATE_LIMIT_PAUSE = 5.0
+
+# Longest single sleep, so waiters notice quota freed by other processes
+MAX_POLL_INTERVAL = 1.0
+
+# Sleep while another local waiter is at the head of the queue
+QUEUE_POLL_INTERVAL = 0.05
+
+# Local-only period after a Redis failure, doubled while failures continue
+REDIS_BACKOFF_INITIAL = 5.0
+REDIS_BACKOFF_MAX = 60.0
+
+
+class AIPriority(str, Enum):
+    """Priority classes for AI requests."""
+    INTERACTIVE = "interactive"  # API requests with a user waiting
+    BATCH = "batch"              # Worker and pipeline jobs
+
+
+_PRIORITY_RANK = {AIPriority.INTERACTIVE: 0, AIPriority.BATCH: 1}
+
+_current_priority: ContextVar[AIPriority] = ContextVar("ai_priority", default=AIPriority.BATCH)
+
+
+@contextmanager
+def ai_priority(priority: AIPriority) -> Iterator[None]:
+    """
+    Run AI calls made inside the block with the given priority.
+
+    Args:
+        priority: Priority class for requests made in this context
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> AIPriority:
+    """Get the priority of AI calls made in the current context."""
+    return _current_priority.get()
+
+
+# Refill both buckets, then take one request and `cost` tokens if enough is
+# left above the caller's reserve. Returns {granted, wait_ms}.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local pause = redis.call('PTTL', KEYS[3])
+if pause > 0 then
+    return {0, pause}
+end
+
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local ttl = tonumber(ARGV[5])
+
+local function refill(key, capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, level + math.max(now - ts, 0) * capacity / 60000)
+end
+
+local requests = refill(KEYS[1], rpm)
+local tokens = refill(KEYS[2], tpm)
+local need_requests = 1 + reserve * rpm
+local need_tokens = math.min(cost, tpm) + reserve * tpm
+
+local granted = 0
+local wait = 0
+if requests >= need_requests and tokens >= need_tokens then
+    requests = requests - 1
+    tokens = tokens - cost
+    granted = 1
+else
+    wait = math.max((need_requests - requests) * 60000 / rpm, (need_tokens - tokens) * 60000 / tpm)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(requests), 'ts', tostring(now))
+redis.call('HSET', KEYS[2], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ttl)
+redis.call('PEXPIRE', KEYS[2], ttl)
+return {granted, math.ceil(wait)}
+"""
+
+# Charge (or refund) tokens after the response reports actual usage
+_ADJUST_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tpm = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local level = tonumber(state[1]) or tpm
+local ts = tonumber(state[2]) or now
+level = math.min(tpm, level + math.max(now - ts, 0) * tpm / 60000) - tonumber(ARGV[2])
+redis.call('HSET', KEYS[1], 'tokens', tostring(level), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+class _LocalBuckets:
+    """In-process RPM/TPM buckets, used without Redis or when it is unreachable."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated, 0.0)
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+        self._updated = now
+
+    def try_acquire(self, cost: int, reserve: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            self._refill(now)
+            need_requests = 1 + reserve * self.rpm
+            need_tokens = min(cost, self.tpm) + reserve * self.tpm
+            if self._requests >= need_requests and self._tokens >= need_tokens:
+                self._requests -= 1
+                self._tokens -= cost
+                return 0.0
+
+            return max(
+                (need_requests - self._requests) * 60.0 / self.rpm,
+                (need_tokens - self._tokens) * 60.0 / self.tpm
+            )
+
+    def adjust(self, delta: int) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= delta
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class _RedisBuckets:
+    """RPM/TPM buckets shared by every process through Redis."""
+
+    KEY_TTL_MS = 120000
+
+    def __init__(self, redis_url: str, name: str, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._client = redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+        self._keys = [f"ai_quota:{name}:rpm", f"ai_quota:{name}:tpm", f"ai_quota:{name}:pause"]
+        self._acquire = self._client.register_script(_ACQUIRE_SCRIPT)
+        self._adjust = self._client.register_script(_ADJUST_SCRIPT)
+
+    def try_acquire(self, cost: int, reserve: float) -> float:
+        granted, wait_ms = self._acquire(
+            keys=self._keys,
+            args=[self.rpm, self.tpm, cost, reserve, self.KEY_TTL_MS]
+        )
+        return 0.0 if int(granted) else max(int(wait_ms), 1) / 1000.0
+
+    def adjust(self, delta: int) -> None:
+        self._adjust(keys=[self._keys[1]], args=[self.tpm, delta, self.KEY_TTL_MS])
+
+    def pause(self, seconds: float) -> None:
+        # Never shorten a pause another process already set
+        remaining = self._client.pttl(self._keys[2])
+        pause_ms = int(seconds * 1000)
+        if remaining is None or remaining < pause_ms:
+            self._client.set(self._keys[2], 1, px=pause_ms)
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    deadline: float
+    seq: int
+    priority: AIPriority = field(compare=False)
+    cost: int = field(compare=False)
+
+
+class QuotaGovernor:
+    """
+    Meters AI requests against shared request and token rates.
+
+    Within a process, waiters form one queue ordered by priority and then
+    deadline; only the head of the queue draws from the shared buckets.
+    Across processes, batch requests leave a reserve of the quota untouched
+    so interactive requests are served first.
+    """
+
+    def __init__(
+        self,
+        name: str = "gemini",
+        requests_per_minute: int = 60,
+        tokens_per_minute: int = 1000000,
+        interactive_reserve: float = 0.2,
+        backend: str = "redis",
+        redis_url: Optional[str] = None,
+        interactive_timeout: float = 15.0,
+        batch_timeout: float = 90.0
+    ):
+        """
+        Initialize quota governor.
+
+        Args:
+            name: Quota name; processes sharing a name share the quota
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Estimated token rate limit (input plus output)
+            interactive_reserve: Fraction of each bucket batch requests may not use
+            backend: "redis" for a cluster-wide quota, "local" for this process only
+            redis_url: Redis URL for the redis backend
+            interactive_timeout: Default queueing deadline for interactive requests
+            batch_timeout: Default queueing deadline for batch requests
+        """
+        self.name = name
+        self.requests_per_minute = max(requests_per_minute, 1)
+        self.tokens_per_minute = max(tokens_per_minute, 1)
+        self.interactive_reserve = min(max(interactive_reserve, 0.0), 0.9)
+        self.timeouts = {
+            AIPriority.INTERACTIVE: interactive_timeout,
+            AIPriority.BATCH: batch_timeout
+        }
+
+        self._local = _LocalBuckets(self.requests_per_minute, self.tokens_per_minute)
+        self._shared: Optional[_RedisBuckets] = None
+        if backend == "redis":
+            if not REDIS_AVAILABLE:
+                logger.warning("redis package not installed; AI quota is enforced per process")
+            else:
+                try:
+                    self._shared = _RedisBuckets(
+                        redis_url, name, self.requests_per_minute, self.tokens_per_minute
+                    )
+                except Exception as e:
+                    logger.warning(f"Redis unavailable for AI quota, enforcing per process: {e}")
+
+        self._redis_backoff = 0.0
+        self._redis_retry_at = 0.0
+
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "granted": 0,
+            "timeouts": 0,
+            "rate_limited": 0,
+            "redis_errors": 0,
+            "total_wait_seconds": 0.0,
+            "estimated_tokens": 0,
+            "actual_tokens": 0
+        }
+
+    async def acquire(
+        self,
+        tokens: int,
+        priority: Optional[AIPriority] = None,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        Wait until the quota allows one request of the given size.
+
+        Args:
+            tokens: Estimated tokens for the request (input plus expected output)
+            priority: Priority class (context priority if None)
+            timeout: Longest time to queue (priority default if None)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            AIQuotaExceededException: If no quota was granted before the deadline
+        """
+        waiter = self._enqueue(tokens, priority, timeout)
+        start = time.monotonic()
+        try:
+            while True:
+                delay = self._queue_delay(waiter, start)
+                if delay is None:
+                    wait = await self._buckets_call_async("try_acquire", waiter.cost, self._reserve(waiter))
+                    delay = self._grant_or_delay(waiter, start, wait)
+                    if delay is None:
+                        return time.monotonic() - start
+                await asyncio.sleep(delay)
+        finally:
+            self._dequeue(waiter)
+
+    def acquire_sync(
+        self,
+        tokens: int,
+        priority: Optional[AIPriority] = None,
+        timeout: Optional[float] = None
+    ) -> float:
+        """Blocking variant of acquire() for synchronous callers."""
+        waiter = self._enqueue(tokens, priority, timeout)
+        start = time.monotonic()
+        try:
+            while True:
+                delay = self._attempt(waiter, start)
+                if delay is None:
+                    return time.monotonic() - start
+                time.sleep(delay)
+        finally:
+            self._dequeue(waiter)
+
+    def _enqueue(self, tokens: int, priority: Optional[AIPriority], timeout: Optional[float]) -> _Waiter:
+        priority = priority or current_priority()
+        if timeout is None:
+            timeout = self.timeouts[priority]
+        waiter = _Waiter(
+            rank=_PRIORITY_RANK[priority],
+            deadline=time.monotonic() + timeout,
+            seq=next(self._seq),
+            priority=priority,
+            cost=max(int(tokens), 1)
+        )
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            except ValueError:
+                pass
+
+    def _attempt(self, waiter: _Waiter, start: float) -> Optional[float]:
+        """Try to take quota; None when granted, otherwise seconds to sleep."""
+        delay = self._queue_delay(waiter, start)
+        if delay is not None:
+            return delay
+        wait = self._buckets_call("try_acquire", waiter.cost, self._reserve(waiter))
+        return self._grant_or_delay(waiter, start, wait)
+
+    def _queue_delay(self, waiter: _Waiter, start: float) -> Optional[float]:
+        """None when the waiter is at the head of the queue, otherwise seconds to sleep."""
+        now = time.monotonic()
+        if now >= waiter.deadline:
+            self._stats["timeouts"] += 1
+            raise AIQuotaExceededException(
+                f"No AI quota within {waiter.deadline - start:.1f}s ({waiter.priority.value} priority)",
+                priority=waiter.priority.value,
+                waited_seconds=now - start
+            )
+
+        with self._lock:
+            at_head = self._waiters[0] is waiter
+
+        if not at_head:
+            return min(QUEUE_POLL_INTERVAL, waiter.deadline - now)
+        return None
+
+    def _reserve(self, waiter: _Waiter) -> float:
+        return self.interactive_reserve if waiter.priority == AIPriority.BATCH else 0.0
+
+    def _grant_or_delay(self, waiter: _Waiter, start: float, wait: float) -> Optional[float]:
+        """Record a grant (None), or turn a refusal into the next sleep."""
+        now = time.monotonic()
+        if not wait:
+            self._stats["granted"] += 1
+            self._stats["total_wait_seconds"] += now - start
+            return None
+
+        # Jitter spreads out processes that were refused at the same moment
+        wait *= 1.0 + random.uniform(0.0, 0.1)
+        return min(wait, MAX_POLL_INTERVAL, max(waiter.deadline - now, 0.0))
+
+    def _use_shared(self) -> bool:
+        return self._shared is not None and time.monotonic() >= self._redis_retry_at
+
+    def _buckets_call(self, method: str, *args: Any) -> Any:
+        if self._use_shared():
+            try:
+                result = getattr(self._shared, method)(*args)
+            except Exception as e:
+                self._redis_failed(e)
+            else:
+                self._redis_backoff = 0.0
+                return result
+        return getattr(self._local, method)(*args)
+
+    async def _buckets_call_async(self, method: str, *args: Any) -> Any:
+        """_buckets_call for coroutines; the blocking Redis round trip runs in a thread."""
+        if self._use_shared():
+            return await asyncio.to_thread(self._buckets_call, method, *args)
+        return getattr(self._local, method)(*args)
+
+    def _redis_failed(self, error: Exception) -> None:
+        """Use the local buckets for a while instead of waiting on Redis every call."""
+        self._stats["redis_errors"] += 1
+        self._redis_backoff = min(max(self._redis_backoff * 2, REDIS_BACKOFF_INITIAL), REDIS_BACKOFF_MAX)
+        self._redis_retry_at = time.monotonic() + self._redis_backoff
+        logger.warning(
+            f"AI quota Redis call failed, using local quota for {self._redis_backoff:.0f}s: {error}"
+        )
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """
+        Reconcile the token bucket with the usage the API reported.
+
+        Args:
+            estimated_tokens: Tokens charged when the quota was acquired
+            actual_tokens: Total tokens reported by the response, if any
+        """
+        delta = self._usage_delta(estimated_tokens, actual_tokens)
+        if delta:
+            self._buckets_call("adjust", delta)
+
+    async def record_usage_async(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Variant of record_usage() that does not block the event loop."""
+        delta = self._usage_delta(estimated_tokens, actual_tokens)
+        if delta:
+            await self._buckets_call_async("adjust", delta)
+
+    def _usage_delta(self, estimated_tokens: int, actual_tokens: Optional[int]) -> int:
+        self._stats["estimated_tokens"] += estimated_tokens
+        if actual_tokens is None:
+            return 0
+        self._stats["actual_tokens"] += actual_tokens
+        return actual_tokens - estimated_tokens
+
+    def report_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """
+        Pause all processes after the API answered 429.
+
+        Args:
+            retry_after: Server-suggested delay in seconds, if known
+        """
+        self._buckets_call("pause", self._rate_limit_pause(retry_after))
+
+    async def report_rate_limited_async(self, retry_after: Optional[float] = None) -> None:
+        """Variant of report_rate_limited() that does not block the event loop."""
+        await self._buckets_call_async("pause", self._rate_limit_pause(retry_after))
+
+    def _rate_limit_pause(self, retry_after: Optional[float]) -> float:
+        self._stats["rate_limited"] += 1
+        pause = retry_after if retry_after and retry_after > 0 else DEFAULT_RATE_LIMIT_PAUSE
+        logger.warning(f"Gemini rate limit hit; pausing AI requests for {pause:.1f}s")
+        return pause
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get governor statistics."""
+        stats = dict(self._stats)
+        stats.update({
+            "backend": "redis" if self._shared is not None else "local",
+            "redis_backoff_seconds": max(self._redis_retry_at - time.monotonic(), 0.0),
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "queued": len(self._waiters)
+        })
+        return stats
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an SDK exception is a 429 / quota exhaustion response."""
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    return getattr(error, "code", None) == 429 or "429" in str(error)
+
+
+def retry_after_from(error: BaseException) -> Optional[float]:
+    """Extract a retry delay from a rate limit error message, if present."""
+    match = re.search(r"retry[ _-]?(?:after|delay)\D{0,20}(\d+(?:\.\d+)?)", str(error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def response_token_count(response: Any) -> Optional[int]:
+    """Total tokens reported by an SDK response, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    return int(total) if total else None
+
+
+# Global governor instance
+_quota_governor: Optional[QuotaGovernor] = None
+_quota_governor_lock = threading.Lock()
+
+
+def get_quota_governor() -> Optional[QuotaGovernor]:
+    """Get the global quota governor, or None when quota governing is disabled."""
+    global _quota_governor
+    if _quota_governor is None:
+        from config.settings import get_settings
+        settings = get_settings()
+        if not settings.ai_quota_enabled:
+            return None
+        with _quota_governor_lock:
+            if _quota_governor is None:
+                _quota_governor = QuotaGovernor(
+                    requests_per_minute=settings.ai_quota_rpm,
+                    tokens_per_minute=settings.ai_quota_tpm,
+                    interactive_reserve=settings.ai_quota_interactive_reserve,
+                    backend=settings.ai_quota_backend,
+                    redis_url=settings.redis_url,
+                    interactive_timeout=settings.ai_quota_interactive_timeout,
+                    batch_timeout=settings.ai_quota_batch_timeout
+                )
+    return _quota_governor
@@ -0,0 +1,455 @@
+"""
+Content-addressed cache for AI analysis results.
+
+This module provides the AIResultCache class that stores Gemini results keyed
+by a hash of the normalized content plus the prompt version and model name,
+so byte-identical (or whitespace-identical) pages re-scraped across jobs do
+not pay for another model call. Results live in an in-process LRU backed by a
+persistent tier (SQLite or Redis) and expire after a TTL.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.ai.model_backend import GEMINI_BACKEND, active_backend_name
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+REDIS_KEY_PREFIX = "ai_cache:"
+
+
+def normalize_content(content: str) -> str:
+    """Normalize content so formatting-only differences hash identically."""
+    if not content:
+        return ""
+    content = unicodedata.normalize("NFC", content)
+    return " ".join(content.split())
+
+
+def make_cache_key(
+    namespace: str,
+    content: str,
+    prompt_version: str,
+    model_name: str,
+    variant: str = ""
+) -> str:
+    """
+    Build the cache key for an AI result.
+
+    Args:
+        namespace: Calling operation (e.g. "text_analysis")
+        content: Content sent to the model
+        prompt_version: Version of the prompt template; bump when the prompt changes
+        model_name: Model identifier
+        variant: Any other input that changes the result (analysis type, content type)
+
+    Returns:
+        Namespaced hex digest identifying the result
+    """
+    # Results of an offline stand-in backend must never be served for the real model
+    backend = active_backend_name()
+    if backend != GEMINI_BACKEND:
+        model_name = f"{backend}/{model_name}"
+
+    digest = hashlib.sha256()
+    for part in (namespace, model_name, prompt_version, variant):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    digest.update(normalize_content(content).encode("utf-8"))
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+class _SQLiteTier:
+    """Persistent tier stored in a local SQLite database."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_expires ON results(expires_at)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] <= time.time():
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, time.time(), expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _RedisTier:
+    """Persistent tier shared across workers through Redis."""
+
+    def __init__(self, redis_url: str):
+        self._client = redis.from_url(redis_url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        pipe = self._client.pipeline()
+        pipe.get(REDIS_KEY_PREFIX + key)
+        pipe.ttl(REDIS_KEY_PREFIX + key)
+        value, ttl = pipe.execute()
+        if value is None:
+            return None
+        return value, time.time() + max(ttl, 0)
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        ttl = max(int(expires_at - time.time()), 1)
+        self._client.set(REDIS_KEY_PREFIX + key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(REDIS_KEY_PREFIX + key)
+
+    def purge_expired(self) -> int:
+        # Redis expires keys itself
+        return 0
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=REDIS_KEY_PREFIX + "*", count=500):
+            self._client.delete(key)
+
+    def count(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=REDIS_KEY_PREFIX + "*", count=500))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AIResultCache:
+    """
+    Two-tier cache for AI results keyed by normalized-content hash.
+
+    Lookups check the in-process LRU first and fall back to the persistent
+    tier, promoting hits into memory. Concurrent async callers asking for the
+    same key share a single computation.
+    """
+
+    def __init__(
+        self,
+        backend: str = "sqlite",
+        path: str = "data/cache/ai_results.db",
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_memory_entries: int = 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Persistent tier: "memory" (none), "sqlite" or "redis"
+            path: SQLite database path for the sqlite backend
+            redis_url: Redis URL for the redis backend
+            ttl_seconds: Default time to live for stored results
+            max_memory_entries: Capacity of the in-process LRU
+        """
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown AI cache backend: {backend}")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+        self._persistent = None
+        if backend == "sqlite":
+            self._persistent = _SQLiteTier(path)
+        elif backend == "redis":
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis package is required for the redis AI cache backend")
+            self._persistent = _RedisTier(redis_url)
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key from make_cache_key()
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        now = time.time()
+        value = None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    value = entry[0]
+                else:
+                    del self._memory[key]
+
+        if value is not None:
+            self._record("memory_hits")
+            return copy.deepcopy(value)
+
+        if self._persistent is not None:
+            try:
+                stored = self._persistent.get(key)
+            except Exception as e:
+                logger.warning(f"AI cache lookup failed: {e}")
+                self._record("errors")
+                stored = None
+
+            if stored is not None:
+                raw_value, expires_at = stored
+                value = json.loads(raw_value)
+                self._remember(key, value, expires_at)
+                self._record("persistent_hits")
+                return copy.deepcopy(value)
+
+        self._record("misses")
+        return None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Key from make_cache_key()
+            value: JSON-serializable result
+            ttl_seconds: Time to live (cache default if None)
+        """
+        expires_at = time.time() + (ttl_seconds or self.ttl_seconds)
+        # Round-trip through JSON so memory hits look exactly like persistent hits
+        raw_value = json.dumps(value, default=str)
+        self._remember(key, json.loads(raw_value), expires_at)
+
+        if self._persistent is not None:
+            try:
+                self._persistent.set(key, raw_value, expires_at)
+            except Exception as e:
+                logger.warning(f"AI cache store failed: {e}")
+                self._record("errors")
+        self._record("stores")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Async lookup that keeps persistent-tier I/O off the event loop."""
+        with self._lock:
+            entry = self._memory.get(key)
+            in_memory = entry is not None and entry[1] > time.time()
+        if in_memory or self._persistent is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """Async store that keeps persistent-tier I/O off the event loop."""
+        if self._persistent is None:
+            self.set(key, value, ttl_seconds)
+        else:
+            await asyncio.to_thread(self.set, key, value, ttl_seconds)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda result: True,
+        ttl_seconds: Optional[int] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Return the cached result or compute and store it.
+
+        Args:
+            key: Key from make_cache_key()
+            compute: Coroutine factory producing the result on a miss
+            should_cache: Predicate deciding whether a computed result is stored
+            ttl_seconds: Time to live (cache default if None)
+
+        Returns:
+            (result, cache_hit) tuple
+        """
+        cached = await self.aget(key)
+        if cached is not None:
+            return cached, True
+
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending)), True
+
+        future = loop.create_future()
+        self._inflight[inflight_key] = future
+        try:
+            result = await compute()
+            if should_cache(result):
+                await self.aset(key, result, ttl_seconds)
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be waiting on the shared future; avoid "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    def invalidate(self, key: str) -> None:
+        """Remove a result from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._persistent is not None:
+            self._persistent.delete(key)
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._memory.clear()
+        if self._persistent is not None:
+            self._persistent.clear()
+
+    def purge_expired(self) -> int:
+        """Drop expired results and return how many persistent entries were removed."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expires_at) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+        return self._persistent.purge_expired() if self._persistent is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["backend"] = self.backend
+        if self._persistent is not None:
+            try:
+                stats["persistent_entries"] = self._persistent.count()
+            except Exception:
+                stats["persistent_entries"] = None
+        return stats
+
+    def close(self) -> None:
+        if self._persistent is not None:
+            self._persistent.close()
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _record(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+        if stat in ("memory_hits", "persistent_hits", "misses"):
+            try:
+                from src.utils.metrics import get_metrics_collector
+                get_metrics_collector().increment_counter("ai_cache_misses" if stat == "misses" else "ai_cache_hits")
+            except Exception:
+                pass
+
+
+# Global AI result cache instance
+_ai_result_cache: Optional[AIResultCache] = None
+_ai_result_cache_lock = threading.Lock()
+
+
+def get_ai_result_cache() -> Optional[AIResultCache]:
+    """
+    Get the global AI result cache, or None when caching is disabled.
+
+    Configured from Settings.ai_cache_* (AI_CACHE_* environment variables).
+    """
+    global _ai_result_cache
+    if _ai_result_cache is None:
+        with _ai_result_cache_lock:
+            if _ai_result_cache is None:
+                from config.settings import get_settings
+                settings = get_settings()
+                if not settings.ai_cache_enabled:
+                    return None
+                try:
+                    _ai_result_cache = AIResultCache(
+                        backend=settings.ai_cache_backend,
+                        path=settings.ai_cache_path,
+                        redis_url=settings.redis_url,
+                        ttl_seconds=settings.ai_cache_ttl_seconds,
+                        max_memory_entries=settings.ai_cache_memory_entries
+                    )
+                except Exception as e:
+                    logger.warning(f"AI result cache unavailable, falling back to memory only: {e}")
+                    _ai_result_cache = AIResultCache(
+                        backend="memory",
+                        ttl_seconds=settings.ai_cache_ttl_seconds,
+                        max_memory_entries=settings.ai_cache_memory_entries
+                    )
+    return _ai_result_cache
@@ -0,0 +1,357 @@
+"""
+Offline stand-in for the Gemini API.
+
+This module provides StandInModel, a model backend with the GenerativeModel
+call interface that answers locally. Responses are valid JSON filled in from
+the JSON template each prompt already contains (one entry per document for
+multi-document prompts), latency follows a configurable distribution, a share
+of calls fails with server errors or 429 rate limits, and usage metadata
+reports estimated token counts. Select it with AI_BACKEND=standin to exercise
+batching, caching, quotas and the circuit breaker without a key or network.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.ai.content_condenser import estimate_tokens
+from src.ai.model_backend import ModelResponse, UsageMetadata
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+# Rate limit responses come back quickly, as a fraction of a normal call
+RATE_LIMIT_LATENCY_FACTOR = 0.1
+
+# Text that introduces the response template, e.g. "Return JSON in this format:"
+_TEMPLATE_INTRO = re.compile(r"(?<![\"\w])(?:JSON|structure)[^\n{\[\"]*:\s*(?=[{\[])", re.IGNORECASE)
+_DOCUMENT_PATTERN = re.compile(r"=== DOCUMENT (\S+) ===(.*?)=== END \1 ===", re.DOTALL)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]{2,}")
+_SENTENCE_PATTERN = re.compile(r"[^.!?]{20,}[.!?]")
+
+
+class StandInServerError(Exception):
+    """Simulated 500 response."""
+    code = 500
+
+
+class StandInRateLimitError(Exception):
+    """Simulated 429 response; recognized by the quota governor through its code."""
+    code = 429
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the stand-in model."""
+    latency_ms: float = 800.0
+    latency_distribution: str = "lognormal"
+    # Relative spread: sigma for lognormal, stddev/mean for normal, +/- range for uniform
+    latency_jitter: float = 0.5
+    ms_per_output_token: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # Server-side quota; 0 disables the limit
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    retry_after_seconds: float = 2.0
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.latency_distribution}' "
+                f"(expected one of: {', '.join(LATENCY_DISTRIBUTIONS)})"
+            )
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "StandInConfig":
+        """Build the configuration from the AI_STANDIN_* settings."""
+        return cls(
+            latency_ms=settings.ai_standin_latency_ms,
+            latency_distribution=settings.ai_standin_latency_distribution,
+            latency_jitter=settings.ai_standin_latency_jitter,
+            error_rate=settings.ai_standin_error_rate,
+            rate_limit_rate=settings.ai_standin_rate_limit_rate,
+            requests_per_minute=settings.ai_standin_rpm,
+            tokens_per_minute=settings.ai_standin_tpm,
+            seed=settings.ai_standin_seed
+        )
+
+
+def find_response_template(prompt: str) -> Optional[Any]:
+    """
+    Extract the JSON template a prompt asks the model to follow.
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        Parsed template, or None if the prompt contains none
+    """
+    located = _locate_template(prompt)
+    return located[0] if located else None
+
+
+def _locate_template(prompt: str) -> Optional[Tuple[Any, int, int]]:
+    """The last parseable template in a prompt with its (start, end) offsets."""
+    for match in reversed(list(_TEMPLATE_INTRO.finditer(prompt))):
+        block = _balanced_block(prompt, match.end())
+        if block is None:
+            continue
+        try:
+            return json.loads(block), match.end(), match.end() + len(block)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _balanced_block(text: str, start: int) -> Optional[str]:
+    """The bracketed block starting at text[start], honouring JSON strings."""
+    opening = text[start]
+    closing = "}" if opening == "{" else "]"
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1] if char == closing else None
+    return None
+
+
+class _TemplateFiller:
+    """Fills a JSON template with values drawn from the prompt's content."""
+
+    def __init__(self, content: str, rng: random.Random):
+        text = _TAG_PATTERN.sub(" ", content)
+        self.rng = rng
+        self.words = _WORD_PATTERN.findall(text) or ["content"]
+        self.sentences = [s.strip() for s in _SENTENCE_PATTERN.findall(text)] or [" ".join(self.words[:12])]
+
+    def fill(self, template: Any, key: str = "") -> Any:
+        if isinstance(template, dict):
+            return {name: self.fill(value, name) for name, value in template.items()}
+        if isinstance(template, list):
+            return self._fill_list(template, key)
+        if isinstance(template, bool):
+            return template
+        if isinstance(template, int):
+            if key == "word_count":
+                return len(self.words)
+            return self.rng.randint(1, max(template * 2, 1))
+        if isinstance(template, float):
+            if 0.0 <= template <= 1.0:
+                return round(self.rng.uniform(0.6, 0.98), 2)
+            return round(self.rng.uniform(template * 0.5, template * 1.1), 2)
+        if isinstance(template, str):
+            return self._fill_string(template, key)
+        return template
+
+    def _fill_list(self, template: List[Any], key: str) -> List[Any]:
+        if not template:
+            return []
+        if isinstance(template[0], (dict, list)):
+            return [self.fill(template[0], key) for _ in range(self.rng.randint(1, 3))]
+        return [self.fill(item, key) for item in template]
+
+    def _fill_string(self, template: str, key: str) -> str:
+        options = template.split("|")
+        if len(options) > 1 and " " not in template:
+            return self.rng.choice(options)
+
+        key = key.lower()
+        if key in ("summary", "description", "content", "context", "meta_description"):
+            return self.rng.choice(self.sentences)[:200]
+        if key == "language":
+            return "en"
+        if key in ("url", "src", "action", "href"):
+            return f"https://example.com/{self.rng.choice(self.words).lower()}"
+        if "date" in key:
+            return f"2024-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}"
+        return " ".join(self.rng.choice(self.words) for _ in range(self.rng.randint(1, 3)))
+
+
+class StandInModel:
+    """
+    Local model backend that imitates Gemini's responses, latency and failures.
+
+    Thread-safe: the blocking and async entry points share one random stream,
+    one set of rate windows and one set of statistics.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        """
+        Initialize the stand-in model.
+
+        Args:
+            config: Latency, failure and quota behaviour (defaults if None)
+        """
+        self.config = config or StandInConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[float, int]] = collections.deque()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "requests": 0,
+            "succeeded": 0,
+            "server_errors": 0,
+            "rate_limited": 0,
+            "prompt_tokens": 0,
+            "output_tokens": 0,
+            "total_latency_seconds": 0.0
+        }
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> ModelResponse:
+        """Generate a response, sleeping for the simulated latency."""
+        delay, outcome = self._plan(prompt)
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def generate_content_async(self, prompt: Any, **kwargs: Any) -> ModelResponse:
+        """Generate a response, awaiting the simulated latency."""
+        delay, outcome = self._plan(prompt)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def _plan(self, prompt: Any) -> Tuple[float, Any]:
+        """Decide the latency and the response or error for one call."""
+        prompt = prompt if isinstance(prompt, str) else str(prompt)
+        prompt_tokens = estimate_tokens(prompt)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            now = time.monotonic()
+            latency = self._sample_latency()
+            roll = self._rng.random()
+
+            if self._over_quota(now, prompt_tokens) or roll < self.config.rate_limit_rate:
+                self._stats["rate_limited"] += 1
+                delay = latency * RATE_LIMIT_LATENCY_FACTOR
+                self._stats["total_latency_seconds"] += delay
+                return delay, StandInRateLimitError(
+                    f"429 Resource has been exhausted (e.g. check quota). "
+                    f"retry_delay {self.config.retry_after_seconds:g}"
+                )
+
+            self._window.append((now, prompt_tokens))
+            if roll < self.config.rate_limit_rate + self.config.error_rate:
+                self._stats["server_errors"] += 1
+                self._stats["total_latency_seconds"] += latency
+                return latency, StandInServerError("500 An internal error has occurred")
+
+        text = self._respond(prompt)
+        output_tokens = estimate_tokens(text)
+        delay = latency + output_tokens * self.config.ms_per_output_token / 1000.0
+
+        with self._lock:
+            self._stats["succeeded"] += 1
+            self._stats["prompt_tokens"] += prompt_tokens
+            self._stats["output_tokens"] += output_tokens
+            self._stats["total_latency_seconds"] += delay
+
+        return delay, ModelResponse(
+            text=text,
+            usage_metadata=UsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens
+            )
+        )
+
+    def _sample_latency(self) -> float:
+        """Latency in seconds from the configured distribution."""
+        mean = max(self.config.latency_ms, 0.0)
+        jitter = max(self.config.latency_jitter, 0.0)
+        distribution = self.config.latency_distribution
+
+        if mean == 0 or distribution == "fixed":
+            value = mean
+        elif distribution == "uniform":
+            value = self._rng.uniform(mean * (1 - jitter), mean * (1 + jitter))
+        elif distribution == "normal":
+            value = self._rng.gauss(mean, mean * jitter)
+        elif distribution == "exponential":
+            value = self._rng.expovariate(1.0 / mean)
+        else:
+            # Keep the configured mean: E[lognormal] = exp(mu + sigma^2 / 2)
+            value = self._rng.lognormvariate(math.log(mean) - jitter ** 2 / 2, jitter)
+        return max(value, 0.0) / 1000.0
+
+    def _over_quota(self, now: float, prompt_tokens: int) -> bool:
+        """Whether the call exceeds the server-side per-minute limits."""
+        while self._window and now - self._window[0][0] >= 60.0:
+            self._window.popleft()
+        rpm = self.config.requests_per_minute
+        tpm = self.config.tokens_per_minute
+        if rpm and len(self._window) >= rpm:
+            return True
+        if tpm and sum(tokens for _, tokens in self._window) + prompt_tokens > tpm:
+            return True
+        return False
+
+    def _respond(self, prompt: str) -> str:
+        """Build a response that follows the prompt's JSON template."""
+        # The same prompt always gets the same answer, like a cached model call
+        seed = f"{self.config.seed}:{hashlib.sha1(prompt.encode('utf-8')).hexdigest()}"
+        rng = random.Random(seed)
+        located = _locate_template(prompt)
+        if located is None:
+            return "Stand-in response: " + " ".join(_WORD_PATTERN.findall(prompt)[:20])
+        template, start, end = located
+
+        documents = _DOCUMENT_PATTERN.findall(prompt)
+        if documents and '"results"' in prompt and isinstance(template, dict):
+            results = []
+            for doc_id, body in documents:
+                entry = {"id": doc_id}
+                entry.update(_TemplateFiller(body, rng).fill(template))
+                results.append(entry)
+            return json.dumps({"results": results})
+
+        content = prompt[:start] + prompt[end:]
+        return json.dumps(_TemplateFiller(content, rng).fill(template))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, error and token statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+        total_latency = stats.pop("total_latency_seconds")
+        stats["total_tokens"] = stats["prompt_tokens"] + stats["output_tokens"]
+        stats["average_latency_ms"] = (
+            round(total_latency / stats["requests"] * 1000, 1) if stats["requests"] else 0.0
+        )
+        return stats
+
+    def reset_stats(self) -> None:
+        """Clear statistics and the rate windows."""
+        with self._lock:
+            self._stats = self._empty_stats()
+            self._window.clear()
@@ -5,7 +5,6 @@ This module uses Gemini AI to identify structured data patterns in web content
 and extract them into organized, queryable formats.
 """
 
-import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -15,6 +14,8 @@ import google.generativeai as genai
 from bs4 import BeautifulSoup
 
 from src.models.pydantic_models import ContentType
+from src.ai.content_condenser import condense_for_prompt
+from src.ai.client import get_ai_client
 
 
 logger = logging.getLogger(__name__)
@@ -184,9 +185,7 @@ class StructureExtractor:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             if not response.text:
                 raise ValueError("Empty response from Gemini")
@@ -256,9 +255,7 @@ class StructureExtractor:
             }}
             """
             
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             result = json.loads(response.text)
             result["metadata"]["processing_timestamp"] = datetime.utcnow().isoformat()
@@ -286,7 +283,7 @@ class StructureExtractor:
         prompt = f"""
         Analyze this text content and identify structured patterns. {focus_instruction}
         
-        Text: {text_content[:4000]}
+        Text: {condense_for_prompt(text_content, is_html=False)}
         
         Return structured data in JSON format:
         {{
@@ -335,9 +332,7 @@ class StructureExtractor:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             result = json.loads(response.text)
             result["metadata"]["processing_timestamp"] = datetime.utcnow().isoformat()
@@ -359,7 +354,7 @@ class StructureExtractor:
         prompt = f"""
         Analyze this content and extract any structured information:
         
-        Content: {content[:3000]}
+        Content: {condense_for_prompt(content, 750)}
         
         Return any structured patterns you can identify in JSON format:
         {{
@@ -380,9 +375,7 @@ class StructureExtractor:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             result = json.loads(response.text)
             result["metadata"]["processing_timestamp"] = datetime.utcnow().isoformat()
@@ -5,7 +5,6 @@ This module provides natural language processing capabilities including
 entity extraction, sentiment analysis, and content classification.
 """
 
-import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -13,9 +12,20 @@ from datetime import datetime
 
 import google.generativeai as genai
 
+from .content_condenser import condense_for_prompt
+from .client import get_ai_client
+from .result_cache import get_ai_result_cache, make_cache_key
+
 
 logger = logging.getLogger(__name__)
 
+# Bump when any analysis prompt changes so cached results are not reused
+PROMPT_VERSION = "2"
+
+# Token budgets for the narrower prompts; comprehensive analysis uses AI_CONDENSE_TOKEN_BUDGET
+ENTITY_PROMPT_TOKENS = 750
+CLASSIFICATION_PROMPT_TOKENS = 500
+
 
 class TextAnalyzer:
     """
@@ -53,18 +63,50 @@ class TextAnalyzer:
             Dictionary containing analysis results
         """
         try:
-            if analysis_type == "comprehensive":
-                return await self._comprehensive_analysis(text_content, source_url)
-            elif analysis_type == "entities_only":
-                return await self._extract_entities_only(text_content)
-            elif analysis_type == "classification_only":
-                return await self._classify_content_only(text_content)
-            else:
-                raise ValueError(f"Unknown analysis type: {analysis_type}")
+            cache = get_ai_result_cache()
+            if cache is None:
+                return await self._run_analysis(text_content, source_url, analysis_type)
+            
+            cache_key = make_cache_key(
+                "text_analysis", text_content, PROMPT_VERSION,
+                getattr(self.model, "model_name", "gemini"), analysis_type
+            )
+            result, cache_hit = await cache.get_or_compute(
+                cache_key,
+                lambda: self._run_analysis(text_content, source_url, analysis_type),
+                should_cache=self._is_cacheable
+            )
+            
+            if cache_hit and isinstance(result.get("metadata"), dict):
+                result["metadata"]["cache_hit"] = True
+                if "source_url" in result["metadata"]:
+                    result["metadata"]["source_url"] = source_url
+            return result
                 
         except Exception as e:
             self.logger.error(f"Text analysis failed: {e}")
             return self._create_error_result(str(e))   
+    
+    async def _run_analysis(
+        self,
+        text_content: str,
+        source_url: str,
+        analysis_type: str
+    ) -> Dict[str, Any]:
+        """Dispatch to the requested analysis."""
+        if analysis_type == "comprehensive":
+            return await self._comprehensive_analysis(text_content, source_url)
+        elif analysis_type == "entities_only":
+            return await self._extract_entities_only(text_content)
+        elif analysis_type == "classification_only":
+            return await self._classify_content_only(text_content)
+        else:
+            raise ValueError(f"Unknown analysis type: {analysis_type}")
+    
+    def _is_cacheable(self, result: Dict[str, Any]) -> bool:
+        """Only model results are cached; errors and fallbacks are retried next time."""
+        metadata = result.get("metadata") or {}
+        return "error" not in metadata and metadata.get("processing_method") != "fallback"
  
     async def _comprehensive_analysis(
         self,
@@ -78,7 +120,7 @@ class TextAnalyzer:
         Analyze the following web content and provide a comprehensive analysis in JSON format.
         
         Source URL: {source_url}
-        Content: {text_content[:4000]}  # Limit content to avoid token limits
+        Content: {condense_for_prompt(text_content)}
         
         Please provide analysis in the following JSON structure:
         {{
@@ -124,9 +166,7 @@ class TextAnalyzer:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             if not response.text:
                 raise ValueError("Empty response from Gemini")
@@ -154,7 +194,7 @@ class TextAnalyzer:
         prompt = f"""
         Extract named entities from the following text and return them in JSON format:
         
-        Text: {text_content[:3000]}
+        Text: {condense_for_prompt(text_content, ENTITY_PROMPT_TOKENS)}
         
         Return JSON in this format:
         {{
@@ -171,9 +211,7 @@ class TextAnalyzer:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             result = json.loads(response.text)
             result["metadata"] = {
@@ -193,7 +231,7 @@ class TextAnalyzer:
         prompt = f"""
         Classify the following web content and return classification in JSON format:
         
-        Content: {text_content[:2000]}
+        Content: {condense_for_prompt(text_content, CLASSIFICATION_PROMPT_TOKENS)}
         
         Return JSON in this format:
         {{
@@ -209,9 +247,7 @@ class TextAnalyzer:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             result = json.loads(response.text)
             result["metadata"] = {
@@ -355,7 +391,7 @@ class TextAnalyzer:
         prompt = f"""
         Extract only the following entity types from the text: {entity_types_str}
         
-        Text: {text_content[:3000]}
+        Text: {condense_for_prompt(text_content, ENTITY_PROMPT_TOKENS)}
         
         Return JSON array of entities:
         [
@@ -368,9 +404,7 @@ class TextAnalyzer:
         """
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response = await get_ai_client().generate(self.model, prompt)
             
             entities = json.loads(response.text)
             return entities if isinstance(entities, list) else []
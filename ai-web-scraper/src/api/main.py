@@ -27,22 +27,44 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import asyncio
+import concurrent.futures
+import functools
 import google.generativeai as genai
 
+from config.settings import get_settings
 from src.database import get_db
 from src.models.database_models import ScrapingJobORM, ScrapedDataORM
 from src.models.pydantic_models import (
     ScrapingJob, ScrapedData, JobStatus, ScrapingConfig,
     JobResponse, JobListResponse, DataListResponse, HealthCheckResponse, ErrorResponse
 )
+from src.ai.content_condenser import condense_for_prompt
+from src.ai.client import get_ai_client
+from src.ai.model_backend import get_model_backend
+from src.ai.quota_governor import AIPriority
+from src.ai.result_cache import get_ai_result_cache, make_cache_key
+from src.pipeline.fingerprint import content_fingerprint
+from src.pipeline.enrichment import (
+    SUCCESS_STATUSES, EnrichmentRequest, get_enrichment_queue, is_pending
+)
+from src.scraper.compression import get_accept_encoding
+from src.scraper.response_reader import BoundedResponseReader
+from src.utils.async_runtime import get_async_runtime, shutdown_async_runtime
 from src.utils.security_config import SecurityConfig, validate_security_on_startup
 
-# Configure Gemini AI
+# Configure Gemini AI (or the configured alternative backend)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
+model = get_model_backend()
+if model is None and GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
     model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
+# Bump when the analysis prompt below changes so cached results are not reused
+ANALYSIS_PROMPT_VERSION = "2"
+
+# Token budget for page content in the analysis prompt
+ANALYSIS_CONTENT_TOKENS = 500
+
 # Request models
 class JobCreate(BaseModel):
     name: str
@@ -52,7 +74,7 @@ class JobCreate(BaseModel):
 def analyze_content_with_ai(content: str, title: str) -> dict:
     """Analyze content using Gemini AI with standardized response format"""
     try:
-        if not GEMINI_API_KEY:
+        if model is None:
             return {
                 "summary": "AI analysis not available - API key not configured",
                 "confidence": 0.0,
@@ -63,6 +85,18 @@ def analyze_content_with_ai(content: str, title: str) -> dict:
                 "processing_status": "disabled"
             }
         
+        # Only the prompt inputs (title and condensed content) affect the result
+        prompt_content = condense_for_prompt(content, ANALYSIS_CONTENT_TOKENS)
+        cache = get_ai_result_cache()
+        cache_key = make_cache_key(
+            "api_analysis", f"{title}\n{prompt_content}", ANALYSIS_PROMPT_VERSION, "gemini-2.0-flash-exp"
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                cached["cache_hit"] = True
+                return cached
+        
         prompt = f"""
         Analyze this web content and provide a JSON response with the following structure:
         {{
@@ -76,12 +110,13 @@ def analyze_content_with_ai(content: str, title: str) -> dict:
         }}
         
         Title: {title}
-        Content: {content[:2000]}
+        Content: {prompt_content}
         
         Respond only with valid JSON.
         """
         
-        response = model.generate_content(prompt)
+        # Runs on the AI client's executor with a timeout, not in this thread
+        response = get_ai_client().generate_sync(model, prompt, AIPriority.INTERACTIVE)
         
         if response and response.text:
             try:
@@ -104,6 +139,9 @@ def analyze_content_with_ai(content: str, title: str) -> dict:
                     "raw_response": response.text[:500]  # Keep first 500 chars of raw response
                 }
                 
+                if cache is not None:
+                    cache.set(cache_key, standardized_result)
+                
                 return standardized_result
                 
             except (json.JSONDecodeError, ValueError, KeyError) as e:
@@ -177,6 +215,7 @@ async def scrape_website_enhanced(job_id: str, url: str, max_pages: int = 1):
             respect_robots_txt=os.getenv("SCRAPER_RESPECT_ROBOTS_TXT", "true").lower() == "true",
             extract_images=True,
             extract_links=True,
+            use_http_cache=os.getenv("SCRAPER_HTTP_CACHE", "true").lower() == "true",
             max_pages=max_pages
         )
         
@@ -184,8 +223,10 @@ async def scrape_website_enhanced(job_id: str, url: str, max_pages: int = 1):
         async with SimpleWebScraper(scraper_config) as scraper:
             logger.info(f"Starting enhanced scraping for job {job_id}: {url}")
             
-            # Scrape the URL
-            scraped_data = await scraper.scrape_url(url, job_id)
+            # Scrape the URL; with deferred enrichment the AI analysis runs after saving
+            scraped_data = await scraper.scrape_url(
+                url, job_id, defer_ai=get_settings().ai_deferred_enrichment
+            )
             
             if scraped_data:
                 # Convert to database model
@@ -194,6 +235,7 @@ async def scrape_website_enhanced(job_id: str, url: str, max_pages: int = 1):
                     job_id=scraped_data.job_id,
                     url=scraped_data.url,
                     content=scraped_data.content,
+                    content_hash=content_fingerprint(scraped_data.content),
                     raw_html=scraped_data.raw_html,
                     confidence_score=scraped_data.confidence_score,
                     ai_processed=scraped_data.ai_processed,
@@ -214,6 +256,15 @@ async def scrape_website_enhanced(job_id: str, url: str, max_pages: int = 1):
                     job.total_pages = max_pages
                     db.commit()
                 
+                if job and is_pending(scraped_data.ai_metadata):
+                    get_enrichment_queue().submit(EnrichmentRequest(
+                        data_id=scraped_data.id,
+                        job_id=job_id,
+                        url=url,
+                        analyze=functools.partial(scraper.enrich, scraped_data),
+                        store=store_enrichment
+                    ))
+                
                 logger.info(f"Successfully completed scraping job {job_id}")
             else:
                 raise Exception("Failed to scrape any data from the URL")
@@ -232,17 +283,58 @@ async def scrape_website_enhanced(job_id: str, url: str, max_pages: int = 1):
         db.close()
 
 
+def save_enrichment(data_id: str, job_id: str, ai_metadata: dict):
+    """Store deferred AI results for a record and advance the job's enriched progress"""
+    db = next(get_db())
+    try:
+        values = {"ai_metadata": ai_metadata, "processed_at": datetime.utcnow()}
+        if ai_metadata.get("processing_status") in SUCCESS_STATUSES:
+            confidence = ai_metadata.get("confidence", 0.5)
+            values.update({
+                "ai_processed": True,
+                "confidence_score": confidence,
+                "data_quality_score": confidence  # Use confidence as quality score
+            })
+        db.query(ScrapedDataORM).filter(ScrapedDataORM.id == data_id).update(values)
+        
+        # Failed analyses count too, so enriched progress always reaches the total
+        db.query(ScrapingJobORM).filter(ScrapingJobORM.id == job_id).update(
+            {ScrapingJobORM.pages_enriched: ScrapingJobORM.pages_enriched + 1},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def store_enrichment(request: EnrichmentRequest, ai_metadata: dict):
+    """Enrichment queue callback that saves results off the event loop"""
+    await asyncio.to_thread(save_enrichment, request.data_id, request.job_id, ai_metadata)
+
+
+async def drain_enrichment(timeout: Optional[float] = None):
+    """Wait for queued AI enrichment on this loop, then stop its workers"""
+    queue = get_enrichment_queue()
+    if not await queue.join(timeout):
+        logger.warning("AI enrichment did not finish; remaining records stay pending")
+    await queue.close()
+
+
+async def drain_runtime_enrichment():
+    """Shutdown hook that finishes background jobs' AI enrichment on the shared loop"""
+    await drain_enrichment(timeout=10.0)
+
+
 def scrape_website(job_id: str, url: str, max_pages: int = 1):
     """Background task wrapper for enhanced scraping"""
-    import asyncio
-    
-    # Create new event loop for this thread
-    loop = None
+    # Run on the process's long-lived event loop instead of a new loop per job,
+    # so scraper sessions stay warm; its enrichment queue keeps working after
+    # this returns and is drained when the runtime stops
+    runtime = get_async_runtime()
+    runtime.add_shutdown_hook(drain_runtime_enrichment)
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(scrape_website_enhanced(job_id, url, max_pages))
-    except asyncio.CancelledError:
+        runtime.run(scrape_website_enhanced(job_id, url, max_pages))
+    except (asyncio.CancelledError, concurrent.futures.CancelledError):
         logger.info(f"Scraping job {job_id} was cancelled")
     except KeyboardInterrupt:
         logger.info(f"Scraping job {job_id} interrupted by user")
@@ -253,20 +345,6 @@ def scrape_website(job_id: str, url: str, max_pages: int = 1):
             scrape_website_basic(job_id, url, max_pages)
         except Exception as fallback_error:
             logger.error(f"Fallback scraping also failed: {fallback_error}")
-    finally:
-        if loop:
-            try:
-                # Cancel any remaining tasks
-                pending = asyncio.all_tasks(loop)
-                for task in pending:
-                    task.cancel()
-                
-                if pending:
-                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                
-                loop.close()
-            except Exception as cleanup_error:
-                logger.error(f"Error during loop cleanup: {cleanup_error}")
 
 
 def scrape_website_basic(job_id: str, url: str, max_pages: int = 1):
@@ -286,7 +364,8 @@ def scrape_website_basic(job_id: str, url: str, max_pages: int = 1):
         user_agents = SecurityConfig.get_secure_user_agents()
         import random
         headers = {
-            'User-Agent': random.choice(user_agents).strip()
+            'User-Agent': random.choice(user_agents).strip(),
+            'Accept-Encoding': get_accept_encoding()
         }
         
         # Add delay to be respectful
@@ -294,8 +373,14 @@ def scrape_website_basic(job_id: str, url: str, max_pages: int = 1):
         time.sleep(delay)
         
         start_time = time.time()
-        response = requests.get(url, headers=headers, timeout=int(os.getenv("SCRAPER_TIMEOUT", "15")))
-        response.raise_for_status()
+        response = requests.get(url, headers=headers, timeout=int(os.getenv("SCRAPER_TIMEOUT", "15")), stream=True)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        # Stream the body with content-type and size guards
+        response = BoundedResponseReader(max_bytes=ScrapingConfig().max_response_bytes).read(response)
         load_time = time.time() - start_time
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -332,17 +417,19 @@ def scrape_website_basic(job_id: str, url: str, max_pages: int = 1):
         ai_result = analyze_content_with_ai(content_text, title_text)
         
         # Create scraped data record
+        content = {
+            "title": title_text,
+            "text": content_text[:2000],  # Limit text length
+            "headings": [h.get_text().strip() for h in main_content.find_all(['h1', 'h2', 'h3'])[:5]],
+            "links_count": len(main_content.find_all('a', href=True)),
+            "images_count": len(main_content.find_all('img', src=True))
+        }
         scraped_data = ScrapedDataORM(
             id=str(uuid4()),
             job_id=job_id,
             url=url,
-            content={
-                "title": title_text,
-                "text": content_text[:2000],  # Limit text length
-                "headings": [h.get_text().strip() for h in main_content.find_all(['h1', 'h2', 'h3'])[:5]],
-                "links_count": len(main_content.find_all('a', href=True)),
-                "images_count": len(main_content.find_all('img', src=True))
-            },
+            content=content,
+            content_hash=content_fingerprint(content),
             raw_html=response.text[:5000],  # Limit size
             confidence_score=ai_result.get("confidence", 0.5),
             ai_processed=True,
@@ -397,6 +484,12 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Web Scraper API...")
     
+    # Give queued AI enrichment a moment; unfinished records stay pending
+    await drain_enrichment(timeout=10.0)
+    
+    # Stop the shared loop used by synchronous background jobs (runs its drain hook)
+    await asyncio.to_thread(shutdown_async_runtime)
+    
     # Cancel any running background tasks
     if background_tasks_tracker:
         logger.info(f"Cancelling {len(background_tasks_tracker)} background tasks...")
@@ -449,7 +542,7 @@ def create_app() -> FastAPI:
             services={
                 "api": "healthy",
                 "database": "healthy",
-                "ai_service": "healthy" if GEMINI_API_KEY else "disabled"
+                "ai_service": "healthy" if model is not None else "disabled"
             }
         )
     
@@ -469,6 +562,7 @@ def create_app() -> FastAPI:
                 "started_at": job.started_at.isoformat() if job.started_at else None,
                 "completed_at": job.completed_at.isoformat() if job.completed_at else None,
                 "pages_completed": job.pages_completed or 0,
+                "pages_enriched": job.pages_enriched or 0,
                 "total_pages": job.total_pages or 0,
                 "error_message": job.error_message,
                 "retry_count": job.retry_count or 0,
@@ -538,8 +632,8 @@ def create_app() -> FastAPI:
                     await scrape_website_enhanced(job_id, job.url, max_pages)
                 except Exception as e:
                     logger.error(f"Background task error for job {job_id}: {e}")
-                    # Fallback to basic scraping
-                    scrape_website_basic(job_id, job.url, max_pages)
+                    # Fallback to basic scraping, off the event loop since it blocks
+                    await asyncio.to_thread(scrape_website_basic, job_id, job.url, max_pages)
             
             # Create and track the task
             task = asyncio.create_task(tracked_scrape_task())
@@ -223,6 +223,18 @@ class DataService:
         except Exception as e:
             logger.error(f"Failed to delete export: {e}")
             return False
+    
+    async def rescore_confidence(
+        self,
+        user_id: str,
+        job_id: Optional[str] = None,
+        data_ids: Optional[List[str]] = None
+    ) -> dict:
+        """Recompute confidence scores of AI-processed data."""
+        repository = await self._get_repository()
+        stats = await repository.rescore_confidence(job_id=job_id, data_ids=data_ids)
+        logger.info(f"Rescored {stats['rescored']} records for user {user_id}")
+        return stats
 
 
 # Create service instance
@@ -704,4 +716,36 @@ async def reprocess_data(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to queue data for reprocessing"
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/rescore",
+    summary="Rescore Data Confidence",
+    description="Recompute confidence scores of AI-processed data in vectorized batches"
+)
+async def rescore_data(
+    job_id: Optional[str] = Query(None, description="Only rescore data from this job"),
+    data_ids: Optional[List[str]] = Query(None, description="Only rescore these data record IDs"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Recompute confidence scores of AI-processed data.
+    
+    Uses the stored AI results, so no AI requests are made; use this after
+    the confidence scoring changes instead of reprocessing the data.
+    """
+    try:
+        stats = await data_service.rescore_confidence(current_user["user_id"], job_id, data_ids)
+        
+        return {
+            "message": f"Rescored {stats['rescored']} records",
+            **stats
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to rescore data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to rescore data"
+        )
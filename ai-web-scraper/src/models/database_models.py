@@ -42,6 +42,7 @@ class ScrapingJobORM(Base):
     total_pages = Column(Integer, default=0, nullable=False)
     pages_completed = Column(Integer, default=0, nullable=False)
     pages_failed = Column(Integer, default=0, nullable=False)
+    pages_enriched = Column(Integer, default=0, nullable=False)
     
     # Error handling
     error_message = Column(Text, nullable=True)
@@ -86,6 +87,9 @@ class ScrapedDataORM(Base):
     content = Column(JSON, nullable=False)
     raw_html = Column(Text, nullable=True)
     
+    # Canonical content fingerprint for cross-job duplicate detection
+    content_hash = Column(String(32), nullable=True, index=True)
+    
     # Metadata
     content_metadata = Column(JSON, default=dict, nullable=False)
     
@@ -48,6 +48,26 @@ class ScrapingConfig(BaseModel):
     follow_links: bool = Field(default=False, description="Follow and scrape linked pages")
     max_depth: int = Field(default=1, ge=1, le=5, description="Maximum depth for link following")
     
+    # Response body limits
+    max_response_bytes: int = Field(
+        default=10 * 1024 * 1024, ge=1024, le=100 * 1024 * 1024,
+        description="Maximum number of body bytes read per response"
+    )
+    metadata_only: bool = Field(
+        default=False,
+        description="Stop reading the response body after </head> (metadata-only jobs)"
+    )
+    
+    # HTTP caching
+    use_http_cache: bool = Field(
+        default=False,
+        description="Serve unchanged pages from the on-disk HTTP cache with conditional revalidation"
+    )
+    archive_responses: bool = Field(
+        default=False,
+        description="Capture full request/response records to the WARC archive"
+    )
+    
     # Rate limiting and politeness
     delay_between_requests: float = Field(
         default=1.0, ge=0.1, le=10.0,
@@ -74,6 +94,18 @@ class ScrapingConfig(BaseModel):
     # JavaScript execution settings
     javascript_enabled: bool = Field(default=True, description="Enable JavaScript execution in browser")
     
+    # AI processing
+    combined_ai_analysis: Optional[bool] = Field(
+        default=None,
+        description="Analyze each page with one combined AI request (None uses the server default)"
+    )
+    
+    # Cross-job deduplication
+    skip_stored_duplicates: bool = Field(
+        default=False,
+        description="Save a reference to the earlier record instead of content another job already stored"
+    )
+    
     @field_validator('user_agent')
     @classmethod
     def validate_user_agent(cls, v):
@@ -100,6 +132,7 @@ class ScrapingJob(BaseModel):
     total_pages: int = Field(default=0, ge=0, description="Total number of pages to scrape")
     pages_completed: int = Field(default=0, ge=0, description="Number of pages completed")
     pages_failed: int = Field(default=0, ge=0, description="Number of pages that failed")
+    pages_enriched: int = Field(default=0, ge=0, description="Number of saved pages whose AI enrichment finished")
     
     # Error handling
     error_message: Optional[str] = Field(default=None, description="Error message if job failed")
@@ -159,6 +192,10 @@ class ScrapedData(BaseModel):
     content: Dict[str, Any] = Field(..., description="Extracted content data")
     raw_html: Optional[str] = Field(default=None, description="Raw HTML content")
     content_type: ContentType = Field(default=ContentType.HTML, description="Type of content scraped")
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="Canonical content fingerprint used for duplicate detection"
+    )
     
     # Content metadata (added for consistency with database model)
     content_metadata: Dict[str, Any] = Field(
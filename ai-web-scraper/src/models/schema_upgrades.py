@@ -0,0 +1,68 @@
+"""
+In-place upgrades for databases created before newer columns existed.
+
+Base.metadata.create_all() creates missing tables but never alters existing
+ones, so columns added to the ORM models after a database was created are
+added here with ALTER TABLE. Upgrades are idempotent: columns that already
+exist are skipped.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+class ColumnUpgrade(NamedTuple):
+    """A column added to an existing table."""
+    table: str
+    column: str
+    definition: str
+    index: Optional[str] = None
+
+
+# Columns added after the initial schema, in the order they were introduced
+COLUMN_UPGRADES: List[ColumnUpgrade] = [
+    ColumnUpgrade(
+        "scraped_data", "content_hash", "VARCHAR(32)",
+        index="ix_scraped_data_content_hash"
+    ),
+    ColumnUpgrade("scraping_jobs", "pages_enriched", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+def upgrade_schema(connection: Connection) -> List[str]:
+    """
+    Add missing columns (and their indexes) to existing tables.
+
+    Use with a synchronous connection inside a transaction, or through
+    ``await connection.run_sync(upgrade_schema)`` for async engines.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        "table.column" names of the columns that were added
+    """
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    applied = []
+
+    for upgrade in COLUMN_UPGRADES:
+        if upgrade.table not in tables:
+            # create_all() builds new tables with every column
+            continue
+        columns = {column["name"] for column in inspector.get_columns(upgrade.table)}
+        if upgrade.column in columns:
+            continue
+
+        connection.execute(text(
+            f"ALTER TABLE {upgrade.table} ADD COLUMN {upgrade.column} {upgrade.definition}"
+        ))
+        if upgrade.index:
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {upgrade.index} ON {upgrade.table} ({upgrade.column})"
+            ))
+        applied.append(f"{upgrade.table}.{upgrade.column}")
+
+    return applied
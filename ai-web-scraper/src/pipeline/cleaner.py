@@ -6,17 +6,21 @@ capabilities for scraped web data. It includes duplicate detection, data type va
 format normalization, and automated data correction with confidence scoring.
 """
 
-import hashlib
+import asyncio
 import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
-import pandas as pd
 from pydantic import BaseModel, Field
 
 from ..models.pydantic_models import ScrapedData
 from ..utils.logger import get_logger
+from .columnar_cleaner import ColumnarCleaner
+from .fingerprint import content_fingerprint
+from .near_duplicates import NearDuplicateIndex
+from .quality_stats import StreamingQualityMetrics
 
 logger = get_logger(__name__)
 
@@ -63,12 +67,23 @@ class DataCleaner:
     format normalization, and quality assessment for scraped web data.
     """
     
-    def __init__(self):
-        """Initialize the DataCleaner with default cleaning rules."""
+    def __init__(self, near_duplicate_index: Optional[NearDuplicateIndex] = None):
+        """
+        Initialize the DataCleaner with default cleaning rules.
+        
+        Args:
+            near_duplicate_index: Historical index that detect_duplicates also
+                checks records against (see get_near_duplicate_index())
+        """
         self.logger = get_logger(self.__class__.__name__)
         self.cleaning_rules: List[CleaningRule] = []
         self.content_hashes: Set[str] = set()
         self.similarity_threshold = 0.85
+        self.near_duplicate_index = near_duplicate_index
+        
+        # Batches this large are cleaned column-wise; pandas overhead dominates below it
+        self.columnar_min_batch = 64
+        self.columnar_cleaner = ColumnarCleaner(self)
         
         # Initialize default cleaning rules
         self._initialize_default_rules()
@@ -121,88 +136,223 @@ class DataCleaner:
         self.cleaning_rules.append(rule)
         self.logger.info(f"Added cleaning rule for field '{rule.field_name}' with type '{rule.rule_type}'")
     
-    def clean_data(self, data: List[ScrapedData]) -> Tuple[List[ScrapedData], DataQualityMetrics]:
+    def clean_data(
+        self,
+        data: List[ScrapedData],
+        existing_hashes: Optional[Set[str]] = None
+    ) -> Tuple[List[ScrapedData], DataQualityMetrics]:
         """
         Clean and validate a list of scraped data records.
         
+        Cleaned records carry the content hash of the record as extracted, so
+        saving them stores the same fingerprint later batches are checked
+        against. With a near-duplicate index, near duplicates are flagged in
+        their content_metadata (see flag_near_duplicates()) but kept.
+        
         Args:
             data: List of ScrapedData objects to clean
-            
+            existing_hashes: Content hashes already stored, e.g. from
+                DataRepository.find_existing_content_hashes(); matching
+                records count as duplicates
+        
         Returns:
             Tuple of (cleaned_data, quality_metrics)
         """
         start_time = datetime.utcnow()
         self.logger.info(f"Starting data cleaning process for {len(data)} records")
         
-        # Initialize metrics
-        metrics = DataQualityMetrics(
-            total_records=len(data),
-            valid_records=0,
-            invalid_records=0,
-            duplicate_records=0,
-            corrected_records=0,
-            overall_quality_score=0.0,
-            completeness_score=0.0,
-            accuracy_score=0.0,
-            consistency_score=0.0,
-            processing_time=0.0
+        # Track duplicates, including those already stored by earlier jobs
+        seen_hashes = set(existing_hashes or ())
+        aggregate = StreamingQualityMetrics()
+        cleaned_data = self._clean_batch(data, seen_hashes, aggregate)
+        
+        # Calculate processing time
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        aggregate.processing_time = processing_time
+        metrics = aggregate.to_metrics()
+        
+        self.logger.info(
+            f"Data cleaning completed. Valid: {metrics.valid_records}, "
+            f"Invalid: {metrics.invalid_records}, Duplicates: {metrics.duplicate_records}, "
+            f"Processing time: {processing_time:.2f}s"
         )
-        cleaned_data = []
         
-        # Track duplicates
-        seen_hashes = set()
-        duplicate_count = 0
+        return cleaned_data, metrics
+    
+    async def clean_stream(
+        self,
+        records: AsyncIterable[ScrapedData],
+        aggregate: Optional[StreamingQualityMetrics] = None,
+        batch_size: int = 500,
+        existing_hashes_lookup: Optional[Callable[[List[str]], Awaitable[Set[str]]]] = None
+    ) -> AsyncIterator[ScrapedData]:
+        """
+        Clean records from an async stream, yielding cleaned records as they are ready.
+        
+        Records are cleaned in batches of batch_size off the event loop.
+        Quality statistics accumulate in constant memory in the aggregate;
+        call aggregate.to_metrics() when the stream is done, or merge
+        aggregates from several workers first.
+        
+        Without a lookup, duplicates are detected against every content hash
+        seen in the stream, which grows with the number of distinct records.
+        With a lookup such as DataRepository.find_existing_content_hashes,
+        each batch is checked against stored records instead and only its own
+        hashes are kept, so memory stays bounded as long as the consumer saves
+        the yielded records before requesting the next batch.
+        
+        The lookup is only for records that are not stored yet (new scrapes
+        or replays). Re-cleaning stored data, e.g. from
+        DataRepository.iter_scraped_data(), must not use it: every stored
+        record would find its own hash and count as a duplicate of itself.
+        
+        Args:
+            records: Async iterable of records, e.g. DataRepository.iter_scraped_data()
+                (without a lookup) or freshly scraped records
+            aggregate: Accumulator to update (a new one if None)
+            batch_size: Records cleaned together
+            existing_hashes_lookup: Async callable returning which of the
+                given content hashes are already stored; only for records
+                that have not been saved
+        
+        Yields:
+            Cleaned records, in input order
+        """
+        aggregate = aggregate if aggregate is not None else StreamingQualityMetrics()
+        seen_hashes: Set[str] = set()
+        batch: List[ScrapedData] = []
+        
+        async def finish(batch: List[ScrapedData]) -> List[ScrapedData]:
+            nonlocal seen_hashes
+            start_time = time.perf_counter()
+            if existing_hashes_lookup is not None:
+                hashes = [self._generate_content_hash(record.content) for record in batch]
+                seen_hashes = await existing_hashes_lookup(hashes)
+            cleaned = await asyncio.to_thread(self._clean_batch, batch, seen_hashes, aggregate)
+            aggregate.processing_time += time.perf_counter() - start_time
+            return cleaned
+        
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                for cleaned_record in await finish(batch):
+                    yield cleaned_record
+                batch = []
+        
+        if batch:
+            for cleaned_record in await finish(batch):
+                yield cleaned_record
+    
+    def _clean_batch(
+        self,
+        data: List[ScrapedData],
+        seen_hashes: Set[str],
+        aggregate: StreamingQualityMetrics
+    ) -> List[ScrapedData]:
+        """
+        Deduplicate and clean a batch, recording the outcome of every record.
+        
+        Args:
+            data: Records to clean
+            seen_hashes: Content hashes already seen; updated in place
+            aggregate: Quality statistics to update
+        
+        Returns:
+            Cleaned records
+        """
+        unique_records, unique_hashes = self._deduplicate(data, seen_hashes, aggregate)
+        cleaned_data = self._clean_unique(unique_records, unique_hashes, aggregate)
+        self.flag_near_duplicates(cleaned_data)
+        return cleaned_data
+    
+    def _deduplicate(
+        self,
+        data: List[ScrapedData],
+        seen_hashes: Set[str],
+        aggregate: StreamingQualityMetrics
+    ) -> Tuple[List[ScrapedData], List[str]]:
+        """
+        Drop records whose content hash was already seen.
+        
+        Args:
+            data: Records to check
+            seen_hashes: Content hashes already seen; updated in place
+            aggregate: Quality statistics to count duplicates in
         
+        Returns:
+            Tuple of (unique_records, their content hashes)
+        """
+        unique_records = []
+        unique_hashes = []
         for record in data:
             try:
                 # Check for duplicates
                 content_hash = self._generate_content_hash(record.content)
                 if content_hash in seen_hashes:
-                    duplicate_count += 1
+                    aggregate.add_duplicate()
                     self.logger.debug(f"Duplicate record found: {record.id}")
                     continue
                 seen_hashes.add(content_hash)
-                
-                # Clean the record
-                cleaned_record, record_metrics = self._clean_single_record(record)
-                
+                unique_records.append(record)
+                unique_hashes.append(content_hash)
+            except Exception as e:
+                self.logger.error(f"Error cleaning record {record.id}: {str(e)}")
+                aggregate.add_invalid()
+        
+        return unique_records, unique_hashes
+    
+    def _clean_unique(
+        self,
+        records: List[ScrapedData],
+        content_hashes: List[str],
+        aggregate: StreamingQualityMetrics
+    ) -> List[ScrapedData]:
+        """
+        Clean deduplicated records and record their outcomes.
+        
+        Args:
+            records: Deduplicated records
+            content_hashes: Content hash of each record
+            aggregate: Quality statistics to update
+        
+        Returns:
+            Cleaned records
+        """
+        cleaned_data = []
+        cleaned_results = self._clean_records(records)
+        
+        for record, content_hash, (cleaned_record, record_metrics) in zip(records, content_hashes, cleaned_results):
+            try:
                 if cleaned_record:
+                    cleaned_record.content_hash = content_hash
+                    aggregate.add_cleaned(cleaned_record, record_metrics)
                     cleaned_data.append(cleaned_record)
-                    metrics.valid_records += 1
-                    
-                    # Update field quality scores
-                    for field, score in record_metrics.get('field_scores', {}).items():
-                        if field not in metrics.field_quality_scores:
-                            metrics.field_quality_scores[field] = []
-                        metrics.field_quality_scores[field].append(score)
-                    
-                    # Track corrections
-                    if record_metrics.get('corrected', False):
-                        metrics.corrected_records += 1
                 else:
-                    metrics.invalid_records += 1
-                    
+                    aggregate.add_invalid()
+            
             except Exception as e:
                 self.logger.error(f"Error cleaning record {record.id}: {str(e)}")
-                metrics.invalid_records += 1
+                aggregate.add_invalid()
         
-        # Update metrics
-        metrics.duplicate_records = duplicate_count
-        
-        # Calculate quality scores
-        metrics = self._calculate_quality_scores(metrics, cleaned_data)
-        
-        # Calculate processing time
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
-        metrics.processing_time = processing_time
+        return cleaned_data
+
+    def _clean_records(self, records: List[ScrapedData]) -> List[Tuple[Optional[ScrapedData], Dict[str, Any]]]:
+        """
+        Clean records with the columnar engine, or one by one for small batches.
         
-        self.logger.info(
-            f"Data cleaning completed. Valid: {metrics.valid_records}, "
-            f"Invalid: {metrics.invalid_records}, Duplicates: {metrics.duplicate_records}, "
-            f"Processing time: {processing_time:.2f}s"
-        )
+        Args:
+            records: Deduplicated records to clean
+            
+        Returns:
+            (cleaned_record, record_metrics) per record, in input order
+        """
+        if len(records) >= self.columnar_min_batch:
+            try:
+                return self.columnar_cleaner.clean_batch(records)
+            except Exception as e:
+                self.logger.warning(f"Columnar cleaning failed, cleaning records one by one: {str(e)}")
         
-        return cleaned_data, metrics
+        return [self._clean_single_record(record) for record in records]
     
     def _clean_single_record(self, record: ScrapedData) -> Tuple[Optional[ScrapedData], Dict[str, Any]]:
         """
@@ -272,24 +422,7 @@ class DataCleaner:
             overall_score = (avg_field_score + type_validation_score) / 2
             
             # Update the record with cleaned data
-            cleaned_record = ScrapedData(
-                id=record.id,
-                job_id=record.job_id,
-                url=record.url,
-                content=cleaned_content,
-                raw_html=record.raw_html,
-                content_type=record.content_type,
-                content_metadata=record.content_metadata,
-                confidence_score=record.confidence_score,
-                ai_processed=record.ai_processed,
-                ai_metadata=record.ai_metadata,
-                data_quality_score=overall_score,
-                validation_errors=validation_errors,
-                extracted_at=record.extracted_at,
-                processed_at=record.processed_at,
-                content_length=record.content_length,
-                load_time=record.load_time
-            )
+            cleaned_record = self._build_cleaned_record(record, cleaned_content, overall_score, validation_errors)
             
             record_metrics['validation_errors'] = validation_errors
             
@@ -305,6 +438,33 @@ class DataCleaner:
             record_metrics['validation_errors'].append(f"Cleaning failed: {str(e)}")
             return None, record_metrics
     
+    def _build_cleaned_record(
+        self,
+        record: ScrapedData,
+        cleaned_content: Dict[str, Any],
+        quality_score: float,
+        validation_errors: List[str]
+    ) -> ScrapedData:
+        """Create the cleaned copy of a record."""
+        return ScrapedData(
+            id=record.id,
+            job_id=record.job_id,
+            url=record.url,
+            content=cleaned_content,
+            raw_html=record.raw_html,
+            content_type=record.content_type,
+            content_metadata=record.content_metadata,
+            confidence_score=record.confidence_score,
+            ai_processed=record.ai_processed,
+            ai_metadata=record.ai_metadata,
+            data_quality_score=quality_score,
+            validation_errors=validation_errors,
+            extracted_at=record.extracted_at,
+            processed_at=record.processed_at,
+            content_length=record.content_length,
+            load_time=record.load_time
+        )
+
     def _apply_cleaning_rule(self, value: Any, rule: CleaningRule) -> Tuple[Any, float, bool]:
         """
         Apply a specific cleaning rule to a field value.
@@ -509,21 +669,68 @@ class DataCleaner:
     
     def _generate_content_hash(self, content: Dict[str, Any]) -> str:
         """Generate a hash for content to detect duplicates."""
-        # Create a normalized string representation of the content
-        content_str = str(sorted(content.items()))
-        return hashlib.md5(content_str.encode()).hexdigest()
+        return content_fingerprint(content)
+    
+    def flag_near_duplicates(self, records: List[ScrapedData]) -> int:
+        """
+        Mark records that nearly duplicate earlier records of the batch or history.
+        
+        Exact duplicates are dropped during deduplication; near duplicates
+        are only annotated with ``near_duplicate_of`` and
+        ``near_duplicate_similarity`` in their content_metadata (best match
+        wins). Does nothing without a near-duplicate index. The records are
+        not added to the index; that happens once they are saved (see
+        index_saved_records()).
+        
+        Args:
+            records: Cleaned records, modified in place
+        
+        Returns:
+            Number of records flagged
+        """
+        if self.near_duplicate_index is None or not records:
+            return 0
+        
+        best: Dict[str, Tuple[str, float]] = {}
+        for original_id, record_id, similarity in self.detect_duplicates(records):
+            if record_id not in best or similarity > best[record_id][1]:
+                best[record_id] = (original_id, similarity)
+        
+        for record in records:
+            if record.id in best:
+                original_id, similarity = best[record.id]
+                record.content_metadata["near_duplicate_of"] = original_id
+                record.content_metadata["near_duplicate_similarity"] = round(similarity, 3)
+        return len(best)
     
-    def detect_duplicates(self, data: List[ScrapedData]) -> List[Tuple[str, str, float]]:
+    def detect_duplicates(self, data: List[ScrapedData], update_index: bool = False) -> List[Tuple[str, str, float]]:
         """
-        Detect duplicate records using content hashing and similarity algorithms.
+        Detect duplicate records using content hashing and MinHash/LSH similarity search.
+        
+        Exact duplicates are found by content hash. Near-duplicate candidates
+        come from an LSH index over per-record MinHash signatures and are
+        confirmed with the field similarity measure, so only records sharing a
+        bucket are compared instead of every pair. When the cleaner has a
+        historical index, records are also matched against all previously
+        indexed records using the estimated similarity of their signatures.
+        
+        Candidates need a high Jaccard similarity over all field-qualified
+        words, which is stricter than the old pairwise check in one case: that
+        check scored only the fields both records have, so a record matching
+        a subset of another's fields, e.g. {"title": "Hello"} and
+        {"title": "Hello", "text": "..."}, scored 1.0. Such pairs rarely share
+        an LSH bucket and are no longer reported unless the extra fields are
+        short.
         
         Args:
             data: List of ScrapedData objects to check for duplicates
-            
+            update_index: Add the records to the historical index afterwards
+        
         Returns:
             List of tuples (record_id1, record_id2, similarity_score)
         """
         duplicates = []
+        reported: Set[Tuple[str, str]] = set()
         content_hashes = {}
         
         # First pass: exact duplicates using hashes
@@ -532,16 +739,46 @@ class DataCleaner:
             
             if content_hash in content_hashes:
                 duplicates.append((content_hashes[content_hash], record.id, 1.0))
+                reported.add((content_hashes[content_hash], record.id))
             else:
                 content_hashes[content_hash] = record.id
         
-        # Second pass: similarity-based duplicates
-        for i, record1 in enumerate(data):
-            for j, record2 in enumerate(data[i+1:], i+1):
-                similarity = self._calculate_content_similarity(record1.content, record2.content)
+        # Second pass: similarity-based duplicates among LSH candidates
+        history = self.near_duplicate_index
+        batch_index = (
+            NearDuplicateIndex(num_perm=history.num_perm, bands=history.bands, seed=history.seed)
+            if history is not None else NearDuplicateIndex()
+        )
+        records = {}
+        signatures = {}
+        for record in data:
+            signature = batch_index.signature(record.content)
+            if signature is None:
+                continue
+            
+            for candidate_id, _ in batch_index.query(signature):
+                if (candidate_id, record.id) in reported:
+                    continue
+                similarity = self._calculate_content_similarity(records[candidate_id].content, record.content)
                 
                 if similarity >= self.similarity_threshold:
-                    duplicates.append((record1.id, record2.id, similarity))
+                    duplicates.append((candidate_id, record.id, similarity))
+                    reported.add((candidate_id, record.id))
+            
+            records[record.id] = record
+            signatures[record.id] = signature
+            batch_index.add(record.id, signature)
+        
+        # Third pass: matches against historical records, whose content is not kept
+        if history is not None:
+            for record_id, signature in signatures.items():
+                for historical_id, similarity in history.query(signature, self.similarity_threshold, exclude=record_id):
+                    if historical_id not in records:
+                        duplicates.append((historical_id, record_id, similarity))
+            
+            if update_index:
+                for record_id, signature in signatures.items():
+                    history.add(record_id, signature)
         
         self.logger.info(f"Found {len(duplicates)} duplicate pairs")
         return duplicates
@@ -551,20 +788,16 @@ class DataCleaner:
         if not content1 or not content2:
             return 0.0
         
-        # Convert to pandas Series for easier comparison
         try:
-            df1 = pd.Series(content1)
-            df2 = pd.Series(content2)
-            
             # Find common keys
-            common_keys = set(df1.index) & set(df2.index)
+            common_keys = content1.keys() & content2.keys()
             if not common_keys:
                 return 0.0
             
             # Calculate similarity for common fields
             similarities = []
             for key in common_keys:
-                val1, val2 = str(df1[key]), str(df2[key])
+                val1, val2 = str(content1[key]), str(content2[key])
                 
                 if val1 == val2:
                     similarities.append(1.0)
@@ -581,48 +814,11 @@ class DataCleaner:
                         similarities.append(0.0)
             
             return sum(similarities) / len(similarities) if similarities else 0.0
-            
+        
         except Exception as e:
             self.logger.error(f"Error calculating content similarity: {str(e)}")
             return 0.0
-    
-    def _calculate_quality_scores(self, metrics: DataQualityMetrics, cleaned_data: List[ScrapedData]) -> DataQualityMetrics:
-        """Calculate overall quality scores for the dataset."""
-        if metrics.total_records == 0:
-            return metrics
-        
-        # Calculate completeness score
-        metrics.completeness_score = metrics.valid_records / metrics.total_records
-        
-        # Calculate accuracy score based on validation errors
-        total_errors = sum(len(record.validation_errors) for record in cleaned_data)
-        max_possible_errors = metrics.valid_records * 5  # Assume max 5 errors per record
-        metrics.accuracy_score = max(0.0, 1.0 - (total_errors / max_possible_errors)) if max_possible_errors > 0 else 1.0
-        
-        # Calculate consistency score based on field quality scores
-        if metrics.field_quality_scores:
-            field_averages = []
-            for field, scores in metrics.field_quality_scores.items():
-                if isinstance(scores, list):
-                    avg_score = sum(scores) / len(scores)
-                    metrics.field_quality_scores[field] = avg_score
-                    field_averages.append(avg_score)
-                else:
-                    field_averages.append(scores)
-            
-            metrics.consistency_score = sum(field_averages) / len(field_averages) if field_averages else 0.0
-        else:
-            metrics.consistency_score = 0.0
-        
-        # Calculate overall quality score
-        metrics.overall_quality_score = (
-            metrics.completeness_score * 0.4 +
-            metrics.accuracy_score * 0.4 +
-            metrics.consistency_score * 0.2
-        )
-        
-        return metrics
-    
+
     def generate_quality_report(self, metrics: DataQualityMetrics) -> Dict[str, Any]:
         """Generate a comprehensive data quality report."""
         report = {
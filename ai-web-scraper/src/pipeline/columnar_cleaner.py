@@ -0,0 +1,307 @@
+"""
+Columnar batch engine for DataCleaner.
+
+DataCleaner._clean_single_record walks each record field by field and runs
+each cleaning rule's regexes on one value at a time. This engine pivots a
+batch of records into one long column of (record, field, value) rows, applies
+every CleaningRule once over all the rows it matches using pandas/numpy column
+operations and C-level string methods, and pivots the results back into
+records. Rule semantics, cleaned values and
+per-record metrics are the same as the per-record path, which remains the
+fallback for rules without a vectorized form and for batches the engine
+cannot handle.
+"""
+
+import string
+import unicodedata
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from ..models.pydantic_models import ScrapedData
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from .cleaner import CleaningRule, DataCleaner
+
+logger = get_logger(__name__)
+
+_ASCII_LETTERS = string.ascii_letters.encode("ascii")
+
+# Vectorized rule: (cleaner, original values, rule parameters) -> (cleaned values, scores)
+VectorizedRule = Callable[["DataCleaner", pd.Series, Dict[str, Any]], Tuple[pd.Series, np.ndarray]]
+
+
+def _url_score(url: str) -> float:
+    try:
+        parsed = urlparse(url)
+        return 1.0 if parsed.scheme and parsed.netloc else 0.4
+    except Exception:
+        return 0.2
+
+
+def _parse_price(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _clean_email_column(cleaner: "DataCleaner", values: pd.Series, parameters: Dict[str, Any]) -> Tuple[pd.Series, np.ndarray]:
+    cleaned = values.str.strip()
+    if parameters.get("normalize_case", True):
+        cleaned = cleaned.str.lower()
+
+    valid = cleaned.str.match(cleaner.email_pattern.pattern).astype(bool).to_numpy()
+    domain_has_dot = cleaned.str.rsplit("@", n=1).str[-1].str.contains(".", regex=False)
+    partial = (cleaned.str.contains("@", regex=False) & domain_has_dot).astype(bool).to_numpy()
+    scores = np.where(valid, 1.0, np.where(partial, 0.7, 0.2))
+    return cleaned, scores
+
+
+def _clean_phone_column(cleaner: "DataCleaner", values: pd.Series, parameters: Dict[str, Any]) -> Tuple[pd.Series, np.ndarray]:
+    cleaned = values.str.strip()
+    if parameters.get("remove_formatting", True):
+        cleaned = cleaned.str.replace(r'[\s\-\(\)\.]', '', regex=True)
+
+    valid = cleaned.str.match(cleaner.phone_pattern.pattern).astype(bool).to_numpy()
+    digits_only = cleaned.str.replace(r'\D', '', regex=True)
+    plausible = digits_only.str.len().between(7, 15).to_numpy()
+    cleaned = cleaned.where(valid | ~plausible, digits_only)
+    scores = np.where(valid, 1.0, np.where(plausible, 0.8, 0.2))
+    return cleaned, scores
+
+
+def _clean_url_column(cleaner: "DataCleaner", values: pd.Series, parameters: Dict[str, Any]) -> Tuple[pd.Series, np.ndarray]:
+    cleaned = values.str.strip()
+
+    if parameters.get("normalize_scheme", True):
+        has_scheme = cleaned.str.startswith(('http://', 'https://'))
+        protocol_relative = ~has_scheme & cleaned.str.startswith('//')
+        bare_host = ~has_scheme & ~protocol_relative & cleaned.str.contains('.', regex=False)
+        cleaned = cleaned.mask(protocol_relative, 'https:' + cleaned).mask(bare_host, 'https://' + cleaned)
+
+    if parameters.get("remove_fragments", False):
+        cleaned = cleaned.str.split('#', n=1).str[0]
+
+    # urlparse has no vectorized equivalent; parse each distinct URL once
+    scores_by_url = {url: _url_score(url) for url in cleaned.unique()}
+    scores = cleaned.map(scores_by_url).to_numpy(dtype=float)
+    return cleaned, scores
+
+
+def _clean_text_column(cleaner: "DataCleaner", values: pd.Series, parameters: Dict[str, Any]) -> Tuple[pd.Series, np.ndarray]:
+    texts = values.tolist()
+    if parameters.get("remove_extra_whitespace", True):
+        # str.split() and re's \s agree on what whitespace is, so this equals re.sub(r'\s+', ' ', text.strip())
+        texts = [" ".join(text.split()) for text in texts]
+    ascii_rows = np.fromiter((text.isascii() for text in texts), dtype=bool, count=len(texts))
+    if parameters.get("normalize_unicode", True):
+        # ASCII text is already NFKC-normalized
+        texts = [text if is_ascii else unicodedata.normalize('NFKC', text) for text, is_ascii in zip(texts, ascii_rows)]
+        ascii_rows = np.fromiter((text.isascii() for text in texts), dtype=bool, count=len(texts))
+
+    # ASCII letters are counted by deleting them in C; str.isalpha() decides for other text
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    alpha_counts = np.fromiter(
+        (
+            len(text) - len(text.encode("ascii").translate(None, _ASCII_LETTERS)) if is_ascii
+            else sum(c.isalpha() for c in text)
+            for text, is_ascii in zip(texts, ascii_rows)
+        ),
+        dtype=np.int64,
+        count=len(texts)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha_ratio = alpha_counts / lengths
+    scores = np.where(
+        lengths == 0, 0.0,
+        np.where(lengths < 3, 0.5, np.where(alpha_ratio > 0.3, 0.9, 0.6))
+    )
+    return pd.Series(texts, index=values.index, dtype=object), scores
+
+
+def _clean_price_column(cleaner: "DataCleaner", values: pd.Series, parameters: Dict[str, Any]) -> Tuple[pd.Series, np.ndarray]:
+    cleaned = values.str.strip()
+
+    numeric = cleaned.str.extract(r'([\d,]+\.?\d*)', expand=False)
+    matched = numeric.notna().to_numpy()
+    prices = numeric.str.replace(',', '', regex=False).map(_parse_price)
+    parsed = prices.notna().to_numpy()
+
+    decimal_places = parameters.get("decimal_places", 2)
+    currency_symbol = parameters.get("currency_symbol") or ""
+    if parsed.any():
+        formatted = [f"{currency_symbol}{price:.{decimal_places}f}" for price in prices[parsed]]
+        cleaned = cleaned.copy()
+        cleaned[parsed] = formatted
+
+    scores = np.where(parsed, 0.9, np.where(matched, 0.3, 0.1))
+    return cleaned, scores
+
+
+VECTORIZED_RULES: Dict[str, VectorizedRule] = {
+    "email_validation": _clean_email_column,
+    "phone_normalization": _clean_phone_column,
+    "url_validation": _clean_url_column,
+    "text_cleaning": _clean_text_column,
+    "price_normalization": _clean_price_column,
+}
+
+
+class ColumnarCleaner:
+    """
+    Applies a DataCleaner's rules to a whole batch of records at once.
+
+    Produces the same (cleaned_record, record_metrics) pairs as
+    DataCleaner._clean_single_record for every record.
+    """
+
+    def __init__(self, cleaner: "DataCleaner"):
+        """
+        Initialize the engine.
+
+        Args:
+            cleaner: Cleaner whose rules, patterns and validation are applied
+        """
+        self.cleaner = cleaner
+
+    def clean_batch(self, records: List[ScrapedData]) -> List[Tuple[Optional[ScrapedData], Dict[str, Any]]]:
+        """
+        Clean a batch of records.
+
+        Args:
+            records: Records to clean
+
+        Returns:
+            (cleaned_record, record_metrics) per record, in input order;
+            cleaned_record is None for rejected records
+        """
+        # Pivot: one row per non-None field value
+        row_records: List[int] = []
+        row_fields: List[str] = []
+        row_values: List[str] = []
+        scalar_records: Dict[int, Tuple[Optional[ScrapedData], Dict[str, Any]]] = {}
+
+        for position, record in enumerate(records):
+            try:
+                fields = [
+                    (field_name, field_value if isinstance(field_value, str) else str(field_value))
+                    for field_name, field_value in record.content.items()
+                    if field_value is not None
+                ]
+            except Exception:
+                # Values that cannot be stringified take the per-record path and its error handling
+                scalar_records[position] = self.cleaner._clean_single_record(record)
+                continue
+            for field_name, value in fields:
+                row_records.append(position)
+                row_fields.append(field_name)
+                row_values.append(value)
+
+        original = pd.Series(row_values, dtype=object)
+        field_names = np.array(row_fields, dtype=object)
+        row_scores = np.ones(len(row_values))
+        row_corrected = np.zeros(len(row_values), dtype=bool)
+        cleaned_values = np.empty(len(row_values), dtype=object)
+
+        for rule in self.cleaner.cleaning_rules:
+            if not rule.enabled:
+                continue
+            if rule.field_name == "text":
+                mask = np.ones(len(row_values), dtype=bool)
+            else:
+                mask = field_names == rule.field_name
+            if not mask.any():
+                continue
+
+            values = original[mask]
+            cleaned, scores = self._apply_rule(rule, values)
+
+            # Empty values are returned unchanged with zero confidence
+            empty = (values == "").to_numpy()
+            cleaned = cleaned.where(~empty, values)
+            scores = np.where(empty, 0.0, scores)
+
+            corrected = (cleaned != values).to_numpy()
+            positions = np.flatnonzero(mask)
+            row_scores[positions] = np.minimum(row_scores[positions], scores)
+            row_corrected[positions] |= corrected
+            cleaned_values[positions[corrected]] = cleaned.to_numpy()[corrected]
+
+        # Pivot back into records
+        results: List[Tuple[Optional[ScrapedData], Dict[str, Any]]] = []
+        row_scores_list = row_scores.tolist()
+        row = 0
+        for position, record in enumerate(records):
+            if position in scalar_records:
+                results.append(scalar_records[position])
+                continue
+
+            cleaned_content = record.content.copy()
+            field_scores: Dict[str, float] = {}
+            corrected = False
+            while row < len(row_records) and row_records[row] == position:
+                field_name = row_fields[row]
+                if row_corrected[row]:
+                    cleaned_content[field_name] = cleaned_values[row]
+                    corrected = True
+                field_scores[field_name] = row_scores_list[row]
+                row += 1
+
+            results.append(self._finish_record(record, cleaned_content, field_scores, corrected))
+
+        return results
+
+    def _apply_rule(self, rule: "CleaningRule", values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """Apply one rule to the distinct values it matches, vectorized when possible."""
+        # Scraped fields repeat a lot (navigation text, categories, currencies); clean each value once
+        codes, distinct = pd.factorize(values)
+        distinct = pd.Series(distinct, dtype=object)
+
+        vectorized = VECTORIZED_RULES.get(rule.rule_type)
+        cleaned = None
+        if vectorized is not None:
+            try:
+                cleaned, scores = vectorized(self.cleaner, distinct, rule.parameters)
+            except Exception as e:
+                logger.warning(f"Vectorized {rule.rule_type} failed, applying it per value: {str(e)}")
+
+        if cleaned is None:
+            outcomes = [self.cleaner._apply_cleaning_rule(value, rule) for value in distinct]
+            cleaned = pd.Series([outcome[0] for outcome in outcomes], dtype=object)
+            scores = np.array([outcome[1] for outcome in outcomes], dtype=float)
+
+        cleaned = pd.Series(cleaned.to_numpy()[codes], index=values.index, dtype=object)
+        return cleaned, np.asarray(scores, dtype=float)[codes]
+
+    def _finish_record(
+        self,
+        record: ScrapedData,
+        cleaned_content: Dict[str, Any],
+        field_scores: Dict[str, float],
+        corrected: bool
+    ) -> Tuple[Optional[ScrapedData], Dict[str, Any]]:
+        """Score a cleaned record the way _clean_single_record does."""
+        validation_errors: List[str] = []
+        type_validation_score = self.cleaner._validate_data_types(cleaned_content, validation_errors)
+
+        scores = list(field_scores.values())
+        avg_field_score = sum(scores) / len(scores) if scores else 0.5
+        overall_score = (avg_field_score + type_validation_score) / 2
+
+        record_metrics = {
+            'field_scores': field_scores,
+            'corrected': corrected,
+            'validation_errors': validation_errors
+        }
+        if overall_score < 0.3:
+            return None, record_metrics
+
+        cleaned_record = self.cleaner._build_cleaned_record(record, cleaned_content, overall_score, validation_errors)
+        return cleaned_record, record_metrics
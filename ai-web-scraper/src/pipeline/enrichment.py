@@ -0,0 +1,237 @@
+"""
+Deferred AI enrichment of saved scraped data.
+
+Scraped records are saved as soon as they are extracted, scored with the
+heuristic confidence below and marked as pending enrichment. The AI analysis
+runs afterwards: Celery workers queue enrich_data_task, and in-process callers
+such as the API use the AIEnrichmentQueue in this module. Either way the
+stored record is updated in place and the job's enriched-page counter is
+incremented, so jobs report scraped and enriched progress separately.
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from ..ai.confidence_scorer import ConfidenceScorer
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# processing_status values of records whose AI analysis has not finished
+PENDING_STATUS = "pending"
+FAILED_STATUS = "failed"
+
+# processing_status values that carry usable AI results
+SUCCESS_STATUSES = {"success", "partial_success"}
+
+
+def pending_ai_metadata() -> Dict[str, Any]:
+    """AI metadata for a record saved before its AI analysis has run."""
+    return {"processing_status": PENDING_STATUS, "queued_at": datetime.utcnow().isoformat()}
+
+
+def failed_ai_metadata(error: BaseException) -> Dict[str, Any]:
+    """AI metadata for a record whose deferred AI analysis failed."""
+    return {
+        "processing_status": FAILED_STATUS,
+        "error": str(error),
+        "failed_at": datetime.utcnow().isoformat()
+    }
+
+
+def is_pending(ai_metadata: Optional[Dict[str, Any]]) -> bool:
+    """Whether a record is still waiting for AI enrichment."""
+    return bool(ai_metadata) and ai_metadata.get("processing_status") == PENDING_STATUS
+
+
+async def heuristic_confidence(content: Dict[str, Any]) -> float:
+    """
+    Confidence score for extracted content before any AI analysis.
+
+    The extracted content is scored as structured data with no entities or
+    classification, so the score reflects extraction completeness and
+    structure only and is replaced once the AI analysis finishes.
+
+    Args:
+        content: Extracted content dictionary
+
+    Returns:
+        Confidence score between 0.0 and 1.0
+    """
+    return await ConfidenceScorer().calculate_confidence(
+        structured_data=content or {},
+        entities=[],
+        classification={},
+        raw_content=str((content or {}).get("text") or "")
+    )
+
+
+@dataclass
+class EnrichmentRequest:
+    """One saved record waiting for AI analysis."""
+    data_id: str
+    job_id: str
+    url: str
+    # Runs the AI analysis and returns the new ai_metadata
+    analyze: Callable[[], Awaitable[Dict[str, Any]]]
+    # Persists the ai_metadata for data_id and advances the job's progress
+    store: Callable[["EnrichmentRequest", Dict[str, Any]], Awaitable[None]]
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class AIEnrichmentQueue:
+    """
+    Bounded in-process queue that runs deferred AI analyses in the background.
+
+    Workers are started on the running event loop with the first request.
+    A failed analysis is stored as failed rather than retried, so every
+    queued record reaches a final state and enriched progress can complete.
+    """
+
+    def __init__(self, concurrency: int = 4, max_pending: int = 1000):
+        """
+        Initialize the enrichment queue.
+
+        Args:
+            concurrency: Number of analyses running at once
+            max_pending: Maximum queued requests before submit() refuses more
+        """
+        self.concurrency = max(concurrency, 1)
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: Set[asyncio.Task] = set()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "enriched": 0,
+            "failed": 0,
+            "store_errors": 0,
+            "total_wait_seconds": 0.0
+        }
+
+    def submit(self, request: EnrichmentRequest) -> bool:
+        """
+        Queue a record for AI enrichment.
+
+        Args:
+            request: Enrichment request
+
+        Returns:
+            True if queued; False if the queue is full, in which case the
+            record stays pending
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            logger.warning(
+                "AI enrichment queue full, record left pending",
+                extra={"data_id": request.data_id, "job_id": request.job_id}
+            )
+            return False
+
+        self._stats["submitted"] += 1
+        self._start_workers()
+        return True
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.concurrency:
+            task = asyncio.ensure_future(self._worker())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    async def _worker(self) -> None:
+        while True:
+            request = await self._queue.get()
+            try:
+                await self._enrich(request)
+            finally:
+                self._queue.task_done()
+
+    async def _enrich(self, request: EnrichmentRequest) -> None:
+        self._stats["total_wait_seconds"] += time.monotonic() - request.queued_at
+        try:
+            ai_metadata = await request.analyze()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Deferred AI analysis failed",
+                extra={"data_id": request.data_id, "url": request.url, "error": str(e)}
+            )
+            ai_metadata = failed_ai_metadata(e)
+
+        if ai_metadata.get("processing_status") in SUCCESS_STATUSES:
+            self._stats["enriched"] += 1
+        else:
+            self._stats["failed"] += 1
+
+        try:
+            await request.store(request, ai_metadata)
+        except Exception as e:
+            self._stats["store_errors"] += 1
+            logger.error(
+                "Failed to store AI enrichment",
+                extra={"data_id": request.data_id, "job_id": request.job_id, "error": str(e)}
+            )
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued request has been processed.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """Stop the workers; queued requests stay pending."""
+        for task in list(self._workers):
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get enrichment queue statistics."""
+        stats = dict(self._stats)
+        total_wait = stats.pop("total_wait_seconds")
+        finished = stats["enriched"] + stats["failed"]
+        stats["pending"] = self._queue.qsize() if self._queue is not None else 0
+        stats["workers"] = len(self._workers)
+        stats["average_wait_seconds"] = round(total_wait / finished, 3) if finished else 0.0
+        return stats
+
+
+# The queue and its workers are bound to one event loop
+_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AIEnrichmentQueue]" = weakref.WeakKeyDictionary()
+
+
+def get_enrichment_queue() -> AIEnrichmentQueue:
+    """Get the enrichment queue for the running event loop."""
+    loop = asyncio.get_running_loop()
+    queue = _queues.get(loop)
+    if queue is None:
+        from config.settings import get_settings
+        settings = get_settings()
+        queue = AIEnrichmentQueue(
+            concurrency=settings.ai_enrichment_concurrency,
+            max_pending=settings.ai_enrichment_max_pending
+        )
+        _queues[loop] = queue
+    return queue
@@ -0,0 +1,62 @@
+"""
+Canonical content fingerprints for exact duplicate detection.
+
+Content dictionaries are serialized canonically (sorted keys at every
+nesting level, fixed separators, sets sorted) so logically identical content
+always produces the same bytes, then hashed with BLAKE2b. The fingerprint is
+stored in the indexed scraped_data.content_hash column, which turns duplicate
+checks into a single index lookup across all jobs.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Dict
+
+# Hex length of stored fingerprints (128-bit digest)
+FINGERPRINT_LENGTH = 32
+
+
+def _canonical_default(value: Any) -> Any:
+    """JSON fallback for values json.dumps does not handle natively."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=lambda item: json.dumps(item, sort_keys=True, default=_canonical_default))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def canonical_content(content: Dict[str, Any]) -> bytes:
+    """
+    Serialize content to canonical bytes.
+
+    Args:
+        content: Content dictionary, possibly nested
+
+    Returns:
+        UTF-8 encoded canonical JSON
+    """
+    return json.dumps(
+        content,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical_default
+    ).encode("utf-8")
+
+
+def content_fingerprint(content: Dict[str, Any]) -> str:
+    """
+    Fingerprint content for duplicate detection.
+
+    Args:
+        content: Content dictionary, possibly nested
+
+    Returns:
+        Hex BLAKE2b-128 digest of the canonical serialization
+    """
+    return hashlib.blake2b(canonical_content(content), digest_size=FINGERPRINT_LENGTH // 2).hexdigest()
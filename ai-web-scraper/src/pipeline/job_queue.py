@@ -6,8 +6,10 @@ for managing asynchronous scraping operations with Redis backend.
 """
 
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import redis
@@ -55,8 +57,13 @@ celery_app.conf.update(
     # Task routing
     task_routes={
         "src.pipeline.worker.scrape_url_task": {"queue": "scraping"},
+        "src.pipeline.worker.scrape_chunk_task": {"queue": "scraping"},
+        "src.pipeline.worker.finish_batch_scrape_task": {"queue": "scraping"},
         "src.pipeline.worker.process_content_task": {"queue": "processing"},
         "src.pipeline.worker.clean_data_task": {"queue": "cleaning"},
+        "src.pipeline.worker.clean_batch_task": {"queue": "cleaning"},
+        "src.pipeline.worker.merge_cleaning_results_task": {"queue": "cleaning"},
+        "src.pipeline.worker.enrich_data_task": {"queue": "enrichment"},
     },
     
     # Task execution settings
@@ -89,6 +96,82 @@ celery_app.conf.update(
     task_send_events=True,
 )
 
+# Job hashes expire after this many seconds
+JOB_TTL_SECONDS = 86400
+
+# Secondary indexes over the job:<id> hashes. Index scores are creation
+# timestamps, so every listing is a range read instead of a KEYS scan.
+JOBS_CREATED_KEY = "jobs:created"          # sorted set of all job IDs
+JOBS_STATUS_KEY_PREFIX = "jobs:status:"    # sorted set of job IDs per status
+JOBS_USER_KEY_PREFIX = "jobs:user:"        # sorted set of job IDs per user
+JOBS_OWNER_KEY = "jobs:owner"              # hash of job ID -> user ID
+JOBS_STATUS_COUNTS_KEY = "jobs:status_counts"  # hash of status -> job count
+
+# Sets job fields and moves the job between status indexes and counters
+# in one step, based on the status stored in the hash. Does nothing when the
+# hash does not exist (expired), so no partial, TTL-less hash is recreated.
+# KEYS: job hash, created index, status counts
+# ARGV: job ID, new status, status key prefix, field/value pairs...
+_UPDATE_STATUS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local old_status = redis.call('HGET', KEYS[1], 'status')
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+if old_status and old_status ~= ARGV[2] then
+    local created = redis.call('ZSCORE', KEYS[2], ARGV[1])
+    if created then
+        redis.call('ZREM', ARGV[3] .. old_status, ARGV[1])
+        redis.call('ZADD', ARGV[3] .. ARGV[2], created, ARGV[1])
+        redis.call('HINCRBY', KEYS[3], old_status, -1)
+        redis.call('HINCRBY', KEYS[3], ARGV[2], 1)
+    end
+end
+return old_status
+"""
+
+# Increments progress counters of an existing job hash.
+# KEYS: job hash
+# ARGV: counter/amount pairs...
+_INCREMENT_PROGRESS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# Deletes a job and removes it from every index. Works for jobs whose hash
+# has already expired: status indexes are probed and the owner is kept in
+# a separate hash.
+# KEYS: job hash, created index, status counts, owner hash
+# ARGV: job ID, status key prefix, user key prefix, statuses...
+_REMOVE_JOB_SCRIPT = """
+redis.call('DEL', KEYS[1])
+local removed = redis.call('ZREM', KEYS[2], ARGV[1])
+for i = 4, #ARGV do
+    if redis.call('ZREM', ARGV[2] .. ARGV[i], ARGV[1]) == 1 then
+        redis.call('HINCRBY', KEYS[3], ARGV[i], -1)
+    end
+end
+local user_id = redis.call('HGET', KEYS[4], ARGV[1])
+if user_id then
+    redis.call('ZREM', ARGV[3] .. user_id, ARGV[1])
+    redis.call('HDEL', KEYS[4], ARGV[1])
+end
+return removed
+"""
+
+
+def _timestamp_score(value: datetime) -> float:
+    """Index score of a timestamp; naive datetimes are UTC like the rest of the job store."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
 class JobQueue:
     """
     Manages asynchronous scraping tasks using Celery and Redis.
@@ -107,6 +190,9 @@ class JobQueue:
         self.redis_url = redis_url or REDIS_URL
         self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
         self.logger = get_logger(self.__class__.__name__)
+        self._update_status_script = self.redis_client.register_script(_UPDATE_STATUS_SCRIPT)
+        self._increment_progress_script = self.redis_client.register_script(_INCREMENT_PROGRESS_SCRIPT)
+        self._remove_job_script = self.redis_client.register_script(_REMOVE_JOB_SCRIPT)
         
         # Test Redis connection
         try:
@@ -151,7 +237,8 @@ class JobQueue:
         config: ScrapingConfig = None,
         priority: int = 5,
         eta: datetime = None,
-        countdown: int = None
+        countdown: int = None,
+        user_id: str = None
     ) -> ScrapingJob:
         """
         Submit a new scraping job to the queue.
@@ -162,6 +249,7 @@ class JobQueue:
             priority: Job priority (1=highest, 10=lowest)
             eta: Estimated time of arrival for job execution
             countdown: Delay in seconds before job execution
+            user_id: User who created the job
             
         Returns:
             ScrapingJob: Created job instance
@@ -174,27 +262,37 @@ class JobQueue:
             url=url,
             config=config,
             priority=priority,
-            status=JobStatus.PENDING
+            status=JobStatus.PENDING,
+            user_id=user_id
         )
         
         try:
-            # Store job in Redis
+            # Store job in Redis together with its index entries
             job_key = f"job:{job.id}"
-            self.redis_client.hset(
-                job_key,
-                mapping={
-                    "id": job.id,
-                    "url": job.url,
-                    "config": job.config.model_dump_json(),
-                    "status": job.status.value,
-                    "created_at": job.created_at.isoformat(),
-                    "priority": job.priority,
-                    "retry_count": job.retry_count
-                }
-            )
+            job_data = {
+                "id": job.id,
+                "url": job.url,
+                "config": job.config.model_dump_json(),
+                "status": job.status.value,
+                "created_at": job.created_at.isoformat(),
+                "priority": job.priority,
+                "retry_count": job.retry_count
+            }
+            if user_id:
+                job_data["user_id"] = user_id
+            created_score = _timestamp_score(job.created_at)
             
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.hset(job_key, mapping=job_data)
             # Set expiration for job data (24 hours)
-            self.redis_client.expire(job_key, 86400)
+            pipe.expire(job_key, JOB_TTL_SECONDS)
+            pipe.zadd(JOBS_CREATED_KEY, {job.id: created_score})
+            pipe.zadd(f"{JOBS_STATUS_KEY_PREFIX}{job.status.value}", {job.id: created_score})
+            pipe.hincrby(JOBS_STATUS_COUNTS_KEY, job.status.value, 1)
+            if user_id:
+                pipe.zadd(f"{JOBS_USER_KEY_PREFIX}{user_id}", {job.id: created_score})
+                pipe.hset(JOBS_OWNER_KEY, job.id, user_id)
+            pipe.execute()
             
             # Submit task to Celery - import here to avoid circular import
             try:
@@ -265,32 +363,7 @@ class JobQueue:
             if not job_data:
                 return None
             
-            # Reconstruct job from Redis data
-            job = ScrapingJob(
-                id=job_data["id"],
-                url=job_data["url"],
-                config=ScrapingConfig.model_validate_json(job_data["config"]),
-                status=JobStatus(job_data["status"]),
-                created_at=datetime.fromisoformat(job_data["created_at"]),
-                priority=int(job_data["priority"]),
-                retry_count=int(job_data.get("retry_count", 0))
-            )
-            
-            # Update with optional fields
-            if "started_at" in job_data:
-                job.started_at = datetime.fromisoformat(job_data["started_at"])
-            if "completed_at" in job_data:
-                job.completed_at = datetime.fromisoformat(job_data["completed_at"])
-            if "error_message" in job_data:
-                job.error_message = job_data["error_message"]
-            if "total_pages" in job_data:
-                job.total_pages = int(job_data["total_pages"])
-            if "pages_completed" in job_data:
-                job.pages_completed = int(job_data["pages_completed"])
-            if "pages_failed" in job_data:
-                job.pages_failed = int(job_data["pages_failed"])
-            
-            return job
+            return self._job_from_data(job_data)
             
         except Exception as e:
             self.logger.error(
@@ -299,6 +372,104 @@ class JobQueue:
             )
             return None
     
+    def get_jobs(self, job_ids: List[str], batch_size: int = 500) -> List[ScrapingJob]:
+        """
+        Get several jobs with one pipelined round trip per batch.
+        
+        Args:
+            job_ids: Job identifiers
+            batch_size: Hashes fetched per round trip
+            
+        Returns:
+            List[ScrapingJob]: Jobs that exist, in the order of job_ids
+        """
+        try:
+            jobs = []
+            for start in range(0, len(job_ids), batch_size):
+                found, unusable = self._load_jobs(job_ids[start:start + batch_size])
+                jobs.extend(job for job in found if job is not None)
+                if unusable:
+                    self._remove_jobs(unusable)
+            return jobs
+            
+        except Exception as e:
+            self.logger.error(
+                "Failed to get jobs",
+                extra={"job_count": len(job_ids), "error": str(e)}
+            )
+            return []
+    
+    def _load_jobs(self, job_ids: List[str]) -> Tuple[List[Optional[ScrapingJob]], List[str]]:
+        """
+        Fetch job hashes in a single pipeline.
+        
+        Args:
+            job_ids: Job identifiers
+            
+        Returns:
+            Tuple of (job or None per ID, IDs whose hash is missing or malformed)
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(f"job:{job_id}")
+        
+        jobs = []
+        unusable = []
+        for job_id, job_data in zip(job_ids, pipe.execute()):
+            job = None
+            if job_data:
+                try:
+                    job = self._job_from_data(job_data)
+                except Exception as e:
+                    # e.g. a partial hash left by a write to an expired job
+                    self.logger.warning(
+                        "Skipping malformed job hash",
+                        extra={"job_id": job_id, "error": str(e)}
+                    )
+            jobs.append(job)
+            if job is None:
+                unusable.append(job_id)
+        return jobs, unusable
+    
+    def _job_from_data(self, job_data: Dict[str, str]) -> ScrapingJob:
+        """
+        Reconstruct a job from its Redis hash.
+        
+        Args:
+            job_data: Fields of a job:<id> hash
+            
+        Returns:
+            ScrapingJob: Job instance
+        """
+        job = ScrapingJob(
+            id=job_data["id"],
+            url=job_data["url"],
+            config=ScrapingConfig.model_validate_json(job_data["config"]),
+            status=JobStatus(job_data["status"]),
+            created_at=datetime.fromisoformat(job_data["created_at"]),
+            priority=int(job_data["priority"]),
+            retry_count=int(job_data.get("retry_count", 0)),
+            user_id=job_data.get("user_id")
+        )
+        
+        # Update with optional fields
+        if "started_at" in job_data:
+            job.started_at = datetime.fromisoformat(job_data["started_at"])
+        if "completed_at" in job_data:
+            job.completed_at = datetime.fromisoformat(job_data["completed_at"])
+        if "error_message" in job_data:
+            job.error_message = job_data["error_message"]
+        if "total_pages" in job_data:
+            job.total_pages = int(job_data["total_pages"])
+        if "pages_completed" in job_data:
+            job.pages_completed = int(job_data["pages_completed"])
+        if "pages_failed" in job_data:
+            job.pages_failed = int(job_data["pages_failed"])
+        if "pages_enriched" in job_data:
+            job.pages_enriched = int(job_data["pages_enriched"])
+        
+        return job
+    
     def update_job_status(
         self, 
         job_id: str, 
@@ -319,28 +490,13 @@ class JobQueue:
             bool: True if update successful, False otherwise
         """
         try:
-            job_key = f"job:{job_id}"
-            
-            # Prepare update data
-            update_data = {"status": status.value}
-            
-            if status == JobStatus.RUNNING and "started_at" not in kwargs:
-                update_data["started_at"] = datetime.utcnow().isoformat()
-            elif status in [JobStatus.COMPLETED, JobStatus.FAILED] and "completed_at" not in kwargs:
-                update_data["completed_at"] = datetime.utcnow().isoformat()
-            
-            if error_message:
-                update_data["error_message"] = error_message
-            
-            # Add any additional fields
-            for key, value in kwargs.items():
-                if isinstance(value, datetime):
-                    update_data[key] = value.isoformat()
-                else:
-                    update_data[key] = str(value)
-            
-            # Update Redis
-            self.redis_client.hset(job_key, mapping=update_data)
+            update_data = self._status_update_data(status, error_message, kwargs)
+            if self._write_status_update(self.redis_client, job_id, status, update_data) is None:
+                self.logger.warning(
+                    "Job not found for status update",
+                    extra={"job_id": job_id, "status": status.value}
+                )
+                return False
             
             self.logger.info(
                 "Updated job status",
@@ -356,6 +512,121 @@ class JobQueue:
             )
             return False
     
+    def update_jobs(self, updates: Dict[str, Tuple[JobStatus, Dict[str, str]]]) -> bool:
+        """
+        Write status updates for several jobs in one pipelined round trip.
+        
+        Args:
+            updates: Job ID -> (status, hash fields from _status_update_data)
+            
+        Returns:
+            bool: True if update successful, False otherwise
+        """
+        if not updates:
+            return True
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for job_id, (status, update_data) in updates.items():
+                self._write_status_update(pipe, job_id, status, update_data)
+            pipe.execute()
+            
+            self.logger.debug("Updated job statuses", extra={"job_count": len(updates)})
+            return True
+            
+        except Exception as e:
+            self.logger.error(
+                "Failed to update job statuses",
+                extra={"job_count": len(updates), "error": str(e)}
+            )
+            return False
+    
+    @staticmethod
+    def _status_update_data(
+        status: JobStatus,
+        error_message: Optional[str],
+        fields: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """
+        Hash fields written for a status update.
+        
+        Args:
+            status: New job status
+            error_message: Error message if job failed
+            fields: Additional fields to update
+            
+        Returns:
+            Dict[str, str]: Field values as stored in the job hash
+        """
+        update_data = {"status": status.value}
+        
+        if status == JobStatus.RUNNING and "started_at" not in fields:
+            update_data["started_at"] = datetime.utcnow().isoformat()
+        elif status in [JobStatus.COMPLETED, JobStatus.FAILED] and "completed_at" not in fields:
+            update_data["completed_at"] = datetime.utcnow().isoformat()
+        
+        if error_message:
+            update_data["error_message"] = error_message
+        
+        # Add any additional fields
+        for key, value in fields.items():
+            if isinstance(value, datetime):
+                update_data[key] = value.isoformat()
+            else:
+                update_data[key] = str(value)
+        
+        return update_data
+    
+    def _write_status_update(
+        self,
+        client: Any,
+        job_id: str,
+        status: JobStatus,
+        update_data: Dict[str, str]
+    ) -> Optional[str]:
+        """
+        Update the hash, status indexes and status counters atomically (on a client or pipeline).
+        
+        Returns:
+            Previous status, or None if the job does not exist (pipelines return the pipeline)
+        """
+        fields = [item for pair in update_data.items() for item in pair]
+        return self._update_status_script(
+            keys=[f"job:{job_id}", JOBS_CREATED_KEY, JOBS_STATUS_COUNTS_KEY],
+            args=[job_id, status.value, JOBS_STATUS_KEY_PREFIX, *fields],
+            client=client
+        )
+    
+    def increment_job_progress(self, job_id: str, **counters: int) -> bool:
+        """
+        Atomically increment job progress counters without changing the status.
+        
+        Used for progress that finishes after the job itself, such as
+        deferred AI enrichment (pages_enriched).
+        
+        Args:
+            job_id: Unique job identifier
+            **counters: Counter names and increments
+            
+        Returns:
+            bool: True if update successful, False otherwise
+        """
+        try:
+            args = [item for pair in counters.items() for item in pair]
+            if not self._increment_progress_script(keys=[f"job:{job_id}"], args=args):
+                self.logger.warning(
+                    "Job not found for progress update",
+                    extra={"job_id": job_id, "counters": list(counters)}
+                )
+                return False
+            return True
+            
+        except Exception as e:
+            self.logger.error(
+                "Failed to increment job progress",
+                extra={"job_id": job_id, "counters": list(counters), "error": str(e)}
+            )
+            return False
+    
     def cancel_job(self, job_id: str) -> bool:
         """
         Cancel a pending or running job.
@@ -400,6 +671,175 @@ class JobQueue:
             )
             return False
     
+    def _index_jobs(
+        self,
+        index_key: str,
+        limit: int,
+        min_score: Any = "-inf",
+        max_score: Any = "+inf",
+        newest_first: bool = True,
+        predicate: Callable[[ScrapingJob], bool] = None
+    ) -> List[ScrapingJob]:
+        """
+        Read jobs from a secondary index in creation order.
+        
+        Reads the index one page at a time and fetches each page's hashes in
+        a single pipeline. Index entries whose job hash has expired or is
+        malformed are removed on the way.
+        
+        Args:
+            index_key: Sorted set to read
+            limit: Maximum number of jobs to return
+            min_score: Lowest creation timestamp (inclusive)
+            max_score: Highest creation timestamp (inclusive)
+            newest_first: Read newest jobs first
+            predicate: Additional filter applied to loaded jobs
+            
+        Returns:
+            List[ScrapingJob]: Jobs in index order
+        """
+        jobs = []
+        offset = 0
+        page_size = max(limit, 1)
+        
+        while len(jobs) < limit:
+            if newest_first:
+                job_ids = self.redis_client.zrevrangebyscore(
+                    index_key, max_score, min_score, start=offset, num=page_size
+                )
+            else:
+                job_ids = self.redis_client.zrangebyscore(
+                    index_key, min_score, max_score, start=offset, num=page_size
+                )
+            if not job_ids:
+                break
+            offset += len(job_ids)
+            
+            page, expired = self._load_jobs(job_ids)
+            jobs.extend(
+                job for job in page
+                if job is not None and (predicate is None or predicate(job))
+            )
+            
+            if expired:
+                self._remove_jobs(expired)
+                # Removed entries shift the remaining ones down
+                offset -= len(expired)
+            if len(job_ids) < page_size:
+                break
+        
+        return jobs[:limit]
+    
+    def _remove_jobs(self, job_ids: List[str]) -> int:
+        """
+        Delete jobs and remove them from all indexes.
+        
+        Args:
+            job_ids: Job identifiers
+            
+        Returns:
+            int: Number of jobs that were indexed
+        """
+        statuses = [status.value for status in JobStatus]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for job_id in job_ids:
+            self._remove_job_script(
+                keys=[f"job:{job_id}", JOBS_CREATED_KEY, JOBS_STATUS_COUNTS_KEY, JOBS_OWNER_KEY],
+                args=[job_id, JOBS_STATUS_KEY_PREFIX, JOBS_USER_KEY_PREFIX, *statuses],
+                client=pipe
+            )
+        return sum(pipe.execute())
+    
+    def _prune_expired_jobs(self, batch_size: int = 500) -> int:
+        """
+        Remove index entries of jobs whose hash has expired.
+        
+        Only jobs older than the hash TTL can have expired, so this reads the
+        oldest part of the creation index instead of every job.
+        
+        Args:
+            batch_size: Jobs checked per round trip
+            
+        Returns:
+            int: Number of index entries removed
+        """
+        cutoff = _timestamp_score(datetime.utcnow()) - JOB_TTL_SECONDS
+        pruned = 0
+        offset = 0
+        
+        while True:
+            job_ids = self.redis_client.zrangebyscore(
+                JOBS_CREATED_KEY, "-inf", cutoff, start=offset, num=batch_size
+            )
+            if not job_ids:
+                break
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            for job_id in job_ids:
+                pipe.exists(f"job:{job_id}")
+            expired = [job_id for job_id, exists in zip(job_ids, pipe.execute()) if not exists]
+            
+            if expired:
+                pruned += self._remove_jobs(expired)
+            offset += len(job_ids) - len(expired)
+            if len(job_ids) < batch_size:
+                break
+        
+        return pruned
+    
+    def rebuild_indexes(self, batch_size: int = 500) -> int:
+        """
+        Rebuild the secondary indexes and status counters from the job hashes.
+        
+        Needed once for jobs stored before the indexes existed. Uses SCAN,
+        so Redis is not blocked while the keyspace is walked.
+        
+        Args:
+            batch_size: Keys fetched per SCAN round trip
+            
+        Returns:
+            int: Number of jobs indexed
+        """
+        index_keys = [JOBS_CREATED_KEY, JOBS_STATUS_COUNTS_KEY, JOBS_OWNER_KEY]
+        index_keys.extend(f"{JOBS_STATUS_KEY_PREFIX}{status.value}" for status in JobStatus)
+        index_keys.extend(self.redis_client.scan_iter(match=f"{JOBS_USER_KEY_PREFIX}*", count=batch_size))
+        self.redis_client.delete(*index_keys)
+        
+        indexed = 0
+        job_keys = []
+        for job_key in self.redis_client.scan_iter(match="job:*", count=batch_size):
+            job_keys.append(job_key)
+            if len(job_keys) >= batch_size:
+                indexed += self._index_job_keys(job_keys)
+                job_keys = []
+        if job_keys:
+            indexed += self._index_job_keys(job_keys)
+        
+        self.logger.info("Rebuilt job indexes", extra={"indexed_jobs": indexed})
+        return indexed
+    
+    def _index_job_keys(self, job_keys: List[str]) -> int:
+        """Add a batch of existing job hashes to the indexes."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for job_key in job_keys:
+            pipe.hmget(job_key, "id", "status", "created_at", "user_id")
+        
+        indexed = 0
+        index_pipe = self.redis_client.pipeline(transaction=False)
+        for job_id, status, created_at, user_id in pipe.execute():
+            if not (job_id and status and created_at):
+                continue
+            created_score = _timestamp_score(datetime.fromisoformat(created_at))
+            index_pipe.zadd(JOBS_CREATED_KEY, {job_id: created_score})
+            index_pipe.zadd(f"{JOBS_STATUS_KEY_PREFIX}{status}", {job_id: created_score})
+            index_pipe.hincrby(JOBS_STATUS_COUNTS_KEY, status, 1)
+            if user_id:
+                index_pipe.zadd(f"{JOBS_USER_KEY_PREFIX}{user_id}", {job_id: created_score})
+                index_pipe.hset(JOBS_OWNER_KEY, job_id, user_id)
+            indexed += 1
+        index_pipe.execute()
+        return indexed
+    
     def get_active_jobs(self, limit: int = 100) -> List[ScrapingJob]:
         """
         Get list of active (pending or running) jobs.
@@ -411,22 +851,17 @@ class JobQueue:
             List[ScrapingJob]: List of active jobs
         """
         try:
-            # Get all job keys
-            job_keys = self.redis_client.keys("job:*")
+            # Oldest jobs of each active status
             active_jobs = []
-            
-            for job_key in job_keys[:limit]:
-                job_data = self.redis_client.hgetall(job_key)
-                if job_data and job_data.get("status") in [JobStatus.PENDING.value, JobStatus.RUNNING.value]:
-                    job_id = job_data["id"]
-                    job = self.get_job_status(job_id)
-                    if job:
-                        active_jobs.append(job)
+            for status in (JobStatus.PENDING, JobStatus.RUNNING):
+                active_jobs.extend(self._index_jobs(
+                    f"{JOBS_STATUS_KEY_PREFIX}{status.value}", limit, newest_first=False
+                ))
             
             # Sort by priority and creation time
             active_jobs.sort(key=lambda x: (x.priority, x.created_at))
             
-            return active_jobs
+            return active_jobs[:limit]
             
         except Exception as e:
             self.logger.error("Failed to get active jobs", extra={"error": str(e)})
@@ -437,7 +872,8 @@ class JobQueue:
         limit: int = 50,
         status_filter: JobStatus = None,
         start_date: datetime = None,
-        end_date: datetime = None
+        end_date: datetime = None,
+        user_id: str = None
     ) -> List[ScrapingJob]:
         """
         Get job history with optional filtering.
@@ -447,68 +883,58 @@ class JobQueue:
             status_filter: Filter by job status
             start_date: Filter jobs created after this date
             end_date: Filter jobs created before this date
+            user_id: Filter by the user who created the job
             
         Returns:
-            List[ScrapingJob]: List of jobs matching criteria
+            List[ScrapingJob]: List of jobs matching criteria, newest first
         """
         try:
-            job_keys = self.redis_client.keys("job:*")
-            jobs = []
+            # Read the narrowest index; a second filter is checked on the loaded jobs
+            predicate = None
+            if user_id:
+                index_key = f"{JOBS_USER_KEY_PREFIX}{user_id}"
+                if status_filter:
+                    predicate = lambda job: job.status == status_filter
+            elif status_filter:
+                index_key = f"{JOBS_STATUS_KEY_PREFIX}{status_filter.value}"
+            else:
+                index_key = JOBS_CREATED_KEY
             
-            for job_key in job_keys:
-                job_data = self.redis_client.hgetall(job_key)
-                if not job_data:
-                    continue
-                
-                # Apply status filter
-                if status_filter and job_data.get("status") != status_filter.value:
-                    continue
-                
-                # Apply date filters
-                created_at = datetime.fromisoformat(job_data["created_at"])
-                if start_date and created_at < start_date:
-                    continue
-                if end_date and created_at > end_date:
-                    continue
-                
-                job_id = job_data["id"]
-                job = self.get_job_status(job_id)
-                if job:
-                    jobs.append(job)
-            
-            # Sort by creation time (newest first)
-            jobs.sort(key=lambda x: x.created_at, reverse=True)
-            
-            return jobs[:limit]
+            return self._index_jobs(
+                index_key,
+                limit,
+                min_score=_timestamp_score(start_date) if start_date else "-inf",
+                max_score=_timestamp_score(end_date) if end_date else "+inf",
+                predicate=predicate
+            )
             
         except Exception as e:
             self.logger.error("Failed to get job history", extra={"error": str(e)})
             return []
     
-    def cleanup_old_jobs(self, max_age_days: int = 7) -> int:
+    def cleanup_old_jobs(self, max_age_days: int = 7, batch_size: int = 500) -> int:
         """
         Clean up old job records from Redis.
         
         Args:
             max_age_days: Maximum age of jobs to keep in days
+            batch_size: Jobs removed per round trip
             
         Returns:
             int: Number of jobs cleaned up
         """
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
-            job_keys = self.redis_client.keys("job:*")
             cleaned_count = 0
             
-            for job_key in job_keys:
-                job_data = self.redis_client.hgetall(job_key)
-                if not job_data:
-                    continue
-                
-                created_at = datetime.fromisoformat(job_data["created_at"])
-                if created_at < cutoff_date:
-                    self.redis_client.delete(job_key)
-                    cleaned_count += 1
+            while True:
+                # Jobs created strictly before the cutoff, oldest first
+                job_ids = self.redis_client.zrangebyscore(
+                    JOBS_CREATED_KEY, "-inf", f"({_timestamp_score(cutoff_date)}", start=0, num=batch_size
+                )
+                if not job_ids:
+                    break
+                cleaned_count += self._remove_jobs(job_ids)
             
             self.logger.info(
                 "Cleaned up old jobs",
@@ -535,21 +961,18 @@ class JobQueue:
             scheduled_tasks = inspect.scheduled()
             reserved_tasks = inspect.reserved()
             
-            # Get Redis stats
-            total_jobs = len(self.redis_client.keys("job:*"))
+            # Get Redis stats from the indexes and counters
+            self._prune_expired_jobs()
+            total_jobs = self.redis_client.zcard(JOBS_CREATED_KEY)
             
             # Count jobs by status
             status_counts = {}
             for status in JobStatus:
                 status_counts[status.value] = 0
             
-            job_keys = self.redis_client.keys("job:*")
-            for job_key in job_keys:
-                job_data = self.redis_client.hgetall(job_key)
-                if job_data and "status" in job_data:
-                    status = job_data["status"]
-                    if status in status_counts:
-                        status_counts[status] += 1
+            for status, count in self.redis_client.hgetall(JOBS_STATUS_COUNTS_KEY).items():
+                if status in status_counts:
+                    status_counts[status] = int(count)
             
             return {
                 "total_jobs": total_jobs,
@@ -572,6 +995,84 @@ class JobQueue:
                 "error": str(e)
             }
 
+class JobProgressWriter:
+    """
+    Coalesces job status and progress updates.
+    
+    Updates are merged per job in memory and written together, in one
+    pipelined round trip, at most once per flush interval. The merged
+    fields are the same as if every update had been written immediately,
+    so readers only see progress up to flush_interval late. Thread-safe.
+    """
+    
+    def __init__(self, job_queue: JobQueue = None, flush_interval: float = 1.0):
+        """
+        Initialize the writer.
+        
+        Args:
+            job_queue: Queue to write to (global job queue if None)
+            flush_interval: Minimum seconds between writes
+        """
+        self.job_queue = job_queue or get_job_queue()
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Tuple[JobStatus, Dict[str, str]]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> "JobProgressWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+    
+    def update(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error_message: str = None,
+        **kwargs
+    ) -> None:
+        """
+        Record a status update; same arguments as JobQueue.update_job_status.
+        
+        Args:
+            job_id: Unique job identifier
+            status: New job status
+            error_message: Error message if job failed
+            **kwargs: Additional fields to update
+        """
+        update_data = JobQueue._status_update_data(status, error_message, kwargs)
+        with self._lock:
+            if job_id in self._pending:
+                update_data = {**self._pending[job_id][1], **update_data}
+            self._pending[job_id] = (status, update_data)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+    
+    def flush(self) -> bool:
+        """
+        Write all pending updates.
+        
+        Returns:
+            bool: True if the write succeeded (or nothing was pending)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        
+        if self.job_queue.update_jobs(pending):
+            return True
+        
+        # Keep failed updates for the next flush unless newer ones replaced them
+        with self._lock:
+            for job_id, (status, update_data) in pending.items():
+                if job_id in self._pending:
+                    update_data = {**update_data, **self._pending[job_id][1]}
+                    status = self._pending[job_id][0]
+                self._pending[job_id] = (status, update_data)
+        return False
+
 
 # Global job queue instance - created lazily to avoid Redis connection on import
 job_queue = None
@@ -0,0 +1,421 @@
+"""
+MinHash/LSH index for near-duplicate detection.
+
+Each record is reduced once to a MinHash signature over its field-qualified
+words, so the Jaccard similarity of two records' word sets can be estimated
+from the share of equal signature positions. Signatures are split into LSH
+bands and bucketed by band, so looking up the candidates for a record only
+touches the records that share a bucket with it instead of every stored
+record. The index is incremental and can be saved and loaded, which lets new
+scrapes be checked against all historical data.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bumped when tokenization or hashing changes; older saved indexes are rebuilt
+SIGNATURE_VERSION = 1
+
+# Minimum seconds between writes of the shared index to disk
+SAVE_INTERVAL_SECONDS = 60.0
+
+# Mersenne prime for the universal hash family h(x) = (a * x + b) mod p
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def content_tokens(content: Dict[str, Any]) -> Set[str]:
+    """
+    Field-qualified word tokens of a content dictionary.
+
+    Words are split and lowercased the same way DataCleaner compares field
+    values, and qualified by their field so equal words in different fields
+    do not match.
+
+    Args:
+        content: Record content
+
+    Returns:
+        Set of "field<US>word" tokens
+    """
+    tokens = set()
+    for key, value in (content or {}).items():
+        for word in str(value).lower().split():
+            tokens.add(f"{key}\x1f{word}")
+    return tokens
+
+
+def _token_hashes(tokens: Iterable[str]) -> "np.ndarray":
+    """Stable 32-bit token hashes (Python's hash() is salted per process)."""
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+            for token in tokens
+        ),
+        dtype=np.uint64
+    )
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index of record signatures.
+
+    With b bands of r rows, two records become candidates with probability
+    1 - (1 - s^r)^b for Jaccard similarity s; the default 32 bands of 4 rows
+    find pairs above ~0.6 almost always and rarely return pairs below ~0.3.
+    Thread-safe.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: MinHash permutations per signature
+            bands: LSH bands; must divide num_perm
+            seed: Seed of the permutation parameters
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the near-duplicate index")
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+
+        # a < 2^31 and x < 2^32 keep a * x + b below 2^64, so uint64 never overflows
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, "np.ndarray"] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._signatures
+
+    def signature(self, content: Dict[str, Any]) -> Optional["np.ndarray"]:
+        """
+        MinHash signature of a record's content.
+
+        Args:
+            content: Record content
+
+        Returns:
+            uint32 signature, or None for content without words
+        """
+        tokens = content_tokens(content)
+        if not tokens:
+            return None
+        hashes = _token_hashes(tokens)
+        permuted = (hashes[:, None] * self._a + self._b) % np.uint64(_MERSENNE_PRIME)
+        return (permuted & np.uint64(_MAX_HASH)).min(axis=0).astype(np.uint32)
+
+    def add_content(self, record_id: str, content: Dict[str, Any]) -> bool:
+        """
+        Add a record by its content.
+
+        Args:
+            record_id: Record identifier
+            content: Record content
+
+        Returns:
+            True if the record was indexed (content without words is not)
+        """
+        signature = self.signature(content)
+        if signature is None:
+            return False
+        self.add(record_id, signature)
+        return True
+
+    def _band_keys(self, signature: "np.ndarray") -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, record_id: str, signature: "np.ndarray") -> None:
+        """
+        Add or replace a record's signature.
+
+        Args:
+            record_id: Record identifier
+            signature: Signature from signature()
+        """
+        with self._lock:
+            if record_id in self._signatures:
+                self._remove_locked(record_id)
+            self._signatures[record_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(record_id)
+
+    def remove(self, record_id: str) -> bool:
+        """
+        Remove a record from the index.
+
+        Returns:
+            True if the record was indexed
+        """
+        with self._lock:
+            if record_id not in self._signatures:
+                return False
+            self._remove_locked(record_id)
+            return True
+
+    def _remove_locked(self, record_id: str) -> None:
+        signature = self._signatures.pop(record_id)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(record_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def query(
+        self,
+        signature: "np.ndarray",
+        threshold: float = 0.0,
+        exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find indexed records similar to a signature.
+
+        Args:
+            signature: Signature from signature()
+            threshold: Minimum estimated Jaccard similarity
+            exclude: Record ID to leave out (the queried record itself)
+
+        Returns:
+            (record_id, estimated_similarity) pairs, most similar first
+        """
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                bucket = self._buckets[band].get(key)
+                if bucket:
+                    candidates.update(bucket)
+            candidates.discard(exclude)
+            if not candidates:
+                return []
+            ids = list(candidates)
+            matrix = np.stack([self._signatures[record_id] for record_id in ids])
+
+        similarities = (matrix == signature).mean(axis=1)
+        matches = [
+            (record_id, float(similarity))
+            for record_id, similarity in zip(ids, similarities)
+            if similarity >= threshold
+        ]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def save(self, path: str) -> None:
+        """Save the index to a compressed .npz file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            ids = list(self._signatures)
+            signatures = (
+                np.stack([self._signatures[record_id] for record_id in ids])
+                if ids else np.zeros((0, self.num_perm), dtype=np.uint32)
+            )
+        # Write to a temp file of our own next to the target and rename it, so
+        # readers never see a partial file and concurrent writers never share one
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory or None, prefix=f"{os.path.basename(path)}.", suffix=".tmp.npz"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    ids=np.array(ids, dtype=str),
+                    signatures=signatures,
+                    params=np.array([SIGNATURE_VERSION, self.num_perm, self.bands, self.seed])
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "NearDuplicateIndex":
+        """Load an index saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            version, num_perm, bands, seed = (int(value) for value in data["params"])
+            if version != SIGNATURE_VERSION:
+                raise ValueError(
+                    f"Index signature version {version} does not match {SIGNATURE_VERSION}; rebuild it"
+                )
+            index = cls(num_perm=num_perm, bands=bands, seed=seed)
+            for record_id, signature in zip(data["ids"], data["signatures"]):
+                index.add(str(record_id), signature)
+        return index
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            bucket_counts = [len(buckets) for buckets in self._buckets]
+        return {
+            "records": len(self._signatures),
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+            "buckets": sum(bucket_counts)
+        }
+
+
+# Global index instance
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+_near_duplicate_index_lock = threading.Lock()
+_last_saved = 0.0
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Get the shared historical near-duplicate index.
+
+    Loaded from the configured path when it exists, otherwise created empty.
+
+    Returns:
+        The index, or None when numpy is not installed
+    """
+    global _near_duplicate_index
+    if _near_duplicate_index is None:
+        with _near_duplicate_index_lock:
+            if _near_duplicate_index is None:
+                if not NUMPY_AVAILABLE:
+                    logger.warning("numpy not installed; near-duplicate index disabled")
+                    return None
+
+                from config.settings import get_settings
+                settings = get_settings()
+                path = settings.dedup_index_path
+                index = None
+                if path and os.path.exists(path):
+                    try:
+                        index = NearDuplicateIndex.load(path)
+                        logger.info(f"Loaded near-duplicate index with {len(index)} records from {path}")
+                    except Exception as e:
+                        logger.warning(f"Could not load near-duplicate index {path}, starting empty: {e}")
+                if index is None:
+                    index = NearDuplicateIndex(num_perm=settings.dedup_num_perm, bands=settings.dedup_bands)
+                _near_duplicate_index = index
+    return _near_duplicate_index
+
+
+def index_saved_records(records: Iterable[Any]) -> int:
+    """
+    Add saved records to the shared index and persist it when due.
+
+    Args:
+        records: Saved records with ``id`` and ``content`` attributes
+
+    Returns:
+        Number of records indexed
+    """
+    index = get_near_duplicate_index()
+    if index is None:
+        return 0
+    indexed = sum(1 for record in records if index.add_content(record.id, record.content))
+    if indexed:
+        save_near_duplicate_index()
+    return indexed
+
+
+@contextmanager
+def _exclusive_file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on ``<path>.lock`` across processes.
+
+    Without fcntl (Windows) only the in-process lock applies.
+    """
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def save_near_duplicate_index(force: bool = False) -> bool:
+    """
+    Persist the shared index to the configured path.
+
+    Every worker process keeps its own copy of the index, so records other
+    processes saved to the file since it was loaded are merged in first
+    rather than overwritten. The load-merge-replace runs under an exclusive
+    file lock, so concurrent savers (e.g. every prefork child on shutdown)
+    serialize instead of dropping each other's records. Writes are
+    throttled to one per SAVE_INTERVAL_SECONDS unless forced.
+
+    Args:
+        force: Save even if the index was saved recently (e.g. on shutdown)
+
+    Returns:
+        True if the index was saved
+    """
+    global _last_saved
+    index = _near_duplicate_index
+    if index is None:
+        return False
+    from config.settings import get_settings
+    path = get_settings().dedup_index_path
+    if not path:
+        return False
+
+    with _near_duplicate_index_lock:
+        now = time.monotonic()
+        if not force and now - _last_saved < SAVE_INTERVAL_SECONDS:
+            return False
+        _last_saved = now
+
+        with _exclusive_file_lock(path):
+            if os.path.exists(path):
+                try:
+                    stored = NearDuplicateIndex.load(path)
+                except Exception as e:
+                    logger.warning(f"Could not merge near-duplicate index {path}, overwriting it: {e}")
+                else:
+                    if (stored.num_perm, stored.bands, stored.seed) == (index.num_perm, index.bands, index.seed):
+                        for record_id, signature in stored._signatures.items():
+                            if record_id not in index:
+                                index.add(record_id, signature)
+            index.save(path)
+    return True
@@ -0,0 +1,163 @@
+"""
+Parallel cleaning for large batches.
+
+DataCleaner runs in one Python thread. ParallelCleaner keeps duplicate
+detection in the coordinating process, where a single seen-hash set is
+consulted in input order so the first occurrence of any content wins exactly
+as in the serial cleaner. It then shards the unique records across a process
+pool, cleans the shards in parallel, and merges the partial quality
+statistics into one DataQualityMetrics. The same shard function backs the
+clean_batch_task Celery task, which cleans a whole batch of records per
+message.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..models.pydantic_models import ScrapedData
+from ..utils.logger import get_logger
+from .cleaner import CleaningRule, DataCleaner, DataQualityMetrics
+from .quality_stats import StreamingQualityMetrics
+
+logger = get_logger(__name__)
+
+
+def clean_shard(
+    records: List[ScrapedData],
+    content_hashes: List[str],
+    rules: Optional[List[CleaningRule]] = None
+) -> Tuple[List[ScrapedData], Dict[str, Any]]:
+    """
+    Clean one shard of deduplicated records.
+
+    Runs in pool processes and Celery workers, so the result is picklable and
+    the quality statistics are returned in their serialized form.
+
+    Args:
+        records: Deduplicated records
+        content_hashes: Content hash of each record
+        rules: Cleaning rules to apply (DataCleaner defaults if None)
+
+    Returns:
+        Tuple of (cleaned records, StreamingQualityMetrics.to_dict())
+    """
+    cleaner = DataCleaner()
+    if rules is not None:
+        cleaner.cleaning_rules = list(rules)
+
+    aggregate = StreamingQualityMetrics()
+    start_time = time.perf_counter()
+    cleaned = cleaner._clean_unique(records, content_hashes, aggregate)
+    aggregate.processing_time = time.perf_counter() - start_time
+    return cleaned, aggregate.to_dict()
+
+
+def split_shards(items: List[Any], shard_size: int) -> List[List[Any]]:
+    """Split a list into consecutive shards of at most shard_size items."""
+    return [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
+
+
+class ParallelCleaner:
+    """
+    Cleans large batches across a process pool.
+
+    Produces the same cleaned records, in the same order, as
+    DataCleaner.clean_data; per-field averages can differ from the serial
+    result in the last bits because partial sums are merged.
+    """
+
+    def __init__(
+        self,
+        cleaner: Optional[DataCleaner] = None,
+        max_workers: Optional[int] = None,
+        shard_size: Optional[int] = None
+    ):
+        """
+        Initialize the parallel cleaner.
+
+        Args:
+            cleaner: Cleaner providing the rules and duplicate hashing (new instance if None)
+            max_workers: Worker processes (CLEANING_WORKERS, or CPU count, if None)
+            shard_size: Records per shard sent to a worker (CLEANING_SHARD_SIZE if None)
+        """
+        from config.settings import get_settings
+        settings = get_settings()
+
+        self.cleaner = cleaner or DataCleaner()
+        self.max_workers = max_workers or settings.cleaning_workers or multiprocessing.cpu_count()
+        self.shard_size = shard_size or settings.cleaning_shard_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelCleaner":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Create the pool on first use; None when a pool cannot help or is not allowed."""
+        if self.max_workers <= 1:
+            return None
+        if multiprocessing.current_process().daemon:
+            # Celery prefork children are daemonic and cannot start processes
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def clean_data(
+        self,
+        data: List[ScrapedData],
+        existing_hashes: Optional[Set[str]] = None
+    ) -> Tuple[List[ScrapedData], DataQualityMetrics]:
+        """
+        Clean and validate records in parallel.
+
+        Args:
+            data: List of ScrapedData objects to clean
+            existing_hashes: Content hashes already stored; matching records
+                count as duplicates
+
+        Returns:
+            Tuple of (cleaned_data, quality_metrics)
+        """
+        start_time = time.perf_counter()
+        aggregate = StreamingQualityMetrics()
+        seen_hashes = set(existing_hashes or ())
+        unique_records, unique_hashes = self.cleaner._deduplicate(data, seen_hashes, aggregate)
+
+        executor = self._get_executor() if len(unique_records) > self.shard_size else None
+        if executor is None:
+            cleaned_data = self.cleaner._clean_unique(unique_records, unique_hashes, aggregate)
+        else:
+            record_shards = split_shards(unique_records, self.shard_size)
+            hash_shards = split_shards(unique_hashes, self.shard_size)
+            futures = [
+                executor.submit(clean_shard, records, hashes, self.cleaner.cleaning_rules)
+                for records, hashes in zip(record_shards, hash_shards)
+            ]
+
+            cleaned_data = []
+            for future in futures:
+                shard_cleaned, shard_stats = future.result()
+                cleaned_data.extend(shard_cleaned)
+                shard_aggregate = StreamingQualityMetrics.from_dict(shard_stats)
+                # Shard times overlap; the wall-clock time is reported below
+                shard_aggregate.processing_time = 0.0
+                aggregate.merge(shard_aggregate)
+
+            logger.info(f"Cleaned {len(unique_records)} records in {len(futures)} shards")
+
+        # Needs the whole batch and the historical index, so it runs here rather than in the shards
+        self.cleaner.flag_near_duplicates(cleaned_data)
+
+        aggregate.processing_time = time.perf_counter() - start_time
+        return cleaned_data, aggregate.to_metrics()
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,359 @@
+"""
+Constant-memory, mergeable data quality statistics.
+
+DataCleaner used to keep every field score in lists until the end of a run.
+These aggregates keep a fixed amount of state per field instead (count, sum,
+variance and a quantile sketch), so cleaning can stream over arbitrarily many
+records and partial results from several workers can be merged and reported
+as one DataQualityMetrics.
+"""
+
+import math
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..models.pydantic_models import ScrapedData
+
+if TYPE_CHECKING:
+    from .cleaner import DataQualityMetrics
+
+# Records are assumed to have at most this many validation errors when
+# scoring accuracy (same assumption as the original batch metrics)
+MAX_ERRORS_PER_RECORD = 5
+
+
+class RunningStats:
+    """
+    Count, sum, mean, variance and range of a stream of values.
+
+    The sum is compensated (Neumaier), like built-in sum() of floats since
+    Python 3.12, so averages match sum(values) / len(values); the variance
+    uses Welford's update and Chan's formula for merging.
+    """
+
+    __slots__ = ("count", "total", "compensation", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        self._add_to_total(value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def _add_to_total(self, value: float) -> None:
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge another aggregate into this one."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.total, self.compensation = other.count, other.total, other.compensation
+            self.mean, self.m2 = other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self._add_to_total(other.total)
+        self.compensation += other.compensation
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def average(self) -> float:
+        """Sum divided by count."""
+        return (self.total + self.compensation) / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count, "total": self.total, "compensation": self.compensation,
+            "mean": self.mean, "m2": self.m2,
+            "min": self.minimum if self.count else None, "max": self.maximum if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        stats = cls()
+        stats.count, stats.total, stats.compensation = data["count"], data["total"], data["compensation"]
+        stats.mean, stats.m2 = data["mean"], data["m2"]
+        if stats.count:
+            stats.minimum, stats.maximum = data["min"], data["max"]
+        return stats
+
+
+class ScoreSketch:
+    """
+    Quantile sketch for scores in [0, 1].
+
+    A fixed-resolution histogram: memory is bounded by the number of bins,
+    merging adds bin counts, and quantiles are accurate to one bin width.
+    """
+
+    def __init__(self, bins: int = 1000):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            bins: Number of equal-width bins over [0, 1]
+        """
+        self.bins = bins
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add one score; values outside [0, 1] are clamped."""
+        index = min(self.bins - 1, max(0, int(value * self.bins)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+
+    def merge(self, other: "ScoreSketch") -> "ScoreSketch":
+        """Merge another sketch with the same resolution into this one."""
+        if other.bins != self.bins:
+            raise ValueError(f"Cannot merge sketches with {other.bins} and {self.bins} bins")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Midpoint of the bin holding the quantile, or None when empty
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                return (index + 0.5) / self.bins
+        return (max(self.counts) + 0.5) / self.bins
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"bins": self.bins, "counts": {str(index): count for index, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScoreSketch":
+        sketch = cls(bins=data["bins"])
+        sketch.counts = {int(index): count for index, count in data["counts"].items()}
+        sketch.count = sum(sketch.counts.values())
+        return sketch
+
+
+class StreamingQualityMetrics:
+    """
+    Mergeable accumulator behind DataQualityMetrics.
+
+    Holds record counts, per-field score statistics and record quality score
+    statistics; to_metrics() produces the same DataQualityMetrics the batch
+    cleaner reports for the same records.
+    """
+
+    def __init__(self):
+        self.total_records = 0
+        self.valid_records = 0
+        self.invalid_records = 0
+        self.duplicate_records = 0
+        self.corrected_records = 0
+        self.validation_error_count = 0
+        self.processing_time = 0.0
+        self.field_stats: Dict[str, RunningStats] = {}
+        self.field_sketches: Dict[str, ScoreSketch] = {}
+        self.quality_stats = RunningStats()
+        self.quality_sketch = ScoreSketch()
+
+    def add_duplicate(self) -> None:
+        """Count a record skipped as a duplicate."""
+        self.total_records += 1
+        self.duplicate_records += 1
+
+    def add_invalid(self) -> None:
+        """Count a record rejected or failed during cleaning."""
+        self.total_records += 1
+        self.invalid_records += 1
+
+    def add_cleaned(self, record: ScrapedData, record_metrics: Dict[str, Any]) -> None:
+        """
+        Count a cleaned record.
+
+        Args:
+            record: Cleaned record
+            record_metrics: Metrics from the cleaning step (field_scores, corrected)
+        """
+        self.total_records += 1
+        self.valid_records += 1
+        self.validation_error_count += len(record.validation_errors)
+        if record_metrics.get('corrected', False):
+            self.corrected_records += 1
+
+        for field, score in record_metrics.get('field_scores', {}).items():
+            if field not in self.field_stats:
+                self.field_stats[field] = RunningStats()
+                self.field_sketches[field] = ScoreSketch()
+            self.field_stats[field].add(score)
+            self.field_sketches[field].add(score)
+
+        self.quality_stats.add(record.data_quality_score)
+        self.quality_sketch.add(record.data_quality_score)
+
+    def merge(self, other: "StreamingQualityMetrics") -> "StreamingQualityMetrics":
+        """Merge another accumulator (e.g. from another worker) into this one."""
+        self.total_records += other.total_records
+        self.valid_records += other.valid_records
+        self.invalid_records += other.invalid_records
+        self.duplicate_records += other.duplicate_records
+        self.corrected_records += other.corrected_records
+        self.validation_error_count += other.validation_error_count
+        self.processing_time += other.processing_time
+
+        for field, stats in other.field_stats.items():
+            if field not in self.field_stats:
+                self.field_stats[field] = RunningStats()
+                self.field_sketches[field] = ScoreSketch(other.field_sketches[field].bins)
+            self.field_stats[field].merge(stats)
+            self.field_sketches[field].merge(other.field_sketches[field])
+
+        self.quality_stats.merge(other.quality_stats)
+        self.quality_sketch.merge(other.quality_sketch)
+        return self
+
+    def to_metrics(self) -> "DataQualityMetrics":
+        """
+        Build the DataQualityMetrics report.
+
+        Returns:
+            Metrics with per-field average scores and overall quality scores
+        """
+        from .cleaner import DataQualityMetrics
+
+        metrics = DataQualityMetrics(
+            total_records=self.total_records,
+            valid_records=self.valid_records,
+            invalid_records=self.invalid_records,
+            duplicate_records=self.duplicate_records,
+            corrected_records=self.corrected_records,
+            overall_quality_score=0.0,
+            completeness_score=0.0,
+            accuracy_score=0.0,
+            consistency_score=0.0,
+            field_quality_scores={field: stats.average for field, stats in self.field_stats.items()},
+            processing_time=self.processing_time
+        )
+        if self.total_records == 0:
+            return metrics
+
+        metrics.completeness_score = self.valid_records / self.total_records
+
+        max_possible_errors = self.valid_records * MAX_ERRORS_PER_RECORD
+        metrics.accuracy_score = (
+            max(0.0, 1.0 - (self.validation_error_count / max_possible_errors))
+            if max_possible_errors > 0 else 1.0
+        )
+
+        field_averages = list(metrics.field_quality_scores.values())
+        metrics.consistency_score = sum(field_averages) / len(field_averages) if field_averages else 0.0
+
+        metrics.overall_quality_score = (
+            metrics.completeness_score * 0.4 +
+            metrics.accuracy_score * 0.4 +
+            metrics.consistency_score * 0.2
+        )
+        return metrics
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Distribution summary of field and record quality scores.
+
+        Returns:
+            Mean, standard deviation, range and p10/p50/p90 per field and for
+            record quality scores
+        """
+        def describe(stats: RunningStats, sketch: ScoreSketch) -> Dict[str, Any]:
+            return {
+                "count": stats.count,
+                "mean": stats.average,
+                "std": math.sqrt(stats.variance),
+                "min": stats.minimum if stats.count else None,
+                "max": stats.maximum if stats.count else None,
+                "p10": sketch.quantile(0.1),
+                "p50": sketch.quantile(0.5),
+                "p90": sketch.quantile(0.9),
+            }
+
+        return {
+            "records": {
+                "total": self.total_records,
+                "valid": self.valid_records,
+                "invalid": self.invalid_records,
+                "duplicates": self.duplicate_records,
+                "corrected": self.corrected_records,
+            },
+            "quality_score": describe(self.quality_stats, self.quality_sketch),
+            "fields": {
+                field: describe(stats, self.field_sketches[field])
+                for field, stats in self.field_stats.items()
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for transport between workers (JSON-compatible)."""
+        return {
+            "total_records": self.total_records,
+            "valid_records": self.valid_records,
+            "invalid_records": self.invalid_records,
+            "duplicate_records": self.duplicate_records,
+            "corrected_records": self.corrected_records,
+            "validation_error_count": self.validation_error_count,
+            "processing_time": self.processing_time,
+            "field_stats": {field: stats.to_dict() for field, stats in self.field_stats.items()},
+            "field_sketches": {field: sketch.to_dict() for field, sketch in self.field_sketches.items()},
+            "quality_stats": self.quality_stats.to_dict(),
+            "quality_sketch": self.quality_sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingQualityMetrics":
+        """Restore an accumulator serialized with to_dict()."""
+        aggregate = cls()
+        for name in (
+            "total_records", "valid_records", "invalid_records", "duplicate_records",
+            "corrected_records", "validation_error_count", "processing_time"
+        ):
+            setattr(aggregate, name, data[name])
+        aggregate.field_stats = {field: RunningStats.from_dict(stats) for field, stats in data["field_stats"].items()}
+        aggregate.field_sketches = {field: ScoreSketch.from_dict(sketch) for field, sketch in data["field_sketches"].items()}
+        aggregate.quality_stats = RunningStats.from_dict(data["quality_stats"])
+        aggregate.quality_sketch = ScoreSketch.from_dict(data["quality_sketch"])
+        return aggregate
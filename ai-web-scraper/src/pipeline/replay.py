@@ -0,0 +1,227 @@
+"""
+Offline replay of archived responses through the processing pipeline.
+
+This module provides the ArchiveReplayer class that reads responses captured
+in the WARC archive and feeds them through ContentExtractor, the DataCleaner
+and, optionally, the AI ContentProcessor without touching the network, so
+improved extractors can be re-run over previously scraped pages.
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from ..models.pydantic_models import ContentType, ScrapedData, ScrapingConfig
+from ..scraper.content_extractor import ContentExtractor
+from ..scraper.response_reader import DEFAULT_ALLOWED_CONTENT_TYPES, BoundedResponse
+from ..scraper.warc_archive import WarcArchive, WarcIndexEntry, get_warc_archive
+from ..utils.logger import get_logger
+from .cleaner import DataCleaner, DataQualityMetrics
+
+logger = get_logger(__name__)
+
+
+class ArchiveReplayer:
+    """
+    Re-runs extraction, cleaning and AI analysis over archived pages.
+
+    Extraction is CPU-bound and runs without I/O beyond reading the local
+    WARC files; AI analysis is opt-in because it is the only stage that
+    leaves the machine.
+    """
+
+    def __init__(
+        self,
+        archive: Optional[WarcArchive] = None,
+        config: Optional[ScrapingConfig] = None,
+        data_cleaner: Optional[DataCleaner] = None,
+        content_processor: Optional[Any] = None
+    ):
+        """
+        Initialize the replayer.
+
+        Args:
+            archive: WARC archive to read from (global archive if None)
+            config: Scraping configuration used for extraction
+            data_cleaner: Cleaner applied to each batch (new instance if None)
+            content_processor: Optional AI ContentProcessor for the AI stage
+        """
+        self.archive = archive or get_warc_archive()
+        self.config = config or ScrapingConfig()
+        self.extractor = ContentExtractor(self.config)
+        self.data_cleaner = data_cleaner or DataCleaner()
+        self.content_processor = content_processor
+
+    def iter_responses(
+        self,
+        url_prefix: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[WarcIndexEntry, BoundedResponse]]:
+        """
+        Iterate over the latest archived capture of each matching URL.
+
+        Args:
+            url_prefix: Only replay URLs starting with this prefix
+            since: Only replay captures at or after this time
+            until: Only replay captures before this time
+            limit: Maximum number of pages
+
+        Yields:
+            (index entry, archived response) tuples for successful HTML captures
+        """
+        # Filtering in the index keeps the limit and the latest-capture choice
+        # to successful HTML captures; resource records (rendered DOM snapshots)
+        # carry no HTTP status and always qualify
+        entries = self.archive.find(
+            url_prefix=url_prefix,
+            since=since,
+            until=until,
+            limit=limit,
+            status_code=200,
+            content_types=DEFAULT_ALLOWED_CONTENT_TYPES
+        )
+        for entry in entries:
+            try:
+                yield entry, self.archive.load_response(entry)
+            except Exception as e:
+                logger.warning(f"Failed to read archived record {entry.record_id} for {entry.url}: {str(e)}")
+
+    def extract(self, entry: WarcIndexEntry, response: BoundedResponse, job_id: str) -> ScrapedData:
+        """
+        Run the content extractor over an archived response.
+
+        Args:
+            entry: Index entry of the capture
+            response: Archived response
+            job_id: Job identifier for the replayed records
+
+        Returns:
+            ScrapedData built from the archived page
+        """
+        html_content = response.text
+        extracted_content = self.extractor.extract_from_html(html_content, response.url)
+
+        return ScrapedData(
+            job_id=job_id,
+            url=response.url,
+            content=extracted_content,
+            raw_html=html_content if self.config.custom_selectors.get('include_raw_html') else None,
+            content_type=ContentType.HTML,
+            content_metadata={
+                "replayed": True,
+                "warc_record_id": entry.record_id,
+                "warc_file": entry.filename,
+                "captured_at": entry.captured_at,
+                "body_truncated": response.truncated
+            },
+            content_length=len(html_content)
+        )
+
+    async def replay(
+        self,
+        job_id: str,
+        url_prefix: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 100,
+        clean: bool = True,
+        analyze: bool = False
+    ) -> AsyncIterator[Tuple[List[ScrapedData], Optional[DataQualityMetrics]]]:
+        """
+        Replay archived pages in batches.
+
+        Args:
+            job_id: Job identifier assigned to the replayed records
+            url_prefix: Only replay URLs starting with this prefix
+            since: Only replay captures at or after this time
+            until: Only replay captures before this time
+            limit: Maximum number of pages
+            batch_size: Number of pages per yielded batch
+            clean: Run the DataCleaner over each batch
+            analyze: Run the AI ContentProcessor over each page
+
+        Yields:
+            (records, quality metrics) per batch; metrics are None when clean is False
+        """
+        batch: List[Tuple[ScrapedData, BoundedResponse]] = []
+
+        for entry, response in self.iter_responses(url_prefix, since, until, limit):
+            try:
+                batch.append((self.extract(entry, response, job_id), response))
+            except Exception as e:
+                logger.warning(f"Replay extraction failed for {entry.url}: {str(e)}")
+                continue
+
+            if len(batch) >= batch_size:
+                yield await self._finish_batch(batch, clean, analyze)
+                batch = []
+
+        if batch:
+            yield await self._finish_batch(batch, clean, analyze)
+
+    async def replay_all(self, job_id: str, **kwargs) -> Dict[str, Any]:
+        """
+        Replay every matching page and return a summary.
+
+        Args:
+            job_id: Job identifier assigned to the replayed records
+            **kwargs: Arguments forwarded to replay()
+
+        Returns:
+            Summary with replayed records and per-batch metrics
+        """
+        records: List[ScrapedData] = []
+        batch_metrics: List[DataQualityMetrics] = []
+
+        async for batch, metrics in self.replay(job_id, **kwargs):
+            records.extend(batch)
+            if metrics is not None:
+                batch_metrics.append(metrics)
+
+        return {
+            "job_id": job_id,
+            "records": records,
+            "record_count": len(records),
+            "batch_metrics": batch_metrics
+        }
+
+    async def _finish_batch(
+        self,
+        batch: List[Tuple[ScrapedData, BoundedResponse]],
+        clean: bool,
+        analyze: bool
+    ) -> Tuple[List[ScrapedData], Optional[DataQualityMetrics]]:
+        """Apply the optional AI and cleaning stages to an extracted batch."""
+        records = [record for record, _ in batch]
+
+        if analyze and self.content_processor is not None:
+            for record, response in batch:
+                await self._analyze(record, response)
+
+        if not clean:
+            return records, None
+
+        return self.data_cleaner.clean_data(records)
+
+    async def _analyze(self, record: ScrapedData, response: BoundedResponse) -> None:
+        """Run AI processing for one replayed record in place."""
+        try:
+            processed = await self.content_processor.process_content(
+                response.text, ContentType.HTML, record.url,
+                additional_context={"replayed": True},
+                combined_analysis=self.config.combined_ai_analysis
+            )
+            record.ai_processed = True
+            record.confidence_score = processed.confidence_score
+            record.ai_metadata = {
+                "structured_data": processed.structured_data,
+                "entities": processed.entities,
+                "classification": processed.classification,
+                "processing_metadata": processed.processing_metadata
+            }
+            record.processed_at = processed.processed_at
+        except Exception as e:
+            logger.warning(f"AI processing failed during replay for {record.url}: {str(e)}")
+            record.ai_metadata = {"error": str(e), "processing_status": "failed"}
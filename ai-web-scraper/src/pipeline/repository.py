@@ -5,11 +5,12 @@ This module provides the DataRepository class that handles all database operatio
 for scraped data, jobs, and related entities with async PostgreSQL support.
 """
 
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 from uuid import uuid4
 
 from sqlalchemy import and_, desc, func, or_, select, text, update
@@ -25,6 +26,7 @@ from src.models.database_models import (
 from src.models.pydantic_models import (
     DataExportRequest, JobStatus, ScrapedData, ScrapingJob
 )
+from src.pipeline.fingerprint import content_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +72,7 @@ class DataRepository:
                     total_pages=job.total_pages,
                     pages_completed=job.pages_completed,
                     pages_failed=job.pages_failed,
+                    pages_enriched=job.pages_enriched,
                     error_message=job.error_message,
                     retry_count=job.retry_count,
                     user_id=job.user_id,
@@ -249,15 +252,28 @@ class DataRepository:
     
     # ==================== Scraped Data Management Methods ====================
     
-    async def save_scraped_data(self, data: ScrapedData) -> str:
+    async def save_scraped_data(self, data: ScrapedData, skip_duplicates: bool = False) -> str:
         """
         Save scraped data to the database.
         
+        The record's content fingerprint is stored with it. By default the
+        record is always saved, so every job keeps its own rows. With
+        skip_duplicates an indexed lookup on the fingerprint first checks
+        whether any job already saved the same content; the job then has no
+        row of its own for that page. The check is best effort: there is no
+        unique constraint on content_hash, so two concurrent saves of the
+        same content can both insert. Jobs with
+        ScrapingConfig.skip_stored_duplicates keep a reference row instead
+        (see find_content_hash_owners()).
+        
         Args:
             data: ScrapedData instance to save
+            skip_duplicates: Return the existing record ID instead of saving
+                content that is already stored
             
         Returns:
-            str: The saved data record ID
+            str: The saved data record ID, or the existing record's ID when
+                the content is a duplicate
             
         Raises:
             ValueError: If data is invalid
@@ -265,6 +281,19 @@ class DataRepository:
         """
         try:
             async with get_async_db_session() as session:
+                content_hash = data.content_hash or content_fingerprint(data.content)
+                
+                if skip_duplicates:
+                    result = await session.execute(
+                        select(ScrapedDataORM.id)
+                        .where(ScrapedDataORM.content_hash == content_hash)
+                        .limit(1)
+                    )
+                    existing_id = result.scalar_one_or_none()
+                    if existing_id is not None:
+                        self.logger.debug(f"Skipped scraped data {data.id}: duplicate of {existing_id}")
+                        return existing_id
+                
                 data_orm = ScrapedDataORM(
                     id=data.id,
                     job_id=data.job_id,
@@ -272,6 +301,7 @@ class DataRepository:
                     content_type=data.content_type.value,
                     content=data.content,
                     raw_html=data.raw_html,
+                    content_hash=content_hash,
                     content_metadata=data.content_metadata,
                     confidence_score=data.confidence_score,
                     ai_processed=data.ai_processed,
@@ -298,6 +328,95 @@ class DataRepository:
             self.logger.error(f"Data save failed - database error: {e}")
             raise RuntimeError(f"Failed to save scraped data: {e}")
     
+    async def get_scraped_data_by_id(self, data_id: str) -> Optional[ScrapedData]:
+        """
+        Retrieve a scraped data record by ID.
+        
+        Args:
+            data_id: Unique data record identifier
+            
+        Returns:
+            ScrapedData instance or None if not found
+        """
+        try:
+            async with get_async_db_session() as session:
+                stmt = select(ScrapedDataORM).where(ScrapedDataORM.id == data_id)
+                result = await session.execute(stmt)
+                data_orm = result.scalar_one_or_none()
+                
+                if data_orm:
+                    return self._orm_to_pydantic_data(data_orm)
+                return None
+                
+        except SQLAlchemyError as e:
+            self.logger.error(f"Failed to retrieve scraped data {data_id}: {e}")
+            raise RuntimeError(f"Failed to retrieve scraped data: {e}")
+    
+    async def find_existing_content_hashes(self, content_hashes: List[str], batch_size: int = 500) -> Set[str]:
+        """
+        Find which content fingerprints are already stored by any job.
+        
+        Meant for records that are about to be saved: a stored record's own
+        fingerprint is always found.
+        
+        Args:
+            content_hashes: Fingerprints to look up (see content_fingerprint())
+            batch_size: Fingerprints per indexed IN query
+            
+        Returns:
+            Set of the given fingerprints that are already stored
+        """
+        unique_hashes = list(dict.fromkeys(content_hashes))
+        existing = set()
+        try:
+            async with get_async_db_session() as session:
+                for start in range(0, len(unique_hashes), batch_size):
+                    chunk = unique_hashes[start:start + batch_size]
+                    result = await session.execute(
+                        select(ScrapedDataORM.content_hash)
+                        .where(ScrapedDataORM.content_hash.in_(chunk))
+                        .distinct()
+                    )
+                    existing.update(result.scalars().all())
+            return existing
+            
+        except SQLAlchemyError as e:
+            self.logger.error(f"Content hash lookup failed: {e}")
+            raise RuntimeError(f"Failed to look up content hashes: {e}")
+    
+    async def find_content_hash_owners(self, content_hashes: List[str], batch_size: int = 500) -> Dict[str, str]:
+        """
+        Find the earliest stored record for each content fingerprint.
+        
+        Like find_existing_content_hashes(), but returns which record holds
+        the content, so a job can refer to it instead of storing it again.
+        
+        Args:
+            content_hashes: Fingerprints to look up (see content_fingerprint())
+            batch_size: Fingerprints per indexed IN query
+            
+        Returns:
+            Dict mapping each stored fingerprint to the ID of its earliest record
+        """
+        unique_hashes = list(dict.fromkeys(content_hashes))
+        owners = {}
+        try:
+            async with get_async_db_session() as session:
+                for start in range(0, len(unique_hashes), batch_size):
+                    chunk = unique_hashes[start:start + batch_size]
+                    result = await session.execute(
+                        select(ScrapedDataORM.content_hash, ScrapedDataORM.id)
+                        .where(ScrapedDataORM.content_hash.in_(chunk))
+                        .order_by(ScrapedDataORM.extracted_at, ScrapedDataORM.id)
+                    )
+                    for content_hash, data_id in result.all():
+                        owners.setdefault(content_hash, data_id)
+            return owners
+            
+        except SQLAlchemyError as e:
+            self.logger.error(f"Content hash owner lookup failed: {e}")
+            raise RuntimeError(f"Failed to look up content hashes: {e}")
+    
     async def get_scraped_data(
         self,
         job_id: Optional[str] = None,
@@ -367,6 +486,52 @@ class DataRepository:
             self.logger.error(f"Failed to retrieve scraped data: {e}")
             raise RuntimeError(f"Failed to retrieve scraped data: {e}")
     
+    async def iter_scraped_data(
+        self,
+        job_id: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[ScrapedData]:
+        """
+        Stream scraped data records in primary-key order.
+        
+        Pages are read with keyset pagination, each in its own short session,
+        so only one page is held in memory and the consumer can write to the
+        database between pages (e.g. DataCleaner.clean_stream() followed by
+        save_scraped_data()).
+        
+        Args:
+            job_id: Only stream records of this job
+            batch_size: Records read per query
+        
+        Yields:
+            ScrapedData records
+        """
+        last_id = ""
+        while True:
+            try:
+                async with get_async_db_session() as session:
+                    conditions = [ScrapedDataORM.id > last_id]
+                    if job_id:
+                        conditions.append(ScrapedDataORM.job_id == job_id)
+                    
+                    stmt = (
+                        select(ScrapedDataORM)
+                        .where(and_(*conditions))
+                        .order_by(ScrapedDataORM.id)
+                        .limit(batch_size)
+                    )
+                    page = (await session.execute(stmt)).scalars().all()
+                    records = [self._orm_to_pydantic_data(data_orm) for data_orm in page]
+            except SQLAlchemyError as e:
+                self.logger.error(f"Failed to stream scraped data: {e}")
+                raise RuntimeError(f"Failed to stream scraped data: {e}")
+            
+            if not records:
+                return
+            last_id = records[-1].id
+            for record in records:
+                yield record
+
     async def get_data_by_url_pattern(
         self, 
         url_pattern: str,
@@ -406,7 +571,8 @@ class DataRepository:
         confidence_score: float,
         ai_metadata: Dict[str, Any],
         data_quality_score: float,
-        validation_errors: List[str]
+        validation_errors: List[str],
+        ai_processed: bool = True
     ) -> bool:
         """
         Update scraped data with AI processing results.
@@ -417,6 +583,8 @@ class DataRepository:
             ai_metadata: AI processing metadata
             data_quality_score: Data quality score
             validation_errors: List of validation errors
+            ai_processed: False when the AI analysis failed and the scores
+                are still heuristic
             
         Returns:
             bool: True if update was successful
@@ -428,7 +596,7 @@ class DataRepository:
                     .where(ScrapedDataORM.id == data_id)
                     .values(
                         confidence_score=confidence_score,
-                        ai_processed=True,
+                        ai_processed=ai_processed,
                         ai_metadata=ai_metadata,
                         data_quality_score=data_quality_score,
                         validation_errors=validation_errors,
@@ -449,6 +617,96 @@ class DataRepository:
             self.logger.error(f"Failed to update AI processing for data {data_id}: {e}")
             raise RuntimeError(f"Failed to update AI processing: {e}")
     
+    async def rescore_confidence(
+        self,
+        job_id: Optional[str] = None,
+        data_ids: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Recompute the confidence scores of AI-processed records.
+        
+        Records are read in primary-key order, batch_size at a time, scored with
+        the vectorized batch scorer off the event loop and written back with one
+        bulk UPDATE per batch. Records without stored AI results (structured
+        data, entities and classification in ai_metadata) are skipped.
+        
+        Args:
+            job_id: Only rescore records of this job
+            data_ids: Only rescore these records
+            batch_size: Records scored and updated per batch
+        
+        Returns:
+            Dict with scanned, rescored and skipped record counts
+        """
+        from src.ai.confidence_scorer import ConfidenceScorer, ScoringInput
+        
+        scorer = ConfidenceScorer()
+        stats = {"scanned": 0, "rescored": 0, "skipped": 0}
+        last_id = ""
+        
+        try:
+            async with self._monitor_query_performance("rescore_confidence"):
+                async with get_async_db_session() as session:
+                    while True:
+                        conditions = [ScrapedDataORM.ai_processed == True, ScrapedDataORM.id > last_id]
+                        if job_id:
+                            conditions.append(ScrapedDataORM.job_id == job_id)
+                        if data_ids:
+                            conditions.append(ScrapedDataORM.id.in_(data_ids))
+                        
+                        stmt = (
+                            select(
+                                ScrapedDataORM.id,
+                                ScrapedDataORM.content,
+                                ScrapedDataORM.raw_html,
+                                ScrapedDataORM.ai_metadata
+                            )
+                            .where(and_(*conditions))
+                            .order_by(ScrapedDataORM.id)
+                            .limit(batch_size)
+                        )
+                        rows = (await session.execute(stmt)).all()
+                        if not rows:
+                            break
+                        
+                        last_id = rows[-1].id
+                        stats["scanned"] += len(rows)
+                        
+                        ids = []
+                        records = []
+                        for row in rows:
+                            ai_metadata = row.ai_metadata or {}
+                            if not all(key in ai_metadata for key in ("structured_data", "entities", "classification")):
+                                stats["skipped"] += 1
+                                continue
+                            ids.append(row.id)
+                            records.append(ScoringInput(
+                                structured_data=ai_metadata["structured_data"],
+                                entities=ai_metadata["entities"],
+                                classification=ai_metadata["classification"],
+                                raw_content=row.raw_html or str((row.content or {}).get("text") or "")
+                            ))
+                        
+                        if records:
+                            scores = await asyncio.to_thread(scorer.score_batch, records)
+                            await session.execute(
+                                update(ScrapedDataORM),
+                                [
+                                    {"id": data_id, "confidence_score": float(score)}
+                                    for data_id, score in zip(ids, scores)
+                                ]
+                            )
+                            await session.commit()
+                            stats["rescored"] += len(records)
+                    
+                    self.logger.info(f"Rescored confidence of {stats['rescored']} records", extra=stats)
+                    return stats
+        
+        except SQLAlchemyError as e:
+            self.logger.error(f"Failed to rescore confidence: {e}")
+            raise RuntimeError(f"Failed to rescore confidence: {e}")
+
     # ==================== Logging Methods ====================
     
     async def add_job_log(
@@ -1245,6 +1503,7 @@ class DataRepository:
             total_pages=job_orm.total_pages,
             pages_completed=job_orm.pages_completed,
             pages_failed=job_orm.pages_failed,
+            pages_enriched=job_orm.pages_enriched or 0,
             error_message=job_orm.error_message,
             retry_count=job_orm.retry_count,
             user_id=job_orm.user_id,
@@ -1263,6 +1522,7 @@ class DataRepository:
             content=data_orm.content,
             raw_html=data_orm.raw_html,
             content_type=ContentType(data_orm.content_type),
+            content_hash=data_orm.content_hash,
             content_metadata=data_orm.content_metadata,
             confidence_score=data_orm.confidence_score,
             ai_processed=data_orm.ai_processed,
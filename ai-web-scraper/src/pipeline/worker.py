@@ -5,30 +5,46 @@ This module contains the Celery tasks that handle the actual scraping,
 content processing, and data cleaning operations in the background.
 """
 
-import asyncio
+import math
 import traceback
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from celery import Task
+from celery import Task, chord
+from celery.result import AsyncResult
 from celery.exceptions import Retry, WorkerLostError
-from celery.signals import task_prerun, task_postrun, task_failure
+from celery.signals import (
+    task_failure, task_postrun, task_prerun, worker_process_init, worker_process_shutdown, worker_shutdown
+)
+
+from config.settings import get_settings
 
-from .job_queue import celery_app, get_job_queue
-from ..models.pydantic_models import JobStatus, ScrapingConfig, ScrapedData, ScrapingResult
+from .job_queue import JobProgressWriter, celery_app, get_job_queue
+from ..models.pydantic_models import ContentType, JobStatus, ScrapingConfig, ScrapedData, ScrapingResult
 from ..scraper.web_scraper import WebScraper
 from ..ai.content_processor import ContentProcessor
 from ..pipeline.cleaner import DataCleaner
+from ..pipeline.fingerprint import content_fingerprint
+from ..pipeline.near_duplicates import (
+    get_near_duplicate_index, index_saved_records, save_near_duplicate_index
+)
+from ..pipeline.parallel_cleaner import clean_shard, split_shards
+from ..pipeline.quality_stats import StreamingQualityMetrics
 from ..pipeline.repository import DataRepository
+from ..pipeline.enrichment import (
+    failed_ai_metadata, heuristic_confidence, is_pending, pending_ai_metadata
+)
 from ..utils.logger import get_logger
+from ..utils.async_runtime import get_async_runtime, run_async, shutdown_async_runtime
 from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.exceptions import AIQuotaExceededException
 
 logger = get_logger(__name__)
 
 # Initialize components
 web_scraper = WebScraper()
 content_processor = ContentProcessor()
-data_cleaner = DataCleaner()
+data_cleaner = DataCleaner(near_duplicate_index=get_near_duplicate_index())
 data_repository = DataRepository()
 
 # Circuit breakers for external services
@@ -43,12 +59,15 @@ scraper_circuit_breaker = CircuitBreaker(
     )
 )
 
+# Rate limits are paced by the AI quota governor, so quota waits are not
+# failures and the breaker only has to cover real outages
 ai_circuit_breaker = CircuitBreaker(
     name="ai_processor", 
     config=CircuitBreakerConfig(
         failure_threshold=3,
-        recovery_timeout=600.0,  # 10 minutes
-        timeout=120.0
+        recovery_timeout=120.0,  # 2 minutes
+        timeout=120.0,
+        ignored_exceptions=(AIQuotaExceededException,)
     )
 )
 
@@ -127,7 +146,7 @@ def scrape_url_task(self, job_id: str, url: str, config: Dict[str, Any]) -> Dict
         
         # Perform scraping with circuit breaker
         try:
-            scraping_result = asyncio.run(scraper_circuit_breaker.call(
+            scraping_result = run_async(scraper_circuit_breaker.call(
                 web_scraper.scrape_url, url, scraping_config
             ))
         except Exception as e:
@@ -142,56 +161,132 @@ def scrape_url_task(self, job_id: str, url: str, config: Dict[str, Any]) -> Dict
         if not scraping_result.success:
             raise Exception(f"Scraping failed: {scraping_result.error_message}")
         
+        # Content another job already stored is referenced instead of saved again
+        stored_owners = {}
+        if scraping_config.skip_stored_duplicates:
+            stored_owners = find_stored_duplicates(scraping_result.data, job_id)
+        
         # Process scraped data
+        ai_enabled = scraping_config.javascript_enabled  # Use as proxy for AI processing
+        defer_ai = ai_enabled and get_settings().ai_deferred_enrichment
         processed_data = []
+        duplicate_references = []
         for raw_data in scraping_result.data:
+            content_hash = content_fingerprint(raw_data.content)
+            if content_hash in stored_owners:
+                # Dropped as a duplicate during cleaning, so it is not analyzed
+                duplicate_references.append(
+                    stored_duplicate_reference(raw_data, content_hash, stored_owners[content_hash])
+                )
+                processed_data.append(raw_data)
+                continue
             try:
-                # Process with AI if enabled
-                if scraping_config.javascript_enabled:  # Use as proxy for AI processing
-                    processed_content = process_content_with_ai(raw_data.content, raw_data.url)
+                if defer_ai:
+                    # Save with heuristic scores now; enrich_data_task adds the AI results
+                    raw_data.confidence_score = run_async(heuristic_confidence(raw_data.content))
+                    raw_data.ai_processed = False
+                    raw_data.ai_metadata = pending_ai_metadata()
+                elif ai_enabled:
+                    processed_content = process_content_with_ai(
+                        raw_data.content, raw_data.url,
+                        combined_analysis=scraping_config.combined_ai_analysis
+                    )
                     raw_data.ai_processed = True
                     raw_data.ai_metadata = processed_content.get("metadata", {})
                     raw_data.confidence_score = processed_content.get("confidence_score", 0.0)
                 
-                # Clean and validate data
-                cleaned_data = data_cleaner.clean_scraped_data(raw_data)
-                processed_data.append(cleaned_data)
-                
             except Exception as e:
                 logger.warning(
                     "Failed to process scraped data",
                     extra={"job_id": job_id, "url": raw_data.url, "error": str(e)}
                 )
                 # Keep original data if processing fails
-                processed_data.append(raw_data)
+            processed_data.append(raw_data)
+        
+        # Clean and validate data; records matching stored content count as duplicates
+        try:
+            processed_data, _ = data_cleaner.clean_data(processed_data, existing_hashes=set(stored_owners))
+        except Exception as e:
+            logger.warning(
+                "Failed to clean scraped data",
+                extra={"job_id": job_id, "url": url, "error": str(e)}
+            )
+            processed_data = [
+                data for data in processed_data
+                if content_fingerprint(data.content) not in stored_owners
+            ]
         
         # Save to database
-        saved_count = 0
+        saved_data = []
         for data in processed_data:
             try:
-                data_repository.save_scraped_data(data)
-                saved_count += 1
+                run_async(data_repository.save_scraped_data(data))
+                saved_data.append(data)
             except Exception as e:
                 logger.error(
                     "Failed to save scraped data",
                     extra={"job_id": job_id, "data_id": data.id, "error": str(e)}
                 )
+        saved_count = len(saved_data)
         
-        # Update job status
+        for reference in duplicate_references:
+            try:
+                run_async(data_repository.save_scraped_data(reference))
+            except Exception as e:
+                logger.error(
+                    "Failed to save duplicate reference",
+                    extra={"job_id": job_id, "data_id": reference.id, "error": str(e)}
+                )
+        
+        # Later scrapes are checked for near duplicates of these records
+        try:
+            index_saved_records(saved_data)
+        except Exception as e:
+            logger.warning(
+                "Failed to update near-duplicate index",
+                extra={"job_id": job_id, "error": str(e)}
+            )
+        
+        # Update job status; scraped progress is final, enriched progress follows
         get_job_queue().update_job_status(
             job_id,
             JobStatus.COMPLETED,
             total_pages=1,
             pages_completed=1 if scraping_result.success else 0,
-            pages_failed=0 if scraping_result.success else 1
+            pages_failed=0 if scraping_result.success else 1,
+            pages_enriched=0
         )
         
+        # Queue AI enrichment only for records that are in the database to update
+        enrichment_queued = 0
+        for data in saved_data:
+            if not is_pending(data.ai_metadata):
+                continue
+            try:
+                enrich_data_task.apply_async(
+                    # The task reloads the record, so page content never goes through the broker
+                    kwargs={
+                        "data_id": data.id,
+                        "job_id": job_id,
+                        "combined_analysis": scraping_config.combined_ai_analysis
+                    },
+                    queue="enrichment"
+                )
+                enrichment_queued += 1
+            except Exception as e:
+                logger.error(
+                    "Failed to queue AI enrichment",
+                    extra={"job_id": job_id, "data_id": data.id, "error": str(e)}
+                )
+        
         result = {
             "success": True,
             "job_id": job_id,
             "url": url,
             "data_count": len(processed_data),
             "saved_count": saved_count,
+            "duplicate_count": len(duplicate_references),
+            "enrichment_queued": enrichment_queued,
             "processing_time": scraping_result.total_time
         }
         
@@ -245,7 +340,13 @@ def scrape_url_task(self, job_id: str, url: str, config: Dict[str, Any]) -> Dict
 
 
 @celery_app.task(bind=True, base=CallbackTask, name="src.pipeline.worker.process_content_task")
-def process_content_task(self, content: str, url: str, content_type: str = "html") -> Dict[str, Any]:
+def process_content_task(
+    self,
+    content: str,
+    url: str,
+    content_type: str = "html",
+    combined_analysis: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Process content using AI for intelligent extraction.
     
@@ -253,6 +354,7 @@ def process_content_task(self, content: str, url: str, content_type: str = "html
         content: Raw content to process
         url: Source URL
         content_type: Type of content (html, text, etc.)
+        combined_analysis: Use one combined AI request (server default if None)
         
     Returns:
         Dict[str, Any]: Processing result
@@ -265,8 +367,9 @@ def process_content_task(self, content: str, url: str, content_type: str = "html
     try:
         # Process with AI using circuit breaker
         try:
-            result = asyncio.run(ai_circuit_breaker.call(
-                content_processor.process_content, content, content_type
+            result = run_async(ai_circuit_breaker.call(
+                content_processor.process_content, content, content_type,
+                combined_analysis=combined_analysis
             ))
         except Exception as e:
             if ai_circuit_breaker.state.value == "open":
@@ -320,6 +423,129 @@ def process_content_task(self, content: str, url: str, content_type: str = "html
         }
 
 
+@celery_app.task(bind=True, name="src.pipeline.worker.enrich_data_task", max_retries=3)
+def enrich_data_task(
+    self,
+    data_id: str,
+    job_id: str,
+    combined_analysis: Optional[bool] = None,
+    **legacy_kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Run the deferred AI analysis of a saved record and update it in place.
+    
+    The record is loaded from the database by ID, so messages stay small
+    whatever the page size. The task does not use CallbackTask: an
+    enrichment failure leaves the scraped data usable and must not mark the
+    finished job as failed.
+    
+    Args:
+        data_id: Saved data record identifier
+        job_id: Job that produced the record
+        combined_analysis: Use one combined AI request (server default if None)
+        legacy_kwargs: Page content and scores sent by older producers; ignored
+        
+    Returns:
+        Dict[str, Any]: Enrichment result
+    """
+    logger.info(
+        "Starting AI enrichment task",
+        extra={"task_id": self.request.id, "job_id": job_id, "data_id": data_id}
+    )
+    
+    try:
+        data = run_async(data_repository.get_scraped_data_by_id(data_id))
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=30 * (2 ** self.request.retries), exc=e)
+        data = None
+        logger.error(
+            "Failed to load data for AI enrichment",
+            extra={"job_id": job_id, "data_id": data_id, "error": str(e)}
+        )
+    
+    if data is None:
+        logger.warning(
+            "Skipping AI enrichment of missing data record",
+            extra={"job_id": job_id, "data_id": data_id}
+        )
+        get_job_queue().increment_job_progress(job_id, pages_enriched=1)
+        return {
+            "success": False,
+            "job_id": job_id,
+            "data_id": data_id,
+            "processing_status": "missing"
+        }
+    
+    url = data.url
+    content = data.raw_html or data.content.get("text", "")
+    confidence_score = data.confidence_score
+    data_quality_score = data.data_quality_score
+    
+    try:
+        processed = run_async(ai_circuit_breaker.call(
+            content_processor.process_content, content, ContentType.HTML, url,
+            combined_analysis=combined_analysis
+        ))
+        ai_metadata = dict(processed.processing_metadata)
+        ai_metadata.update({
+            "processing_status": "success",
+            "classification": processed.classification,
+            "entities": processed.entities,
+            "structured_data": processed.structured_data
+        })
+        confidence_score = processed.confidence_score
+        ai_processed = True
+    except Exception as e:
+        # An open breaker means the AI service is down; retrying soon will not help
+        if ai_circuit_breaker.state.value != "open" and self.request.retries < self.max_retries:
+            raise self.retry(countdown=30 * (2 ** self.request.retries), exc=e)
+        logger.warning(
+            "AI enrichment failed, keeping heuristic scores",
+            extra={"job_id": job_id, "data_id": data_id, "error": str(e)}
+        )
+        ai_metadata = failed_ai_metadata(e)
+        ai_processed = False
+    
+    try:
+        updated = run_async(data_repository.update_data_ai_processing(
+            data_id,
+            confidence_score=confidence_score,
+            ai_metadata=ai_metadata,
+            data_quality_score=data_quality_score,
+            validation_errors=[],
+            ai_processed=ai_processed
+        ))
+    except Exception as e:
+        logger.error(
+            "Failed to store AI enrichment",
+            extra={"job_id": job_id, "data_id": data_id, "error": str(e)}
+        )
+        updated = False
+    
+    # Failed analyses count too, so enriched progress always reaches the total
+    get_job_queue().increment_job_progress(job_id, pages_enriched=1)
+    
+    logger.info(
+        "Completed AI enrichment task",
+        extra={
+            "task_id": self.request.id,
+            "job_id": job_id,
+            "data_id": data_id,
+            "ai_processed": ai_processed,
+            "confidence_score": confidence_score
+        }
+    )
+    
+    return {
+        "success": ai_processed and updated,
+        "job_id": job_id,
+        "data_id": data_id,
+        "confidence_score": confidence_score,
+        "processing_status": ai_metadata["processing_status"]
+    }
+
+
 @celery_app.task(bind=True, base=CallbackTask, name="src.pipeline.worker.clean_data_task")
 def clean_data_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -376,22 +602,229 @@ def clean_data_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+@celery_app.task(bind=True, name="src.pipeline.worker.clean_batch_task")
+def clean_batch_task(self, records: List[Dict[str, Any]], content_hashes: List[str]) -> Dict[str, Any]:
+    """
+    Clean a batch of deduplicated records in one task.
+    
+    Args:
+        records: Serialized ScrapedData records, already deduplicated
+        content_hashes: Content hash of each record
+    
+    Returns:
+        Dict[str, Any]: Cleaned records and serialized quality statistics
+    """
+    logger.info(
+        "Starting batch cleaning task",
+        extra={"task_id": self.request.id, "records": len(records)}
+    )
+    
+    try:
+        scraped_data = [ScrapedData(**record) for record in records]
+        cleaned_data, stats = clean_shard(scraped_data, content_hashes, data_cleaner.cleaning_rules)
+        
+        logger.info(
+            "Completed batch cleaning task",
+            extra={"task_id": self.request.id, "records": len(records), "cleaned": len(cleaned_data)}
+        )
+        
+        return {
+            "success": True,
+            "cleaned_data": [record.model_dump(mode="json") for record in cleaned_data],
+            "metrics": stats
+        }
+    
+    except Exception as e:
+        logger.error(
+            "Batch cleaning task failed",
+            extra={
+                "task_id": self.request.id,
+                "records": len(records),
+                "error": str(e),
+                "traceback": traceback.format_exc()
+            }
+        )
+        
+        # Count the whole batch as invalid so merged metrics still add up
+        failed = StreamingQualityMetrics()
+        for _ in records:
+            failed.add_invalid()
+        return {
+            "success": False,
+            "error": str(e),
+            "cleaned_data": [],
+            "metrics": failed.to_dict()
+        }
+
+
+@celery_app.task(bind=True, name="src.pipeline.worker.merge_cleaning_results_task")
+def merge_cleaning_results_task(self, results: List[Dict[str, Any]], base_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the results of clean_batch_task into one report.
+    
+    Args:
+        results: clean_batch_task results, in submission order
+        base_metrics: Serialized statistics of the dispatch step (duplicates)
+    
+    Returns:
+        Dict[str, Any]: Cleaned records, DataQualityMetrics and score distribution summary
+    """
+    aggregate = StreamingQualityMetrics.from_dict(base_metrics)
+    cleaned_data = []
+    failed_batches = 0
+    for result in results:
+        cleaned_data.extend(result["cleaned_data"])
+        aggregate.merge(StreamingQualityMetrics.from_dict(result["metrics"]))
+        if not result["success"]:
+            failed_batches += 1
+    
+    # Near duplicates span batches, so they are flagged on the merged result
+    if data_cleaner.near_duplicate_index is not None and cleaned_data:
+        records = [ScrapedData(**record) for record in cleaned_data]
+        if data_cleaner.flag_near_duplicates(records):
+            cleaned_data = [record.model_dump(mode="json") for record in records]
+    
+    return {
+        "success": failed_batches == 0,
+        "failed_batches": failed_batches,
+        "cleaned_data": cleaned_data,
+        "metrics": aggregate.to_metrics().model_dump(mode="json"),
+        "quality_summary": aggregate.summary()
+    }
+
+
+def submit_cleaning_batches(
+    records: List[ScrapedData],
+    existing_hashes: Optional[List[str]] = None,
+    batch_size: Optional[int] = None
+) -> AsyncResult:
+    """
+    Clean records on the cleaning workers, batch_size records per task.
+    
+    Duplicates are removed here against one seen-hash set before the batches
+    are sent, so no two workers clean the same content; a chord merges the
+    batch results and their quality statistics.
+    
+    Args:
+        records: Records to clean
+        existing_hashes: Content hashes already stored; matching records count as duplicates
+        batch_size: Records per task (CLEANING_BATCH_SIZE if None)
+    
+    Returns:
+        AsyncResult of merge_cleaning_results_task
+    """
+    batch_size = batch_size or get_settings().cleaning_batch_size
+    aggregate = StreamingQualityMetrics()
+    unique_records, unique_hashes = data_cleaner._deduplicate(records, set(existing_hashes or ()), aggregate)
+    
+    batches = [
+        clean_batch_task.s([record.model_dump(mode="json") for record in batch_records], batch_hashes)
+        for batch_records, batch_hashes in zip(
+            split_shards(unique_records, batch_size),
+            split_shards(unique_hashes, batch_size)
+        )
+    ]
+    if not batches:
+        return merge_cleaning_results_task.delay([], aggregate.to_dict())
+    return chord(batches)(merge_cleaning_results_task.s(aggregate.to_dict()))
+
+
+def _scrape_urls(
+    job_id: str,
+    urls: List[str],
+    config: Dict[str, Any],
+    offset: int = 0,
+    on_result: Optional[Callable[[int, int], None]] = None
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Scrape URLs of a batch one after another in the current worker.
+    
+    Args:
+        job_id: Batch job identifier
+        urls: URLs to scrape
+        config: Scraping configuration dictionary
+        offset: Position of the first URL in the batch (used for sub-job IDs)
+        on_result: Called with the running (completed, failed) counts after each URL
+        
+    Returns:
+        Tuple of (per-URL results, completed count, failed count)
+    """
+    results = []
+    completed_count = 0
+    failed_count = 0
+    
+    for i, url in enumerate(urls, start=offset):
+        try:
+            # Run the individual scraping task in this worker
+            result = scrape_url_task.apply(kwargs={
+                "job_id": f"{job_id}_{i}",
+                "url": url,
+                "config": config
+            }).get()
+            
+            if result.get("success"):
+                completed_count += 1
+            else:
+                failed_count += 1
+            
+            results.append(result)
+            
+        except Exception as e:
+            failed_count += 1
+            logger.error(
+                "Failed to process URL in batch",
+                extra={"job_id": job_id, "url": url, "error": str(e)}
+            )
+            results.append({
+                "success": False,
+                "url": url,
+                "error": str(e)
+            })
+        
+        if on_result is not None:
+            on_result(completed_count, failed_count)
+    
+    return results, completed_count, failed_count
+
+
+def _batch_chunk_size(url_count: int, chunk_size: int, max_parallel_chunks: int) -> int:
+    """Chunk size that splits url_count URLs into at most max_parallel_chunks chunks."""
+    return max(chunk_size, math.ceil(url_count / max(max_parallel_chunks, 1)), 1)
+
+
 @celery_app.task(bind=True, name="src.pipeline.worker.batch_scrape_task")
-def batch_scrape_task(self, job_id: str, urls: List[str], config: Dict[str, Any]) -> Dict[str, Any]:
+def batch_scrape_task(
+    self,
+    job_id: str,
+    urls: List[str],
+    config: Dict[str, Any],
+    fan_out: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Process multiple URLs in a batch.
     
+    In fan-out mode the URLs are split into scrape_chunk_task sub-tasks that
+    run in parallel on the scraping workers, and finish_batch_scrape_task
+    records the final job status and returns the batch result. Otherwise
+    the URLs are scraped one after another inside this task.
+    
     Args:
         job_id: Unique job identifier
         urls: List of URLs to scrape
         config: Scraping configuration dictionary
+        fan_out: Dispatch URL chunks to the worker fleet (BATCH_SCRAPE_FANOUT if None)
         
     Returns:
-        Dict[str, Any]: Batch processing result
+        Dict[str, Any]: Batch processing result; in fan-out mode the dispatch
+        summary, with the batch result available from callback_task_id
     """
+    settings = get_settings()
+    if fan_out is None:
+        fan_out = settings.batch_scrape_fanout
+    
     logger.info(
         "Starting batch scraping task",
-        extra={"task_id": self.request.id, "job_id": job_id, "url_count": len(urls)}
+        extra={"task_id": self.request.id, "job_id": job_id, "url_count": len(urls), "fan_out": fan_out}
     )
     
     try:
@@ -399,57 +832,61 @@ def batch_scrape_task(self, job_id: str, urls: List[str], config: Dict[str, Any]
         get_job_queue().update_job_status(
             job_id,
             JobStatus.RUNNING,
-            total_pages=len(urls)
+            total_pages=len(urls),
+            pages_completed=0,
+            pages_failed=0
         )
         
-        results = []
-        completed_count = 0
-        failed_count = 0
+        if fan_out and urls:
+            chunk_size = _batch_chunk_size(
+                len(urls), settings.batch_scrape_chunk_size, settings.batch_scrape_max_parallel_chunks
+            )
+            chunks = [
+                scrape_chunk_task.s(job_id, urls[start:start + chunk_size], config, start)
+                for start in range(0, len(urls), chunk_size)
+            ]
+            callback = chord(chunks)(finish_batch_scrape_task.s(job_id, len(urls)))
+            
+            logger.info(
+                "Dispatched batch scraping chunks",
+                extra={
+                    "task_id": self.request.id,
+                    "job_id": job_id,
+                    "chunk_count": len(chunks),
+                    "chunk_size": chunk_size,
+                    "callback_task_id": callback.id
+                }
+            )
+            
+            return {
+                "success": True,
+                "job_id": job_id,
+                "total_urls": len(urls),
+                "chunk_count": len(chunks),
+                "callback_task_id": callback.id
+            }
         
-        for i, url in enumerate(urls):
-            try:
-                # Submit individual scraping task
-                result = scrape_url_task.apply(kwargs={
-                    "job_id": f"{job_id}_{i}",
-                    "url": url,
-                    "config": config
-                })
-                
-                if result.get("success"):
-                    completed_count += 1
-                else:
-                    failed_count += 1
-                
-                results.append(result)
-                
-                # Update progress
-                get_job_queue().update_job_status(
-                    job_id,
-                    JobStatus.RUNNING,
-                    pages_completed=completed_count,
-                    pages_failed=failed_count
-                )
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    "Failed to process URL in batch",
-                    extra={"job_id": job_id, "url": url, "error": str(e)}
-                )
-                results.append({
-                    "success": False,
-                    "url": url,
-                    "error": str(e)
-                })
+        progress = JobProgressWriter(get_job_queue())
+        results, completed_count, failed_count = _scrape_urls(
+            job_id, urls, config,
+            # Update progress (coalesced, written at most once per flush interval)
+            on_result=lambda completed, failed: progress.update(
+                job_id,
+                JobStatus.RUNNING,
+                pages_completed=completed,
+                pages_failed=failed
+            )
+        )
         
-        # Update final job status
+        # Update final job status together with any progress not yet written
         final_status = JobStatus.COMPLETED if failed_count == 0 else JobStatus.FAILED
-        get_job_queue().update_job_status(
+        progress.update(
             job_id,
             final_status,
             pages_completed=completed_count,
             pages_failed=failed_count
         )
+        progress.flush()
         
         logger.info(
             "Completed batch scraping task",
@@ -490,13 +927,172 @@ def batch_scrape_task(self, job_id: str, urls: List[str], config: Dict[str, Any]
         }
 
 
-def process_content_with_ai(content: Dict[str, Any], url: str) -> Dict[str, Any]:
+@celery_app.task(bind=True, name="src.pipeline.worker.scrape_chunk_task")
+def scrape_chunk_task(
+    self,
+    job_id: str,
+    urls: List[str],
+    config: Dict[str, Any],
+    offset: int
+) -> Dict[str, Any]:
+    """
+    Scrape one chunk of a fanned-out batch.
+    
+    Never raises, so a failing chunk is accounted as failed URLs instead of
+    preventing the chord callback from running.
+    
+    Args:
+        job_id: Batch job identifier
+        urls: URLs of this chunk
+        config: Scraping configuration dictionary
+        offset: Position of the chunk's first URL in the batch
+        
+    Returns:
+        Dict[str, Any]: Chunk counts and per-URL results
+    """
+    try:
+        results, completed_count, failed_count = _scrape_urls(job_id, urls, config, offset)
+    except Exception as e:
+        logger.error(
+            "Batch scraping chunk failed",
+            extra={"task_id": self.request.id, "job_id": job_id, "offset": offset, "error": str(e)}
+        )
+        results = [{"success": False, "url": url, "error": str(e)} for url in urls]
+        completed_count, failed_count = 0, len(urls)
+    
+    # Chunks finish concurrently, so progress is added rather than set
+    get_job_queue().increment_job_progress(
+        job_id, pages_completed=completed_count, pages_failed=failed_count
+    )
+    
+    return {
+        "completed_count": completed_count,
+        "failed_count": failed_count,
+        "results": results
+    }
+
+
+@celery_app.task(bind=True, name="src.pipeline.worker.finish_batch_scrape_task")
+def finish_batch_scrape_task(
+    self,
+    chunk_results: List[Dict[str, Any]],
+    job_id: str,
+    total_urls: int
+) -> Dict[str, Any]:
+    """
+    Aggregate the chunks of a fanned-out batch and set the final job status.
+    
+    Args:
+        chunk_results: scrape_chunk_task results, in URL order
+        job_id: Batch job identifier
+        total_urls: Number of URLs in the batch
+        
+    Returns:
+        Dict[str, Any]: Batch processing result, as returned by batch_scrape_task inline
+    """
+    results = []
+    completed_count = 0
+    failed_count = 0
+    for chunk in chunk_results:
+        results.extend(chunk["results"])
+        completed_count += chunk["completed_count"]
+        failed_count += chunk["failed_count"]
+    
+    final_status = JobStatus.COMPLETED if failed_count == 0 else JobStatus.FAILED
+    get_job_queue().update_job_status(
+        job_id,
+        final_status,
+        pages_completed=completed_count,
+        pages_failed=failed_count
+    )
+    
+    logger.info(
+        "Completed batch scraping task",
+        extra={
+            "task_id": self.request.id,
+            "job_id": job_id,
+            "completed_count": completed_count,
+            "failed_count": failed_count
+        }
+    )
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "total_urls": total_urls,
+        "completed_count": completed_count,
+        "failed_count": failed_count,
+        "results": results
+    }
+
+
+def find_stored_duplicates(records: List[ScrapedData], job_id: str) -> Dict[str, str]:
+    """
+    Look up which of the records' content other jobs already stored.
+    
+    The lookup is best effort: if it fails, nothing counts as stored.
+    
+    Args:
+        records: Scraped records that have not been saved
+        job_id: Job identifier (for logging)
+        
+    Returns:
+        Dict mapping stored content fingerprints to the ID of the record holding them
+    """
+    if not records:
+        return {}
+    try:
+        return run_async(data_repository.find_content_hash_owners(
+            [content_fingerprint(record.content) for record in records]
+        ))
+    except Exception as e:
+        logger.warning(
+            "Failed to look up stored duplicates",
+            extra={"job_id": job_id, "error": str(e)}
+        )
+        return {}
+
+
+def stored_duplicate_reference(record: ScrapedData, content_hash: str, existing_id: str) -> ScrapedData:
+    """
+    Build the row a job keeps for a page whose content is already stored.
+    
+    The reference has no content of its own; content_metadata["duplicate_of"]
+    names the record that holds it.
+    
+    Args:
+        record: Scraped record whose content is a duplicate
+        content_hash: Fingerprint of the record's content
+        existing_id: ID of the stored record with the same content
+        
+    Returns:
+        ScrapedData: Reference record with the scraped record's ID
+    """
+    return ScrapedData(
+        id=record.id,
+        job_id=record.job_id,
+        url=record.url,
+        content={},
+        content_type=record.content_type,
+        content_hash=content_hash,
+        content_metadata={"duplicate_of": existing_id},
+        extracted_at=record.extracted_at,
+        load_time=record.load_time
+    )
+
+
+def process_content_with_ai(
+    content: Dict[str, Any],
+    url: str,
+    combined_analysis: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Helper function to process content with AI.
     
     Args:
         content: Content dictionary to process
         url: Source URL
+        combined_analysis: Use one combined AI request (server default if None)
         
     Returns:
         Dict[str, Any]: AI processing result
@@ -506,7 +1102,8 @@ def process_content_with_ai(content: Dict[str, Any], url: str) -> Dict[str, Any]
         result = process_content_task.apply(kwargs={
             "content": str(content),
             "url": url,
-            "content_type": "html"
+            "content_type": "html",
+            "combined_analysis": combined_analysis
         })
         
         return result if result.get("success") else {
@@ -564,4 +1161,26 @@ def task_failure_handler(sender=None, task_id=None, exception=None, traceback=No
             "exception": str(exception),
             "traceback": str(traceback)
         }
-    )
\ No newline at end of file
+    )
+
+
+# Worker process lifecycle: one long-lived event loop per worker process, so
+# the scraper's browser session, HTTP connections and async DB connections
+# are reused across tasks instead of being rebuilt on a new loop each time
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """Start the process's event loop runtime."""
+    runtime = get_async_runtime()
+    runtime.add_shutdown_hook(web_scraper.cleanup)
+    logger.info("Worker event loop started", extra={"pid": runtime.pid})
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def worker_process_shutdown_handler(**kwargs):
+    """Release loop-bound resources, stop the event loop runtime and persist the near-duplicate index."""
+    shutdown_async_runtime()
+    try:
+        save_near_duplicate_index(force=True)
+    except Exception as e:
+        logger.warning("Failed to save near-duplicate index", extra={"error": str(e)})
@@ -0,0 +1,299 @@
+"""
+Content-Encoding negotiation and incremental decompression.
+
+This module builds the Accept-Encoding header from the decoders that are
+installed and provides streaming decoders for gzip, deflate, brotli and zstd
+so that response bodies can be decompressed chunk by chunk.
+"""
+
+import zlib
+from typing import List, Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+if BROTLI_AVAILABLE:
+    # Bounded decoding needs output_buffer_limit (brotli >= 1.1); without it a
+    # small brotli body could expand without limit, so br is not offered
+    try:
+        brotli.Decompressor().process(b'', output_buffer_limit=1)
+    except (TypeError, AttributeError):
+        BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Largest piece of output produced per decompression step
+OUTPUT_SLICE = 64 * 1024
+
+
+class StreamDecoder:
+    """
+    Base class for incremental Content-Encoding decoders.
+
+    Decoders produce output in slices of at most OUTPUT_SLICE bytes and stop
+    decompressing once max_output bytes have been produced, so a small
+    compressed body cannot expand into unbounded memory before size limits
+    are checked.
+    """
+
+    def __init__(self, max_output: Optional[int] = None):
+        """
+        Initialize the decoder.
+
+        Args:
+            max_output: Maximum total bytes to produce (unbounded if None)
+        """
+        self.max_output = max_output
+        self.output_bytes = 0
+        self.limit_reached = False
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decode a chunk of encoded data."""
+        raise NotImplementedError
+
+    def flush(self) -> bytes:
+        """Return any data still buffered in the decoder."""
+        return b''
+
+    def _slice_size(self) -> int:
+        if self.max_output is None:
+            return OUTPUT_SLICE
+        return min(OUTPUT_SLICE, self.max_output - self.output_bytes)
+
+    def _count(self, output: bytes) -> bytes:
+        """Account for produced output, cutting it off at max_output."""
+        if self.max_output is not None:
+            remaining = self.max_output - self.output_bytes
+            if len(output) >= remaining:
+                output = output[:remaining]
+                self.limit_reached = True
+        self.output_bytes += len(output)
+        return output
+
+
+class _ZlibDecoder(StreamDecoder):
+    """Shared bounded decompression loop of the zlib-based decoders."""
+
+    def __init__(self, wbits: int, max_output: Optional[int] = None):
+        super().__init__(max_output)
+        self._wbits = wbits
+        self._decoder = zlib.decompressobj(wbits)
+
+    def _drain(self, data: bytes, restart_members: bool = False) -> bytes:
+        """Decompress data one output slice at a time until it is consumed or the limit is hit."""
+        chunks = []
+        while not self.limit_reached:
+            size = self._slice_size()
+            chunk = self._decoder.decompress(data, size)
+            data = self._decoder.unconsumed_tail
+            chunks.append(self._count(chunk))
+            if self._decoder.eof:
+                if restart_members and self._decoder.unused_data:
+                    # Some servers send several gzip members back to back
+                    data = self._decoder.unused_data
+                    self._decoder = zlib.decompressobj(self._wbits)
+                    continue
+                break
+            if not data and len(chunk) < size:
+                break
+        return b''.join(chunks)
+
+    def flush(self) -> bytes:
+        if self.limit_reached:
+            return b''
+        return self._count(self._decoder.flush())
+
+
+class GzipDecoder(_ZlibDecoder):
+    """Incremental gzip decoder (handles concatenated members)."""
+
+    def __init__(self, max_output: Optional[int] = None):
+        super().__init__(16 + zlib.MAX_WBITS, max_output)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._drain(data, restart_members=True)
+
+
+class DeflateDecoder(_ZlibDecoder):
+    """Incremental deflate decoder accepting both zlib-wrapped and raw streams."""
+
+    def __init__(self, max_output: Optional[int] = None):
+        super().__init__(zlib.MAX_WBITS, max_output)
+        self._first_chunk = b''
+        self._detected = False
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._detected:
+            return self._drain(data)
+
+        # Keep what was seen so far in case the stream has to be replayed as raw deflate
+        self._first_chunk += data
+        output_bytes = self.output_bytes
+        try:
+            output = self._drain(data)
+        except zlib.error:
+            self._detected = True
+            self._wbits = -zlib.MAX_WBITS
+            self._decoder = zlib.decompressobj(self._wbits)
+            self.output_bytes, self.limit_reached = output_bytes, False
+            output = self._drain(self._first_chunk)
+            self._first_chunk = b''
+            return output
+        if output:
+            self._detected = True
+            self._first_chunk = b''
+        return output
+
+
+class BrotliDecoder(StreamDecoder):
+    """Incremental brotli decoder."""
+
+    def __init__(self, max_output: Optional[int] = None):
+        super().__init__(max_output)
+        self._decoder = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        chunks = []
+        while not self.limit_reached:
+            # The limit is soft (brotli may overshoot by one block); _count trims the excess
+            chunk = self._decoder.process(data, output_buffer_limit=self._slice_size())
+            data = b''
+            chunks.append(self._count(chunk))
+            # Keep pulling with empty input until the decoder has no more output ready
+            if not chunk or self._decoder.is_finished():
+                break
+        return b''.join(chunks)
+
+
+class _OutputLimitReached(Exception):
+    """Raised from the zstd output sink to stop decompressing."""
+
+
+class ZstdDecoder(StreamDecoder):
+    """
+    Incremental zstd decoder (handles multiple frames).
+
+    zstandard's decompressobj has no output bound, so data is pushed through
+    a stream_writer whose sink receives output slices and interrupts the
+    decompressor once the limit is reached.
+    """
+
+    def __init__(self, max_output: Optional[int] = None):
+        super().__init__(max_output)
+        self._chunks: List[bytes] = []
+        self._writer = zstandard.ZstdDecompressor().stream_writer(
+            self, write_size=OUTPUT_SLICE, write_return_read=False
+        )
+
+    def write(self, data: bytes) -> int:
+        """Output sink called by the zstd stream writer."""
+        self._chunks.append(self._count(bytes(data)))
+        if self.limit_reached:
+            raise _OutputLimitReached()
+        return len(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.limit_reached:
+            return b''
+        try:
+            self._writer.write(data)
+        except _OutputLimitReached:
+            pass
+        output = b''.join(self._chunks)
+        self._chunks = []
+        return output
+
+
+class MultiDecoder(StreamDecoder):
+    """Applies several decoders for stacked encodings such as ``gzip, br``."""
+
+    def __init__(self, decoders: List[StreamDecoder]):
+        super().__init__()
+        # Encodings are listed in the order they were applied, so decode in reverse
+        self._decoders = list(reversed(decoders))
+
+    def decompress(self, data: bytes) -> bytes:
+        for decoder in self._decoders:
+            data = decoder.decompress(data)
+        self._update_limit()
+        return data
+
+    def flush(self) -> bytes:
+        data = b''
+        for decoder in self._decoders:
+            data = (decoder.decompress(data) if data else b'') + decoder.flush()
+        self._update_limit()
+        return data
+
+    def _update_limit(self) -> None:
+        # Every stage is bounded; one hitting its limit means the body is over it
+        self.limit_reached = any(decoder.limit_reached for decoder in self._decoders)
+
+
+def supported_encodings() -> List[str]:
+    """Return the content codings that can be decoded in this environment."""
+    encodings = ['gzip', 'deflate']
+    if BROTLI_AVAILABLE:
+        encodings.append('br')
+    if ZSTD_AVAILABLE:
+        encodings.append('zstd')
+    return encodings
+
+
+def get_accept_encoding() -> str:
+    """Build the Accept-Encoding header value, preferring the densest codings."""
+    preference = ['zstd', 'br', 'gzip', 'deflate']
+    available = supported_encodings()
+    return ', '.join(e for e in preference if e in available)
+
+
+def _single_decoder(encoding: str, max_output: Optional[int] = None) -> StreamDecoder:
+    """Create a decoder for one content coding."""
+    if encoding in ('gzip', 'x-gzip'):
+        return GzipDecoder(max_output)
+    if encoding == 'deflate':
+        return DeflateDecoder(max_output)
+    if encoding == 'br' and BROTLI_AVAILABLE:
+        return BrotliDecoder(max_output)
+    if encoding == 'zstd' and ZSTD_AVAILABLE:
+        return ZstdDecoder(max_output)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def get_decoder(content_encoding: Optional[str], max_output: Optional[int] = None) -> Optional[StreamDecoder]:
+    """
+    Create a streaming decoder for a Content-Encoding header value.
+
+    Args:
+        content_encoding: Raw Content-Encoding header value
+        max_output: Maximum decoded bytes to produce (unbounded if None)
+
+    Returns:
+        StreamDecoder, or None for identity/absent encodings
+
+    Raises:
+        ValueError: If an encoding is not supported
+    """
+    if not content_encoding:
+        return None
+
+    encodings = [
+        e.strip().lower() for e in content_encoding.split(',')
+        if e.strip() and e.strip().lower() != 'identity'
+    ]
+    if not encodings:
+        return None
+
+    decoders = [_single_decoder(e, max_output) for e in encodings]
+    return decoders[0] if len(decoders) == 1 else MultiDecoder(decoders)
@@ -51,6 +51,20 @@ class ScrapingSettings(BaseSettings):
     allow_redirects: bool = Field(default=True, description="Allow HTTP redirects")
     max_redirects: int = Field(default=5, description="Maximum number of redirects to follow")
     
+    # HTTP cache settings
+    http_cache_dir: str = Field(default="data/cache/http", description="Directory for the on-disk HTTP cache")
+    http_cache_max_bytes: int = Field(
+        default=1024 * 1024 * 1024, ge=1024 * 1024,
+        description="Size budget for cached response bodies"
+    )
+    
+    # WARC archive settings
+    warc_archive_dir: str = Field(default="data/archive", description="Directory for WARC capture files")
+    warc_max_file_bytes: int = Field(
+        default=1024 * 1024 * 1024, ge=1024 * 1024,
+        description="Size after which a new WARC file is started"
+    )
+    
     # Security settings
     respect_robots_txt: bool = Field(default=True, description="Respect robots.txt by default")
     max_retries: int = Field(default=3, ge=0, le=10, description="Maximum retry attempts")
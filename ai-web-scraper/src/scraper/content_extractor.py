@@ -18,6 +18,30 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Elements that never carry page content (ads, overlays, share widgets)
+BOILERPLATE_SELECTORS = [
+    '.advertisement', '.ad', '.ads',
+    '.cookie-banner', '.cookie-notice',
+    '.popup', '.modal',
+    '.social-share', '.share-buttons',
+    '.newsletter-signup',
+    '[style*="display: none"]',
+    '[style*="visibility: hidden"]'
+]
+
+# Main content containers, most specific first
+MAIN_CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '[role="main"]',
+    '.main-content',
+    '.content',
+    '.post-content',
+    '.entry-content',
+    '#main',
+    '#content'
+]
+
 
 class ContentExtractor:
     """
@@ -103,17 +127,7 @@ class ContentExtractor:
                 logger.warning(f"Invalid exclude selector '{selector}': {str(e)}")
         
         # Remove common unwanted elements
-        unwanted_selectors = [
-            '.advertisement', '.ad', '.ads',
-            '.cookie-banner', '.cookie-notice',
-            '.popup', '.modal',
-            '.social-share', '.share-buttons',
-            '.newsletter-signup',
-            '[style*="display: none"]',
-            '[style*="visibility: hidden"]'
-        ]
-        
-        for selector in unwanted_selectors:
+        for selector in BOILERPLATE_SELECTORS:
             try:
                 for element in soup.select(selector):
                     element.decompose()
@@ -278,19 +292,7 @@ class ContentExtractor:
             BeautifulSoup object containing main content
         """
         # Try semantic HTML5 elements first
-        main_selectors = [
-            'main',
-            'article',
-            '[role="main"]',
-            '.main-content',
-            '.content',
-            '.post-content',
-            '.entry-content',
-            '#main',
-            '#content'
-        ]
-        
-        for selector in main_selectors:
+        for selector in MAIN_CONTENT_SELECTORS:
             try:
                 main_area = soup.select_one(selector)
                 if main_area:
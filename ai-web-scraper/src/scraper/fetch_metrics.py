@@ -0,0 +1,88 @@
+"""
+Per-domain fetch metrics.
+
+This module tracks transfer statistics for the HTTP fetch layer, including
+the bytes saved by content compression, aggregated per domain.
+"""
+
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class DomainFetchStats:
+    """Aggregated transfer statistics for a single domain."""
+    responses: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    bytes_saved: int = 0
+    encodings: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded size divided by transferred size (1.0 when uncompressed)."""
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+
+class FetchMetrics:
+    """Thread-safe per-domain fetch statistics."""
+
+    def __init__(self):
+        self._stats: Dict[str, DomainFetchStats] = {}
+        self._lock = threading.Lock()
+
+    def record_transfer(
+        self,
+        url: str,
+        wire_bytes: int,
+        decoded_bytes: int,
+        content_encoding: Optional[str] = None
+    ) -> None:
+        """
+        Record one response transfer.
+
+        Args:
+            url: Response URL (used to derive the domain)
+            wire_bytes: Bytes received from the network
+            decoded_bytes: Bytes after content decoding
+            content_encoding: Content-Encoding of the response, if any
+        """
+        domain = urlparse(url).netloc.lower()
+        encoding = (content_encoding or 'identity').lower()
+
+        with self._lock:
+            stats = self._stats.setdefault(domain, DomainFetchStats())
+            stats.responses += 1
+            stats.wire_bytes += wire_bytes
+            stats.decoded_bytes += decoded_bytes
+            stats.bytes_saved += max(decoded_bytes - wire_bytes, 0)
+            stats.encodings[encoding] = stats.encodings.get(encoding, 0) + 1
+
+    def get_domain_stats(self, domain: str) -> Optional[DomainFetchStats]:
+        """Get statistics for a single domain."""
+        with self._lock:
+            return self._stats.get(domain.lower())
+
+    def get_bytes_saved(self) -> Dict[str, int]:
+        """Get the bytes saved by compression for every domain."""
+        with self._lock:
+            return {domain: stats.bytes_saved for domain, stats in self._stats.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a serializable copy of all domain statistics."""
+        with self._lock:
+            return {
+                domain: {**asdict(stats), 'compression_ratio': stats.compression_ratio}
+                for domain, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Clear all collected statistics."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Global fetch metrics instance
+fetch_metrics = FetchMetrics()
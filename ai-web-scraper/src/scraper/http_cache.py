@@ -0,0 +1,496 @@
+"""
+On-disk HTTP cache with conditional revalidation.
+
+This module provides the HttpCache class that stores response bodies in a
+local content-addressed store, keeps validators (ETag / Last-Modified) and
+freshness information in a SQLite index, and evicts least recently used
+entries once the store exceeds its size budget. Extraction results can be
+attached to an entry so unchanged pages skip parsing on refetch.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from .response_reader import BoundedResponse
+
+logger = logging.getLogger(__name__)
+
+
+# Response headers kept with a cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date')
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header into a directive dictionary.
+
+    Args:
+        value: Raw Cache-Control header value
+
+    Returns:
+        Dict mapping lower-case directive names to their value (or None)
+    """
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+
+    return directives
+
+
+def compute_expiry(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """
+    Compute when a response stops being fresh.
+
+    Args:
+        headers: Response headers
+        now: Reference timestamp (time of storage or revalidation)
+
+    Returns:
+        Expiry timestamp, or None if the response must not be stored
+    """
+    directives = parse_cache_control(headers.get('Cache-Control'))
+
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return now
+
+    max_age = directives.get('max-age')
+    if max_age is not None:
+        try:
+            return now + max(int(max_age), 0)
+        except ValueError:
+            return now
+
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return now
+
+    # No explicit freshness information: always revalidate
+    return now
+
+
+@dataclass
+class CacheEntry:
+    """Index record for a cached URL."""
+    url: str
+    body_hash: str
+    size: int
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    stored_at: float = 0.0
+    expires_at: float = 0.0
+    extraction_key: Optional[str] = None
+    # URL the response came from after redirects, when it differs from url
+    final_url: Optional[str] = None
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the entry can be served without contacting the origin."""
+        return (now or time.time()) < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build the request headers used to revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Content-addressed on-disk HTTP cache.
+
+    Bodies are stored once per SHA-256 digest under ``objects/``; the SQLite
+    index maps URLs to bodies, validators and freshness. All methods are
+    thread-safe so the cache can be used from executor threads.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the index and body objects
+            max_size_bytes: Total size budget for stored bodies
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self._objects_dir = os.path.join(cache_dir, 'objects')
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, 'index.db'),
+            check_same_thread=False
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                extraction_key TEXT,
+                extracted TEXT,
+                final_url TEXT
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if 'final_url' not in columns:
+            # Index created before entries were keyed by the requested URL
+            self._conn.execute("ALTER TABLE entries ADD COLUMN final_url TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_body_hash ON entries(body_hash)")
+        self._conn.commit()
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """
+        Find the cache entry for a URL.
+
+        Args:
+            url: Requested URL (before redirects)
+
+        Returns:
+            CacheEntry if the URL is cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body_hash, size, status_code, headers, encoding, stored_at, "
+                "expires_at, extraction_key, final_url FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+            if not row:
+                self._stats['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        return CacheEntry(
+            url=row[0],
+            body_hash=row[1],
+            size=row[2],
+            status_code=row[3],
+            headers=json.loads(row[4]),
+            encoding=row[5],
+            stored_at=row[6],
+            expires_at=row[7],
+            extraction_key=row[8],
+            final_url=row[9]
+        )
+
+    def load_body(self, entry: CacheEntry) -> Optional[bytes]:
+        """Read the body of an entry from the object store."""
+        try:
+            with open(self._object_path(entry.body_hash), 'rb') as f:
+                return f.read()
+        except OSError:
+            logger.warning(f"Cached body missing for {entry.url}")
+            self.invalidate(entry.url)
+            return None
+
+    def to_response(self, entry: CacheEntry, body: bytes, revalidated: bool = False) -> BoundedResponse:
+        """
+        Build a response object from a cached entry.
+
+        Args:
+            entry: Cache entry
+            body: Cached body
+            revalidated: Whether the origin confirmed the entry with a 304
+
+        Returns:
+            BoundedResponse marked as served from cache
+        """
+        with self._lock:
+            self._stats['revalidated' if revalidated else 'hits'] += 1
+
+        return BoundedResponse(
+            status_code=entry.status_code,
+            headers=entry.headers,
+            url=entry.final_url or entry.url,
+            content=body,
+            encoding=entry.encoding,
+            wire_bytes=0,
+            from_cache=True,
+            revalidated=revalidated
+        )
+
+    def store(self, response: BoundedResponse, url: Optional[str] = None) -> Optional[CacheEntry]:
+        """
+        Store a freshly fetched response.
+
+        Partial bodies, non-200 responses and responses marked ``no-store``
+        are not cached. Entries are keyed by the requested URL, the one
+        lookup() and the extraction methods are called with; the URL after
+        redirects is kept for the cached response.
+
+        Args:
+            response: Response read through the bounded reader
+            url: Requested URL (response.url if None)
+
+        Returns:
+            The stored CacheEntry, or None if the response was not cacheable
+        """
+        if response.status_code != 200 or response.truncated or response.stopped_at_head:
+            return None
+
+        now = time.time()
+        expires_at = compute_expiry(response.headers, now)
+        if expires_at is None:
+            return None
+
+        headers = {k: response.headers[k] for k in STORED_HEADERS if response.headers.get(k)}
+        # Without validators or a freshness lifetime a cached copy can never be reused
+        if expires_at <= now and 'ETag' not in headers and 'Last-Modified' not in headers:
+            return None
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        self._write_object(body_hash, response.content)
+
+        url = url or response.url
+        entry = CacheEntry(
+            url=url,
+            body_hash=body_hash,
+            size=len(response.content),
+            status_code=response.status_code,
+            headers=headers,
+            encoding=response.encoding,
+            stored_at=now,
+            expires_at=expires_at,
+            final_url=response.url if response.url != url else None
+        )
+
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT body_hash, extraction_key, extracted FROM entries WHERE url = ?",
+                (entry.url,)
+            ).fetchone()
+
+            # Extraction results stay valid only while the body is unchanged
+            extraction_key, extracted = None, None
+            if previous and previous[0] == body_hash:
+                extraction_key, extracted = previous[1], previous[2]
+                entry.extraction_key = extraction_key
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, body_hash, size, status_code, headers, encoding, "
+                "stored_at, expires_at, last_access, extraction_key, extracted, final_url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.url, body_hash, entry.size, entry.status_code, json.dumps(headers),
+                 entry.encoding, now, expires_at, now, extraction_key, extracted, entry.final_url)
+            )
+            self._conn.commit()
+            self._stats['stored'] += 1
+
+            if previous and previous[0] != body_hash:
+                self._delete_object_if_unreferenced(previous[0])
+            self._evict_if_needed()
+
+        return entry
+
+    def refresh(self, entry: CacheEntry, response_headers: Mapping[str, str]) -> CacheEntry:
+        """
+        Update an entry after the origin answered 304 Not Modified.
+
+        Args:
+            entry: Entry that was revalidated
+            response_headers: Headers of the 304 response
+
+        Returns:
+            The refreshed CacheEntry
+        """
+        now = time.time()
+        for name in STORED_HEADERS:
+            if response_headers.get(name):
+                entry.headers[name] = response_headers[name]
+
+        expires_at = compute_expiry(entry.headers, now)
+        entry.expires_at = now if expires_at is None else expires_at
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET headers = ?, expires_at = ?, last_access = ? WHERE url = ?",
+                (json.dumps(entry.headers), entry.expires_at, now, entry.url)
+            )
+            self._conn.commit()
+
+        return entry
+
+    def get_extraction(self, url: str, extraction_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the extraction result stored for an unchanged body.
+
+        Args:
+            url: Page URL
+            extraction_key: Fingerprint of the extraction settings
+
+        Returns:
+            Previously extracted content, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT extracted FROM entries WHERE url = ? AND extraction_key = ?",
+                (url, extraction_key)
+            ).fetchone()
+
+        if not row or row[0] is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def store_extraction(self, url: str, extraction_key: str, extracted: Dict[str, Any]) -> None:
+        """Attach an extraction result to the cached entry for a URL."""
+        try:
+            payload = json.dumps(extracted, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Extraction result for {url} is not serializable: {e}")
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET extraction_key = ?, extracted = ? WHERE url = ?",
+                (extraction_key, payload, url)
+            )
+            self._conn.commit()
+
+    def invalidate(self, url: str) -> None:
+        """Remove a URL from the cache."""
+        with self._lock:
+            row = self._conn.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._conn.commit()
+            if row:
+                self._delete_object_if_unreferenced(row[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current store size."""
+        with self._lock:
+            entries, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "
+                "(SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)"
+            ).fetchone()
+            return {
+                **self._stats,
+                'objects': entries,
+                'total_size_bytes': total_size,
+                'max_size_bytes': self.max_size_bytes
+            }
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def _object_path(self, body_hash: str) -> str:
+        return os.path.join(self._objects_dir, body_hash[:2], body_hash)
+
+    def _write_object(self, body_hash: str, content: bytes) -> None:
+        """Write a body object atomically unless it already exists."""
+        path = self._object_path(body_hash)
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _delete_object_if_unreferenced(self, body_hash: str) -> None:
+        """Delete a body object once no entry points to it. Caller holds the lock."""
+        referenced = self._conn.execute(
+            "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone()
+        if referenced:
+            return
+        try:
+            os.remove(self._object_path(body_hash))
+        except OSError:
+            pass
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently used entries until the size budget is met. Caller holds the lock."""
+        total_size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)"
+        ).fetchone()[0]
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        candidates = self._conn.execute(
+            "SELECT url, body_hash, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+
+        for url, body_hash, size in candidates:
+            if total_size <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_referenced = self._conn.execute(
+                "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+            ).fetchone()
+            if not still_referenced:
+                total_size -= size
+                try:
+                    os.remove(self._object_path(body_hash))
+                except OSError:
+                    pass
+            self._stats['evicted'] += 1
+
+        self._conn.commit()
+
+
+# Global cache instance
+_http_cache: Optional[HttpCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Get the global HTTP cache configured from scraping settings."""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                from .config import config_manager
+                _http_cache = HttpCache(
+                    config_manager.settings.http_cache_dir,
+                    config_manager.settings.http_cache_max_bytes
+                )
+    return _http_cache
@@ -0,0 +1,279 @@
+"""
+Bounded streaming response reader.
+
+This module provides the BoundedResponseReader class that reads HTTP response
+bodies incrementally, rejecting non-HTML and oversized responses from their
+headers, decompressing the body as it arrives and enforcing a byte limit on
+the decoded content while the body is streamed.
+"""
+
+import logging
+from typing import Iterable, Mapping, Optional
+
+import requests
+
+from ..utils.exceptions import ResponseRejectedException
+from .compression import StreamDecoder, get_decoder
+from .fetch_metrics import fetch_metrics
+
+logger = logging.getLogger(__name__)
+
+
+# Content types that the HTML extraction pipeline can handle
+DEFAULT_ALLOWED_CONTENT_TYPES = (
+    'text/html',
+    'application/xhtml+xml',
+    'application/xml',
+    'text/xml',
+    'text/plain',
+)
+
+# Marker used to stop reading early for metadata-only jobs
+HEAD_END_MARKER = b'</head>'
+
+
+class BoundedResponse:
+    """Response whose body was read through a BoundedResponseReader."""
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        url: str,
+        content: bytes,
+        encoding: Optional[str] = None,
+        truncated: bool = False,
+        stopped_at_head: bool = False,
+        wire_bytes: Optional[int] = None,
+        from_cache: bool = False,
+        revalidated: bool = False,
+        reason: Optional[str] = None,
+        request_headers: Optional[Mapping[str, str]] = None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self.encoding = encoding
+        self.content = content
+        self.truncated = truncated
+        self.stopped_at_head = stopped_at_head
+        self.content_encoding = headers.get('Content-Encoding')
+        self.wire_bytes = len(content) if wire_bytes is None else wire_bytes
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+        self.reason = reason
+        self.request_headers = request_headers or {}
+
+    @classmethod
+    def from_response(cls, response: requests.Response, content: bytes, **kwargs) -> 'BoundedResponse':
+        """Create a bounded response from a streamed requests response."""
+        return cls(
+            status_code=response.status_code,
+            headers=response.headers,
+            url=response.url,
+            content=content,
+            encoding=response.encoding,
+            reason=response.reason,
+            request_headers=response.request.headers if response.request is not None else None,
+            **kwargs
+        )
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the response charset (UTF-8 when unknown)."""
+        try:
+            return self.content.decode(self.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    @property
+    def bytes_read(self) -> int:
+        """Number of decoded body bytes kept in memory."""
+        return len(self.content)
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes not transferred thanks to content compression."""
+        return max(self.bytes_read - self.wire_bytes, 0)
+
+
+class BoundedResponseReader:
+    """
+    Reads streamed responses with content-type and size guards.
+
+    The response must have been requested with ``stream=True`` so that the
+    body is not downloaded before the guards run.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        metadata_only: bool = False,
+        allowed_content_types: Iterable[str] = DEFAULT_ALLOWED_CONTENT_TYPES,
+        chunk_size: int = 64 * 1024
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            max_bytes: Maximum number of body bytes to keep
+            metadata_only: Stop reading once the closing </head> tag is seen
+            allowed_content_types: Accepted media types (without parameters)
+            chunk_size: Size of the chunks read from the network
+        """
+        self.max_bytes = max_bytes
+        self.metadata_only = metadata_only
+        self.allowed_content_types = {t.lower() for t in allowed_content_types}
+        self.chunk_size = chunk_size
+
+    def check_headers(self, response: requests.Response) -> None:
+        """
+        Reject a response from its headers before reading the body.
+
+        Args:
+            response: Streamed response
+
+        Raises:
+            ResponseRejectedException: If the content type is not accepted or
+                the declared length exceeds the byte limit
+        """
+        content_type = response.headers.get('Content-Type', '')
+        media_type = content_type.split(';', 1)[0].strip().lower()
+
+        # A missing Content-Type is common on small sites; let the parser decide
+        if media_type and media_type not in self.allowed_content_types:
+            raise ResponseRejectedException(
+                f"Unsupported content type '{media_type}' for {response.url}",
+                url=response.url,
+                reason="content_type",
+                content_type=media_type
+            )
+
+        content_length = self._declared_length(response)
+        # Metadata-only reads stop early, so a large declared body is not a problem
+        if content_length is not None and content_length > self.max_bytes and not self.metadata_only:
+            raise ResponseRejectedException(
+                f"Declared body size {content_length} exceeds limit of {self.max_bytes} bytes "
+                f"for {response.url}",
+                url=response.url,
+                reason="content_length",
+                content_type=media_type,
+                content_length=content_length
+            )
+
+    def read(self, response: requests.Response) -> BoundedResponse:
+        """
+        Check headers and read the body up to the configured limits.
+
+        The body is read from the raw stream and decoded incrementally so
+        that the byte limit applies to decompressed content. The underlying
+        connection is always released, including when the read stops early.
+
+        Args:
+            response: Streamed response
+
+        Returns:
+            BoundedResponse holding at most ``max_bytes`` of body
+        """
+        try:
+            self.check_headers(response)
+            # One byte past the limit is enough to know the body is over it
+            decoder = self._create_decoder(response, max_output=self.max_bytes + 1)
+            result = self._read_body(
+                response,
+                response.raw.stream(self.chunk_size, decode_content=False),
+                decoder
+            )
+        finally:
+            response.close()
+
+        fetch_metrics.record_transfer(
+            response.url,
+            wire_bytes=result.wire_bytes,
+            decoded_bytes=result.bytes_read,
+            content_encoding=result.content_encoding
+        )
+        return result
+
+    def _read_body(
+        self,
+        response: requests.Response,
+        raw_chunks: Iterable[bytes],
+        decoder: Optional[StreamDecoder] = None
+    ) -> BoundedResponse:
+        """Decode and accumulate body chunks until the end of stream or a limit is hit."""
+        buffer = bytearray()
+        truncated = False
+        stopped_at_head = False
+        wire_bytes = 0
+        finished = False
+
+        def decoded_chunks():
+            nonlocal wire_bytes, finished
+            for raw_chunk in raw_chunks:
+                wire_bytes += len(raw_chunk)
+                yield decoder.decompress(raw_chunk) if decoder else raw_chunk
+            finished = True
+            if decoder:
+                yield decoder.flush()
+
+        for chunk in decoded_chunks():
+            if not chunk:
+                continue
+
+            # Search the previous tail as well so a marker split across chunks is found
+            search_from = max(len(buffer) - len(HEAD_END_MARKER), 0)
+            buffer.extend(chunk)
+
+            if self.metadata_only:
+                head_end = bytes(buffer[search_from:]).lower().find(HEAD_END_MARKER)
+                if head_end != -1:
+                    del buffer[search_from + head_end + len(HEAD_END_MARKER):]
+                    stopped_at_head = True
+                    break
+
+            if len(buffer) > self.max_bytes:
+                del buffer[self.max_bytes:]
+                truncated = True
+                logger.warning(
+                    f"Response body for {response.url} truncated at {self.max_bytes} bytes"
+                )
+                break
+
+        if not finished:
+            logger.debug(f"Stopped reading {response.url} after {wire_bytes} bytes on the wire")
+
+        return BoundedResponse.from_response(
+            response,
+            bytes(buffer),
+            truncated=truncated,
+            stopped_at_head=stopped_at_head,
+            wire_bytes=wire_bytes
+        )
+
+    @staticmethod
+    def _create_decoder(
+        response: requests.Response,
+        max_output: Optional[int] = None
+    ) -> Optional[StreamDecoder]:
+        """Create the decoder for the response Content-Encoding, bounded to max_output bytes."""
+        content_encoding = response.headers.get('Content-Encoding')
+        try:
+            return get_decoder(content_encoding, max_output)
+        except ValueError as e:
+            raise ResponseRejectedException(
+                f"{e} for {response.url}",
+                url=response.url,
+                reason="content_encoding"
+            )
+
+    @staticmethod
+    def _declared_length(response: requests.Response) -> Optional[int]:
+        """Return the Content-Length header as an int, if present and valid."""
+        value = response.headers.get('Content-Length')
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return None
@@ -17,11 +17,28 @@ import google.generativeai as genai
 import os
 from datetime import datetime
 
+from ..ai.content_condenser import condense_for_prompt
+from ..ai.client import get_ai_client
+from ..ai.model_backend import get_model_backend
+from ..ai.page_classifier import TriageAction, TriageDecision, get_page_triage, sample_from_record
+from ..ai.result_cache import get_ai_result_cache, make_cache_key
 from ..models.pydantic_models import ScrapingConfig, ScrapedData, ContentType
+from ..pipeline.enrichment import heuristic_confidence, pending_ai_metadata
+from ..utils.exceptions import ResponseRejectedException
 from ..utils.security_config import SecurityConfig
+from .compression import get_accept_encoding
+from .http_cache import HttpCache, get_http_cache
+from .warc_archive import WarcArchive, get_warc_archive
+from .response_reader import BoundedResponse, BoundedResponseReader
 
 logger = logging.getLogger(__name__)
 
+# Bump when the _analyze_with_ai prompt changes so cached results are not reused
+AI_PROMPT_VERSION = "2"
+
+# Token budget for page content in the analysis prompt
+AI_CONTENT_TOKENS = 500
+
 
 class SimpleWebScraper:
     """
@@ -34,11 +51,27 @@ class SimpleWebScraper:
         """Initialize the simple web scraper."""
         self.config = config or ScrapingConfig()
         self.session = requests.Session()
+        self.response_reader = BoundedResponseReader(
+            max_bytes=self.config.max_response_bytes,
+            metadata_only=self.config.metadata_only
+        )
+        self.http_cache: Optional[HttpCache] = None
+        if self.config.use_http_cache:
+            try:
+                self.http_cache = get_http_cache()
+            except Exception as e:
+                logger.warning(f"HTTP cache unavailable, fetching without it: {e}")
+        self.warc_archive: Optional[WarcArchive] = None
+        if self.config.archive_responses:
+            try:
+                self.warc_archive = get_warc_archive()
+            except Exception as e:
+                logger.warning(f"WARC archive unavailable, responses will not be captured: {e}")
         
         # Configure Gemini AI if available
-        self.gemini_model = None
+        self.gemini_model = get_model_backend()
         gemini_key = os.getenv("GEMINI_API_KEY")
-        if gemini_key:
+        if self.gemini_model is None and gemini_key:
             try:
                 genai.configure(api_key=gemini_key)
                 self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
@@ -58,7 +91,7 @@ class SimpleWebScraper:
             'User-Agent': user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': get_accept_encoding(),
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
@@ -66,13 +99,15 @@ class SimpleWebScraper:
         # Set timeout
         self.session.timeout = self.config.timeout
     
-    async def scrape_url(self, url: str, job_id: str = None) -> Optional[ScrapedData]:
+    async def scrape_url(self, url: str, job_id: str = None, defer_ai: bool = False) -> Optional[ScrapedData]:
         """
         Scrape a single URL and return structured data.
         
         Args:
             url: URL to scrape
             job_id: Optional job identifier
+            defer_ai: Return heuristic scores and pending AI metadata instead of
+                waiting for the AI analysis; run it later with enrich()
             
         Returns:
             ScrapedData if successful, None if failed
@@ -110,18 +145,32 @@ class SimpleWebScraper:
             if len(response.content) < 100:
                 logger.warning(f"Response content too small ({len(response.content)} bytes) for {url}")
             
-            # Parse the content with error handling
-            try:
-                soup = BeautifulSoup(response.content, 'html.parser')
-            except Exception as e:
-                logger.error(f"Failed to parse HTML for {url}: {e}")
-                return None
+            # Unchanged pages reuse the extraction stored with the cached body
+            extracted_content = None
+            extraction_key = self._extraction_key()
+            if response.from_cache and self.http_cache:
+                extracted_content = self.http_cache.get_extraction(url, extraction_key)
             
-            # Extract content with enhanced error handling
-            extracted_content = self._extract_content(soup, url)
+            if extracted_content is None:
+                # Parse the content with error handling
+                try:
+                    soup = BeautifulSoup(response.content, 'html.parser')
+                except Exception as e:
+                    logger.error(f"Failed to parse HTML for {url}: {e}")
+                    return None
+                
+                # Extract content with enhanced error handling
+                extracted_content = self._extract_content(soup, url)
+                
+                if self.http_cache and response.status_code == 200:
+                    self.http_cache.store_extraction(url, extraction_key, extracted_content)
             
-            # Validate extracted content
-            if not extracted_content.get('text') or len(extracted_content['text'].strip()) < 50:
+            # Validate extracted content (metadata-only reads never contain body text)
+            if self.config.metadata_only:
+                extracted_content['text'] = extracted_content['metadata'].get(
+                    'description', extracted_content.get('title', '')
+                )
+            elif not extracted_content.get('text') or len(extracted_content['text'].strip()) < 50:
                 logger.warning(f"Insufficient content extracted from {url}")
                 # Don't return None, but mark with low confidence
                 extracted_content['text'] = extracted_content.get('title', 'No content available')
@@ -131,16 +180,27 @@ class SimpleWebScraper:
             confidence_score = 0.5
             
             if self.gemini_model and extracted_content.get('text'):
-                try:
-                    ai_result = await self._analyze_with_ai(
-                        extracted_content['text'], 
-                        extracted_content.get('title', '')
-                    )
-                    ai_metadata = ai_result
-                    confidence_score = ai_result.get('confidence', 0.5)
-                except Exception as e:
-                    logger.warning(f"AI analysis failed for {url}: {e}")
-                    ai_metadata = {"error": str(e), "processing_status": "failed"}
+                triage = self._triage_page(url, extracted_content)
+                if triage is not None and triage.action != TriageAction.AI:
+                    # Navigation, listings and confidently classified pages skip Gemini;
+                    # the triage confidence rates the page type, not the data, so it
+                    # stays in ai_metadata and the record gets the heuristic score
+                    ai_metadata = self._triage_metadata(triage)
+                    confidence_score = await heuristic_confidence(extracted_content)
+                elif defer_ai:
+                    ai_metadata = pending_ai_metadata()
+                    confidence_score = await heuristic_confidence(extracted_content)
+                else:
+                    try:
+                        ai_result = await self._analyze_with_ai(
+                            extracted_content['text'], 
+                            extracted_content.get('title', '')
+                        )
+                        ai_metadata = ai_result
+                        confidence_score = ai_result.get('confidence', 0.5)
+                    except Exception as e:
+                        logger.warning(f"AI analysis failed for {url}: {e}")
+                        ai_metadata = {"error": str(e), "processing_status": "failed"}
             
             # Calculate quality score based on content
             quality_score = self._calculate_quality_score(extracted_content, response)
@@ -152,8 +212,20 @@ class SimpleWebScraper:
                 content=extracted_content,
                 raw_html=response.text[:5000] if len(response.text) > 5000 else response.text,
                 content_type=ContentType.HTML,
+                content_metadata={
+                    "bytes_read": response.bytes_read,
+                    "wire_bytes": response.wire_bytes,
+                    "content_encoding": response.content_encoding,
+                    "body_truncated": response.truncated,
+                    "stopped_at_head": response.stopped_at_head,
+                    "from_cache": response.from_cache,
+                    "revalidated": response.revalidated
+                },
                 confidence_score=confidence_score,
-                ai_processed=bool(self.gemini_model and ai_metadata.get('processing_status') != 'failed'),
+                ai_processed=bool(
+                    self.gemini_model
+                    and ai_metadata.get('processing_status') not in ('failed', 'skipped', 'local', 'pending')
+                ),
                 ai_metadata=ai_metadata,
                 data_quality_score=quality_score,
                 content_length=len(extracted_content.get('text', '')),
@@ -168,19 +240,61 @@ class SimpleWebScraper:
             logger.error(f"Error scraping {url}: {str(e)}")
             return None
     
-    async def _make_request(self, url: str) -> Optional[requests.Response]:
-        """Make HTTP request with retries."""
+    async def enrich(self, scraped_data: ScrapedData) -> Dict[str, Any]:
+        """
+        Run the AI analysis deferred by scrape_url(defer_ai=True).
+        
+        Args:
+            scraped_data: Record returned by scrape_url
+            
+        Returns:
+            AI metadata for the record
+        """
+        if not self.gemini_model:
+            raise RuntimeError("Gemini AI is not configured")
+        return await self._analyze_with_ai(
+            scraped_data.content.get('text', ''),
+            scraped_data.content.get('title', '')
+        )
+    
+    def _triage_page(self, url: str, extracted_content: Dict[str, Any]) -> Optional[TriageDecision]:
+        """Run the local page classifier, or return None when triage is off."""
+        triage = get_page_triage()
+        if triage is None or self.config.metadata_only:
+            return None
+        try:
+            return triage.decide(sample_from_record(url, extracted_content))
+        except Exception as e:
+            logger.warning(f"Page triage failed for {url}: {e}")
+            return None
+    
+    def _triage_metadata(self, triage: TriageDecision) -> Dict[str, Any]:
+        """AI metadata for a page the local classifier handled."""
+        return {
+            "summary": "",
+            "confidence": triage.confidence,
+            "topics": [],
+            "quality_score": 0.5,
+            "key_info": [],
+            "content_category": triage.label or "other",
+            "language": "unknown",
+            "ai_model": "page_classifier",
+            "processing_status": "skipped" if triage.action == TriageAction.SKIP else "local",
+            "triage": triage.to_dict()
+        }
+    
+    async def _make_request(self, url: str) -> Optional[BoundedResponse]:
+        """Make HTTP request with retries, streaming the body through the bounded reader."""
         for attempt in range(self.config.max_retries + 1):
             try:
                 # Run in executor to avoid blocking
                 loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None, 
-                    lambda: self.session.get(url, timeout=self.config.timeout)
-                )
+                return await loop.run_in_executor(None, self._fetch, url)
                 
-                response.raise_for_status()
-                return response
+            except ResponseRejectedException as e:
+                # Retrying cannot change the content type or size of a resource
+                logger.info(f"Skipping {url}: {e.message}")
+                return None
                 
             except Exception as e:
                 logger.warning(f"Request attempt {attempt + 1} failed for {url}: {str(e)}")
@@ -195,6 +309,62 @@ class SimpleWebScraper:
         
         return None
     
+    def _fetch(self, url: str) -> BoundedResponse:
+        """
+        Blocking streamed GET; the body is only read once the headers pass the guards.
+        
+        With the HTTP cache enabled, fresh entries are served without a request
+        and stale ones are revalidated with If-None-Match / If-Modified-Since.
+        """
+        entry = self.http_cache.lookup(url) if self.http_cache else None
+        
+        if entry and entry.is_fresh():
+            body = self.http_cache.load_body(entry)
+            if body is not None:
+                return self.http_cache.to_response(entry, body)
+        
+        headers = entry.conditional_headers() if entry else {}
+        response = self.session.get(url, timeout=self.config.timeout, stream=True, headers=headers)
+        
+        if entry and response.status_code == 304:
+            response.close()
+            entry = self.http_cache.refresh(entry, response.headers)
+            body = self.http_cache.load_body(entry)
+            if body is not None:
+                return self.http_cache.to_response(entry, body, revalidated=True)
+            # Cached body disappeared: fall back to a full fetch
+            response = self.session.get(url, timeout=self.config.timeout, stream=True)
+        
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        
+        result = self.response_reader.read(response)
+        
+        if self.warc_archive:
+            try:
+                self.warc_archive.write_response(result)
+            except Exception as e:
+                logger.warning(f"Failed to archive response for {url}: {e}")
+        
+        if self.http_cache:
+            try:
+                self.http_cache.store(result, url)
+            except Exception as e:
+                logger.warning(f"Failed to cache response for {url}: {e}")
+        
+        return result
+    
+    def _extraction_key(self) -> str:
+        """Fingerprint of the settings that affect _extract_content output."""
+        return (
+            f"simple:links={int(self.config.extract_links)}:"
+            f"images={int(self.config.extract_images)}:"
+            f"head={int(self.config.metadata_only)}"
+        )
+    
     def _extract_content(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         """Extract content from BeautifulSoup object with enhanced error handling."""
         content = {
@@ -403,7 +573,28 @@ class SimpleWebScraper:
         return body if body else soup
     
     async def _analyze_with_ai(self, text: str, title: str) -> Dict[str, Any]:
-        """Analyze content with Gemini AI."""
+        """Analyze content with Gemini AI, reusing cached results for identical content."""
+        text = condense_for_prompt(text, AI_CONTENT_TOKENS, is_html=False)
+        
+        cache = get_ai_result_cache()
+        if cache is None:
+            return await self._run_ai_analysis(text, title)
+        
+        # Only the prompt inputs (title and condensed text) affect the result
+        cache_key = make_cache_key(
+            "simple_analysis", f"{title}\n{text}", AI_PROMPT_VERSION, "gemini-2.0-flash-exp"
+        )
+        result, cache_hit = await cache.get_or_compute(
+            cache_key,
+            lambda: self._run_ai_analysis(text, title),
+            should_cache=lambda r: r.get("processing_status") == "success"
+        )
+        if cache_hit:
+            result["cache_hit"] = True
+        return result
+    
+    async def _run_ai_analysis(self, text: str, title: str) -> Dict[str, Any]:
+        """Run the Gemini analysis prompt."""
         try:
             prompt = f"""
             Analyze this web content and provide a JSON response with the following structure:
@@ -418,17 +609,12 @@ class SimpleWebScraper:
             }}
             
             Title: {title}
-            Content: {text[:2000]}
+            Content: {text}
             
             Respond only with valid JSON.
             """
             
-            # Run AI analysis in executor
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.gemini_model.generate_content(prompt)
-            )
+            response = await get_ai_client().generate(self.gemini_model, prompt)
             
             if response and response.text:
                 try:
@@ -527,7 +713,7 @@ class SimpleWebScraper:
         """Async context manager entry."""
         return self
     
-    def _calculate_quality_score(self, content: Dict[str, Any], response: requests.Response) -> float:
+    def _calculate_quality_score(self, content: Dict[str, Any], response: BoundedResponse) -> float:
         """Calculate content quality score based on various factors."""
         score = 0.0
         
@@ -0,0 +1,473 @@
+"""
+WARC archive writer and reader.
+
+This module provides the WarcArchive class that captures full request and
+response records into rotating, gzip-compressed WARC 1.1 files on local disk
+and maintains a SQLite index of every archived response so pages can later
+be replayed without touching the network.
+"""
+
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .response_reader import BoundedResponse
+
+logger = logging.getLogger(__name__)
+
+
+WARC_VERSION = 'WARC/1.1'
+
+# Hop-by-hop and transfer headers that no longer describe the stored (decoded) body
+_DROPPED_RESPONSE_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+@dataclass
+class WarcIndexEntry:
+    """Index row pointing to an archived record."""
+    record_id: str
+    url: str
+    warc_type: str
+    captured_at: str
+    filename: str
+    offset: int
+    length: int
+    status_code: Optional[int]
+    content_type: Optional[str]
+    payload_digest: str
+
+
+@dataclass
+class WarcRecord:
+    """A parsed WARC record."""
+    headers: Dict[str, str]
+    block: bytes
+
+    @property
+    def warc_type(self) -> str:
+        return self.headers.get('WARC-Type', '')
+
+    @property
+    def target_uri(self) -> str:
+        return self.headers.get('WARC-Target-URI', '')
+
+
+def _payload_digest(payload: bytes) -> str:
+    """WARC-style SHA-1 digest in base32."""
+    return 'sha1:' + base64.b32encode(hashlib.sha1(payload).digest()).decode('ascii')
+
+
+def _format_headers(headers: List[Tuple[str, str]]) -> bytes:
+    return b''.join(f"{name}: {value}\r\n".encode('utf-8') for name, value in headers)
+
+
+def _parse_header_block(data: bytes) -> Dict[str, str]:
+    headers = {}
+    for line in data.decode('utf-8', errors='replace').split('\r\n'):
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+def _charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return None
+
+
+class WarcArchive:
+    """
+    Rotating WARC archive with a SQLite index.
+
+    Every record is written as its own gzip member so that the index can
+    point directly at it. Files are rotated once they exceed the configured
+    size. All methods are thread-safe.
+    """
+
+    def __init__(self, archive_dir: str, max_file_bytes: int = 1024 * 1024 * 1024, prefix: str = 'scraper'):
+        """
+        Initialize the archive.
+
+        Args:
+            archive_dir: Directory holding WARC files and the index
+            max_file_bytes: Size after which a new WARC file is started
+            prefix: File name prefix for WARC files
+        """
+        self.archive_dir = archive_dir
+        self.max_file_bytes = max_file_bytes
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._file = None
+        self._filename: Optional[str] = None
+        self._sequence = 0
+
+        os.makedirs(archive_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(archive_dir, 'index.db'), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                record_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                warc_type TEXT NOT NULL,
+                captured_at TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                status_code INTEGER,
+                content_type TEXT,
+                payload_digest TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_url ON records(url, captured_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_captured_at ON records(captured_at)")
+        self._conn.commit()
+
+    def write_response(self, response: BoundedResponse) -> str:
+        """
+        Archive a fetched response together with its request.
+
+        The body is stored decoded, so Content-Encoding and Content-Length
+        are rewritten to describe the stored payload.
+
+        Args:
+            response: Response read through the bounded reader
+
+        Returns:
+            WARC-Record-ID of the response record
+        """
+        captured_at = self._warc_date()
+        request_id = self._record_id()
+        response_id = self._record_id()
+
+        request_block = self._http_request_block(response)
+
+        status_line = f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()
+        http_headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_RESPONSE_HEADERS
+        ]
+        http_headers.append(('Content-Length', str(len(response.content))))
+        response_block = (
+            status_line.encode('utf-8') + b'\r\n' + _format_headers(http_headers) + b'\r\n' + response.content
+        )
+
+        extra_headers = [('WARC-Concurrent-To', request_id)]
+        if response.truncated or response.stopped_at_head:
+            extra_headers.append(('WARC-Truncated', 'length'))
+
+        with self._lock:
+            self._write_record(
+                'request', request_id, response.url, captured_at, request_block,
+                'application/http;msgtype=request', [('WARC-Concurrent-To', response_id)]
+            )
+            filename, offset, length = self._write_record(
+                'response', response_id, response.url, captured_at, response_block,
+                'application/http;msgtype=response', extra_headers, payload=response.content
+            )
+            self._index(
+                response_id, response.url, 'response', captured_at, filename, offset, length,
+                response.status_code, response.headers.get('Content-Type'), response.content
+            )
+
+        return response_id
+
+    def write_resource(self, url: str, content: bytes, content_type: str = 'text/html; charset=utf-8') -> str:
+        """
+        Archive a resource that was not fetched over plain HTTP (e.g. a rendered DOM).
+
+        Args:
+            url: URL the resource belongs to
+            content: Resource bytes
+            content_type: MIME type of the resource
+
+        Returns:
+            WARC-Record-ID of the resource record
+        """
+        captured_at = self._warc_date()
+        record_id = self._record_id()
+
+        with self._lock:
+            filename, offset, length = self._write_record(
+                'resource', record_id, url, captured_at, content, content_type, [], payload=content
+            )
+            self._index(record_id, url, 'resource', captured_at, filename, offset, length, 200, content_type, content)
+
+        return record_id
+
+    def find(
+        self,
+        url_prefix: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        latest_only: bool = True,
+        limit: Optional[int] = None,
+        status_code: Optional[int] = None,
+        content_types: Optional[Iterable[str]] = None
+    ) -> Iterator[WarcIndexEntry]:
+        """
+        Query the index for archived responses and resources.
+
+        All filters apply before the latest capture per URL is chosen and
+        before the limit, so a URL whose newest capture does not match is
+        represented by its newest capture that does.
+
+        Args:
+            url_prefix: Only return URLs starting with this prefix
+            since: Only return captures at or after this time
+            until: Only return captures before this time
+            latest_only: Return only the most recent capture per URL
+            limit: Maximum number of entries
+            status_code: Only return response records with this HTTP status;
+                resource records, which have none, are always included
+            content_types: Only return these media types (records without a
+                Content-Type are included)
+
+        Returns:
+            Iterator of index entries ordered by URL
+        """
+        conditions, params = [], []
+        if url_prefix:
+            conditions.append("url >= ? AND url < ?")
+            params.extend([url_prefix, url_prefix + '\uffff'])
+        if since:
+            conditions.append("captured_at >= ?")
+            params.append(self._warc_date(since))
+        if until:
+            conditions.append("captured_at < ?")
+            params.append(self._warc_date(until))
+        if status_code is not None:
+            conditions.append("(warc_type != 'response' OR status_code = ?)")
+            params.append(status_code)
+        if content_types is not None:
+            # Stored values may carry parameters, e.g. "text/html; charset=utf-8"
+            type_conditions = ["content_type IS NULL", "content_type = ''"]
+            for media_type in content_types:
+                type_conditions.append("lower(content_type) = ? OR lower(content_type) LIKE ?")
+                params.extend([media_type.lower(), f"{media_type.lower()};%"])
+            conditions.append(f"({' OR '.join(type_conditions)})")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ("record_id, url, warc_type, captured_at, filename, offset, length, "
+                   "status_code, content_type, payload_digest")
+
+        if latest_only:
+            # Rank within the filtered rows; rowid breaks ties between captures in the same second
+            query = (
+                f"SELECT {columns} FROM ("
+                f"SELECT {columns}, ROW_NUMBER() OVER "
+                f"(PARTITION BY url ORDER BY captured_at DESC, rowid DESC) AS capture_rank "
+                f"FROM records {where}"
+                f") WHERE capture_rank = 1 ORDER BY url"
+            )
+        else:
+            query = f"SELECT {columns} FROM records {where} ORDER BY url, captured_at"
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for row in rows:
+            yield WarcIndexEntry(*row)
+
+    def read_record(self, entry: WarcIndexEntry) -> WarcRecord:
+        """
+        Read and parse the record an index entry points to.
+
+        Args:
+            entry: Index entry
+
+        Returns:
+            Parsed WARC record
+        """
+        with open(os.path.join(self.archive_dir, entry.filename), 'rb') as f:
+            f.seek(entry.offset)
+            data = gzip.decompress(f.read(entry.length))
+
+        header_block, _, rest = data.partition(b'\r\n\r\n')
+        headers = _parse_header_block(header_block.split(b'\r\n', 1)[1])
+        block_length = int(headers.get('Content-Length', len(rest)))
+        return WarcRecord(headers=headers, block=rest[:block_length])
+
+    def load_response(self, entry: WarcIndexEntry) -> BoundedResponse:
+        """
+        Rebuild the archived HTTP response for an index entry.
+
+        Args:
+            entry: Index entry of a response or resource record
+
+        Returns:
+            BoundedResponse with the archived status, headers and body
+        """
+        record = self.read_record(entry)
+
+        if record.warc_type == 'resource':
+            headers = {'Content-Type': record.headers.get('Content-Type', entry.content_type or '')}
+            return BoundedResponse(
+                status_code=200,
+                headers=headers,
+                url=record.target_uri,
+                content=record.block,
+                encoding=_charset_from_content_type(headers['Content-Type']),
+                wire_bytes=0
+            )
+
+        http_head, _, body = record.block.partition(b'\r\n\r\n')
+        status_line, _, header_lines = http_head.partition(b'\r\n')
+        parts = status_line.decode('latin-1').split(' ', 2)
+        headers = _parse_header_block(header_lines)
+
+        return BoundedResponse(
+            status_code=int(parts[1]),
+            headers=headers,
+            url=record.target_uri,
+            content=body,
+            encoding=_charset_from_content_type(headers.get('Content-Type')),
+            truncated='WARC-Truncated' in record.headers,
+            wire_bytes=0,
+            reason=parts[2] if len(parts) > 2 else None
+        )
+
+    def count(self) -> int:
+        """Number of archived responses and resources."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the current WARC file and the index."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._conn.close()
+
+    def _http_request_block(self, response: BoundedResponse) -> bytes:
+        """Serialize the request that produced a response."""
+        parts = urlsplit(response.url)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        headers = [('Host', parts.netloc)]
+        headers.extend((k, v) for k, v in response.request_headers.items() if k.lower() != 'host')
+        return f"GET {target} HTTP/1.1\r\n".encode('utf-8') + _format_headers(headers) + b'\r\n'
+
+    def _write_record(
+        self,
+        warc_type: str,
+        record_id: str,
+        url: str,
+        captured_at: str,
+        block: bytes,
+        content_type: str,
+        extra_headers: List[Tuple[str, str]],
+        payload: Optional[bytes] = None
+    ) -> Tuple[str, int, int]:
+        """Write one record as a gzip member. Caller holds the lock."""
+        self._ensure_file()
+
+        headers = [
+            ('WARC-Type', warc_type),
+            ('WARC-Record-ID', record_id),
+            ('WARC-Date', captured_at),
+            ('WARC-Target-URI', url),
+            ('WARC-Block-Digest', _payload_digest(block)),
+        ]
+        if payload is not None:
+            headers.append(('WARC-Payload-Digest', _payload_digest(payload)))
+        headers.extend(extra_headers)
+        headers.append(('Content-Type', content_type))
+        headers.append(('Content-Length', str(len(block))))
+
+        record = WARC_VERSION.encode('ascii') + b'\r\n' + _format_headers(headers) + b'\r\n' + block + b'\r\n\r\n'
+        member = gzip.compress(record)
+
+        offset = self._file.tell()
+        self._file.write(member)
+        self._file.flush()
+        return self._filename, offset, len(member)
+
+    def _ensure_file(self) -> None:
+        """Open a new WARC file when none is open or the current one is full."""
+        if self._file and self._file.tell() < self.max_file_bytes:
+            return
+
+        if self._file:
+            self._file.close()
+
+        self._sequence += 1
+        timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        self._filename = f"{self.prefix}-{timestamp}-{os.getpid()}-{self._sequence:05d}.warc.gz"
+        self._file = open(os.path.join(self.archive_dir, self._filename), 'ab')
+
+        info = _format_headers([
+            ('software', 'ai-web-scraper'),
+            ('format', 'WARC File Format 1.1'),
+        ])
+        self._write_record('warcinfo', self._record_id(), '', self._warc_date(), info,
+                           'application/warc-fields', [])
+        logger.info(f"Started WARC file {self._filename}")
+
+    def _index(
+        self,
+        record_id: str,
+        url: str,
+        warc_type: str,
+        captured_at: str,
+        filename: str,
+        offset: int,
+        length: int,
+        status_code: Optional[int],
+        content_type: Optional[str],
+        payload: bytes
+    ) -> None:
+        """Add a record to the index. Caller holds the lock."""
+        self._conn.execute(
+            "INSERT INTO records (record_id, url, warc_type, captured_at, filename, offset, length, "
+            "status_code, content_type, payload_digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record_id, url, warc_type, captured_at, filename, offset, length,
+             status_code, content_type, _payload_digest(payload))
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _record_id() -> str:
+        return f"<urn:uuid:{uuid.uuid4()}>"
+
+    @staticmethod
+    def _warc_date(value: Optional[datetime] = None) -> str:
+        return (value or datetime.utcnow()).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+# Global archive instance
+_warc_archive: Optional[WarcArchive] = None
+_warc_archive_lock = threading.Lock()
+
+
+def get_warc_archive() -> WarcArchive:
+    """Get the global WARC archive configured from scraping settings."""
+    global _warc_archive
+    if _warc_archive is None:
+        with _warc_archive_lock:
+            if _warc_archive is None:
+                from .config import config_manager
+                _warc_archive = WarcArchive(
+                    config_manager.settings.warc_archive_dir,
+                    config_manager.settings.warc_max_file_bytes
+                )
+    return _warc_archive
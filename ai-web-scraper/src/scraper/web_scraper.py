@@ -18,6 +18,7 @@ from ..utils.robots_handler import ethical_enforcer
 from .selenium_driver import SeleniumDriver
 from .content_extractor import ContentExtractor
 from .config import config_manager
+from .warc_archive import get_warc_archive
 
 logger = get_logger(__name__)
 
@@ -343,6 +344,13 @@ class WebScraper:
                 if not html_content or len(html_content.strip()) < 100:
                     raise ValueError("Page content is empty or too short")
                 
+                # Capture the rendered DOM so it can be re-extracted offline
+                if config.archive_responses:
+                    try:
+                        get_warc_archive().write_resource(url, html_content.encode('utf-8'))
+                    except Exception as e:
+                        logger.warning(f"Failed to archive rendered page {url}: {str(e)}")
+                
                 # Extract content
                 extracted_content = self.extractor.extract_from_html(html_content, url)
                 
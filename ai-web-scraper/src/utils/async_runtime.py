@@ -0,0 +1,219 @@
+"""
+Long-lived event loop for synchronous callers.
+
+Celery tasks and thread-pool background jobs used to run each coroutine with
+asyncio.run(), which creates and closes an event loop per call. Anything
+bound to a loop (HTTP sessions, browser pools, async DB connection pools,
+asyncio locks) then had to be rebuilt for every task, or broke when reused
+from a closed loop. AsyncRuntime runs one event loop per process in a
+background thread and executes submitted coroutines on it, so such resources
+stay warm across tasks.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+ShutdownHook = Callable[[], Awaitable[Any]]
+
+
+class AsyncRuntime:
+    """
+    An event loop running forever in a daemon thread.
+
+    Coroutines submitted from any other thread run on the loop; shutdown
+    hooks release loop-bound resources before the loop is closed.
+    """
+
+    def __init__(self, name: str = "async-runtime"):
+        """
+        Initialize a stopped runtime.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self.pid = os.getpid()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_hooks: List[ShutdownHook] = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The runtime's event loop, None before start()."""
+        return self._loop
+
+    def start(self) -> "AsyncRuntime":
+        """Start the loop thread if it is not running."""
+        with self._lock:
+            if self.running:
+                return self
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            self._thread.start()
+            started.wait()
+
+        logger.info(f"Started event loop runtime {self.name} in process {self.pid}")
+        return self
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """
+        Schedule a coroutine on the loop without waiting for it.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future with the coroutine's result
+        """
+        if not self.running:
+            coro.close()
+            raise RuntimeError(f"Event loop runtime {self.name} is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait; the coroutine is cancelled on timeout
+
+        Returns:
+            The coroutine's result
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from its own loop; await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def add_shutdown_hook(self, hook: ShutdownHook) -> None:
+        """
+        Register a coroutine function run on the loop before it stops.
+
+        Args:
+            hook: Called without arguments; registering the same hook twice has no effect
+        """
+        with self._lock:
+            if hook not in self._shutdown_hooks:
+                self._shutdown_hooks.append(hook)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Run the shutdown hooks, cancel remaining tasks and close the loop.
+
+        Args:
+            timeout: Maximum seconds for the hooks and for cancelled tasks to finish
+        """
+        if not self.running:
+            return
+
+        try:
+            self.run(self._shutdown(), timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error while stopping event loop runtime {self.name}: {e}")
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._thread = None
+        logger.info(f"Stopped event loop runtime {self.name} in process {self.pid}")
+
+    async def _shutdown(self) -> None:
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Event loop runtime shutdown hook failed: {e}")
+
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._loop.shutdown_asyncgens()
+
+
+# Global runtime instance (one per process)
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """
+    Get the running event loop runtime of this process, starting it if needed.
+
+    A runtime inherited through fork() has no loop thread in the child, so
+    forked processes (Celery prefork workers) get their own.
+
+    Returns:
+        The started runtime
+    """
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None or _runtime.pid != os.getpid():
+            _runtime = AsyncRuntime()
+        runtime = _runtime
+    return runtime.start()
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the process's long-lived event loop.
+
+    Drop-in replacement for asyncio.run() in synchronous code such as Celery
+    tasks.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Maximum seconds to wait
+
+    Returns:
+        The coroutine's result
+    """
+    return get_async_runtime().run(coro, timeout)
+
+
+def shutdown_async_runtime(timeout: float = 30.0) -> None:
+    """
+    Stop this process's runtime, if one was started.
+
+    Args:
+        timeout: Maximum seconds for shutdown hooks and pending tasks
+    """
+    global _runtime
+    with _runtime_lock:
+        runtime = _runtime if _runtime is not None and _runtime.pid == os.getpid() else None
+        _runtime = None
+    if runtime is not None:
+        runtime.stop(timeout)
@@ -9,7 +9,7 @@ import asyncio
 import logging
 import time
 from enum import Enum
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
 from dataclasses import dataclass, field
 
 from .logger import get_logger
@@ -37,6 +37,9 @@ class CircuitBreakerConfig:
     max_delay: float = 300.0  # 5 minutes max
     backoff_multiplier: float = 2.0
     jitter: bool = True
+    
+    # Exceptions re-raised without counting as failures (e.g. throttling)
+    ignored_exceptions: Tuple[Type[BaseException], ...] = ()
 
 
 class CircuitBreakerError(Exception):
@@ -127,6 +130,8 @@ class CircuitBreaker:
             self._on_success()
             return result
             
+        except self.config.ignored_exceptions:
+            raise
         except Exception as e:
             # Failure - handle state transitions
             self._on_failure(e)
@@ -132,6 +132,32 @@ class ContentExtractionException(ScrapingException):
         })
 
 
+class ResponseRejectedException(ScrapingException):
+    """Response rejected before or while reading its body (type or size guard)."""
+
+    def __init__(
+        self,
+        message: str,
+        url: Optional[str] = None,
+        reason: Optional[str] = None,
+        content_type: Optional[str] = None,
+        content_length: Optional[int] = None,
+        **kwargs
+    ):
+        super().__init__(
+            message,
+            severity=ErrorSeverity.LOW,
+            recoverable=False,
+            **kwargs
+        )
+        self.context.update({
+            "url": url,
+            "reason": reason,
+            "content_type": content_type,
+            "content_length": content_length
+        })
+
+
 class AntiDetectionException(ScrapingException):
     """Anti-bot detection and blocking."""
     
@@ -177,6 +203,29 @@ class AIServiceException(AIProcessingException):
         })
 
 
+class AIQuotaExceededException(AIServiceException):
+    """AI request could not get quota before its deadline."""
+    
+    def __init__(
+        self,
+        message: str,
+        priority: Optional[str] = None,
+        waited_seconds: Optional[float] = None,
+        **kwargs
+    ):
+        super().__init__(
+            message,
+            service_name=kwargs.pop("service_name", "gemini"),
+            api_error_code="quota_wait_timeout",
+            severity=ErrorSeverity.LOW,
+            **kwargs
+        )
+        self.context.update({
+            "priority": priority,
+            "waited_seconds": waited_seconds
+        })
+
+
 class ContentProcessingException(AIProcessingException):
     """Content analysis and processing failures."""
     